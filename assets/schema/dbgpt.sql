@@ -63,6 +63,20 @@ CREATE TABLE IF NOT EXISTS `document_chunk`
     KEY            `idx_document_id` (`document_id`) COMMENT 'index:document_id'
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge document chunk detail';
 
+CREATE TABLE IF NOT EXISTS `knowledge_question_index`
+(
+    `id`           int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `space`        varchar(100) NOT NULL COMMENT 'knowledge space',
+    `question_key` varchar(64)  NOT NULL COMMENT 'sha256 of the normalized question',
+    `question`     text         NULL COMMENT 'normalized question',
+    `document_id`  int          NOT NULL COMMENT 'document id',
+    `chunk_id`     int          NULL COMMENT 'chunk id, null for document questions',
+    `gmt_created`  timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    PRIMARY KEY (`id`),
+    KEY            `idx_question_space_key` (`space`, `question_key`) COMMENT 'index:space,question_key',
+    KEY            `idx_question_document_id` (`document_id`) COMMENT 'index:document_id'
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge question index';
+
 
 CREATE TABLE IF NOT EXISTS `connect_config`
 (
@@ -337,7 +351,8 @@ CREATE TABLE `dbgpt_serve_file` (
   `gmt_created` datetime DEFAULT CURRENT_TIMESTAMP COMMENT 'Record creation time',
   `gmt_modified` datetime DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT 'Record update time',
   PRIMARY KEY (`id`),
-  UNIQUE KEY `uk_bucket_file_id` (`bucket`, `file_id`)
+  UNIQUE KEY `uk_bucket_file_id` (`bucket`, `file_id`),
+  KEY `idx_file_hash_size` (`file_hash`, `file_size`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- dbgpt.dbgpt_serve_variables definition
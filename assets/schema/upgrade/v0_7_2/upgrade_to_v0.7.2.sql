@@ -0,0 +1,23 @@
+-- From 0.7.1 to 0.7.2, we have the following changes:
+USE dbgpt;
+
+-- Normalized question index for the knowledge QA retriever, the existing questions
+-- of a space are indexed by the retriever on its first lookup of the space, or
+-- with POST /api/v2/serve/knowledge/spaces/{space_id}/question_index/rebuild
+CREATE TABLE IF NOT EXISTS `knowledge_question_index`
+(
+    `id`           int          NOT NULL AUTO_INCREMENT COMMENT 'auto increment id',
+    `space`        varchar(100) NOT NULL COMMENT 'knowledge space',
+    `question_key` varchar(64)  NOT NULL COMMENT 'sha256 of the normalized question',
+    `question`     text         NULL COMMENT 'normalized question',
+    `document_id`  int          NOT NULL COMMENT 'document id',
+    `chunk_id`     int          NULL COMMENT 'chunk id, null for document questions',
+    `gmt_created`  timestamp NULL DEFAULT CURRENT_TIMESTAMP COMMENT 'created time',
+    PRIMARY KEY (`id`),
+    KEY            `idx_question_space_key` (`space`, `question_key`) COMMENT 'index:space,question_key',
+    KEY            `idx_question_document_id` (`document_id`) COMMENT 'index:document_id'
+) ENGINE=InnoDB AUTO_INCREMENT=1 DEFAULT CHARSET=utf8mb4 COMMENT='knowledge question index';
+
+-- Index to find the duplicates of a new file by its hash and size
+ALTER TABLE `dbgpt_serve_file`
+    ADD INDEX `idx_file_hash_size` (`file_hash`, `file_size`);
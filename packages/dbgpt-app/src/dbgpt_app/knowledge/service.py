@@ -40,6 +40,7 @@ from dbgpt_serve.rag.models.document_db import (
     KnowledgeDocumentEntity,
 )
 from dbgpt_serve.rag.models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+from dbgpt_serve.rag.models.question_index_db import KnowledgeQuestionIndexDao
 from dbgpt_serve.rag.retriever.knowledge_space import KnowledgeSpaceRetriever
 from dbgpt_serve.rag.service.service import SyncStatus
 from dbgpt_serve.rag.storage_manager import StorageManager
@@ -47,6 +48,7 @@ from dbgpt_serve.rag.storage_manager import StorageManager
 knowledge_space_dao = KnowledgeSpaceDao()
 knowledge_document_dao = KnowledgeDocumentDao()
 document_chunk_dao = DocumentChunkDao()
+question_index_dao = KnowledgeQuestionIndexDao()
 
 logger = logging.getLogger(__name__)
 CFG = Config()
@@ -192,7 +194,9 @@ class KnowledgeService:
             raise Exception(f"there are no or more than one space called {space}")
         space = spaces[0]
         space.context = argument_request.argument
-        return knowledge_space_dao.update_knowledge_space(space)
+        res = knowledge_space_dao.update_knowledge_space(space)
+        self.storage_manager.invalidate(space.name)
+        return res
 
     def get_knowledge_documents(self, space, request: DocumentQueryRequest):
         """get knowledge documents
@@ -410,6 +414,7 @@ class KnowledgeService:
         )
 
         knowledge_space_dao.update_knowledge_space(entity)
+        self.storage_manager.invalidate(space_id)
 
     def delete_space(self, space_name: str):
         """delete knowledge space
@@ -438,8 +443,12 @@ class KnowledgeService:
             document_chunk_dao.raw_delete(document.id)
         # delete documents
         knowledge_document_dao.raw_delete(document_query)
+        # delete question index
+        question_index_dao.delete_by_space(space.name)
         # delete space
-        return knowledge_space_dao.delete_knowledge_space(space)
+        res = knowledge_space_dao.delete_knowledge_space(space)
+        self.storage_manager.invalidate(space.name)
+        return res
 
     def delete_document(self, space_name: str, doc_name: str):
         """delete document
@@ -466,8 +475,12 @@ class KnowledgeService:
             storage_connector.delete_by_ids(vector_ids)
         # delete chunks
         document_chunk_dao.raw_delete(documents[0].id)
+        # delete question index
+        question_index_dao.delete_by_document(space_name, documents[0].id)
         # delete document
-        return str(knowledge_document_dao.raw_delete(document_query))
+        res = knowledge_document_dao.raw_delete(document_query)
+        self.storage_manager.invalidate(space_name)
+        return str(res)
 
     def get_document_chunks(self, request: ChunkQueryRequest):
         """get document chunks
@@ -526,6 +539,8 @@ class KnowledgeService:
                 )
                 for chunk_doc in chunk_docs
             ]
+            # The questions of the chunks of the previous sync are stale
+            question_index_dao.delete_chunk_questions(doc.space, doc.id)
             document_chunk_dao.create_documents_chunks(chunk_entities)
         except Exception as e:
             doc.status = SyncStatus.FAILED.name
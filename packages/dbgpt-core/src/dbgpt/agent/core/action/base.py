@@ -104,6 +104,16 @@ class Action(ABC, Generic[T]):
         """Return the resource type needed for the action."""
         return None
 
+    @property
+    def rely_previous_output(self) -> bool:
+        """Whether the action relies on the output of the previous action.
+
+        The actions which don't rely on it are parsed and run concurrently with the
+        previous actions of the agent, override it and return False if the action
+        doesn't use the rely_action_out of run.
+        """
+        return True
+
     @property
     def name(self) -> str:
         """Return the action name."""
@@ -16,6 +16,11 @@ class BlankAction(Action):
         """Blank action init."""
         super().__init__(**kwargs)
 
+    @property
+    def rely_previous_output(self) -> bool:
+        """Return False, the action doesn't use the previous action output."""
+        return False
+
     @property
     def ai_out_schema(self) -> Optional[str]:
         """Return the AI output schema."""
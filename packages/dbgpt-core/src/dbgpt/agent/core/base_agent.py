@@ -615,43 +615,85 @@ class ConversableAgent(Role, Agent):
         last_speaker_name: Optional[str] = None,
         **kwargs,
     ) -> ActionOutput:
-        """Perform actions."""
-        last_out: Optional[ActionOutput] = None
-        for i, action in enumerate(self.actions):
-            if not message:
-                raise ValueError("The message content is empty!")
+        """Perform actions.
 
-            with root_tracer.start_span(
-                "agent.act.run",
-                metadata={
-                    "message": message,
-                    "sender": sender.name if sender else None,
-                    "recipient": self.name,
-                    "reviewer": reviewer.name if reviewer else None,
-                    "rely_action_out": last_out.to_dict() if last_out else None,
-                    "conv_uid": self.not_null_agent_context.conv_id,
-                    "action_index": i,
-                    "total_action": len(self.actions),
-                },
-            ) as span:
-                ai_message = message.content if message.content else ""
-                real_action = action.parse_action(
-                    ai_message, default_action=action, **kwargs
-                )
-                if real_action is None:
-                    continue
-
-                last_out = await real_action.run(
-                    ai_message=message.content if message.content else "",
-                    resource=None,
-                    rely_action_out=last_out,
-                    **kwargs,
+        The actions which don't rely on the output of the previous action are run
+        concurrently, an action which relies on it waits for the previous actions.
+        The output of the last action in declaration order is returned.
+        """
+        if not message:
+            raise ValueError("The message content is empty!")
+        tasks: List[asyncio.Task] = []
+        try:
+            for i, action in enumerate(self.actions):
+                rely_action_out: Optional[ActionOutput] = None
+                if action.rely_previous_output:
+                    outputs = await asyncio.gather(*tasks)
+                    rely_action_out = _last_action_output(outputs)
+                tasks.append(
+                    asyncio.create_task(
+                        self._run_action(
+                            i,
+                            action,
+                            message,
+                            sender,
+                            reviewer,
+                            rely_action_out,
+                            **kwargs,
+                        )
+                    )
                 )
-                span.metadata["action_out"] = last_out.to_dict() if last_out else None
+            last_out = _last_action_output(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
         if not last_out:
             raise ValueError("Action should return value！")
         return last_out
 
+    async def _run_action(
+        self,
+        action_index: int,
+        action: Action,
+        message: AgentMessage,
+        sender: Agent,
+        reviewer: Optional[Agent],
+        rely_action_out: Optional[ActionOutput],
+        **kwargs,
+    ) -> Optional[ActionOutput]:
+        """Parse and run an action, return None if the action is skipped."""
+        with root_tracer.start_span(
+            "agent.act.run",
+            metadata={
+                "message": message,
+                "sender": sender.name if sender else None,
+                "recipient": self.name,
+                "reviewer": reviewer.name if reviewer else None,
+                "rely_action_out": rely_action_out.to_dict()
+                if rely_action_out
+                else None,
+                "conv_uid": self.not_null_agent_context.conv_id,
+                "action_index": action_index,
+                "total_action": len(self.actions),
+            },
+        ) as span:
+            ai_message = message.content if message.content else ""
+            real_action = action.parse_action(
+                ai_message, default_action=action, **kwargs
+            )
+            if real_action is None:
+                return None
+
+            action_out = await real_action.run(
+                ai_message=ai_message,
+                resource=None,
+                rely_action_out=rely_action_out,
+                **kwargs,
+            )
+            span.metadata["action_out"] = action_out.to_dict() if action_out else None
+            return action_out
+
     async def correctness_check(
         self, message: AgentMessage
     ) -> Tuple[bool, Optional[str]]:
@@ -1200,3 +1242,13 @@ def _new_system_message(content):
 
 def _is_list_of_type(lst: List[Any], type_cls: type) -> bool:
     return all(isinstance(item, type_cls) for item in lst)
+
+
+def _last_action_output(
+    outputs: List[Optional[ActionOutput]],
+) -> Optional[ActionOutput]:
+    """Return the last output of the actions which are not skipped."""
+    for output in reversed(outputs):
+        if output:
+            return output
+    return None
@@ -6,7 +6,9 @@ import logging
 from asyncio import Queue
 from collections import defaultdict
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+import cachetools
 
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.vis.client import VisAgentMessages, VisAgentPlans, VisAppLink, vis_client
@@ -18,9 +20,116 @@ from .default_gpts_memory import DefaultGptsMessageMemory, DefaultGptsPlansMemor
 
 NONE_GOAL_PREFIX: str = "none_goal_count_"
 
+# Max number of conversations whose messages are kept in memory
+DEFAULT_CONV_CACHE_SIZE: int = 256
+# Seconds an idle conversation is kept in memory
+DEFAULT_CONV_CACHE_TTL: int = 3600
+
 logger = logging.getLogger(__name__)
 
 
+class _MessageGroups:
+    """Vis groups of the messages of a conversation since a start round.
+
+    Messages are only appended, so only the messages appended since the last
+    call are grouped.
+    """
+
+    __slots__ = (
+        "start_round",
+        "num_grouped",
+        "groups",
+        "none_goal_count",
+        "app_link_message",
+        "app_launcher_message",
+    )
+
+    def __init__(self, start_round: int):
+        self.start_round = start_round
+        self.num_grouped = start_round
+        self.groups: Dict[str, List[GptsMessage]] = {}
+        self.none_goal_count = 1
+        self.app_link_message: Optional[GptsMessage] = None
+        self.app_launcher_message: Optional[GptsMessage] = None
+
+    def extend(self, messages: List[GptsMessage]):
+        for message in messages[self.num_grouped :]:
+            self._add(message)
+        self.num_grouped = max(self.num_grouped, len(messages))
+
+    def _add(self, message: GptsMessage):
+        if message.sender in [
+            "Intent Recognition Expert",
+            "App Link",
+        ] or message.receiver in ["Intent Recognition Expert", "App Link"]:
+            if (
+                message.sender in ["Intent Recognition Expert", "App Link"]
+                and message.receiver == "AppLauncher"
+            ):
+                self.app_link_message = message
+            if message.receiver != "Human":
+                return
+
+        if message.sender == "AppLauncher":
+            if message.receiver == "Human":
+                self.app_launcher_message = message
+            return
+
+        current_goal = message.current_goal
+        if current_goal:
+            # The plan steps may run concurrently, so the messages of the goals are
+            # interleaved
+            self.groups.setdefault(current_goal, []).append(message)
+        else:
+            self.groups[f"{NONE_GOAL_PREFIX}{self.none_goal_count}"] = [message]
+            self.none_goal_count += 1
+
+
+class _ConversationCache:
+    """Messages and rendered vis fragments of one conversation.
+
+    Messages are only appended, so a fragment rendered from a run of messages
+    never changes and can be keyed by the identity of those messages.
+    """
+
+    __slots__ = ("messages", "fragments", "view", "simple_views", "groups")
+
+    def __init__(self, messages: List[GptsMessage]):
+        self.messages = messages
+        self.fragments: Dict[Tuple, str] = {}
+        # (start round, number of messages, rendered view)
+        self.view: Optional[Tuple[int, int, str]] = None
+        self.simple_views: List[Optional[Dict[str, Any]]] = []
+        self.groups: Optional[_MessageGroups] = None
+
+    def message_groups(self, start_round: int) -> _MessageGroups:
+        if self.groups is None or self.groups.start_round != start_round:
+            self.groups = _MessageGroups(start_round)
+        self.groups.extend(self.messages)
+        return self.groups
+
+
+class _FragmentRenderer:
+    """Render vis fragments, reusing the ones of the previous render.
+
+    Only the fragments used by the current render are kept, so the cache does
+    not grow with fragments of message groups that have since been extended.
+    """
+
+    def __init__(self, previous: Optional[Dict[Tuple, str]] = None):
+        self._previous = previous or {}
+        self.fragments: Dict[Tuple, str] = {}
+
+    async def render(self, key: Tuple, func: Callable[[], Awaitable[str]]) -> str:
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            fragment = self._previous.get(key)
+            if fragment is None:
+                fragment = await func()
+            self.fragments[key] = fragment
+        return fragment
+
+
 class GptsMemory:
     """GPTs memory."""
 
@@ -29,8 +138,15 @@ class GptsMemory:
         plans_memory: Optional[GptsPlansMemory] = None,
         message_memory: Optional[GptsMessageMemory] = None,
         executor: Optional[Executor] = None,
+        cache_size: int = DEFAULT_CONV_CACHE_SIZE,
+        cache_ttl: int = DEFAULT_CONV_CACHE_TTL,
     ):
-        """Create a memory to store plans and messages."""
+        """Create a memory to store plans and messages.
+
+        Messages are always written to the message memory, the in-memory copy of
+        a conversation is only a cache: the least recently used or idle ones are
+        evicted and loaded again from the message memory when needed.
+        """
         self._plans_memory: GptsPlansMemory = (
             plans_memory if plans_memory is not None else DefaultGptsPlansMemory()
         )
@@ -38,7 +154,9 @@ class GptsMemory:
             message_memory if message_memory is not None else DefaultGptsMessageMemory()
         )
         self._executor = executor or ThreadPoolExecutor(max_workers=2)
-        self.messages_cache: defaultdict = defaultdict(list)
+        self._conv_caches: cachetools.TTLCache = cachetools.TTLCache(
+            maxsize=cache_size, ttl=cache_ttl
+        )
         self.channels: defaultdict = defaultdict(Queue)
         self.enable_vis_map: defaultdict = defaultdict(bool)
         self.start_round_map: defaultdict = defaultdict(int)
@@ -53,6 +171,11 @@ class GptsMemory:
         """Return the message memory."""
         return self._message_memory
 
+    @property
+    def messages_cache(self) -> Dict[str, List[GptsMessage]]:
+        """Return the cached messages of the conversations in memory."""
+        return {conv_id: cache.messages for conv_id, cache in self._conv_caches.items()}
+
     def init(
         self,
         conv_id: str,
@@ -63,7 +186,9 @@ class GptsMemory:
         """Gpt memory init."""
         self.channels[conv_id] = asyncio.Queue()
         self.enable_vis_map[conv_id] = enable_vis_message
-        self.messages_cache[conv_id] = history_messages if history_messages else []
+        self._conv_caches[conv_id] = _ConversationCache(
+            list(history_messages) if history_messages else []
+        )
         self.start_round_map[conv_id] = start_round
 
     def enable_vis_message(self, conv_id):
@@ -74,23 +199,44 @@ class GptsMemory:
         """Get conversation message queue."""
         return self.channels[conv_id] if conv_id in self.channels else None
 
+    def close(self, conv_id: str):
+        """Close the message channel of a finished conversation.
+
+        The cached messages are kept until they are evicted, so the conversation
+        can still be read.
+        """
+        self.channels.pop(conv_id, None)
+        self.enable_vis_map.pop(conv_id, None)
+        self.start_round_map.pop(conv_id, None)
+
     def clear(self, conv_id: str):
         """Clear gpt memory."""
         # clear last message queue
-        queue = self.channels.pop(conv_id)  # noqa
-        del queue
-        # clear messages cache'
-        if self.messages_cache.get(conv_id):
-            cache = self.messages_cache.pop(conv_id)  # noqa
-            del cache
-
+        self.channels.pop(conv_id, None)
+        # clear messages cache
+        self._conv_caches.pop(conv_id, None)
         # clear vis_enable_tag
-        vis_enable_tag = self.enable_vis_map.pop(conv_id)  # noqa
-        del vis_enable_tag
-
-        # clear start_roun
-        start_round = self.start_round_map.pop(conv_id)  # noqa
-        del start_round
+        self.enable_vis_map.pop(conv_id, None)
+        # clear start_round
+        self.start_round_map.pop(conv_id, None)
+
+    def _get_conv_cache(self, conv_id: str) -> Optional[_ConversationCache]:
+        cache = self._conv_caches.get(conv_id)
+        if cache is not None:
+            # Reset the expiration time of an active conversation
+            self._conv_caches[conv_id] = cache
+        return cache
+
+    async def _load_conv_cache(self, conv_id: str) -> _ConversationCache:
+        """Get the cached conversation, load it from the message memory if missed."""
+        cache = self._get_conv_cache(conv_id)
+        if cache is None:
+            messages = await blocking_func_to_async(
+                self._executor, self.message_memory.get_by_conv_id, conv_id
+            )
+            cache = _ConversationCache(list(messages or []))
+            self._conv_caches[conv_id] = cache
+        return cache
 
     async def push_message(self, conv_id: str, temp_msg: Optional[str] = None):
         """Push conversation message."""
@@ -98,6 +244,8 @@ class GptsMemory:
         enable_vis_tag = self.enable_vis_message(conv_id=conv_id)
         if enable_vis_tag:
             # 如果有临时消息内容需要push 拼接再最末尾，否则直接从短期记忆中发布最后消息
+            # The view of the stored messages is cached until a message is appended,
+            # so a streamed temp message only renders its own fragment.
             message_view = await self.app_link_chat_message(conv_id)
             if temp_msg:
                 temp_view = await self.agent_stream_message(temp_msg)
@@ -121,31 +269,32 @@ class GptsMemory:
 
     async def append_message(self, conv_id: str, message: GptsMessage):
         """Append message."""
-        self.messages_cache[conv_id].append(message)
         await blocking_func_to_async(
             self._executor, self.message_memory.append, message
         )
+        cache = self._get_conv_cache(conv_id)
+        if cache is not None:
+            cache.messages.append(message)
+        else:
+            # Evicted, the message memory already contains the new message
+            await self._load_conv_cache(conv_id)
 
         # 消息记忆后发布消息
         await self.push_message(conv_id)
 
     async def get_messages(self, conv_id: str) -> List[GptsMessage]:
         """Get message by conv_id."""
-        messages = self.messages_cache[conv_id]
-        if not messages:
-            messages = await blocking_func_to_async(
-                self._executor, self.message_memory.get_by_conv_id, conv_id
-            )
-        return messages
+        cache = await self._load_conv_cache(conv_id)
+        return cache.messages
 
     async def get_agent_messages(
         self, conv_id: str, agent_role: str
     ) -> List[GptsMessage]:
         """Get agent messages."""
-        gpt_messages = self.messages_cache[conv_id]
+        gpt_messages = await self.get_messages(conv_id)
         result = []
         for gpt_message in gpt_messages:
-            if gpt_message.sender == agent_role or gpt_messages.receiver == agent_role:
+            if gpt_message.sender == agent_role or gpt_message.receiver == agent_role:
                 result.append(gpt_message)
         return result
 
@@ -178,7 +327,13 @@ class GptsMemory:
         # Just use the action_output now
         return [m["action_output"] for m in new_list if m["action_output"]]
 
-    async def _message_group_vis_build(self, message_group, vis_items: list):
+    async def _message_group_vis_build(
+        self,
+        message_group,
+        vis_items: list,
+        renderer: Optional[_FragmentRenderer] = None,
+    ):
+        renderer = renderer or _FragmentRenderer()
         num: int = 0
         if message_group:
             last_goal = next(reversed(message_group))
@@ -192,10 +347,10 @@ class GptsMemory:
             for key, value in message_group.items():
                 num = num + 1
                 if key.startswith(NONE_GOAL_PREFIX):
-                    vis_items.append(await self._messages_to_plan_vis(plan_temps))
+                    vis_items.append(await self._render_plan_vis(renderer, plan_temps))
                     plan_temps = []
                     num = 0
-                    vis_items.append(await self._messages_to_agents_vis(value))
+                    vis_items.append(await self._render_agents_vis(renderer, value))
                 else:
                     num += 1
                     plan_temps.append(
@@ -204,19 +359,52 @@ class GptsMemory:
                             "num": num,
                             "status": "complete",
                             "agent": value[0].receiver if value else "",
-                            "markdown": await self._messages_to_agents_vis(value),
+                            "markdown": await self._render_agents_vis(renderer, value),
                         }
                     )
                     need_show_singe_last_message = True
 
             if len(plan_temps) > 0:
-                vis_items.append(await self._messages_to_plan_vis(plan_temps))
+                vis_items.append(await self._render_plan_vis(renderer, plan_temps))
             if need_show_singe_last_message and last_goal_message:
                 vis_items.append(
-                    await self._messages_to_agents_vis([last_goal_message], True)
+                    await self._render_agents_vis(renderer, [last_goal_message], True)
                 )
         return "\n".join(vis_items)
 
+    async def _render_agents_vis(
+        self,
+        renderer: _FragmentRenderer,
+        messages: List[GptsMessage],
+        is_last_message: bool = False,
+    ) -> str:
+        # A group is only extended, its first and last message and its length
+        # identify its messages
+        key = (
+            "agents",
+            is_last_message,
+            len(messages),
+            id(messages[0]) if messages else None,
+            id(messages[-1]) if messages else None,
+        )
+        return await renderer.render(
+            key, lambda: self._messages_to_agents_vis(messages, is_last_message)
+        )
+
+    async def _render_plan_vis(
+        self, renderer: _FragmentRenderer, plan_items: List[Dict]
+    ) -> str:
+        key = (
+            "plans",
+            tuple(
+                (item["name"], item["num"], item["agent"], item["markdown"])
+                for item in plan_items
+            ),
+        )
+        return await renderer.render(
+            key, lambda: self._messages_to_plan_vis(plan_items)
+        )
+
     async def agent_stream_message(
         self,
         message: Union[Dict, str],
@@ -267,108 +455,64 @@ class GptsMemory:
 
     async def simple_message(self, conv_id: str):
         """Get agent simple message."""
-        messages_cache = self.messages_cache[conv_id]
-        if messages_cache and len(messages_cache) > 0:
-            messages = messages_cache
-        else:
-            messages = await blocking_func_to_async(
-                self._executor, self.message_memory.get_by_conv_id, conv_id=conv_id
-            )
-
-        simple_message_list = []
-        for message in messages:
-            if message.sender == "Human":
-                continue
-
-            action_report_str = message.action_report
-            view_info = message.content
-            action_out = None
-            if action_report_str and len(action_report_str) > 0:
-                action_out = ActionOutput.from_dict(json.loads(action_report_str))
-            if action_out is not None:
-                view_info = action_out.content
-
-            simple_message_list.append(
-                {
-                    "sender": message.sender,
-                    "receiver": message.receiver,
-                    "model": message.model_name,
-                    "markdown": view_info,
-                }
-            )
-
-        return simple_message_list
+        cache = await self._load_conv_cache(conv_id)
+        # Only the messages appended since the last call are converted
+        for message in cache.messages[len(cache.simple_views) :]:
+            cache.simple_views.append(self._to_simple_message(message))
+        return [view for view in cache.simple_views if view is not None]
+
+    @staticmethod
+    def _to_simple_message(message: GptsMessage) -> Optional[Dict[str, Any]]:
+        if message.sender == "Human":
+            return None
+
+        action_report_str = message.action_report
+        view_info = message.content
+        action_out = None
+        if action_report_str and len(action_report_str) > 0:
+            action_out = ActionOutput.from_dict(json.loads(action_report_str))
+        if action_out is not None:
+            view_info = action_out.content
+
+        return {
+            "sender": message.sender,
+            "receiver": message.receiver,
+            "model": message.model_name,
+            "markdown": view_info,
+        }
 
     async def app_link_chat_message(self, conv_id: str):
         """Get app link chat message."""
-        messages = []
-        if conv_id in self.messages_cache:
-            messages_cache = self.messages_cache[conv_id]
-            if messages_cache and len(messages_cache) > 0:
-                start_round = (
-                    self.start_round_map[conv_id]
-                    if conv_id in self.start_round_map
-                    else 0
-                )
-                messages = messages_cache[start_round:]
-        else:
-            messages = await blocking_func_to_async(
-                self._executor, self.message_memory.get_by_conv_id, conv_id=conv_id
-            )
+        cache = await self._load_conv_cache(conv_id)
+        start_round = self.start_round_map.get(conv_id, 0)
+        num_messages = len(cache.messages)
+        if cache.view and cache.view[:2] == (start_round, num_messages):
+            return cache.view[2]
+        renderer = _FragmentRenderer(cache.fragments)
 
         # VIS消息组装
-        temp_group: Dict = {}
-        app_link_message: Optional[GptsMessage] = None
-        app_lanucher_message: Optional[GptsMessage] = None
-
-        none_goal_count = 1
-        for message in messages:
-            if message.sender in [
-                "Intent Recognition Expert",
-                "App Link",
-            ] or message.receiver in ["Intent Recognition Expert", "App Link"]:
-                if (
-                    message.sender in ["Intent Recognition Expert", "App Link"]
-                    and message.receiver == "AppLauncher"
-                ):
-                    app_link_message = message
-                if message.receiver != "Human":
-                    continue
-
-            if message.sender == "AppLauncher":
-                if message.receiver == "Human":
-                    app_lanucher_message = message
-                continue
-
-            current_gogal = message.current_goal
-
-            last_goal = next(reversed(temp_group)) if temp_group else None
-            if last_goal:
-                last_goal_messages = temp_group[last_goal]
-                if current_gogal:
-                    if current_gogal == last_goal:
-                        last_goal_messages.append(message)
-                    else:
-                        temp_group[current_gogal] = [message]
-                else:
-                    temp_group[f"{NONE_GOAL_PREFIX}{none_goal_count}"] = [message]
-                    none_goal_count += 1
-            else:
-                if current_gogal:
-                    temp_group[current_gogal] = [message]
-                else:
-                    temp_group[f"{NONE_GOAL_PREFIX}{none_goal_count}"] = [message]
-                    none_goal_count += 1
+        groups = cache.message_groups(start_round)
+        temp_group = groups.groups
+        app_link_message = groups.app_link_message
+        app_lanucher_message = groups.app_launcher_message
 
         vis_items: list = []
         if app_link_message:
+            link_message = app_link_message
+            lanucher_message = app_lanucher_message
             vis_items.append(
-                await self._messages_to_app_link_vis(
-                    app_link_message, app_lanucher_message
+                await renderer.render(
+                    ("app_link", id(link_message), id(lanucher_message)),
+                    lambda: self._messages_to_app_link_vis(
+                        link_message, lanucher_message
+                    ),
                 )
             )
 
-        return await self._message_group_vis_build(temp_group, vis_items)
+        view = await self._message_group_vis_build(temp_group, vis_items, renderer)
+        cache.fragments = renderer.fragments
+        cache.view = (start_round, num_messages, view)
+        return view
 
     async def _messages_to_agents_vis(
         self, messages: List[GptsMessage], is_last_message: bool = False
@@ -458,6 +602,8 @@ class GptsMemory:
             item = await queue.get()
             if item == "[DONE]":
                 queue.task_done()
+                if self.queue(conv_id) is queue:
+                    self.close(conv_id)
                 break
             else:
                 yield item
@@ -0,0 +1,171 @@
+from unittest.mock import patch
+
+import pytest
+
+from ..base import GptsMessage
+from ..gpts_memory import GptsMemory, _MessageGroups
+
+
+def _message(conv_id: str, content: str, goal: str = None, sender: str = "Agent"):
+    return GptsMessage(
+        conv_id=conv_id,
+        sender=sender,
+        receiver="Human",
+        role=sender,
+        content=content,
+        current_goal=goal,
+    )
+
+
+async def _drain(memory: GptsMemory, conv_id: str):
+    items = []
+    queue = memory.queue(conv_id)
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+@pytest.mark.asyncio
+async def test_append_message_renders_full_view():
+    memory = GptsMemory()
+    memory.init("conv1")
+    await memory.append_message("conv1", _message("conv1", "hello", "goal1"))
+    await memory.append_message("conv1", _message("conv1", "world", "goal1"))
+    await memory.append_message("conv1", _message("conv1", "bye"))
+
+    views = await _drain(memory, "conv1")
+    assert len(views) == 3
+    assert "hello" in views[-1] and "world" in views[-1] and "bye" in views[-1]
+    # The cached fragments render the same view as a fresh memory
+    fresh = GptsMemory(message_memory=memory.message_memory)
+    assert await fresh.app_link_chat_message("conv1") == views[-1]
+
+
+@pytest.mark.asyncio
+async def test_stream_message_reuses_rendered_view():
+    memory = GptsMemory()
+    memory.init("conv1")
+    for i in range(5):
+        await memory.append_message("conv1", _message("conv1", f"msg{i}", "goal1"))
+
+    with patch.object(
+        memory, "_messages_to_agents_vis", wraps=memory._messages_to_agents_vis
+    ) as render:
+        for i in range(10):
+            await memory.push_message("conv1", f"token{i}")
+        # Only the streamed fragment is rendered, the stored messages are cached
+        render.assert_not_called()
+
+        await memory.append_message("conv1", _message("conv1", "msg5", "goal2"))
+        # The new goal group and the last message, the goal1 group is reused
+        assert render.call_count == 2
+
+    views = await _drain(memory, "conv1")
+    assert "token9" in views[-2]
+    assert "msg5" in views[-1]
+
+
+@pytest.mark.asyncio
+async def test_simple_message_is_incremental():
+    memory = GptsMemory()
+    memory.init("conv1", enable_vis_message=False)
+    await memory.append_message("conv1", _message("conv1", "q", sender="Human"))
+    await memory.append_message("conv1", _message("conv1", "a1"))
+    await memory.append_message("conv1", _message("conv1", "a2"))
+    views = await _drain(memory, "conv1")
+    assert [v["markdown"] for v in views[-1]] == ["a1", "a2"]
+
+    await memory.push_message("conv1", "temp")
+    views = await _drain(memory, "conv1")
+    assert [v["markdown"] for v in views[-1]] == ["a1", "a2", "temp"]
+    assert [v["markdown"] for v in await memory.simple_message("conv1")] == [
+        "a1",
+        "a2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_evicted_conversation_is_reloaded():
+    memory = GptsMemory(cache_size=1)
+    memory.init("conv1")
+    await memory.append_message("conv1", _message("conv1", "first"))
+    memory.init("conv2")
+    assert "conv1" not in memory.messages_cache
+
+    await memory.append_message("conv1", _message("conv1", "second"))
+    messages = await memory.get_messages("conv1")
+    assert [m.content for m in messages] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_clear():
+    memory = GptsMemory()
+    memory.init("conv1")
+    await memory.append_message("conv1", _message("conv1", "hello"))
+    memory.clear("conv1")
+    assert memory.queue("conv1") is None
+    assert "conv1" not in memory.messages_cache
+    # Clear twice is fine
+    memory.clear("conv1")
+
+
+@pytest.mark.asyncio
+async def test_close_conversation_when_done():
+    memory = GptsMemory()
+    memory.init("conv1", enable_vis_message=False, start_round=1)
+    await memory.append_message("conv1", _message("conv1", "hello"))
+    await memory.complete("conv1")
+    items = [item async for item in memory.chat_messages("conv1")]
+    assert len(items) == 1
+
+    assert "conv1" not in memory.channels
+    assert "conv1" not in memory.enable_vis_map
+    assert "conv1" not in memory.start_round_map
+    # The finished conversation can still be read
+    assert [m.content for m in await memory.get_messages("conv1")] == ["hello"]
+
+
+@pytest.mark.asyncio
+async def test_messages_are_grouped_incrementally():
+    memory = GptsMemory()
+    memory.init("conv1")
+    await memory.append_message("conv1", _message("conv1", "m0", "goal1"))
+    await memory.append_message("conv1", _message("conv1", "m1", "goal1"))
+    await memory.append_message("conv1", _message("conv1", "m2"))
+    await memory.append_message("conv1", _message("conv1", "m3", "goal2"))
+
+    groups = memory._conv_caches["conv1"].groups
+    assert groups.num_grouped == 4
+    assert [[m.content for m in g] for g in groups.groups.values()] == [
+        ["m0", "m1"],
+        ["m2"],
+        ["m3"],
+    ]
+
+    # Grouping from a new start round starts over
+    memory.start_round_map["conv1"] = 2
+    await memory.app_link_chat_message("conv1")
+    groups = memory._conv_caches["conv1"].groups
+    assert [[m.content for m in g] for g in groups.groups.values()] == [
+        ["m2"],
+        ["m3"],
+    ]
+    fresh = GptsMemory(message_memory=memory.message_memory)
+    fresh.init("conv1", history_messages=await memory.get_messages("conv1"))
+    fresh.start_round_map["conv1"] = 2
+    assert await fresh.app_link_chat_message(
+        "conv1"
+    ) == await memory.app_link_chat_message("conv1")
+
+
+def test_group_interleaved_goals():
+    messages = [
+        _message("conv1", str(i), goal=goal)
+        for i, goal in enumerate(["A", "B", "A", None, "B"])
+    ]
+    groups = _MessageGroups(0)
+    groups.extend(messages[:3])
+    groups.extend(messages)
+    assert {
+        goal: [m.content for m in group] for goal, group in groups.groups.items()
+    } == {"A": ["0", "2"], "B": ["1", "4"], "none_goal_count_1": ["3"]}
@@ -43,6 +43,11 @@ class PlanAction(Action[List[PlanInput]]):
         super().__init__(**kwargs)
         self._render_protocol = VisAgentPlans()
 
+    @property
+    def rely_previous_output(self) -> bool:
+        """Return False, the action doesn't use the previous action output."""
+        return False
+
     @property
     def render_protocol(self) -> Optional[Vis]:
         """Return the render protocol."""
@@ -1,7 +1,9 @@
 """Auto plan chat manager agent."""
 
+import asyncio
+import contextlib
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from dbgpt.core.interface.message import ModelMessageRoleType
 
@@ -46,6 +48,10 @@ class AutoPlanChatManager(ManagerAgent):
         ),
     )
 
+    # Max number of the plan steps executed concurrently, the steps whose dependent
+    # steps are all completed are executed concurrently.
+    max_parallel_plans: int = 4
+
     def __init__(self, **kwargs):
         """Create a new AutoPlanChatManager instance."""
         super().__init__(**kwargs)
@@ -166,7 +172,6 @@ class AutoPlanChatManager(ManagerAgent):
                 is_exe_success=False,
                 content="The sender cannot be empty!",
             )
-        speaker: Agent = sender
         final_message = message.content
         rounds = message.rounds
         for i in range(self.max_round):
@@ -221,86 +226,108 @@ class AutoPlanChatManager(ManagerAgent):
                         content=final_message,  # work results message
                     )
                 else:
-                    try:
-                        now_plan: GptsPlan = todo_plans[0]
-                        current_goal_message = AgentMessage(
-                            content=now_plan.sub_task_content,
-                            current_goal=now_plan.sub_task_content,
-                            context={
-                                "plan_task": now_plan.sub_task_content,
-                                "plan_task_num": now_plan.sub_task_num,
-                            },
-                            rounds=rounds + 1,
-                        )
-                        # select the next speaker
-                        speaker, model = await self.select_speaker(
-                            speaker,
-                            self,
-                            now_plan.sub_task_content,
-                            now_plan.sub_task_agent,
-                        )
-                        # Tell the speaker the dependent history information
-                        rely_prompt, rely_messages = await self.process_rely_message(
-                            conv_id=self.not_null_agent_context.conv_id,
-                            now_plan=now_plan,
-                            speaker=speaker,
-                        )
-                        if rely_prompt:
-                            current_goal_message.content = (
-                                rely_prompt + current_goal_message.content
-                            )
-
-                        await self.send(
-                            message=current_goal_message,
-                            recipient=speaker,
-                            reviewer=reviewer,
-                            request_reply=False,
-                        )
-                        agent_reply_message = await speaker.generate_reply(
-                            received_message=current_goal_message,
-                            sender=self,
-                            reviewer=reviewer,
-                            rely_messages=AgentMessage.from_messages(rely_messages),
-                        )
-                        is_success = agent_reply_message.success
-                        reply_message = agent_reply_message.to_llm_message()
-                        await speaker.send(
-                            agent_reply_message, self, reviewer, request_reply=False
-                        )
-                        rounds = agent_reply_message.rounds
-
-                        plan_result = ""
-                        final_message = reply_message["content"]
-                        if is_success:
-                            if reply_message:
-                                action_report = agent_reply_message.action_report
-                                if action_report:
-                                    plan_result = action_report.content
-                                    final_message = action_report.view
-
-                            # The current planned Agent generation verification is
-                            # successful
-                            # Plan executed successfully
-                            self.memory.plans_memory.complete_task(
-                                self.not_null_agent_context.conv_id,
-                                now_plan.sub_task_num,
-                                plan_result,
-                            )
-                        else:
-                            plan_result = reply_message["content"]
-                            self.memory.plans_memory.update_task(
-                                self.not_null_agent_context.conv_id,
-                                now_plan.sub_task_num,
-                                Status.FAILED.value,
-                                now_plan.retry_times + 1,
-                                speaker.name,
-                                "",
-                                plan_result,
-                            )
-                            return ActionOutput(
-                                is_exe_success=False, content=plan_result
-                            )
+                    return await self._execute_plans(
+                        plans,
+                        reviewer,
+                        rounds,
+                        final_message,
+                        max_steps=self.max_round - i,
+                    )
+        return ActionOutput(
+            is_exe_success=False,
+            content=f"Maximum number of dialogue rounds exceeded.{self.max_round}",
+        )
 
+    @staticmethod
+    def _rely_nums(plan: GptsPlan) -> Set[int]:
+        if not plan.rely:
+            return set()
+        return {int(i) for i in plan.rely.split(",") if i.strip()}
+
+    def _plan_rounds_span(self) -> int:
+        """Return the max number of rounds taken by a plan step.
+
+        A step takes a round for the goal message and its reply, and two more rounds
+        for each retry of the speaker.
+        """
+        max_retry_count = max(
+            (getattr(agent, "max_retry_count", 1) for agent in self.agents),
+            default=1,
+        )
+        return 2 * max(max_retry_count, 1)
+
+    async def _execute_plans(
+        self,
+        plans: List[GptsPlan],
+        reviewer: Optional[Agent],
+        rounds: int,
+        final_message: Optional[str],
+        max_steps: int,
+    ) -> ActionOutput:
+        """Execute the todo plan steps in the order of their dependencies.
+
+        Every step whose dependent steps are all completed is dispatched at once, at
+        most max_parallel_plans steps are executed concurrently. The result of each
+        step is written to the plans memory as soon as it completes.
+
+        Each concurrent step gets its own range of rounds, so the messages of the
+        steps don't share rounds. The steps which select the same speaker are
+        executed one by one, an agent handles one message at a time.
+        """
+        plan_nums = {plan.sub_task_num for plan in plans}
+        completed = {
+            plan.sub_task_num for plan in plans if plan.state == Status.COMPLETE.value
+        }
+        todo: Dict[int, GptsPlan] = {
+            plan.sub_task_num: plan
+            for plan in plans
+            if plan.state in [Status.TODO.value, Status.RETRYING.value]
+        }
+        running: Dict[asyncio.Task, GptsPlan] = {}
+        final_messages: Dict[int, str] = {}
+        steps = 0
+        rounds_span = self._plan_rounds_span()
+        # The first round of the next concurrent step
+        next_rounds = rounds
+        speaker_locks: Dict[str, asyncio.Lock] = {}
+        try:
+            while todo or running:
+                ready = [
+                    plan
+                    for plan in todo.values()
+                    if (self._rely_nums(plan) & plan_nums) <= completed
+                ]
+                if not ready and not running:
+                    # The dependencies can't be satisfied, execute in order
+                    ready = [todo[min(todo)]]
+                for plan in sorted(ready, key=lambda p: p.sub_task_num):
+                    if len(running) >= max(1, self.max_parallel_plans):
+                        break
+                    if steps >= max_steps:
+                        break
+                    todo.pop(plan.sub_task_num)
+                    steps += 1
+                    step_rounds = max(next_rounds, rounds) if running else rounds
+                    next_rounds = step_rounds + rounds_span
+                    task = asyncio.create_task(
+                        self._execute_plan(
+                            plan, reviewer, step_rounds, speaker_locks=speaker_locks
+                        )
+                    )
+                    running[task] = plan
+                if not running:
+                    return ActionOutput(
+                        is_exe_success=False,
+                        content="Maximum number of dialogue rounds exceeded."
+                        f"{self.max_round}",
+                    )
+                done, _ = await asyncio.wait(
+                    running.keys(), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    plan = running.pop(task)
+                    try:
+                        is_success, content, reply_rounds = task.result()
                     except Exception as e:
                         logger.exception(
                             f"An exception was encountered during the execution of the"
@@ -311,7 +338,130 @@ class AutoPlanChatManager(ManagerAgent):
                             content=f"An exception was encountered during the execution"
                             f" of the current plan step.{str(e)}",
                         )
+                    rounds = max(rounds, reply_rounds)
+                    if not is_success:
+                        return ActionOutput(is_exe_success=False, content=content)
+                    completed.add(plan.sub_task_num)
+                    final_messages[plan.sub_task_num] = content
+        finally:
+            # Stop the other steps if a step failed
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+        # The plan has been fully executed and a success message is sent to the user.
+        if final_messages:
+            final_message = final_messages[max(final_messages)]
         return ActionOutput(
-            is_exe_success=False,
-            content=f"Maximum number of dialogue rounds exceeded.{self.max_round}",
+            is_exe_success=True,
+            content=final_message,  # work results message
+        )
+
+    async def _execute_plan(
+        self,
+        now_plan: GptsPlan,
+        reviewer: Optional[Agent],
+        rounds: int,
+        speaker_locks: Optional[Dict[str, asyncio.Lock]] = None,
+    ) -> Tuple[bool, str, int]:
+        """Execute a plan step and write its result to the plans memory.
+
+        Args:
+            now_plan (GptsPlan): The plan step to execute.
+            reviewer (Optional[Agent]): The reviewer agent.
+            rounds (int): The rounds before the step.
+            speaker_locks (Optional[Dict[str, asyncio.Lock]]): The locks of the
+                speakers by name, the steps of the same speaker hold its lock.
+
+        Returns:
+            Tuple[bool, str, int]: Whether the step succeeded, the final message of
+                the step (or the failure content) and the rounds after the step.
+        """
+        current_goal_message = AgentMessage(
+            content=now_plan.sub_task_content,
+            current_goal=now_plan.sub_task_content,
+            context={
+                "plan_task": now_plan.sub_task_content,
+                "plan_task_num": now_plan.sub_task_num,
+            },
+            rounds=rounds + 1,
+        )
+        # select the next speaker
+        speaker, model = await self.select_speaker(
+            self,
+            self,
+            now_plan.sub_task_content,
+            now_plan.sub_task_agent,
         )
+        speaker_lock = (
+            speaker_locks.setdefault(speaker.name, asyncio.Lock())
+            if speaker_locks is not None
+            else contextlib.nullcontext()
+        )
+        async with speaker_lock:
+            return await self._execute_plan_with_speaker(
+                now_plan, reviewer, speaker, current_goal_message
+            )
+
+    async def _execute_plan_with_speaker(
+        self,
+        now_plan: GptsPlan,
+        reviewer: Optional[Agent],
+        speaker: Agent,
+        current_goal_message: AgentMessage,
+    ) -> Tuple[bool, str, int]:
+        # Tell the speaker the dependent history information
+        rely_prompt, rely_messages = await self.process_rely_message(
+            conv_id=self.not_null_agent_context.conv_id,
+            now_plan=now_plan,
+            speaker=speaker,
+        )
+        if rely_prompt:
+            current_goal_message.content = rely_prompt + current_goal_message.content
+
+        await self.send(
+            message=current_goal_message,
+            recipient=speaker,
+            reviewer=reviewer,
+            request_reply=False,
+        )
+        agent_reply_message = await speaker.generate_reply(
+            received_message=current_goal_message,
+            sender=self,
+            reviewer=reviewer,
+            rely_messages=AgentMessage.from_messages(rely_messages),
+        )
+        is_success = agent_reply_message.success
+        reply_message = agent_reply_message.to_llm_message()
+        await speaker.send(agent_reply_message, self, reviewer, request_reply=False)
+
+        plan_result = ""
+        final_message = reply_message["content"]
+        if is_success:
+            if reply_message:
+                action_report = agent_reply_message.action_report
+                if action_report:
+                    plan_result = action_report.content
+                    final_message = action_report.view
+
+            # The current planned Agent generation verification is
+            # successful
+            # Plan executed successfully
+            self.memory.plans_memory.complete_task(
+                self.not_null_agent_context.conv_id,
+                now_plan.sub_task_num,
+                plan_result,
+            )
+        else:
+            plan_result = reply_message["content"]
+            self.memory.plans_memory.update_task(
+                self.not_null_agent_context.conv_id,
+                now_plan.sub_task_num,
+                Status.FAILED.value,
+                now_plan.retry_times + 1,
+                speaker.name,
+                "",
+                plan_result,
+            )
+            final_message = plan_result
+        return is_success, final_message, agent_reply_message.rounds
@@ -0,0 +1,188 @@
+import asyncio
+from typing import Dict, List, Optional
+
+import pytest
+
+from ...memory.gpts.base import GptsPlan
+from ...schema import Status
+from ..team_auto_plan import AutoPlanChatManager
+
+
+class _FakeExecutePlan:
+    """Replace the execution of a plan step with a sleep."""
+
+    def __init__(self, delay: float = 0.05, failed: Optional[int] = None):
+        self.delay = delay
+        self.failed = failed
+        self.started: List[int] = []
+        self.finished: List[int] = []
+        self.running = 0
+        self.max_running = 0
+        self.rounds: Dict[int, int] = {}
+
+    async def __call__(self, plan: GptsPlan, reviewer, rounds: int, **kwargs):
+        self.started.append(plan.sub_task_num)
+        self.rounds[plan.sub_task_num] = rounds
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        self.finished.append(plan.sub_task_num)
+        if plan.sub_task_num == self.failed:
+            return False, f"step {plan.sub_task_num} failed", rounds + 1
+        return True, f"result {plan.sub_task_num}", rounds + 1
+
+
+def _plans(relies: Dict[int, str], states: Optional[Dict[int, str]] = None):
+    states = states or {}
+    return [
+        GptsPlan(
+            conv_id="conv1",
+            sub_task_num=num,
+            sub_task_content=f"task {num}",
+            rely=rely,
+            state=states.get(num, Status.TODO.value),
+        )
+        for num, rely in relies.items()
+    ]
+
+
+def _manager(
+    fake: _FakeExecutePlan, max_parallel_plans: int = 4
+) -> AutoPlanChatManager:
+    manager = AutoPlanChatManager(max_parallel_plans=max_parallel_plans)
+    object.__setattr__(manager, "_execute_plan", fake)
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently():
+    fake = _FakeExecutePlan()
+    manager = _manager(fake)
+    plans = _plans({1: "", 2: "", 3: "1,2", 4: "3"})
+    output = await manager._execute_plans(plans, None, 0, "", max_steps=100)
+
+    assert output.is_exe_success
+    assert output.content == "result 4"
+    assert sorted(fake.started[:2]) == [1, 2]
+    assert fake.started[2:] == [3, 4]
+    assert fake.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_wall_time_follows_critical_path():
+    fake = _FakeExecutePlan(delay=0.1)
+    manager = _manager(fake, max_parallel_plans=8)
+    plans = _plans({i: "" for i in range(1, 9)})
+    start = asyncio.get_running_loop().time()
+    await manager._execute_plans(plans, None, 0, "", max_steps=100)
+    cost = asyncio.get_running_loop().time() - start
+    assert cost < 0.4
+    assert fake.max_running == 8
+
+
+@pytest.mark.asyncio
+async def test_parallelism_limit():
+    fake = _FakeExecutePlan(delay=0.01)
+    manager = _manager(fake, max_parallel_plans=1)
+    plans = _plans({1: "", 2: "", 3: ""})
+    await manager._execute_plans(plans, None, 0, "", max_steps=100)
+    assert fake.started == [1, 2, 3]
+    assert fake.max_running == 1
+
+
+@pytest.mark.asyncio
+async def test_completed_and_unknown_dependencies():
+    fake = _FakeExecutePlan(delay=0.01)
+    manager = _manager(fake)
+    plans = _plans(
+        {1: "", 2: "1,9", 3: "2"},
+        states={1: Status.COMPLETE.value},
+    )
+    output = await manager._execute_plans(plans, None, 0, "", max_steps=100)
+    assert output.is_exe_success
+    assert fake.started == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_failed_step_stops_others():
+    fake = _FakeExecutePlan(delay=0.05, failed=1)
+    manager = _manager(fake)
+    plans = _plans({1: "", 2: "", 3: "1"})
+    # Step 2 is slower than step 1
+    original = fake.__call__
+
+    async def _execute(plan, reviewer, rounds, **kwargs):
+        if plan.sub_task_num == 2:
+            await asyncio.sleep(1)
+        return await original(plan, reviewer, rounds, **kwargs)
+
+    object.__setattr__(manager, "_execute_plan", _execute)
+    output = await manager._execute_plans(plans, None, 0, "", max_steps=100)
+    assert not output.is_exe_success
+    assert output.content == "step 1 failed"
+    assert fake.finished == [1]
+
+
+@pytest.mark.asyncio
+async def test_max_steps():
+    fake = _FakeExecutePlan(delay=0.01)
+    manager = _manager(fake)
+    plans = _plans({1: "", 2: "1", 3: "2"})
+    output = await manager._execute_plans(plans, None, 0, "", max_steps=2)
+    assert not output.is_exe_success
+    assert fake.started == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_steps_own_rounds():
+    fake = _FakeExecutePlan(delay=0.01)
+    manager = _manager(fake)
+    span = manager._plan_rounds_span()
+    plans = _plans({1: "", 2: "", 3: "1,2"})
+    await manager._execute_plans(plans, None, 10, "", max_steps=100)
+    # The steps running together don't share rounds, the step after them starts
+    # from the rounds of the completed steps
+    assert fake.rounds[1] == 10
+    assert fake.rounds[2] == 10 + span
+    assert fake.rounds[3] == 10 + span + 1
+
+
+@pytest.mark.asyncio
+async def test_steps_of_same_speaker_serialized():
+    manager = AutoPlanChatManager()
+    running: Dict[str, int] = {}
+    max_running: Dict[str, int] = {}
+
+    class _Speaker:
+        def __init__(self, name: str):
+            self.name = name
+
+    speakers = {"a": _Speaker("a"), "b": _Speaker("b")}
+
+    async def _select_speaker(last_speaker, selector, now_goal_context, pre_allocated):
+        return speakers[pre_allocated], None
+
+    async def _execute_plan_with_speaker(now_plan, reviewer, speaker, message):
+        running[speaker.name] = running.get(speaker.name, 0) + 1
+        max_running[speaker.name] = max(
+            max_running.get(speaker.name, 0), running[speaker.name]
+        )
+        await asyncio.sleep(0.02)
+        running[speaker.name] -= 1
+        return True, "", message.rounds + 1
+
+    object.__setattr__(manager, "select_speaker", _select_speaker)
+    object.__setattr__(
+        manager, "_execute_plan_with_speaker", _execute_plan_with_speaker
+    )
+    plans = _plans({1: "", 2: "", 3: "", 4: ""})
+    for plan, agent in zip(plans, ["a", "a", "a", "b"]):
+        plan.sub_task_agent = agent
+    locks: Dict[str, asyncio.Lock] = {}
+    await asyncio.gather(
+        *[manager._execute_plan(plan, None, 0, speaker_locks=locks) for plan in plans]
+    )
+    assert max_running == {"a": 1, "b": 1}
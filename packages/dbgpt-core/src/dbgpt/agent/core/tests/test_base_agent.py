@@ -0,0 +1,135 @@
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from ..action.base import Action, ActionOutput
+from ..agent import AgentContext, AgentMessage
+from ..base_agent import ConversableAgent
+from ..profile import ProfileConfig
+
+
+class _TestAgent(ConversableAgent):
+    profile: ProfileConfig = ProfileConfig(name="Test", role="Tester")
+
+
+class _SleepAction(Action[None]):
+    def __init__(
+        self,
+        name: str,
+        events: List[str],
+        delay: float = 0.05,
+        rely: bool = False,
+        skip: bool = False,
+        fail: bool = False,
+    ):
+        super().__init__(name=name)
+        self.events = events
+        self.delay = delay
+        self.rely = rely
+        self.skip = skip
+        self.fail = fail
+        self.rely_action_out: Optional[ActionOutput] = None
+
+    @property
+    def rely_previous_output(self) -> bool:
+        return self.rely
+
+    def parse_action(self, ai_message, default_action, resource=None, **kwargs):
+        return None if self.skip else default_action
+
+    async def run(
+        self,
+        ai_message: str,
+        resource=None,
+        rely_action_out: Optional[ActionOutput] = None,
+        need_vis_render: bool = True,
+        **kwargs,
+    ) -> ActionOutput:
+        self.rely_action_out = rely_action_out
+        self.events.append(f"start {self.name}")
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ValueError(f"{self.name} failed")
+        self.events.append(f"end {self.name}")
+        return ActionOutput(content=f"{self.name} output")
+
+
+def _agent(actions: List[Action]) -> ConversableAgent:
+    agent = _TestAgent(agent_context=AgentContext(conv_id="conv1"))
+    agent.actions = actions
+    return agent
+
+
+async def _act(agent: ConversableAgent) -> ActionOutput:
+    return await agent.act(AgentMessage(content="hello"), sender=agent)
+
+
+@pytest.mark.asyncio
+async def test_independent_actions_run_concurrently():
+    events: List[str] = []
+    agent = _agent(
+        [
+            _SleepAction("a", events, delay=0.1),
+            _SleepAction("b", events, delay=0.1),
+            _SleepAction("c", events, delay=0.01),
+        ]
+    )
+    start = asyncio.get_running_loop().time()
+    output = await _act(agent)
+    cost = asyncio.get_running_loop().time() - start
+
+    assert cost < 0.18
+    assert events[:3] == ["start a", "start b", "start c"]
+    # The output of the last action in declaration order
+    assert output.content == "c output"
+
+
+@pytest.mark.asyncio
+async def test_dependent_action_waits_for_previous_output():
+    events: List[str] = []
+    a = _SleepAction("a", events)
+    b = _SleepAction("b", events, delay=0.01)
+    c = _SleepAction("c", events, rely=True)
+    agent = _agent([a, b, c])
+    output = await _act(agent)
+
+    assert events.index("start c") > events.index("end a")
+    assert c.rely_action_out.content == "b output"
+    assert a.rely_action_out is None
+    assert output.content == "c output"
+
+
+@pytest.mark.asyncio
+async def test_skipped_actions():
+    events: List[str] = []
+    b = _SleepAction("b", events, rely=True)
+    agent = _agent(
+        [
+            _SleepAction("a", events),
+            b,
+            _SleepAction("c", events, skip=True),
+        ]
+    )
+    output = await _act(agent)
+    assert b.rely_action_out.content == "a output"
+    assert output.content == "b output"
+
+    agent = _agent([_SleepAction("a", events, skip=True)])
+    with pytest.raises(ValueError, match="Action should return value"):
+        await _act(agent)
+
+
+@pytest.mark.asyncio
+async def test_failed_action_cancels_others():
+    events: List[str] = []
+    agent = _agent(
+        [
+            _SleepAction("a", events, delay=0.01, fail=True),
+            _SleepAction("b", events, delay=0.5),
+        ]
+    )
+    with pytest.raises(ValueError, match="a failed"):
+        await _act(agent)
+    await asyncio.sleep(0.01)
+    assert "end b" not in events
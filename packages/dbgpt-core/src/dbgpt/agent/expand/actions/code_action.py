@@ -22,6 +22,11 @@ class CodeAction(Action[None]):
         self._render_protocol = VisCode()
         self._code_execution_config = {}
 
+    @property
+    def rely_previous_output(self) -> bool:
+        """Return False, the action doesn't use the previous action output."""
+        return False
+
     @property
     def render_protocol(self) -> Optional[Vis]:
         """Return the render protocol."""
@@ -52,6 +52,11 @@ class IndicatorAction(Action[IndicatorInput]):
         """Return the resource type needed for the action."""
         return ResourceType.Knowledge
 
+    @property
+    def rely_previous_output(self) -> bool:
+        """Return False, the action doesn't use the previous action output."""
+        return False
+
     @property
     def render_protocol(self) -> Optional[Vis]:
         """Return the render protocol."""
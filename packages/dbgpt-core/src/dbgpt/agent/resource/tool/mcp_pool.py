@@ -0,0 +1,358 @@
+"""Pooled long-lived MCP client sessions."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+
+logger = logging.getLogger(__name__)
+
+# Create the transport streams of a MCP connection, e.g. the sse client
+ConnectFunc = Callable[[], AsyncContextManager[Tuple[Any, Any]]]
+
+# The message is not delivered when the transport is closed, so it is safe to retry
+_RECONNECT_EXCEPTIONS = (anyio.ClosedResourceError, anyio.BrokenResourceError)
+
+
+class MCPSession:
+    """A long-lived MCP client session.
+
+    The transport and the session are entered and exited in a background task, so the
+    session can be used by any task of the event loop.
+    """
+
+    def __init__(self, connect: ConnectFunc, connect_timeout: float = 30):
+        """Create a new MCPSession."""
+        self._connect = connect
+        self._connect_timeout = connect_timeout
+        self._session: Optional[ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._closed = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._broken = False
+        self.last_used = time.monotonic()
+
+    async def _run(self):
+        try:
+            async with self._connect() as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self._session = session
+                    self._ready.set()
+                    await self._closed.wait()
+        except BaseException as e:
+            self._error = e
+            if not isinstance(e, (Exception, asyncio.CancelledError)):
+                raise
+        finally:
+            self._session = None
+            self._ready.set()
+
+    async def start(self) -> ClientSession:
+        """Connect to the server and initialize the session."""
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), self._connect_timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise ValueError(
+                f"Connect to MCP server timeout after {self._connect_timeout}s"
+            )
+        if self._session is None:
+            await self.close()
+            raise ValueError(f"Connect to MCP server failed: {self._error}")
+        return self._session
+
+    @property
+    def session(self) -> ClientSession:
+        """Get the client session."""
+        if self._session is None:
+            raise ValueError("MCP session is not connected")
+        return self._session
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the session can be reused."""
+        return (
+            not self._broken
+            and self._session is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    def mark_broken(self):
+        """Mark the session broken, it will be closed instead of reused."""
+        self._broken = True
+
+    async def ping(self, timeout: float) -> bool:
+        """Check the session with a ping request."""
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.info(f"Ping MCP session failed: {e}")
+            self.mark_broken()
+            return False
+
+    async def close(self):
+        """Close the session and the transport."""
+        self._closed.set()
+        if self._task and not self._task.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), 5)
+            except Exception:
+                self._task.cancel()
+
+
+class MCPSessionPool:
+    """A bounded pool of long-lived sessions of a MCP server.
+
+    Sessions are created on demand and reused, at most max_size sessions are used
+    concurrently. An idle session is checked with a ping before reuse if it is idle
+    longer than health_check_interval, broken sessions are closed and replaced by new
+    ones. Sessions idle longer than idle_timeout are closed. The tool listing is cached
+    for tools_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        connect: ConnectFunc,
+        max_size: int = 4,
+        health_check_interval: float = 30,
+        tools_ttl: float = 300,
+        connect_timeout: float = 30,
+        idle_timeout: float = 300,
+        on_empty: Optional[Callable[["MCPSessionPool"], None]] = None,
+    ):
+        """Create a new MCPSessionPool.
+
+        Args:
+            connect (ConnectFunc): Create the transport streams of a connection.
+            max_size (int): Max number of concurrent sessions.
+            health_check_interval (float): Ping the idle session before reuse if it
+                is idle longer than this seconds.
+            tools_ttl (float): Seconds to cache the tool listing.
+            connect_timeout (float): Seconds to wait for the connection and the
+                initialize handshake.
+            idle_timeout (float): Close the idle session if it is idle longer than
+                this seconds.
+            on_empty (Optional[Callable[[MCPSessionPool], None]]): Called when the
+                pool has no idle or in-use sessions left.
+        """
+        self._connect = connect
+        self._max_size = max(1, max_size)
+        self._health_check_interval = health_check_interval
+        self._tools_ttl = tools_ttl
+        self._connect_timeout = connect_timeout
+        self._idle_timeout = idle_timeout
+        self._on_empty = on_empty
+        self._in_use = 0
+        self._evict_task: Optional[asyncio.Task] = None
+        self._semaphore = asyncio.Semaphore(self._max_size)
+        self._idle: Deque[MCPSession] = deque()
+        self._tools: Optional[List[Any]] = None
+        self._tools_time = 0.0
+        self._tools_lock = asyncio.Lock()
+        self._loop = asyncio.get_running_loop()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop of the sessions."""
+        return self._loop
+
+    @property
+    def options(self) -> Dict[str, Any]:
+        """Get the options of the pool."""
+        return {
+            "max_size": self._max_size,
+            "health_check_interval": self._health_check_interval,
+            "tools_ttl": self._tools_ttl,
+            "connect_timeout": self._connect_timeout,
+            "idle_timeout": self._idle_timeout,
+        }
+
+    @property
+    def empty(self) -> bool:
+        """Whether the pool has no idle or in-use sessions."""
+        return not self._idle and self._in_use == 0
+
+    def _check_empty(self):
+        if self.empty and self._on_empty is not None:
+            self._on_empty(self)
+
+    async def _acquire(self) -> MCPSession:
+        while self._idle:
+            session = self._idle.pop()
+            if session.healthy and (
+                time.monotonic() - session.last_used < self._health_check_interval
+                or await session.ping(self._connect_timeout)
+            ):
+                return session
+            await session.close()
+        session = MCPSession(self._connect, self._connect_timeout)
+        await session.start()
+        return session
+
+    async def _release(self, session: MCPSession):
+        session.last_used = time.monotonic()
+        if session.healthy:
+            self._idle.append(session)
+            if self._evict_task is None or self._evict_task.done():
+                self._evict_task = asyncio.create_task(self._evict_idle())
+        else:
+            await session.close()
+
+    async def _evict_idle(self):
+        """Close the sessions idle longer than idle_timeout until none is idle."""
+        while self._idle:
+            # The idle sessions are reused from the right, the left one is the oldest
+            expire_time = self._idle[0].last_used + self._idle_timeout
+            await asyncio.sleep(max(expire_time - time.monotonic(), 0))
+            now = time.monotonic()
+            while self._idle and now - self._idle[0].last_used >= self._idle_timeout:
+                await self._idle.popleft().close()
+        self._check_empty()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        """Get a session from the pool, return it to the pool after use."""
+        # Count the waiting callers too, the pool is not empty while they wait
+        self._in_use += 1
+        try:
+            async with self._semaphore:
+                session = await self._acquire()
+                try:
+                    yield session.session
+                except McpError:
+                    # The error response of the server, the session is still usable
+                    raise
+                except Exception:
+                    session.mark_broken()
+                    raise
+                finally:
+                    await self._release(session)
+        finally:
+            self._in_use -= 1
+            self._check_empty()
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call the tool, reconnect once if the connection is closed."""
+        # Keep the pool from being removed between the call and the retry
+        self._in_use += 1
+        try:
+            try:
+                async with self.session() as session:
+                    return await session.call_tool(name, arguments=arguments)
+            except _RECONNECT_EXCEPTIONS as e:
+                logger.info(f"MCP connection closed: {e!r}, reconnect and call {name}")
+                async with self.session() as session:
+                    return await session.call_tool(name, arguments=arguments)
+        finally:
+            self._in_use -= 1
+            self._check_empty()
+
+    async def list_tools(self) -> List[Any]:
+        """List the tools of the server, the result is cached for tools_ttl."""
+        async with self._tools_lock:
+            if (
+                self._tools is not None
+                and time.monotonic() - self._tools_time < self._tools_ttl
+            ):
+                return self._tools
+            async with self.session() as session:
+                result = await session.list_tools()
+            self._tools = result.tools
+            self._tools_time = time.monotonic()
+            return self._tools
+
+    def invalidate_tools(self):
+        """Invalidate the cached tool listing."""
+        self._tools = None
+
+    async def close(self):
+        """Close the idle sessions."""
+        if self._evict_task is not None:
+            self._evict_task.cancel()
+            self._evict_task = None
+        while self._idle:
+            await self._idle.pop().close()
+
+
+def _close_pool(pool: MCPSessionPool):
+    """Close the sessions of the pool in its own event loop."""
+    loop = pool.loop
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(pool.close(), loop)
+    elif not loop.is_closed():
+        logger.warning(
+            "The event loop of the replaced MCP session pool is not running, its "
+            "idle sessions can't be closed"
+        )
+
+
+_POOLS: Dict[Hashable, MCPSessionPool] = {}
+# The keys already warned about different pool options, to warn once
+_OPTIONS_WARNED: Set[Hashable] = set()
+
+
+def _remove_pool(key: Hashable, pool: MCPSessionPool):
+    """Remove the pool without sessions, the key may hold a newer pool."""
+    if _POOLS.get(key) is pool:
+        del _POOLS[key]
+        _OPTIONS_WARNED.discard(key)
+
+
+def get_mcp_session_pool(
+    key: Hashable, connect: ConnectFunc, **kwargs
+) -> MCPSessionPool:
+    """Get the session pool of the key in the current event loop.
+
+    The pools are shared by all the tool packs, sessions can't be shared across event
+    loops, so a new pool is created when the key is used in another event loop and the
+    sessions of the old pool are closed in its event loop. The options of the first
+    pool of the key are used, a warning is logged if different options are passed.
+    A pool is removed once all its sessions are closed, so the keys of rotated
+    headers or per-pack SSL contexts don't accumulate.
+
+    Args:
+        key (Hashable): The key of the server, includes the connect options.
+        connect (ConnectFunc): Create the transport streams of a connection.
+        **kwargs: The options of a new pool.
+    """
+    pool = _POOLS.get(key)
+    if pool is not None and pool.loop is not asyncio.get_running_loop():
+        _close_pool(pool)
+        pool = None
+    if pool is None:
+        pool = MCPSessionPool(
+            connect, on_empty=lambda p: _remove_pool(key, p), **kwargs
+        )
+        _POOLS[key] = pool
+    elif key not in _OPTIONS_WARNED and any(
+        pool.options.get(k) != v for k, v in kwargs.items()
+    ):
+        _OPTIONS_WARNED.add(key)
+        logger.warning(
+            f"The MCP session pool of {key} already exists with options "
+            f"{pool.options}, the different options {kwargs} are ignored"
+        )
+    return pool
@@ -5,8 +5,6 @@ import os
 import ssl
 from typing import Any, Callable, Dict, List, Optional, Sequence, Type, Union, cast
 
-from mcp import ClientSession
-
 from dbgpt.util.json_utils import parse_or_raise_error
 
 from ...util.mcp_utils import sse_client
@@ -14,6 +12,7 @@ from ..base import EXECUTE_ARGS_TYPE, PARSE_EXECUTE_ARGS_FUNCTION, ResourceType,
 from ..pack import Resource, ResourcePack
 from .base import DB_GPT_TOOL_IDENTIFIER, BaseTool, FunctionTool, ToolFunc
 from .exceptions import ToolExecutionException, ToolNotFoundException
+from .mcp_pool import MCPSessionPool, get_mcp_session_pool
 
 ToolResourceType = Union[Resource, BaseTool, List[BaseTool], ToolFunc, List[ToolFunc]]
 
@@ -340,6 +339,19 @@ class MCPToolPack(ToolPack):
                 },
             )
 
+        The sessions of each server are long-lived and pooled, they are shared by all
+        the tool packs with the same server options, the pool options of the first
+        tool pack are used. You can set the max number of concurrent sessions, the
+        seconds to cache the tool listing and to keep an idle session:
+        .. code-block:: python
+
+            tools = MCPToolPack(
+                "http://127.0.0.1:8000/sse",
+                max_sessions_per_server=8,
+                tools_cache_ttl=60,
+                session_idle_timeout=600,
+            )
+
     """
 
     def __init__(
@@ -351,6 +363,10 @@ class MCPToolPack(ToolPack):
         default_ssl_verify: Union[ssl.SSLContext, str, bool] = True,
         default_ssl_cafile: Optional[str] = None,
         overwrite_same_tool: bool = True,
+        max_sessions_per_server: int = 4,
+        tools_cache_ttl: float = 300,
+        health_check_interval: float = 30,
+        session_idle_timeout: float = 300,
         **kwargs,
     ):
         """Create an Auto-GPT plugin tool pack."""
@@ -368,6 +384,10 @@ class MCPToolPack(ToolPack):
         self._ssl_verify_map = ssl_verify or {}
         self.server_ssl_verify_map = {}
         self._overwrite_same_tool = overwrite_same_tool
+        self._max_sessions_per_server = max_sessions_per_server
+        self._tools_cache_ttl = tools_cache_ttl
+        self._health_check_interval = health_check_interval
+        self._session_idle_timeout = session_idle_timeout
 
     def switch_mcp_input_schema(self, input_schema: dict):
         args = {}
@@ -399,6 +419,24 @@ class MCPToolPack(ToolPack):
         except Exception as e:
             raise ValueError(f"MCP input_schema can't parase!{str(e)},{input_schema}")
 
+    def _session_pool(self, server: str) -> MCPSessionPool:
+        """Get the session pool of the server."""
+        headers = self.server_headers_map.get(server, {})
+        ssl_verify = self.server_ssl_verify_map.get(server, True)
+        key = (
+            server,
+            tuple(sorted((k, str(v)) for k, v in headers.items())),
+            ssl_verify,
+        )
+        return get_mcp_session_pool(
+            key,
+            lambda: sse_client(url=server, headers=headers, verify=ssl_verify),
+            max_size=self._max_sessions_per_server,
+            health_check_interval=self._health_check_interval,
+            tools_ttl=self._tools_cache_ttl,
+            idle_timeout=self._session_idle_timeout,
+        )
+
     async def preload_resource(self):
         """Preload the resource."""
         server_list = []
@@ -415,46 +453,26 @@ class MCPToolPack(ToolPack):
             )
             self.server_ssl_verify_map[server] = server_ssl_verify
 
-            async with sse_client(
-                url=server, headers=server_headers, verify=server_ssl_verify
-            ) as (read, write):
-                async with ClientSession(read, write) as session:
-                    # Initialize the connection
-                    await session.initialize()
-                    result = await session.list_tools()
-                    for tool in result.tools:
-                        tool_name = tool.name
-                        self.tool_server_map[tool_name] = server
-                        args = self.switch_mcp_input_schema(tool.inputSchema)
-
-                        async def call_mcp_tool(
-                            tool_name=tool_name, server=server, **kwargs
-                        ):
-                            try:
-                                headers_to_use = self.server_headers_map.get(server, {})
-                                ssl_verify_to_use = self.server_ssl_verify_map.get(
-                                    server, True
-                                )
-                                async with sse_client(
-                                    url=server,
-                                    headers=headers_to_use,
-                                    verify=ssl_verify_to_use,
-                                ) as (read, write):
-                                    async with ClientSession(read, write) as session:
-                                        # Initialize the connection
-                                        await session.initialize()
-                                        return await session.call_tool(
-                                            tool_name, arguments=kwargs
-                                        )
-                            except Exception as e:
-                                raise ValueError(f"MCP Call Exception! {str(e)}")
-
-                        self.add_command(
-                            tool.description,
-                            tool_name,
-                            args,
-                            call_mcp_tool,
-                            parse_execute_args_func=json_parse_execute_args_func,
-                            overwrite=self._overwrite_same_tool,
+            tools = await self._session_pool(server).list_tools()
+            for tool in tools:
+                tool_name = tool.name
+                self.tool_server_map[tool_name] = server
+                args = self.switch_mcp_input_schema(tool.inputSchema)
+
+                async def call_mcp_tool(tool_name=tool_name, server=server, **kwargs):
+                    try:
+                        return await self._session_pool(server).call_tool(
+                            tool_name, arguments=kwargs
                         )
+                    except Exception as e:
+                        raise ValueError(f"MCP Call Exception! {str(e)}")
+
+                self.add_command(
+                    tool.description,
+                    tool_name,
+                    args,
+                    call_mcp_tool,
+                    parse_execute_args_func=json_parse_execute_args_func,
+                    overwrite=self._overwrite_same_tool,
+                )
         self._loaded = True
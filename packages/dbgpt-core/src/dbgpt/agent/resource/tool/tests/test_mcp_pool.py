@@ -0,0 +1,257 @@
+import asyncio
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import anyio
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_client_server_memory_streams
+
+from ..mcp_pool import (
+    _OPTIONS_WARNED,
+    _POOLS,
+    MCPSessionPool,
+    get_mcp_session_pool,
+)
+from ..pack import MCPToolPack
+
+
+class _InProcessServer:
+    """An in-process MCP server which counts the connections."""
+
+    def __init__(self):
+        self.connections = 0
+        self.list_tools_calls = 0
+        self.running_calls = 0
+        self.max_running_calls = 0
+        self.mcp = FastMCP("test")
+
+        @self.mcp.tool(description="Add two numbers.")
+        async def add(a: int, b: int) -> int:
+            self.running_calls += 1
+            self.max_running_calls = max(self.max_running_calls, self.running_calls)
+            await asyncio.sleep(0.01)
+            self.running_calls -= 1
+            return a + b
+
+        server = self.mcp._mcp_server
+        list_tools = self.mcp.list_tools
+
+        async def _list_tools():
+            self.list_tools_calls += 1
+            return await list_tools()
+
+        server.list_tools()(_list_tools)
+
+    @asynccontextmanager
+    async def connect(self):
+        self.connections += 1
+        server = self.mcp._mcp_server
+        async with create_client_server_memory_streams() as (
+            client_streams,
+            server_streams,
+        ):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(
+                    lambda: server.run(
+                        server_streams[0],
+                        server_streams[1],
+                        server.create_initialization_options(),
+                    )
+                )
+                try:
+                    yield client_streams
+                finally:
+                    tg.cancel_scope.cancel()
+
+
+def _result_text(result) -> str:
+    return result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_reuse_session():
+    server = _InProcessServer()
+    pool = MCPSessionPool(server.connect)
+    for i in range(5):
+        result = await pool.call_tool("add", {"a": i, "b": 1})
+        assert _result_text(result) == str(i + 1)
+    assert server.connections == 1
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_bounded_concurrent_sessions():
+    server = _InProcessServer()
+    pool = MCPSessionPool(server.connect, max_size=2)
+    results = await asyncio.gather(
+        *[pool.call_tool("add", {"a": i, "b": i}) for i in range(10)]
+    )
+    assert [_result_text(r) for r in results] == [str(2 * i) for i in range(10)]
+    assert server.connections == 2
+    assert server.max_running_calls <= 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_broken_session():
+    server = _InProcessServer()
+    pool = MCPSessionPool(server.connect)
+    await pool.call_tool("add", {"a": 1, "b": 1})
+    # Close the connection behind the pool
+    pool._idle[0]._closed.set()
+    await asyncio.sleep(0.05)
+
+    result = await pool.call_tool("add", {"a": 2, "b": 2})
+    assert _result_text(result) == "4"
+    assert server.connections == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_health_check_idle_session():
+    server = _InProcessServer()
+    pool = MCPSessionPool(server.connect, health_check_interval=0)
+    await pool.call_tool("add", {"a": 1, "b": 1})
+    with patch.object(
+        pool._idle[0].session, "send_ping", side_effect=ValueError("ping failed")
+    ):
+        await pool.call_tool("add", {"a": 1, "b": 1})
+    assert server.connections == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_tools():
+    server = _InProcessServer()
+    pool = MCPSessionPool(server.connect, tools_ttl=300)
+    tools = await pool.list_tools()
+    assert [t.name for t in tools] == ["add"]
+    await pool.list_tools()
+    assert server.list_tools_calls == 1
+
+    pool.invalidate_tools()
+    await pool.list_tools()
+    assert server.list_tools_calls == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_mcp_tool_pack_pooled():
+    server = _InProcessServer()
+
+    def _sse_client(url, headers=None, verify=True):
+        return server.connect()
+
+    with patch("dbgpt.agent.resource.tool.pack.sse_client", _sse_client):
+        pack = MCPToolPack("http://in-process/sse")
+        await pack.preload_resource()
+        other = MCPToolPack("http://in-process/sse")
+        await other.preload_resource()
+        for i in range(3):
+            result = await pack.async_execute(resource_name="add", a=i, b=i)
+            assert _result_text(result) == str(2 * i)
+
+    assert server.connections == 1
+    assert server.list_tools_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_evict_idle_session():
+    server = _InProcessServer()
+    pool = MCPSessionPool(server.connect, idle_timeout=0.05)
+    await pool.call_tool("add", {"a": 1, "b": 1})
+    session = pool._idle[0]
+    await asyncio.sleep(0.2)
+    assert not pool._idle
+    assert not session.healthy
+
+    await pool.call_tool("add", {"a": 1, "b": 1})
+    assert server.connections == 2
+    await pool.close()
+
+
+def test_close_pool_of_replaced_loop():
+    server = _InProcessServer()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+
+        async def _call():
+            pool = get_mcp_session_pool("server", server.connect)
+            await pool.call_tool("add", {"a": 1, "b": 1})
+            return pool
+
+        old_pool = asyncio.run_coroutine_threadsafe(_call(), loop).result(5)
+        session = old_pool._idle[0]
+
+        async def _get_pool():
+            return get_mcp_session_pool("server", server.connect)
+
+        pool = asyncio.run(_get_pool())
+        assert pool is not old_pool
+        for _ in range(50):
+            if not old_pool._idle and not session.healthy:
+                break
+            time.sleep(0.02)
+        assert not old_pool._idle
+        assert not session.healthy
+    finally:
+        _POOLS.pop("server", None)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+@pytest.mark.asyncio
+async def test_warn_different_pool_options(caplog):
+    server = _InProcessServer()
+    try:
+        pool = get_mcp_session_pool("options", server.connect, max_size=2)
+        with caplog.at_level(logging.WARNING):
+            assert get_mcp_session_pool("options", server.connect, max_size=2) is pool
+            assert not caplog.records
+            assert get_mcp_session_pool("options", server.connect, max_size=8) is pool
+            assert get_mcp_session_pool("options", server.connect, max_size=8) is pool
+        assert len(caplog.records) == 1
+        assert "different options" in caplog.records[0].getMessage()
+    finally:
+        _POOLS.pop("options", None)
+        _OPTIONS_WARNED.discard("options")
+
+
+@pytest.mark.asyncio
+async def test_remove_pool_without_sessions():
+    server = _InProcessServer()
+    try:
+        pool = get_mcp_session_pool("empty", server.connect, idle_timeout=0.05)
+        await pool.call_tool("add", {"a": 1, "b": 1})
+        assert _POOLS["empty"] is pool
+        await asyncio.sleep(0.2)
+        assert pool.empty
+        assert "empty" not in _POOLS
+
+        new_pool = get_mcp_session_pool("empty", server.connect, idle_timeout=0.05)
+        assert new_pool is not pool
+        await new_pool.close()
+    finally:
+        _POOLS.pop("empty", None)
+
+
+@pytest.mark.asyncio
+async def test_keep_pool_with_session_in_use():
+    server = _InProcessServer()
+    try:
+        pool = get_mcp_session_pool("in_use", server.connect, idle_timeout=0.05)
+        async with pool.session() as session:
+            await session.call_tool("add", {"a": 1, "b": 1})
+            await asyncio.sleep(0.1)
+            assert _POOLS["in_use"] is pool
+        assert _POOLS["in_use"] is pool
+        await pool.close()
+    finally:
+        _POOLS.pop("in_use", None)
@@ -48,6 +48,7 @@ from .task.task_impl import (
     SimpleInputSource,
     SimpleStreamTaskOutput,
     SimpleTaskOutput,
+    StreamTee,
     _is_async_iterator,
 )
 from .trigger.base import Trigger
@@ -99,6 +100,7 @@ __all__ = [
     "DefaultInputContext",
     "SimpleTaskOutput",
     "SimpleStreamTaskOutput",
+    "StreamTee",
     "StreamifyAbsOperator",
     "UnstreamifyAbsOperator",
     "TransformStreamAbsOperator",
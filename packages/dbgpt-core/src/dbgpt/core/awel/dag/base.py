@@ -369,6 +369,8 @@ class DAGNode(DAGLifecycle, DependencyMixin, ViewMixin, ABC):
             node_id (str): The node id
         """
         self._node_id = node_id
+        if self._dag:
+            self._dag._clear_cache()
 
     def __hash__(self) -> int:
         """Return the hash value of current DAGNode.
@@ -479,6 +481,7 @@ class DAGNode(DAGLifecycle, DependencyMixin, ViewMixin, ABC):
 
                 self._downstream.append(node)
                 node._upstream.append(self)
+        dag._clear_cache()
 
     def __repr__(self):
         """Return the representation of current DAGNode."""
@@ -812,6 +815,8 @@ class DAG:
         self._lock = asyncio.Lock()
         self._event_loop_task_id_to_ctx: Dict[int, DAGContext] = {}
         self._default_dag_variables = default_dag_variables
+        # Job plans of the end nodes, see `JobManager.build_from_end_node`
+        self._job_plans: Dict[str, Any] = {}
 
     def _append_node(self, node: DAGNode) -> None:
         if node.node_id in self.node_map:
@@ -826,9 +831,13 @@ class DAG:
         if not node_id:
             raise ValueError("Node id can't be None")
         self.node_map[node_id] = node
-        # clear cached nodes
+        self._clear_cache()
+
+    def _clear_cache(self) -> None:
+        """Clear the cached nodes and job plans after the structure changed."""
         self._root_nodes = []
         self._leaf_nodes = []
+        self._job_plans = {}
 
     def _new_node_id(self) -> str:
         return str(uuid.uuid4())
@@ -167,6 +167,10 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
     streaming_operator: bool = False
     incremental_output: bool = False
     output_format: Optional[str] = None
+    # How an output stream read by several downstream operators is shared, see
+    # `StreamTee`. None means buffering without limit.
+    stream_buffer_size: Optional[int] = None
+    slow_consumer_policy: str = "block"
 
     def __init__(
         self,
@@ -193,6 +197,10 @@ class BaseOperator(DAGNode, ABC, Generic[OUT], metaclass=BaseOperatorMeta):
             self.incremental_output = bool(kwargs["incremental_output"])
         if "output_format" in kwargs:
             self.output_format = kwargs["output_format"]
+        if "stream_buffer_size" in kwargs:
+            self.stream_buffer_size = kwargs["stream_buffer_size"]
+        if "slow_consumer_policy" in kwargs:
+            self.slow_consumer_policy = kwargs["slow_consumer_policy"]
         self._runner: WorkflowRunner = runner
         self._dag_ctx: Optional[DAGContext] = None
         self._can_skip_in_branch = can_skip_in_branch
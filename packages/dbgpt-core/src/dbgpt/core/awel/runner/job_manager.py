@@ -3,14 +3,34 @@
 import asyncio
 import logging
 import uuid
-from typing import Dict, List, Optional, cast
+from typing import Dict, List, NamedTuple, Optional, Tuple, cast
 
 from ..dag.base import DAGLifecycle
 from ..operators.base import CALL_DATA, BaseOperator
+from ..task.base import TaskContext
+from ..task.task_impl import SimpleStreamTaskOutput, _TeeBranch
 
 logger = logging.getLogger(__name__)
 
 
+class _JobPlan(NamedTuple):
+    """The execution plan of a DAG from its end node.
+
+    The plan only depends on the structure of the DAG, so it is built once and
+    cached in the DAG until the structure changes.
+    """
+
+    all_nodes: List[BaseOperator]
+    root_nodes: List[BaseOperator]
+    node_name_to_ids: Dict[str, str]
+    # Nodes in execution order, every node after all its upstream nodes
+    execution_order: List[BaseOperator]
+    # The upstream nodes of each node, in the order of its inputs
+    upstream_nodes: Dict[str, Tuple[BaseOperator, ...]]
+    # The number of nodes in the plan reading the output of each node
+    downstream_counts: Dict[str, int]
+
+
 class JobManager(DAGLifecycle):
     """Job manager for DAG.
 
@@ -24,6 +44,7 @@ class JobManager(DAGLifecycle):
         end_node: BaseOperator,
         id2call_data: Dict[str, Optional[Dict]],
         node_name_to_ids: Dict[str, str],
+        plan: Optional[_JobPlan] = None,
     ) -> None:
         """Create a job manager.
 
@@ -33,12 +54,73 @@ class JobManager(DAGLifecycle):
             end_node (BaseOperator): The end node of the DAG.
             id2call_data (Dict[str, Optional[Dict]]): The call data of each node.
             node_name_to_ids (Dict[str, str]): The node name to node id mapping.
+            plan (Optional[_JobPlan], optional): The execution plan of the DAG.
         """
         self._root_nodes = root_nodes
         self._all_nodes = all_nodes
         self._end_node = end_node
         self._id2node_data = id2call_data
         self._node_name_to_ids = node_name_to_ids
+        self._plan = plan or _build_job_plan(end_node)
+        # Branches of the shared output streams not handed out yet
+        self._stream_branches: Dict[str, List[TaskContext]] = {}
+
+    @property
+    def execution_order(self) -> List[BaseOperator]:
+        """Return the nodes in execution order."""
+        return self._plan.execution_order
+
+    def get_upstream_nodes(self, node_id: str) -> Tuple[BaseOperator, ...]:
+        """Get the upstream nodes of a node, in the order of its inputs."""
+        return self._plan.upstream_nodes.get(node_id, ())
+
+    def get_upstream_output(
+        self, node: BaseOperator, task_ctx: TaskContext
+    ) -> TaskContext:
+        """Get the output of an upstream node for one of its downstream nodes.
+
+        An output stream read by several downstream nodes is split with a
+        `StreamTee`, and each downstream node gets its own branch, so the stream
+        is neither consumed by only one of them nor materialized.
+
+        Args:
+            node (BaseOperator): The upstream node.
+            task_ctx (TaskContext): The task context of the upstream node.
+        """
+        node_id = node.node_id
+        num_consumers = self._plan.downstream_counts.get(node_id, 0)
+        if num_consumers <= 1 or not task_ctx.task_output.is_stream:
+            return task_ctx
+        if node_id not in self._stream_branches:
+            outputs = SimpleStreamTaskOutput(task_ctx.task_output.output_stream).tee(
+                num_consumers,
+                max_buffer_size=node.stream_buffer_size,
+                slow_consumer_policy=node.slow_consumer_policy,  # type: ignore
+            )
+            branches = []
+            for output in outputs:
+                branch_ctx = task_ctx.new_ctx()
+                branch_ctx.set_task_output(output)
+                branch_ctx.metadata.update(task_ctx.metadata)
+                branches.append(branch_ctx)
+            self._stream_branches[node_id] = branches
+        branches = self._stream_branches[node_id]
+        if not branches:
+            raise ValueError(f"All stream branches of node {node_id} are taken")
+        return branches.pop(0)
+
+    def release_upstream_output(self, node: BaseOperator, task_ctx: TaskContext):
+        """Release the stream branch of a downstream node which never reads it.
+
+        With the "block" policy and a bounded buffer, a branch that is neither
+        read nor closed blocks the other downstream nodes forever once the buffer
+        is full.
+
+        Args:
+            node (BaseOperator): The upstream node.
+            task_ctx (TaskContext): The task context of the upstream node.
+        """
+        _close_stream_branch(self.get_upstream_output(node, task_ctx))
 
     @staticmethod
     def build_from_end_node(
@@ -47,22 +129,24 @@ class JobManager(DAGLifecycle):
         """Build a job manager from the end node.
 
         This will get all upstream nodes from the end node, and build a job manager.
+        The analysis of the DAG is cached in the DAG of the end node, so only the
+        call data is handled for every run of the same DAG.
 
         Args:
             end_node (BaseOperator): The end node of the DAG.
             call_data (Optional[CALL_DATA], optional): The call data of the end node.
                 Defaults to None.
         """
-        nodes = _build_from_end_node(end_node)
-        root_nodes = _get_root_nodes(nodes)
-        id2call_data = _save_call_data(root_nodes, call_data)
-
-        node_name_to_ids = {}
-        for node in nodes:
-            if node.node_name is not None:
-                node_name_to_ids[node.node_name] = node.node_id
-
-        return JobManager(root_nodes, nodes, end_node, id2call_data, node_name_to_ids)
+        plan = _get_job_plan(end_node)
+        id2call_data = _save_call_data(plan.root_nodes, call_data)
+        return JobManager(
+            plan.root_nodes,
+            plan.all_nodes,
+            end_node,
+            id2call_data,
+            plan.node_name_to_ids,
+            plan,
+        )
 
     def get_call_data_by_id(self, node_id: str) -> Optional[Dict]:
         """Get the call data by node id.
@@ -87,6 +171,14 @@ class JobManager(DAGLifecycle):
         await asyncio.gather(*tasks)
 
 
+def _close_stream_branch(task_ctx: TaskContext):
+    task_output = task_ctx.task_output
+    if isinstance(task_output, SimpleStreamTaskOutput):
+        stream = task_output.output_stream
+        if isinstance(stream, _TeeBranch):
+            stream.close()
+
+
 def _save_call_data(
     root_nodes: List[BaseOperator], call_data: Optional[CALL_DATA]
 ) -> Dict[str, Optional[Dict]]:
@@ -109,17 +201,87 @@ def _save_call_data(
     return id2call_data
 
 
+def _get_job_plan(end_node: BaseOperator) -> _JobPlan:
+    """Get the cached job plan of the end node, build it if missing."""
+    dag = end_node.dag
+    if not dag or not end_node._node_id:
+        return _build_job_plan(end_node)
+    plan = dag._job_plans.get(end_node.node_id)
+    if plan is None:
+        plan = _build_job_plan(end_node)
+        # Store after building, assigning node ids clears the cached plans
+        dag._job_plans[end_node.node_id] = plan
+    return plan
+
+
+def _build_job_plan(end_node: BaseOperator) -> _JobPlan:
+    nodes = _build_from_end_node(end_node)
+    root_nodes = _get_root_nodes(nodes)
+    node_name_to_ids = {}
+    for node in nodes:
+        if node.node_name is not None:
+            node_name_to_ids[node.node_name] = node.node_id
+    execution_order = _build_execution_order(end_node)
+    upstream_nodes = {
+        node.node_id: tuple(cast(BaseOperator, upstream) for upstream in node.upstream)
+        for node in execution_order
+    }
+    downstream_counts: Dict[str, int] = {}
+    for upstreams in upstream_nodes.values():
+        for upstream in upstreams:
+            node_id = upstream.node_id
+            downstream_counts[node_id] = downstream_counts.get(node_id, 0) + 1
+    return _JobPlan(
+        nodes,
+        root_nodes,
+        node_name_to_ids,
+        execution_order,
+        upstream_nodes,
+        downstream_counts,
+    )
+
+
 def _build_from_end_node(end_node: BaseOperator) -> List[BaseOperator]:
-    """Build all nodes from the end node."""
-    nodes = []
-    if isinstance(end_node, BaseOperator) and not end_node._node_id:
-        end_node.set_node_id(str(uuid.uuid4()))
-    nodes.append(end_node)
-    for node in end_node.upstream:
-        node = cast(BaseOperator, node)
-        nodes += _build_from_end_node(node)
+    """Build all nodes from the end node.
+
+    Every node appears once, even if it is the upstream of many nodes.
+    """
+    nodes: List[BaseOperator] = []
+    visited = set()
+    stack = [end_node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BaseOperator) and not node._node_id:
+            node.set_node_id(str(uuid.uuid4()))
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        nodes.append(node)
+        stack.extend(cast(BaseOperator, n) for n in reversed(node.upstream))
     return nodes
 
 
+def _build_execution_order(end_node: BaseOperator) -> List[BaseOperator]:
+    """Return the nodes in the order the runner executes them.
+
+    This is the post-order of a depth-first search from the end node, the same
+    order as running the upstream nodes of every node recursively and in order.
+    """
+    order: List[BaseOperator] = []
+    visited = {id(end_node)}
+    stack = [(end_node, iter(end_node.upstream))]
+    while stack:
+        node, upstream_iter = stack[-1]
+        for upstream in upstream_iter:
+            if id(upstream) not in visited and isinstance(upstream, BaseOperator):
+                visited.add(id(upstream))
+                stack.append((upstream, iter(upstream.upstream)))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    return order
+
+
 def _get_root_nodes(nodes: List[BaseOperator]) -> List[BaseOperator]:
     return list(set(filter(lambda x: not x.upstream, nodes)))
@@ -16,7 +16,7 @@ from ..operators.base import CALL_DATA, BaseOperator, WorkflowRunner
 from ..operators.common_operator import BranchOperator
 from ..task.base import SKIP_DATA, TaskContext, TaskState
 from ..task.task_impl import DefaultInputContext, DefaultTaskContext, SimpleTaskOutput
-from .job_manager import JobManager
+from .job_manager import JobManager, _close_stream_branch
 
 logger = logging.getLogger(__name__)
 
@@ -111,9 +111,16 @@ class DefaultWorkflowRunner(WorkflowRunner):
                 "awel_node_name": node.node_name,
             },
         ):
-            await self._execute_node(
-                job_manager, node, dag_ctx, node_outputs, skip_node_ids, system_app
-            )
+            # Upstream nodes always come before their downstream nodes
+            for current_node in job_manager.execution_order:
+                await self._execute_node(
+                    job_manager,
+                    current_node,
+                    dag_ctx,
+                    node_outputs,
+                    skip_node_ids,
+                    system_app,
+                )
         if not streaming_call and node.dag and exist_dag_ctx is None:
             # streaming call not work for dag end
             # if exist_dag_ctx is not None, it means current dag is a sub dag
@@ -133,24 +140,21 @@ class DefaultWorkflowRunner(WorkflowRunner):
     ):
         # Skip run node
         if node.node_id in node_outputs:
+            # Already run in the exist dag context, release its stream branches
+            for upstream_node in job_manager.get_upstream_nodes(node.node_id):
+                upstream_ctx = node_outputs.get(upstream_node.node_id)
+                if upstream_ctx is not None:
+                    job_manager.release_upstream_output(upstream_node, upstream_ctx)
             return
 
-        # Run all upstream nodes
+        # All upstream nodes have been run, see `JobManager.execution_order`
         # TODO: run in parallel, there are some code to be changed:
         #  dag_ctx.set_current_task_context(task_ctx)
-        for upstream_node in node.upstream:
-            if isinstance(upstream_node, BaseOperator):
-                await self._execute_node(
-                    job_manager,
-                    upstream_node,
-                    dag_ctx,
-                    node_outputs,
-                    skip_node_ids,
-                    system_app,
-                )
-
         inputs = [
-            node_outputs[upstream_node.node_id] for upstream_node in node.upstream
+            job_manager.get_upstream_output(
+                upstream_node, node_outputs[upstream_node.node_id]
+            )
+            for upstream_node in job_manager.get_upstream_nodes(node.node_id)
         ]
         input_ctx = DefaultInputContext(inputs)
         # Log task, get log index(plus 1 every time)
@@ -167,6 +171,9 @@ class DefaultWorkflowRunner(WorkflowRunner):
         task_ctx.set_current_state(TaskState.RUNNING)
 
         if node.node_id in skip_node_ids:
+            for input_task_ctx in inputs:
+                # A skipped node never reads its stream, don't block the others
+                _close_stream_branch(input_task_ctx)
             task_ctx.set_current_state(TaskState.SKIP)
             task_ctx.set_task_output(SimpleTaskOutput(SKIP_DATA))
             node_outputs[node.node_id] = task_ctx
@@ -6,14 +6,17 @@ This implementation can run workflow in local machine.
 import asyncio
 import logging
 from abc import ABC, abstractmethod
+from collections import deque
 from typing import (
     Any,
     AsyncIterator,
     Callable,
     Coroutine,
+    Deque,
     Dict,
     Generic,
     List,
+    Literal,
     Optional,
     Tuple,
     Union,
@@ -42,6 +45,8 @@ from .base import (
 
 logger = logging.getLogger(__name__)
 
+SlowConsumerPolicy = Literal["block", "skip", "error"]
+
 
 async def _reduce_stream(stream: AsyncIterator, reduce_function) -> Any:
     # Init accumulator
@@ -252,6 +257,211 @@ class SimpleStreamTaskOutput(TaskOutput[T], Generic[T]):
             out = cast(AsyncIterator[OUT], transform_func(self.output_stream))
         return SimpleStreamTaskOutput(out)
 
+    def tee(
+        self,
+        num_consumers: int,
+        max_buffer_size: Optional[int] = None,
+        slow_consumer_policy: SlowConsumerPolicy = "block",
+    ) -> List["SimpleStreamTaskOutput[T]"]:
+        """Split the output stream into several outputs reading the same items.
+
+        Args:
+            num_consumers (int): The number of outputs.
+            max_buffer_size (Optional[int], optional): The max number of items
+                buffered for the slowest output, None means no limit.
+            slow_consumer_policy (SlowConsumerPolicy, optional): What to do when the
+                buffer is full, see `StreamTee`. Defaults to "block".
+
+        Returns:
+            List[SimpleStreamTaskOutput[T]]: The new outputs.
+        """
+        stream_tee = StreamTee(
+            self.output_stream,
+            num_consumers,
+            max_buffer_size=max_buffer_size,
+            slow_consumer_policy=slow_consumer_policy,
+        )
+        return [SimpleStreamTaskOutput(branch) for branch in stream_tee.branches]
+
+
+class _TeeEnd:
+    pass
+
+
+_TEE_END = _TeeEnd()
+
+
+class _TeeBranch(Generic[T]):
+    """One consumer of a `StreamTee`."""
+
+    def __init__(self, stream_tee: "StreamTee[T]", index: int) -> None:
+        self._tee = stream_tee
+        self._index = index
+
+    def __aiter__(self) -> "_TeeBranch[T]":
+        return self
+
+    async def __anext__(self) -> T:
+        item = await self._tee._next(self._index)
+        if item is _TEE_END:
+            raise StopAsyncIteration
+        return cast(T, item)
+
+    def close(self) -> None:
+        """Stop reading, the other branches no longer wait for this one."""
+        self._tee._detach(self._index)
+
+    async def aclose(self) -> None:
+        """Stop reading, the other branches no longer wait for this one."""
+        self.close()
+
+
+class StreamTee(Generic[T]):
+    """Share one async iterator between several consumers.
+
+    Every consumer reads all the items of the source. The source is read once and
+    an item is kept in the buffer until all the consumers have read it, so the
+    memory used depends on how far the consumers are apart, not on the length of
+    the stream.
+
+    When ``max_buffer_size`` items are buffered, the ``slow_consumer_policy``
+    decides what happens:
+
+    - "block": the consumers ahead wait for the slowest one (backpressure).
+    - "skip": the slowest consumer loses the oldest items and continues from the
+      oldest buffered one, e.g. for a UI that only shows the latest output.
+    - "error": the slowest consumer raises a ValueError on its next read.
+
+    With "block", a consumer that stops reading must be closed, otherwise the
+    other consumers wait for it forever once the buffer is full.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[T],
+        num_consumers: int,
+        max_buffer_size: Optional[int] = None,
+        slow_consumer_policy: SlowConsumerPolicy = "block",
+    ) -> None:
+        """Create a StreamTee.
+
+        Args:
+            source (AsyncIterator[T]): The stream to share.
+            num_consumers (int): The number of consumers.
+            max_buffer_size (Optional[int], optional): The max number of buffered
+                items, None means no limit.
+            slow_consumer_policy (SlowConsumerPolicy, optional): What to do when the
+                buffer is full. Defaults to "block".
+        """
+        if num_consumers < 1:
+            raise ValueError("num_consumers must be greater than 0")
+        if max_buffer_size is not None and max_buffer_size < 1:
+            raise ValueError("max_buffer_size must be greater than 0")
+        if slow_consumer_policy not in ("block", "skip", "error"):
+            raise ValueError(f"Unknown slow consumer policy {slow_consumer_policy}")
+        self._source = source
+        self._max_buffer_size = max_buffer_size
+        self._policy = slow_consumer_policy
+        self._buffer: Deque[T] = deque()
+        # The index of the first buffered item in the source
+        self._offset = 0
+        # The index of the next item of each consumer, None if closed
+        self._positions: List[Optional[int]] = [0] * num_consumers
+        self._lagged = [False] * num_consumers
+        self._fetching = False
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self._branches = [_TeeBranch(self, i) for i in range(num_consumers)]
+
+    @property
+    def branches(self) -> List[_TeeBranch[T]]:
+        """Return the iterators of the consumers."""
+        return list(self._branches)
+
+    async def _next(self, index: int) -> Union[T, _TeeEnd]:
+        while True:
+            position = self._positions[index]
+            if position is None:
+                return _TEE_END
+            if self._lagged[index]:
+                raise ValueError(
+                    f"Stream consumer {index} fell behind more than "
+                    f"{self._max_buffer_size} items"
+                )
+            if position < self._offset + len(self._buffer):
+                item = self._buffer[position - self._offset]
+                self._positions[index] = position + 1
+                self._trim()
+                return item
+            if self._done:
+                if self._error:
+                    raise self._error
+                return _TEE_END
+            if self._fetching or self._is_blocked():
+                # Wait for another consumer to fetch or to read
+                changed = self._changed
+                await changed.wait()
+                continue
+            await self._fetch()
+
+    def _is_blocked(self) -> bool:
+        return (
+            self._policy == "block"
+            and self._max_buffer_size is not None
+            and len(self._buffer) >= self._max_buffer_size
+        )
+
+    async def _fetch(self) -> None:
+        self._fetching = True
+        try:
+            self._buffer.append(await self._source.__anext__())
+        except StopAsyncIteration:
+            self._done = True
+        except Exception as e:
+            self._done = True
+            self._error = e
+        finally:
+            self._fetching = False
+            self._drop_overflow()
+            self._notify()
+
+    def _drop_overflow(self) -> None:
+        if self._max_buffer_size is None or self._policy == "block":
+            return
+        while len(self._buffer) > self._max_buffer_size:
+            self._buffer.popleft()
+            self._offset += 1
+        for i, position in enumerate(self._positions):
+            if position is not None and position < self._offset:
+                if self._policy == "skip":
+                    self._positions[i] = self._offset
+                else:
+                    self._lagged[i] = True
+
+    def _trim(self) -> None:
+        active = [
+            position
+            for i, position in enumerate(self._positions)
+            if position is not None and not self._lagged[i]
+        ]
+        min_position = min(active) if active else self._offset + len(self._buffer)
+        if self._offset >= min_position:
+            return
+        while self._offset < min_position:
+            self._buffer.popleft()
+            self._offset += 1
+        # Wake up the consumers blocked by a full buffer
+        self._notify()
+
+    def _detach(self, index: int) -> None:
+        self._positions[index] = None
+        self._trim()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
 
 def _is_async_iterator(obj):
     return (
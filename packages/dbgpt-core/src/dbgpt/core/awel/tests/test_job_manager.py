@@ -0,0 +1,67 @@
+import pytest
+
+from .. import DAG, InputOperator, JoinOperator, MapOperator, SimpleInputSource
+from ..runner.job_manager import JobManager
+
+
+def _build_diamond_chain(depth: int):
+    """Build a chain of diamonds, every node reaches the input in 2^depth ways."""
+    input_node = InputOperator(SimpleInputSource(1))
+    node = input_node
+    for _ in range(depth):
+        left = MapOperator(lambda x: x + 1)
+        right = MapOperator(lambda x: x * 2)
+        join = JoinOperator(lambda x, y: x + y)
+        node >> left >> join
+        node >> right >> join
+        node = join
+    return input_node, node
+
+
+def test_job_plan_deduplicates_nodes():
+    with DAG("test_job_plan_deduplicates_nodes"):
+        input_node, end_node = _build_diamond_chain(20)
+    job_manager = JobManager.build_from_end_node(end_node)
+    assert len(job_manager._all_nodes) == 61
+    assert job_manager._root_nodes == [input_node]
+
+    order = job_manager.execution_order
+    assert len(order) == 61
+    assert order[0] is input_node and order[-1] is end_node
+    positions = {node.node_id: i for i, node in enumerate(order)}
+    for node in order:
+        for upstream in job_manager.get_upstream_nodes(node.node_id):
+            assert positions[upstream.node_id] < positions[node.node_id]
+
+
+def test_job_plan_cached_until_dag_changed():
+    with DAG("test_job_plan_cached_until_dag_changed") as dag:
+        input_node = InputOperator(SimpleInputSource(1))
+        end_node = MapOperator(lambda x: x + 1)
+        input_node >> end_node
+    plan = JobManager.build_from_end_node(end_node)._plan
+    assert JobManager.build_from_end_node(end_node, {"data": 1})._plan is plan
+
+    with dag:
+        new_end_node = MapOperator(lambda x: x * 2)
+        end_node >> new_end_node
+    new_plan = JobManager.build_from_end_node(end_node)._plan
+    assert new_plan is not plan
+    assert JobManager.build_from_end_node(new_end_node).execution_order == [
+        input_node,
+        end_node,
+        new_end_node,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_diamond_chain(runner):
+    with DAG("test_run_diamond_chain"):
+        _, end_node = _build_diamond_chain(20)
+    for _ in range(2):
+        res = await runner.execute_workflow(end_node)
+        # (x + 1) + (x * 2) applied 20 times from 1
+        expected = 1
+        for _ in range(20):
+            expected = 3 * expected + 1
+        assert res.current_task_context.task_output.output == expected
@@ -0,0 +1,179 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from .. import (
+    DAG,
+    DAGContext,
+    InputOperator,
+    JoinOperator,
+    MapOperator,
+    ReduceStreamOperator,
+    SimpleInputSource,
+    SimpleStreamTaskOutput,
+    SimpleTaskOutput,
+    StreamTee,
+    TaskState,
+    WorkflowRunner,
+)
+from ..task.task_impl import DefaultTaskContext
+
+
+class _CountingStream:
+    def __init__(self, n: int):
+        self._n = n
+        self.num_read = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> int:
+        if self.num_read >= self._n:
+            raise StopAsyncIteration
+        self.num_read += 1
+        return self.num_read - 1
+
+
+async def _collect(stream, delay: float = 0) -> List[int]:
+    items = []
+    async for item in stream:
+        items.append(item)
+        if delay:
+            await asyncio.sleep(delay)
+    return items
+
+
+@pytest.mark.asyncio
+async def test_tee_reads_source_once():
+    source = _CountingStream(10)
+    stream_tee = StreamTee(source, 3)
+    results = await asyncio.gather(*[_collect(b) for b in stream_tee.branches])
+    assert results == [list(range(10))] * 3
+    assert source.num_read == 10
+    assert len(stream_tee._buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_tee_sequential_consumers_without_limit():
+    outputs = SimpleStreamTaskOutput(_CountingStream(5)).tee(2)
+    assert await _collect(outputs[0].output_stream) == list(range(5))
+    assert await _collect(outputs[1].output_stream) == list(range(5))
+
+
+@pytest.mark.asyncio
+async def test_tee_block_policy_bounds_buffer():
+    source = _CountingStream(20)
+    stream_tee = StreamTee(source, 2, max_buffer_size=3)
+    fast, slow = stream_tee.branches
+    max_lead = 0
+
+    async def read_fast():
+        nonlocal max_lead
+        async for _ in fast:
+            max_lead = max(max_lead, len(stream_tee._buffer))
+        return True
+
+    res = await asyncio.gather(read_fast(), _collect(slow, delay=0.001))
+    assert res[1] == list(range(20))
+    assert max_lead <= 3
+
+
+@pytest.mark.asyncio
+async def test_tee_closed_consumer_does_not_block():
+    stream_tee = StreamTee(_CountingStream(10), 2, max_buffer_size=2)
+    first, second = stream_tee.branches
+    second.close()
+    assert await _collect(first) == list(range(10))
+    assert await _collect(second) == []
+
+
+@pytest.mark.asyncio
+async def test_tee_skip_policy():
+    stream_tee = StreamTee(
+        _CountingStream(10), 2, max_buffer_size=3, slow_consumer_policy="skip"
+    )
+    fast, slow = stream_tee.branches
+    assert await _collect(fast) == list(range(10))
+    # The slow consumer only gets the latest buffered items
+    assert await _collect(slow) == [7, 8, 9]
+
+
+@pytest.mark.asyncio
+async def test_tee_error_policy():
+    stream_tee = StreamTee(
+        _CountingStream(10), 2, max_buffer_size=3, slow_consumer_policy="error"
+    )
+    fast, slow = stream_tee.branches
+    assert await _collect(fast) == list(range(10))
+    with pytest.raises(ValueError):
+        await _collect(slow)
+
+
+@pytest.mark.asyncio
+async def test_tee_propagates_source_error():
+    async def source():
+        yield 1
+        raise RuntimeError("source failed")
+
+    stream_tee = StreamTee(source(), 2)
+    for branch in stream_tee.branches:
+        assert await branch.__anext__() == 1
+        with pytest.raises(RuntimeError):
+            await branch.__anext__()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "stream_input_node",
+    [{"output_streams": [[0, 1, 2, 3, 4]]}],
+    indirect=["stream_input_node"],
+)
+async def test_stream_shared_by_downstream_nodes(
+    runner: WorkflowRunner, stream_input_node: InputOperator
+):
+    with DAG("test_stream_shared_by_downstream_nodes"):
+        sum_node = ReduceStreamOperator(lambda x, y: x + y)
+        map_node = MapOperator(lambda x: x * 10)
+        sum_node2 = ReduceStreamOperator(lambda x, y: x + y)
+        join_node = JoinOperator(lambda x, y: (x, y))
+        stream_input_node >> sum_node >> join_node
+        stream_input_node >> map_node >> sum_node2 >> join_node
+        res = await runner.execute_workflow(join_node)
+        assert res.current_task_context.task_output.output == (10, 100)
+
+
+@pytest.mark.asyncio
+async def test_node_of_exist_dag_ctx_releases_bounded_stream(runner: WorkflowRunner):
+    with DAG("test_node_of_exist_dag_ctx_releases_bounded_stream"):
+        input_node = InputOperator(
+            SimpleInputSource(0), stream_buffer_size=1, slow_consumer_policy="block"
+        )
+        sum_node = ReduceStreamOperator(lambda x, y: x + y)
+        map_node = MapOperator(lambda x: x * 10)
+        sum_node2 = ReduceStreamOperator(lambda x, y: x + y)
+        join_node = JoinOperator(lambda x, y: (x, y))
+        input_node >> sum_node >> join_node
+        input_node >> map_node >> sum_node2 >> join_node
+
+    async def stream():
+        for i in range(5):
+            yield i
+
+    # The input node and sum_node already run in the exist dag context
+    input_ctx = DefaultTaskContext(
+        input_node.node_id, TaskState.SUCCESS, SimpleStreamTaskOutput(stream())
+    )
+    sum_ctx = DefaultTaskContext(
+        sum_node.node_id, TaskState.SUCCESS, SimpleTaskOutput(10)
+    )
+    dag_ctx = DAGContext(
+        event_loop_task_id=0,
+        node_to_outputs={input_node.node_id: input_ctx, sum_node.node_id: sum_ctx},
+        share_data={},
+        streaming_call=False,
+    )
+    res = await asyncio.wait_for(
+        runner.execute_workflow(join_node, exist_dag_ctx=dag_ctx), timeout=5
+    )
+    assert res.current_task_context.task_output.output == (10, 100)
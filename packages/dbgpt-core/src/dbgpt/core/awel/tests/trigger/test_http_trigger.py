@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Dict
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from dbgpt.core.awel import DAG, MapOperator
+from dbgpt.core.awel.trigger.http_trigger import DictHttpTrigger
+
+
+class _SlowOperator(MapOperator[Dict[str, Any], Dict[str, Any]]):
+    def __init__(self, counter: Dict[str, int], **kwargs):
+        super().__init__(**kwargs)
+        self._counter = counter
+
+    async def map(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        self._counter["runs"] += 1
+        await asyncio.sleep(0.2)
+        return {"value": body["value"] * 2}
+
+
+def _create_client(counter: Dict[str, int], **kwargs) -> httpx.AsyncClient:
+    with DAG("test_http_trigger_dag"):
+        trigger = DictHttpTrigger("/test", **kwargs)
+        task = _SlowOperator(counter)
+        trigger >> task
+    router = APIRouter()
+    trigger.mount_to_router(router)
+    app = FastAPI()
+    app.include_router(router)
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+@pytest.mark.asyncio
+async def test_http_trigger_concurrency_limit():
+    counter = {"runs": 0}
+    async with _create_client(counter, max_concurrency=1, max_queue_size=1) as client:
+        responses = await asyncio.gather(
+            *(client.post("/test", json={"value": i}) for i in range(4))
+        )
+    status_codes = sorted(r.status_code for r in responses)
+    # One running, one waiting, the others are rejected
+    assert status_codes == [200, 200, 429, 429]
+    assert counter["runs"] == 2
+
+
+@pytest.mark.asyncio
+async def test_http_trigger_coalesce_requests():
+    counter = {"runs": 0}
+    async with _create_client(counter, coalesce_requests=True) as client:
+        responses = await asyncio.gather(
+            *(client.post("/test", json={"value": 1}) for _ in range(3)),
+            client.post("/test", json={"value": 2}),
+        )
+    assert [r.json() for r in responses] == [
+        {"value": 2},
+        {"value": 2},
+        {"value": 2},
+        {"value": 4},
+    ]
+    assert counter["runs"] == 2
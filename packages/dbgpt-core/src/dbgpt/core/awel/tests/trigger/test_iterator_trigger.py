@@ -1,5 +1,8 @@
+import asyncio
+import os
 from typing import AsyncIterator
 
+import cloudpickle
 import pytest
 
 from dbgpt.core.awel import (
@@ -9,7 +12,7 @@ from dbgpt.core.awel import (
     StreamifyAbsOperator,
     TransformStreamAbsOperator,
 )
-from dbgpt.core.awel.trigger.iterator_trigger import IteratorTrigger
+from dbgpt.core.awel.trigger.iterator_trigger import IteratorTrigger, _load_checkpoint
 
 
 class NumberProducerOperator(StreamifyAbsOperator[int, int]):
@@ -138,3 +141,118 @@ async def test_parallel_safe():
         trigger_task >> number_task >> task
     stream_results = await trigger_task.trigger(parallel_num=3)
     await _check_stream_results(stream_results, 4)
+
+
+@pytest.mark.asyncio
+async def test_trigger_stream_bounded_and_unordered():
+    pulled = []
+
+    def _data():
+        for i in range(10):
+            pulled.append(i)
+            yield i
+
+    async def _square(x: int) -> int:
+        # The first items are the slowest
+        await asyncio.sleep(0.001 * (10 - x))
+        return x * x
+
+    with DAG("test_trigger_stream_unordered"):
+        trigger_task = IteratorTrigger(data=_data())
+        task = MapOperator(_square)
+        trigger_task >> task
+    stream = trigger_task.trigger_stream(parallel_num=3, ordered=False)
+    first = await stream.__anext__()
+    # Only the running items are pulled from the input data
+    assert len(pulled) <= 4
+    results = [first] + [r async for r in stream]
+    assert sorted(results) == [(i, i * i) for i in range(10)]
+    assert results != sorted(results)
+
+
+@pytest.mark.asyncio
+async def test_trigger_stream_checkpoint(tmpdir):
+    checkpoint_path = os.path.join(str(tmpdir), "results.ckpt")
+    calls = []
+
+    def _square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    with DAG("test_trigger_stream_checkpoint"):
+        trigger_task = IteratorTrigger(data=list(range(6)))
+        task = MapOperator(_square)
+        trigger_task >> task
+
+    # Interrupt the run after the first results
+    stream = trigger_task.trigger_stream(
+        parallel_num=2, checkpoint_path=checkpoint_path
+    )
+    assert [await stream.__anext__() for _ in range(3)] == [(0, 0), (1, 1), (2, 4)]
+    await stream.aclose()
+    finished = set(calls)
+    assert {0, 1, 2} <= finished
+
+    calls.clear()
+    results = [
+        r
+        async for r in trigger_task.trigger_stream(
+            parallel_num=2, checkpoint_path=checkpoint_path
+        )
+    ]
+    assert results == [(i, i * i) for i in range(6)]
+    assert set(calls) == set(range(6)) - finished
+
+
+@pytest.mark.asyncio
+async def test_trigger_stream_checkpoint_with_torn_record(tmpdir):
+    checkpoint_path = os.path.join(str(tmpdir), "results.ckpt")
+    calls = []
+
+    def _square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    with DAG("test_trigger_stream_checkpoint_with_torn_record"):
+        trigger_task = IteratorTrigger(data=list(range(6)))
+        task = MapOperator(_square)
+        trigger_task >> task
+
+    stream = trigger_task.trigger_stream(checkpoint_path=checkpoint_path)
+    assert [await stream.__anext__() for _ in range(2)] == [(0, 0), (1, 1)]
+    await stream.aclose()
+    # The process died while writing a record
+    with open(checkpoint_path, "ab") as f:
+        f.write(b"\x80\x05\x95\x10")
+
+    # The first resume records more results after the torn record
+    calls.clear()
+    stream = trigger_task.trigger_stream(checkpoint_path=checkpoint_path)
+    assert [await stream.__anext__() for _ in range(4)] == [
+        (i, i * i) for i in range(4)
+    ]
+    await stream.aclose()
+    assert 0 not in calls and 1 not in calls and {2, 3} <= set(calls)
+
+    # The second resume reads the records of both runs
+    calls.clear()
+    results = [
+        r async for r in trigger_task.trigger_stream(checkpoint_path=checkpoint_path)
+    ]
+    assert results == [(i, i * i) for i in range(6)]
+    assert set(calls) <= {4, 5}
+
+
+def test_load_checkpoint_keeps_offsets(tmpdir):
+    checkpoint_path = os.path.join(str(tmpdir), "results.ckpt")
+    with open(checkpoint_path, "wb") as f:
+        for index in [3, 1]:
+            cloudpickle.dump((index, "x" * 1000), f)
+    finished, offset = _load_checkpoint(checkpoint_path)
+    # Only the offsets of the results are held, they are read again when yielded
+    assert sorted(finished) == [1, 3]
+    assert all(isinstance(v, int) for v in finished.values())
+    assert offset == os.path.getsize(checkpoint_path)
+    with open(checkpoint_path, "rb") as f:
+        f.seek(finished[1])
+        assert cloudpickle.load(f) == (1, "x" * 1000)
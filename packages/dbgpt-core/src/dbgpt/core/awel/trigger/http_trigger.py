@@ -1,5 +1,6 @@
 """Http trigger for AWEL."""
 
+import asyncio
 import json
 import logging
 from enum import Enum
@@ -85,6 +86,67 @@ def _default_streaming_predict_func(body: "CommonRequestType") -> bool:
     return _parse_bool(streaming)
 
 
+class _FlowLimiter:
+    """Limit the in-flight runs and the waiting requests of a flow.
+
+    A request is rejected with 429 when all the runs are in flight and the queue is
+    full, instead of waiting for the busy flow.
+    """
+
+    def __init__(self, max_concurrency: int, max_queue_size: Optional[int] = None):
+        self._max_concurrency = max_concurrency
+        self._max_queue_size = max_queue_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+
+    async def acquire(self) -> Callable[[], None]:
+        """Acquire a run slot.
+
+        Returns:
+            Callable[[], None]: Release the slot, it can be called more than once.
+        """
+        from fastapi import HTTPException
+
+        if (
+            self._semaphore.locked()
+            and self._max_queue_size is not None
+            and self._waiting >= self._max_queue_size
+        ):
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests, the flow is busy, please try again later",
+                headers={"Retry-After": "1"},
+            )
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        released = False
+
+        def _release():
+            nonlocal released
+            if not released:
+                released = True
+                self._semaphore.release()
+
+        return _release
+
+
+def _coalesce_key(body: "CommonRequestType") -> Optional[str]:
+    """Return the key of the identical request bodies, None if not coalescable."""
+    if isinstance(body, BaseModel):
+        body = model_to_dict(body)
+    elif body is not None and not isinstance(body, (dict, str)):
+        # The raw request can't be compared
+        return None
+    try:
+        return json.dumps(body, sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return None
+
+
 class HttpTriggerMetadata(TriggerMetadata):
     """Trigger metadata."""
 
@@ -403,6 +465,33 @@ class HttpTrigger(Trigger):
                 default=200,
                 description="The http status code",
             ),
+            Parameter.build_from(
+                "Max Concurrency",
+                "max_concurrency",
+                int,
+                optional=True,
+                default=None,
+                description="The max number of the in-flight runs, unlimited if not "
+                "set",
+            ),
+            Parameter.build_from(
+                "Max Queue Size",
+                "max_queue_size",
+                int,
+                optional=True,
+                default=None,
+                description="The max number of the requests waiting for a run, the "
+                "others are rejected with 429, unlimited if not set",
+            ),
+            Parameter.build_from(
+                "Coalesce Requests",
+                "coalesce_requests",
+                bool,
+                optional=True,
+                default=False,
+                description="Whether to share one run between the identical "
+                "concurrent requests, only for the idempotent flows",
+            ),
         ],
     )
 
@@ -421,9 +510,23 @@ class HttpTrigger(Trigger):
         status_code: Optional[int] = 200,
         router_tags: Optional[List[str | Enum]] = None,
         register_to_app: bool = False,
+        max_concurrency: Optional[int] = None,
+        max_queue_size: Optional[int] = None,
+        coalesce_requests: bool = False,
         **kwargs,
     ) -> None:
-        """Initialize a HttpTrigger."""
+        """Initialize a HttpTrigger.
+
+        Args:
+            max_concurrency (Optional[int]): The max number of the in-flight runs of
+                the DAG, unlimited if None.
+            max_queue_size (Optional[int]): The max number of the requests waiting
+                for a run when max_concurrency is reached, the others are rejected
+                with 429. Unlimited if None.
+            coalesce_requests (bool): Whether the identical concurrent request bodies
+                share one run of the DAG. Only enable it for the idempotent flows,
+                the streaming requests are never coalesced.
+        """
         super().__init__(**kwargs)
         if not endpoint.startswith("/"):
             endpoint = "/" + endpoint
@@ -444,6 +547,14 @@ class HttpTrigger(Trigger):
         self._response_media_type = response_media_type
         self._end_node: Optional[BaseOperator] = None
         self._register_to_app = register_to_app
+        self._limiter = (
+            _FlowLimiter(int(max_concurrency), max_queue_size)
+            if max_concurrency
+            else None
+        )
+        self._coalesce_requests = _parse_bool(coalesce_requests)
+        # The running DAG of the coalesced requests, key is the request body
+        self._coalesced_runs: Dict[str, asyncio.Future] = {}
 
     async def trigger(self, **kwargs) -> Any:
         """Trigger the DAG. Not used in HttpTrigger."""
@@ -582,6 +693,28 @@ class HttpTrigger(Trigger):
             return self._req_body(**input_data)
         return await super().map(input_data)
 
+    async def _limited_trigger_dag(
+        self, body: Any, dag: DAG, streaming_response: Optional[bool]
+    ) -> Any:
+        """Trigger the DAG within the concurrency limit of the trigger."""
+        release = await self._limiter.acquire() if self._limiter else None
+        try:
+            res = await _trigger_dag(
+                body,
+                dag,
+                streaming_response,
+                self._response_headers,
+                self._response_media_type,
+                on_end=release,
+            )
+        except BaseException:
+            if release:
+                release()
+            raise
+        if release and not streaming_response:
+            release()
+        return res
+
     def _create_route_func(self):
         from inspect import Parameter, Signature
         from typing import get_type_hints
@@ -604,13 +737,22 @@ class HttpTrigger(Trigger):
             dag = self.dag
             if not dag:
                 raise AWELHttpError("DAG is not set")
-            return await _trigger_dag(
-                body,
-                dag,
-                streaming_response,
-                self._response_headers,
-                self._response_media_type,
+            key = (
+                _coalesce_key(body)
+                if self._coalesce_requests and not streaming_response
+                else None
             )
+            if key is None:
+                return await self._limited_trigger_dag(body, dag, streaming_response)
+            future = self._coalesced_runs.get(key)
+            if future is None:
+                future = asyncio.ensure_future(
+                    self._limited_trigger_dag(body, dag, streaming_response)
+                )
+                self._coalesced_runs[key] = future
+                future.add_done_callback(lambda _: self._coalesced_runs.pop(key, None))
+            # Shield the shared run from the cancellation of a single request
+            return await asyncio.shield(future)
 
         def create_route_function(name, req_body_cls: Optional["RequestBody"]):
             async def route_function_request(request: Request):
@@ -708,6 +850,7 @@ async def _trigger_dag(
     streaming_response: Optional[bool] = False,
     response_headers: Optional[Dict[str, str]] = None,
     response_media_type: Optional[str] = None,
+    on_end: Optional[Callable[[], None]] = None,
 ) -> Any:
     from fastapi import BackgroundTasks
     from fastapi.responses import StreamingResponse
@@ -743,12 +886,24 @@ async def _trigger_dag(
         )
 
         async def _after_dag_end():
+            if on_end:
+                on_end()
             await dag._after_dag_end(end_node.current_event_loop_task_id)
 
+        async def _stream_with_end():
+            try:
+                async for chunk in trace_generator:
+                    yield chunk
+            finally:
+                # The run of a streaming response ends with the stream, also
+                # when the client disconnects
+                if on_end:
+                    on_end()
+
         background_tasks = BackgroundTasks()
         background_tasks.add_task(_after_dag_end)
         return StreamingResponse(
-            trace_generator,
+            _stream_with_end() if on_end else trace_generator,
             headers=headers,
             media_type=media_type,
             background=background_tasks,
@@ -817,6 +972,36 @@ _PARAMETER_STATUS_CODE = Parameter.build_from(
     default=200,
     description=_("The http status code"),
 )
+_PARAMETER_MAX_CONCURRENCY = Parameter.build_from(
+    _("Max Concurrency"),
+    "max_concurrency",
+    int,
+    optional=True,
+    default=None,
+    description=_("The max number of the in-flight runs, unlimited if not set"),
+)
+_PARAMETER_MAX_QUEUE_SIZE = Parameter.build_from(
+    _("Max Queue Size"),
+    "max_queue_size",
+    int,
+    optional=True,
+    default=None,
+    description=_(
+        "The max number of the requests waiting for a run, the others are rejected "
+        "with 429, unlimited if not set"
+    ),
+)
+_PARAMETER_COALESCE_REQUESTS = Parameter.build_from(
+    _("Coalesce Requests"),
+    "coalesce_requests",
+    bool,
+    optional=True,
+    default=False,
+    description=_(
+        "Whether to share one run between the identical concurrent requests, only "
+        "for the idempotent flows"
+    ),
+)
 
 
 class DictHttpTrigger(HttpTrigger):
@@ -850,6 +1035,9 @@ class DictHttpTrigger(HttpTrigger):
             _PARAMETER_RESPONSE_BODY.new(),
             _PARAMETER_MEDIA_TYPE.new(),
             _PARAMETER_STATUS_CODE.new(),
+            _PARAMETER_MAX_CONCURRENCY.new(),
+            _PARAMETER_MAX_QUEUE_SIZE.new(),
+            _PARAMETER_COALESCE_REQUESTS.new(),
         ],
     )
 
@@ -911,6 +1099,9 @@ class StringHttpTrigger(HttpTrigger):
             _PARAMETER_RESPONSE_BODY.new(),
             _PARAMETER_MEDIA_TYPE.new(),
             _PARAMETER_STATUS_CODE.new(),
+            _PARAMETER_MAX_CONCURRENCY.new(),
+            _PARAMETER_MAX_QUEUE_SIZE.new(),
+            _PARAMETER_COALESCE_REQUESTS.new(),
         ],
     )
 
@@ -1000,6 +1191,9 @@ class CommonLLMHttpTrigger(HttpTrigger):
             _PARAMETER_RESPONSE_BODY.new(),
             _PARAMETER_MEDIA_TYPE.new(),
             _PARAMETER_STATUS_CODE.new(),
+            _PARAMETER_MAX_CONCURRENCY.new(),
+            _PARAMETER_MAX_QUEUE_SIZE.new(),
+            _PARAMETER_COALESCE_REQUESTS.new(),
         ],
         tags={"order": TAGS_ORDER_HIGH},
     )
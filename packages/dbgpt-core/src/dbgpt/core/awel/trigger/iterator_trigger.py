@@ -2,18 +2,27 @@
 
 import asyncio
 import logging
+import os
+from collections import deque
+from functools import partial
 from typing import (
     Any,
     AsyncIterator,
     Callable,
+    Deque,
+    Dict,
     Iterator,
     List,
     Optional,
+    Set,
+    Sized,
     Tuple,
     Union,
     cast,
 )
 
+import cloudpickle
+
 from ..operators.base import BaseOperator
 from ..task.base import InputSource, TaskState
 from ..task.task_impl import DefaultTaskContext, _is_async_iterator, _is_iterable
@@ -195,120 +204,285 @@ class IteratorTrigger(Trigger[List[Tuple[Any, Any]]]):
                 The first element of the tuple is the input data, the second element is
                 the output data of the leaf node.
         """
+        progress = None
+        if self._show_progress:
+            from tqdm import tqdm
+
+            total = len(self._iter_data) if isinstance(self._iter_data, Sized) else None
+            progress = tqdm(total=total)
+        results: List[Tuple[Any, Any]] = []
+        try:
+            async for result in self.trigger_stream(parallel_num=parallel_num):
+                results.append(result)
+                if progress is not None:
+                    progress.update(1)
+        finally:
+            if progress is not None:
+                progress.close()
+        return results
+
+    async def trigger_stream(
+        self,
+        parallel_num: Optional[int] = None,
+        ordered: bool = True,
+        checkpoint_path: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        """Trigger the dag with iterator data and yield the results as they finish.
+
+        The input data is pulled only when a running slot is free, so the memory
+        doesn't grow with the size of the input data.
+
+        Examples:
+            .. code-block:: python
+
+                with DAG("test_dag") as dag:
+                    trigger_task = IteratorTrigger(range(1000000), parallel_num=8)
+                    task = MapOperator(lambda x: x * x)
+                    trigger_task >> task
+                async for data, result in trigger_task.trigger_stream(
+                    ordered=False, checkpoint_path="squares.ckpt"
+                ):
+                    print(data, result)
+
+        Args:
+            parallel_num (Optional[int], optional): The parallel number of the dag
+                running. Defaults to None.
+            ordered (bool, optional): Whether to yield the results in the order of
+                the input data. In ordered mode a slow item holds back the results
+                after it. Defaults to True.
+            checkpoint_path (Optional[str], optional): The file to record the
+                finished results. The items recorded by an interrupted run with the
+                same input data are not run again. Not supported for streaming
+                calls. Defaults to None.
+
+        Yields:
+            Tuple[Any, Any]: The input data and the output data of the leaf node.
+        """
+        end_node = self._get_end_node()
+        parallel_num = max(parallel_num or self._parallel_num, 1)
+        if checkpoint_path and self._streaming_call:
+            raise ValueError("Checkpoint is not supported for streaming calls")
+        # The offsets of the results finished by a previous run
+        finished: Dict[int, int] = {}
+        checkpoint_file = None
+        checkpoint_reader = None
+        if checkpoint_path:
+            finished, offset = _load_checkpoint(checkpoint_path)
+            if os.path.exists(checkpoint_path):
+                # Drop a torn last record, the records appended after it would
+                # never be read
+                os.truncate(checkpoint_path, offset)
+            checkpoint_file = open(checkpoint_path, "ab")
+            if finished:
+                checkpoint_reader = open(checkpoint_path, "rb")
+
+        def _read_finished(index: int) -> Any:
+            checkpoint_reader.seek(finished.pop(index))
+            return cloudpickle.load(checkpoint_reader)[1]
+
+        # The indexes recorded but not yielded yet
+        recorded: Set[int] = set()
+
+        def _record(index: int, task: asyncio.Future) -> None:
+            if (
+                not checkpoint_file
+                or checkpoint_file.closed
+                or index in recorded
+                or not task.done()
+                or task.cancelled()
+                or task.exception()
+            ):
+                return
+            recorded.add(index)
+            cloudpickle.dump((index, task.result()[1]), checkpoint_file)
+            checkpoint_file.flush()
+
+        inputs = _to_async_iterator(self._iter_data, self.node_id).__aiter__()
+        # The running tasks in input order, or by task in unordered mode
+        window: Deque[asyncio.Future] = deque()
+        running: Set[asyncio.Future] = set()
+        indexes: Dict[asyncio.Future, int] = {}
+        index = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(window) + len(running) < parallel_num:
+                    try:
+                        data = await inputs.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    if index in finished:
+                        # Finished by a previous run
+                        task: asyncio.Future = (
+                            asyncio.get_running_loop().create_future()
+                        )
+                        task.set_result((data, _read_finished(index)))
+                    else:
+                        task = asyncio.create_task(self._run_node(end_node, data))
+                        if checkpoint_file:
+                            task.add_done_callback(partial(_record, index))
+                            indexes[task] = index
+                    index += 1
+                    if ordered:
+                        window.append(task)
+                    else:
+                        running.add(task)
+                if ordered:
+                    if not window:
+                        break
+                    task = window.popleft()
+                    result = await task
+                    recorded.discard(indexes.pop(task, -1))
+                    yield result
+                else:
+                    if not running:
+                        break
+                    done, running = await asyncio.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        recorded.discard(indexes.pop(task, -1))
+                        yield task.result()
+        finally:
+            for task in list(window) + list(running):
+                if task in indexes:
+                    # Keep the results finished before the callbacks run
+                    _record(indexes[task], task)
+                task.cancel()
+            if checkpoint_file:
+                checkpoint_file.close()
+            if checkpoint_reader:
+                checkpoint_reader.close()
+
+    def _get_end_node(self) -> BaseOperator:
         dag = self.dag
         if not dag:
             raise ValueError("DAG is not set for IteratorTrigger")
         leaf_nodes = dag.leaf_nodes
         if len(leaf_nodes) != 1:
             raise ValueError("IteratorTrigger just support one leaf node in dag")
-        end_node = cast(BaseOperator, leaf_nodes[0])
-        streaming_call = self._streaming_call
-        semaphore = asyncio.Semaphore(parallel_num or self._parallel_num)
-        task_id = self.node_id
-        max_retries = self._max_retries
+        return cast(BaseOperator, leaf_nodes[0])
 
-        async def call_stream(call_data: Any, cache_key: Optional[str] = None):
-            """Process streaming data with optional caching."""
-            # If caching is enabled and we have a cache key, try to get cached results
-            if cache_key is not None:
-                cached_result = await self._get_cached_result(cache_key)
-                if cached_result is not None:
-                    # For streaming cached results, we need to yield each item
-                    for item in cached_result:
+    async def _call_stream(
+        self, end_node: BaseOperator, call_data: Any, cache_key: Optional[str] = None
+    ):
+        """Process streaming data with optional caching."""
+        # If caching is enabled and we have a cache key, try to get cached results
+        if cache_key is not None:
+            cached_result = await self._get_cached_result(cache_key)
+            if cached_result is not None:
+                # For streaming cached results, we need to yield each item
+                for item in cached_result:
+                    yield item
+                return
+
+        # Store results for caching if needed
+        cached_items = []
+        try:
+            async for out in await end_node.call_stream(call_data):
+                # Store the result for caching
+                if cache_key is not None:
+                    cached_items.append(out)
+                yield out
+        finally:
+            # Cache the collection of results after processing is complete
+            if cache_key is not None and cached_items:
+                await self._store_in_cache(cache_key, cached_items)
+            await self.dag._after_dag_end(end_node.current_event_loop_task_id)
+
+    async def _run_node(
+        self, end_node: BaseOperator, call_data: Any
+    ) -> Tuple[Any, Any]:
+        # Generate cache key if caching is enabled
+        cache_key = await self._get_cache_key(call_data)
+
+        if self._streaming_call:
+            # Streaming calls
+            if self._timeout:
+                stream_generator = self._call_stream(end_node, call_data, cache_key)
+                task_output = await asyncio.wait_for(
+                    anext(stream_generator.__aiter__()), timeout=self._timeout
+                )
+
+                # Create a combined generator that includes the first item and
+                # the rest
+                async def combined_generator():
+                    yield task_output
+                    async for item in stream_generator:
                         yield item
-                    return
 
-            # Store results for caching if needed
-            cached_items = []
+                return call_data, combined_generator()
+            else:
+                return call_data, self._call_stream(end_node, call_data, cache_key)
+
+        # Non-streaming call with cache and retry logic
+        # Try to get from cache first if caching is enabled
+        if cache_key is not None:
+            cached_result = await self._get_cached_result(cache_key)
+            if cached_result is not None:
+                logger.info(f"Cache hit for key {cache_key}")
+                # For non-streaming calls, just return the cached result
+                # directly
+                # For streaming calls that were previously cached, recreate the
+                # stream
+                if isinstance(cached_result, list) and self._streaming_call:
+                    return call_data, stream_from_cached_data(cached_result)
+                return call_data, cached_result
+
+        # If not cached or cache miss, proceed with regular execution
+        max_retries = self._max_retries
+        attempts = 0
+        while True:
             try:
-                async for out in await end_node.call_stream(call_data):
-                    # Store the result for caching
-                    if cache_key is not None:
-                        cached_items.append(out)
-                    yield out
-            finally:
-                # Cache the collection of results after processing is complete
-                if cache_key is not None and cached_items:
-                    await self._store_in_cache(cache_key, cached_items)
-                await dag._after_dag_end(end_node.current_event_loop_task_id)
-
-        async def run_node_with_control(call_data: Any) -> Tuple[Any, Any]:
-            async with semaphore:
-                # Generate cache key if caching is enabled
-                cache_key = await self._get_cache_key(call_data)
-
-                if streaming_call:
-                    # Streaming calls
-                    if self._timeout:
-                        stream_generator = call_stream(call_data, cache_key)
-                        task_output = await asyncio.wait_for(
-                            anext(stream_generator.__aiter__()), timeout=self._timeout
-                        )
-
-                        # Create a combined generator that includes the first item and
-                        # the rest
-                        async def combined_generator():
-                            yield task_output
-                            async for item in stream_generator:
-                                yield item
-
-                        return call_data, combined_generator()
-                    else:
-                        return call_data, call_stream(call_data, cache_key)
+                if self._timeout:
+                    task_output = await asyncio.wait_for(
+                        end_node.call(call_data), timeout=self._timeout
+                    )
+                else:
+                    task_output = await end_node.call(call_data)
 
-                # Non-streaming call with cache and retry logic
-                # Try to get from cache first if caching is enabled
+                # Cache the result if caching is enabled
                 if cache_key is not None:
-                    cached_result = await self._get_cached_result(cache_key)
-                    if cached_result is not None:
-                        logger.info(f"Cache hit for key {cache_key}")
-                        # For non-streaming calls, just return the cached result
-                        # directly
-                        # For streaming calls that were previously cached, recreate the
-                        # stream
-                        if isinstance(cached_result, list) and self._streaming_call:
-                            return call_data, stream_from_cached_data(cached_result)
-                        return call_data, cached_result
-
-                # If not cached or cache miss, proceed with regular execution
-                nonlocal max_retries
-                attempts = 0
-                while True:
-                    try:
-                        if self._timeout:
-                            task_output = await asyncio.wait_for(
-                                end_node.call(call_data), timeout=self._timeout
-                            )
-                        else:
-                            task_output = await end_node.call(call_data)
-
-                        # Cache the result if caching is enabled
-                        if cache_key is not None:
-                            await self._store_in_cache(cache_key, task_output)
-
-                        return call_data, task_output
-                    except (Exception, asyncio.TimeoutError) as e:
-                        attempts += 1
-                        if attempts > max_retries:
-                            raise RuntimeError(
-                                f"Failed after {max_retries} retries: {str(e)}"
-                            ) from e
-                        await asyncio.sleep(self._retry_delay)
-                        logger.warning(
-                            f"Failed attempt {attempts}/{max_retries} for task "
-                            f"{end_node.node_id}: {str(e)}"
-                        )
-
-        tasks = []
-
-        if self._show_progress:
-            from tqdm.asyncio import tqdm_asyncio
-
-            async_module = tqdm_asyncio
-        else:
-            async_module = asyncio  # type: ignore
-
-        async for data in _to_async_iterator(self._iter_data, task_id):
-            tasks.append(run_node_with_control(data))
-        results: List[Tuple[Any, Any]] = await async_module.gather(*tasks)
-        return results
+                    await self._store_in_cache(cache_key, task_output)
+
+                return call_data, task_output
+            except (Exception, asyncio.TimeoutError) as e:
+                attempts += 1
+                if attempts > max_retries:
+                    raise RuntimeError(
+                        f"Failed after {max_retries} retries: {str(e)}"
+                    ) from e
+                await asyncio.sleep(self._retry_delay)
+                logger.warning(
+                    f"Failed attempt {attempts}/{max_retries} for task "
+                    f"{end_node.node_id}: {str(e)}"
+                )
+
+
+def _load_checkpoint(checkpoint_path: str) -> Tuple[Dict[int, int], int]:
+    """Load the offsets of the finished results by input index from the checkpoint.
+
+    Only the offsets are kept, the results are read again from the file when they are
+    yielded. A record which was not written completely is ignored.
+
+    Returns:
+        Tuple[Dict[int, int], int]: The offsets of the finished results and the
+            offset of the end of the last complete record.
+    """
+    finished: Dict[int, int] = {}
+    offset = 0
+    if not os.path.exists(checkpoint_path):
+        return finished, offset
+    with open(checkpoint_path, "rb") as f:
+        while True:
+            try:
+                index, _ = cloudpickle.load(f)
+            except EOFError:
+                break
+            except Exception as e:
+                logger.warning(f"Ignore the broken record of {checkpoint_path}: {e}")
+                break
+            finished[index] = offset
+            offset = f.tell()
+    return finished, offset
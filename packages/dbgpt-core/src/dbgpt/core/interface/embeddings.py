@@ -1,6 +1,10 @@
 """Interface for embedding models."""
 
 import asyncio
+import json
+import logging
+import os
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Type, Union
@@ -10,6 +14,8 @@ from dbgpt.util.parameter_utils import BaseParameters
 
 from .parameter import EmbeddingDeployModelParameters, RerankerDeployModelParameters
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 @PublicAPI(stability="beta")
@@ -53,6 +59,96 @@ class EmbeddingModelMetadata(BaseParameters):
     )
 
 
+class EmbeddingDimensionRegistry:
+    """The registry of the embedding dimensions, keyed by the model name.
+
+    The dimensions come from the model metadata or are probed once from the model,
+    the probed dimensions are persisted to a json file so that the next process can
+    open the vector stores without calling the embedding model.
+    """
+
+    def __init__(self, persist_path: Optional[str] = None) -> None:
+        """Create a new EmbeddingDimensionRegistry.
+
+        Args:
+            persist_path (Optional[str]): The json file to persist the probed
+                dimensions, if not set, use the file in the model cache directory.
+        """
+        self._persist_path = persist_path
+        self._dimensions: Dict[str, int] = {}
+        self._persisted: Dict[str, int] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def persist_path(self) -> str:
+        """Get the json file to persist the probed dimensions."""
+        if not self._persist_path:
+            from dbgpt.configs.model_config import MODEL_DISK_CACHE_DIR
+
+            self._persist_path = os.path.join(
+                MODEL_DISK_CACHE_DIR, "embedding_dimensions.json"
+            )
+        return self._persist_path
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                self._persisted = {k: int(v) for k, v in json.load(f).items()}
+        except Exception as e:
+            logger.warning(
+                f"Load embedding dimensions from {self.persist_path} failed: {e}"
+            )
+
+    def register(self, model_name: str, dimension: int, persist: bool = False):
+        """Register the dimension of the model.
+
+        Args:
+            model_name (str): The model name.
+            dimension (int): The dimension of the embedding vectors.
+            persist (bool): Whether to persist the dimension to the json file.
+        """
+        with self._lock:
+            self._dimensions[model_name] = dimension
+            if not persist:
+                return
+            self._load()
+            if self._persisted.get(model_name) == dimension:
+                return
+            self._persisted[model_name] = dimension
+            try:
+                os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+                tmp_path = f"{self.persist_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(self._persisted, f, indent=2, sort_keys=True)
+                os.replace(tmp_path, self.persist_path)
+            except Exception as e:
+                logger.warning(
+                    f"Persist embedding dimensions to {self.persist_path} failed: {e}"
+                )
+
+    def get(self, model_name: str) -> Optional[int]:
+        """Get the dimension of the model, return None if it is unknown."""
+        with self._lock:
+            if model_name in self._dimensions:
+                return self._dimensions[model_name]
+            self._load()
+            return self._persisted.get(model_name)
+
+
+_DIMENSION_REGISTRY = EmbeddingDimensionRegistry()
+
+
+def get_embedding_dimension_registry() -> EmbeddingDimensionRegistry:
+    """Get the global embedding dimension registry."""
+    return _DIMENSION_REGISTRY
+
+
 class RerankEmbeddings(ABC):
     """Interface for rerank models."""
 
@@ -112,6 +208,35 @@ class Embeddings(ABC):
         """Check if the model name matches the rerank model."""
         return cls.param_class().get_type_value() == provider
 
+    @property
+    def dimension_model_name(self) -> Optional[str]:
+        """Get the model name to register the dimension with.
+
+        Return None if the embeddings can't be identified by a model name, then the
+        dimension is probed every time.
+        """
+        return getattr(self, "model_name", None)
+
+    def embedding_dimension(self) -> int:
+        """Get the dimension of the embedding vectors.
+
+        Use the registered dimension of the model if it is known, otherwise embed a
+        text once and persist the dimension for the model.
+
+        Returns:
+            int: The dimension of the embedding vectors.
+        """
+        model_name = self.dimension_model_name
+        registry = get_embedding_dimension_registry()
+        if model_name:
+            dimension = registry.get(model_name)
+            if dimension:
+                return dimension
+        dimension = len(self.embed_query("dimension"))
+        if model_name:
+            registry.register(model_name, dimension, persist=True)
+        return dimension
+
     @abstractmethod
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed search docs."""
@@ -120,6 +245,14 @@ class Embeddings(ABC):
     def embed_query(self, text: str) -> List[float]:
         """Embed query text."""
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many query texts.
+
+        The embeddings which can embed many queries in one call override it, by
+        default the queries are embedded one by one.
+        """
+        return [self.embed_query(text) for text in texts]
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         return await asyncio.get_running_loop().run_in_executor(
@@ -13,13 +13,14 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Tuple,
     Type,
     TypeVar,
     Union,
 )
 
 from dbgpt._private.pydantic import BaseModel, Field
-from dbgpt.util.similarity_util import calculate_cosine_similarity
+from dbgpt.util.similarity_util import calculate_cosine_similarities
 
 from .embeddings import Embeddings
 from .llm import LLMClient
@@ -127,6 +128,29 @@ class EvaluationMetric(ABC, Generic[P, C]):
         """
         raise NotImplementedError("sync_compute is not implemented")
 
+    async def compute_batch(
+        self,
+        samples: Sequence[Tuple[P, Optional[Sequence[C]], Optional[str]]],
+    ) -> List[BaseEvaluationResult]:
+        """Compute the evaluation metric of many samples.
+
+        The metrics which can share work between samples, e.g. the embedding
+        calls, override it. By default every sample is computed with `compute`.
+
+        Args:
+            samples(Sequence[Tuple[P, Optional[Sequence[C]], Optional[str]]]): The
+                prediction, contexts and query of every sample.
+
+        Returns:
+            List[BaseEvaluationResult]: The evaluation result of every sample.
+        """
+        return await asyncio.gather(
+            *(
+                self.compute(prediction, contexts, query)
+                for prediction, contexts, query in samples
+            )
+        )
+
 
 class FunctionMetric(EvaluationMetric[P, C], Generic[P, C]):
     """Evaluation metric based on a function."""
@@ -218,25 +242,37 @@ class SimilarityMetric(EvaluationMetric[str, str]):
         query: Optional[str] = None,
     ) -> BaseEvaluationResult:
         """Compute the evaluation metric."""
-        if not contexts:
-            return BaseEvaluationResult(
-                prediction=prediction,
-                contexts=contexts,
-                score=0.0,
-            )
-        try:
-            import numpy as np
-        except ImportError:
-            raise ImportError("numpy is required for SimilarityMetric")
+        return self.sync_compute_batch([(prediction, contexts, query)])[0]
 
-        similarity: np.ndarray = calculate_cosine_similarity(
-            self._embeddings, prediction, contexts
+    async def compute_batch(
+        self,
+        samples: Sequence[Tuple[str, Optional[Sequence[str]], Optional[str]]],
+    ) -> List[BaseEvaluationResult]:
+        """Compute the evaluation metric of many samples."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.sync_compute_batch, samples
         )
-        return BaseEvaluationResult(
-            prediction=prediction,
-            contexts=contexts,
-            score=float(similarity.mean()),
+
+    def sync_compute_batch(
+        self,
+        samples: Sequence[Tuple[str, Optional[Sequence[str]], Optional[str]]],
+    ) -> List[BaseEvaluationResult]:
+        """Compute the evaluation metric of many samples.
+
+        The unique texts of all the samples are embedded together in batches.
+        """
+        similarities = calculate_cosine_similarities(
+            self._embeddings,
+            [(prediction, contexts or []) for prediction, contexts, _ in samples],
         )
+        return [
+            BaseEvaluationResult(
+                prediction=prediction,
+                contexts=contexts,
+                score=float(similarity.mean()) if contexts else 0.0,
+            )
+            for (prediction, contexts, _), similarity in zip(samples, similarities)
+        ]
 
 
 class Evaluator(ABC):
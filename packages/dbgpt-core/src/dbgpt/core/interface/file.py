@@ -3,14 +3,29 @@
 import dataclasses
 import hashlib
 import io
+import json
 import logging
 import os
+import threading
 import uuid
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
 from io import BytesIO
-from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
 from urllib.parse import parse_qs, urlencode, urlparse
 
+import cachetools
 import requests
 
 from dbgpt.component import BaseComponent, ComponentType, SystemApp
@@ -28,6 +43,8 @@ from .storage import (
 
 logger = logging.getLogger(__name__)
 _SCHEMA = "dbgpt-fs"
+# Max number of files whose verified hash is remembered
+_VERIFIED_CACHE_SIZE = 4096
 
 
 @dataclasses.dataclass
@@ -247,6 +264,33 @@ class StorageBackend(ABC):
         """
         return None
 
+    def get_stamp(self, fm: FileMetadata) -> Optional[str]:
+        """Get a cheap fingerprint of the stored file data.
+
+        The stamp must change whenever the stored data changes, it lets the file
+        storage system skip verifying the hash of a file it has already verified.
+
+        Args:
+            fm (FileMetadata): The file metadata
+
+        Returns:
+            Optional[str]: The stamp, None if not supported
+        """
+        return None
+
+    def deduplicate(self, fm: FileMetadata, existing: FileMetadata) -> bool:
+        """Make a file share the stored data of an identical existing file.
+
+        Args:
+            fm (FileMetadata): The metadata of the file just saved
+            existing (FileMetadata): The metadata of an existing file with the same
+                hash and size
+
+        Returns:
+            bool: True if the data is shared now, False if not supported
+        """
+        return False
+
     @property
     @abstractmethod
     def save_chunk_size(self) -> int:
@@ -257,6 +301,53 @@ class StorageBackend(ABC):
         """
 
 
+def _write_file(file_path: str, file_data: BinaryIO, chunk_size: int) -> None:
+    """Write the file data to a new file which replaces the file path.
+
+    The existing file is replaced instead of truncated, it may share its data with
+    other files, see `_link_file`.
+    """
+    tmp_path = f"{file_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = file_data.read(chunk_size)
+                if not chunk:
+                    break
+                f.write(chunk)
+        os.replace(tmp_path, file_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _link_file(src_path: str, dst_path: str) -> bool:
+    """Replace the destination file with a hard link to the source file."""
+    if not os.path.exists(src_path) or not os.path.exists(dst_path):
+        return False
+    if os.path.samefile(src_path, dst_path):
+        return True
+    tmp_path = f"{dst_path}.{uuid.uuid4().hex}.link"
+    try:
+        os.link(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+        return True
+    except OSError as e:
+        logger.warning(f"Can't link file {dst_path} to {src_path}: {e}")
+        return False
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _file_stamp(file_path: str) -> Optional[str]:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return f"{stat.st_ino}-{stat.st_size}-{stat.st_mtime_ns}"
+
+
 class LocalFileStorage(StorageBackend):
     """Local file storage backend."""
 
@@ -285,12 +376,7 @@ class LocalFileStorage(StorageBackend):
         bucket_path = os.path.join(self.base_path, bucket)
         os.makedirs(bucket_path, exist_ok=True)
         file_path = os.path.join(bucket_path, file_id)
-        with open(file_path, "wb") as f:
-            while True:
-                chunk = file_data.read(self.save_chunk_size)
-                if not chunk:
-                    break
-                f.write(chunk)
+        _write_file(file_path, file_data, self.save_chunk_size)
         return file_path
 
     def load(self, fm: FileMetadata) -> BinaryIO:
@@ -299,6 +385,17 @@ class LocalFileStorage(StorageBackend):
         file_path = os.path.join(bucket_path, fm.file_id)
         return open(file_path, "rb")  # noqa: SIM115
 
+    def get_stamp(self, fm: FileMetadata) -> Optional[str]:
+        """Get the stamp of the local file."""
+        return _file_stamp(os.path.join(self.base_path, fm.bucket, fm.file_id))
+
+    def deduplicate(self, fm: FileMetadata, existing: FileMetadata) -> bool:
+        """Hard link the file to the identical existing file."""
+        return _link_file(
+            os.path.join(self.base_path, existing.bucket, existing.file_id),
+            os.path.join(self.base_path, fm.bucket, fm.file_id),
+        )
+
     def delete(self, fm: FileMetadata) -> bool:
         """Delete the file data from the local storage backend."""
         bucket_path = os.path.join(self.base_path, fm.bucket)
@@ -319,6 +416,50 @@ def calculate_file_hash(file_data: BinaryIO, buffer_size: int) -> str:
     return hasher.hexdigest()
 
 
+class _HashingReader:
+    """Wrap a binary stream and hash the data while it is read.
+
+    The hash is only complete if the data was read in order from the start to the
+    end, seeking back to the start restarts the hash.
+    """
+
+    def __init__(self, file_data: BinaryIO):
+        self._file_data = file_data
+        self._reset()
+
+    def _reset(self) -> None:
+        self._hasher = hashlib.md5()
+        self._in_order = True
+        self._complete = False
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = self._file_data.read(size)
+        if self._in_order and not self._complete:
+            if data:
+                self._hasher.update(data)
+            if size is None or size < 0 or (not data and size != 0):
+                # Read to the end
+                self._complete = True
+        return data
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        position = self._file_data.seek(offset, whence)
+        if offset == 0 and whence == io.SEEK_SET:
+            self._reset()
+        else:
+            self._in_order = False
+        return position
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file_data, name)
+
+    def hexdigest(self) -> Optional[str]:
+        """Return the hash if all the data was read in order, otherwise None."""
+        if self._in_order and self._complete:
+            return self._hasher.hexdigest()
+        return None
+
+
 class FileStorageSystem:
     """File storage system."""
 
@@ -327,15 +468,30 @@ class FileStorageSystem:
         storage_backends: Dict[str, StorageBackend],
         metadata_storage: Optional[StorageInterface[FileMetadata, Any]] = None,
         check_hash: bool = True,
+        deduplicate: bool = True,
     ):
-        """Initialize the file storage system."""
+        """Initialize the file storage system.
+
+        Args:
+            storage_backends (Dict[str, StorageBackend]): The storage backends
+            metadata_storage (Optional[StorageInterface[FileMetadata, Any]]): The
+                metadata storage
+            check_hash (bool): Whether to hash the files and verify them on read
+            deduplicate (bool): Whether files with the same hash and size share
+                their stored data, if the backend supports it
+        """
         metadata_storage = metadata_storage or InMemoryStorage()
         self.storage_backends = storage_backends
         self.metadata_storage = metadata_storage
         self.check_hash = check_hash
+        self.deduplicate = deduplicate
         self._save_chunk_size = min(
             backend.save_chunk_size for backend in storage_backends.values()
         )
+        # (bucket, file_id) -> (stamp, file hash) of the verified files
+        self._verified_stamps: cachetools.LRUCache = cachetools.LRUCache(
+            maxsize=_VERIFIED_CACHE_SIZE
+        )
 
     def _calculate_file_hash(self, file_data: BinaryIO) -> str:
         """Calculate the MD5 hash of the file data."""
@@ -370,10 +526,12 @@ class FileStorageSystem:
                 "storage_type": storage_type,
             },
         ):
+            # Hash the data while the backend reads it
+            hashing_reader = _HashingReader(file_data)
             storage_path = backend.save(
                 bucket,
                 file_id,
-                file_data,
+                cast(BinaryIO, hashing_reader),
                 public_url=public_url,
                 public_url_expire=public_url_expire,
             )
@@ -389,10 +547,13 @@ class FileStorageSystem:
             else {}
         )
 
-        with root_tracer.start_span(
-            "file_storage_system.save_file.calculate_hash",
-        ):
-            file_hash = self._calculate_file_hash(file_data)
+        file_hash = hashing_reader.hexdigest() if self.check_hash else None
+        if not file_hash:
+            # The backend did not read the data in order, read it again
+            with root_tracer.start_span(
+                "file_storage_system.save_file.calculate_hash",
+            ):
+                file_hash = self._calculate_file_hash(file_data)
         uri = FileStorageURI(
             storage_type, bucket, file_id, custom_params=custom_metadata
         )
@@ -408,10 +569,45 @@ class FileStorageSystem:
             custom_metadata=custom_metadata,
             file_hash=file_hash,
         )
+        if self.deduplicate and file_hash != "-1":
+            self._deduplicate(backend, metadata)
 
         self.metadata_storage.save(metadata)
+        self._mark_verified(metadata, backend.get_stamp(metadata))
         return str(uri)
 
+    def _deduplicate(self, backend: StorageBackend, metadata: FileMetadata) -> None:
+        """Share the stored data with an identical file saved before."""
+        duplicates = self.metadata_storage.query(
+            QuerySpec(
+                conditions={
+                    "storage_type": metadata.storage_type,
+                    "file_hash": metadata.file_hash,
+                    "file_size": metadata.file_size,
+                },
+                limit=2,
+            ),
+            FileMetadata,
+        )
+        for existing in duplicates:
+            if existing.identifier == metadata.identifier:
+                continue
+            try:
+                if backend.deduplicate(metadata, existing):
+                    logger.info(
+                        f"File {metadata.bucket}/{metadata.file_id} shares the data "
+                        f"of {existing.bucket}/{existing.file_id}"
+                    )
+            except Exception as e:
+                logger.warning(f"Deduplicate file {metadata.file_id} failed: {e}")
+            return
+
+    def _mark_verified(self, metadata: FileMetadata, stamp: Optional[str]) -> None:
+        """Remember the stamp of a file whose data matches its hash."""
+        if self.check_hash and stamp:
+            key = (metadata.bucket, metadata.file_id)
+            self._verified_stamps[key] = (stamp, metadata.file_hash)
+
     @trace("file_storage_system.get_file")
     def get_file(self, uri: str) -> Tuple[BinaryIO, FileMetadata]:
         """Get the file data from the storage backend."""
@@ -459,12 +655,17 @@ class FileStorageSystem:
         ):
             file_data = backend.load(metadata)
 
-        with root_tracer.start_span(
-            "file_storage_system.get_file.verify_hash",
-        ):
-            calculated_hash = self._calculate_file_hash(file_data)
-        if calculated_hash != "-1" and calculated_hash != metadata.file_hash:
-            raise ValueError("File integrity check failed. Hash mismatch.")
+        # Skip the verification if the data has not changed since last verified
+        stamp = backend.get_stamp(metadata) if self.check_hash else None
+        verified = self._verified_stamps.get((metadata.bucket, metadata.file_id))
+        if self.check_hash and (not stamp or verified != (stamp, metadata.file_hash)):
+            with root_tracer.start_span(
+                "file_storage_system.get_file.verify_hash",
+            ):
+                calculated_hash = self._calculate_file_hash(file_data)
+            if calculated_hash != metadata.file_hash:
+                raise ValueError("File integrity check failed. Hash mismatch.")
+            self._mark_verified(metadata, stamp)
 
         return file_data, metadata
 
@@ -514,6 +715,7 @@ class FileStorageSystem:
         if not backend:
             raise ValueError(f"Unsupported storage type: {metadata.storage_type}")
 
+        self._verified_stamps.pop((metadata.bucket, metadata.file_id), None)
         if backend.delete(metadata):
             try:
                 self.metadata_storage.delete(fid)
@@ -598,6 +800,10 @@ class FileStorageClient(BaseComponent):
         self._storage_system = storage_system
         self.save_chunk_size = save_chunk_size
         self.default_storage_type = default_storage_type
+        # Downloaded path -> (stamp, file hash), skips hashing unchanged files
+        self._downloaded_stamps: cachetools.LRUCache = cachetools.LRUCache(
+            maxsize=_VERIFIED_CACHE_SIZE
+        )
 
     def init_app(self, system_app: SystemApp):
         """Initialize the application."""
@@ -718,20 +924,22 @@ class FileStorageClient(BaseComponent):
             target_path = os.path.join(base_path, file_metadata.file_id + extension)
         file_hash = file_metadata.file_hash
         if os.path.exists(target_path) and cache:
+            stamp = _file_stamp(target_path)
+            if self._downloaded_stamps.get(target_path) == (stamp, file_hash):
+                logger.debug(f"File {uri} already downloaded to {target_path}")
+                return target_path, file_metadata
             logger.debug(f"File {target_path} already exists, begin hash check")
             with open(target_path, "rb") as f:
                 if file_hash == calculate_file_hash(f, self.save_chunk_size):
                     logger.info(f"File {uri} already exists at {target_path}")
+                    self._downloaded_stamps[target_path] = (stamp, file_hash)
                     return target_path, file_metadata
         logger.info(f"Downloading file {uri} to {target_path}")
         file_data, _ = self.storage_system.get_file(uri)
 
-        with open(target_path, "wb") as f:
-            while True:
-                chunk = file_data.read(self.save_chunk_size)
-                if not chunk:
-                    break
-                f.write(chunk)
+        with file_data:
+            _write_file(target_path, file_data, self.save_chunk_size)
+        self._downloaded_stamps[target_path] = (_file_stamp(target_path), file_hash)
         return target_path, file_metadata
 
     def get_file(self, uri: str) -> Tuple[BinaryIO, FileMetadata]:
@@ -820,6 +1028,201 @@ class FileStorageClient(BaseComponent):
         return self.storage_system.get_public_url(uri, expire)
 
 
+class _BlobCache:
+    """Size bounded LRU cache of file data on the local disk.
+
+    Entries are keyed by the hash and size of the file, each blob has a sidecar
+    JSON file with its metadata. A blob is only added after its hash matched, so
+    a hit is served without hashing it again. The cache directory can be shared
+    by several processes, blobs are written to a temporary file and renamed.
+
+    The sizes and the recency of the entries are tracked in memory, the directory
+    is only scanned once at startup. Each process evicts the entries it knows,
+    the blobs of other processes are known after their first hit.
+    """
+
+    def __init__(self, cache_path: str, max_size: int):
+        self._cache_path = cache_path
+        self._max_size = max_size
+        os.makedirs(self._cache_path, exist_ok=True)
+        self._lock = threading.Lock()
+        # The lock of a key and the number of threads holding or waiting for it
+        self._key_locks: Dict[str, Tuple[threading.Lock, List[int]]] = {}
+        # The size of the blob of each key, from the least recently used
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_size = 0
+        # The number of threads opening or writing the blob of a key, these keys
+        # are not evicted
+        self._pinned: Dict[str, int] = {}
+        self._load_entries()
+
+    @staticmethod
+    def get_key(fm: FileMetadata) -> Optional[str]:
+        if not fm.file_hash or fm.file_hash == "-1" or fm.file_size < 0:
+            # Can't identify the data without its hash
+            return None
+        return f"{fm.file_hash}_{fm.file_size}"
+
+    def blob_path(self, key: str) -> str:
+        return os.path.join(self._cache_path, key)
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self._cache_path, f"{key}.json")
+
+    def _load_entries(self) -> None:
+        """Load the entries cached before, in the order of their last use."""
+        entries = []
+        with os.scandir(self._cache_path) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                key = entry.name[: -len(".json")]
+                try:
+                    last_used = entry.stat().st_mtime
+                    size = os.path.getsize(self.blob_path(key))
+                except OSError:
+                    continue
+                entries.append((last_used, size, key))
+        for _, size, key in sorted(entries):
+            self._entries[key] = size
+            self._total_size += size
+
+    @contextmanager
+    def key_lock(self, key: str) -> Iterator[None]:
+        """Lock a key to load it, concurrent misses wait for one transfer.
+
+        The lock is removed when no thread holds or waits for it.
+        """
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = (threading.Lock(), [0])
+            lock, users = self._key_locks[key]
+            users[0] += 1
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                users[0] -= 1
+                if users[0] == 0:
+                    del self._key_locks[key]
+
+    @contextmanager
+    def _pin(self, key: str) -> Iterator[None]:
+        """Keep the blob of the key from being evicted."""
+        with self._lock:
+            self._pinned[key] = self._pinned.get(key, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pinned[key] -= 1
+                if self._pinned[key] == 0:
+                    del self._pinned[key]
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open the cached blob, None if missed."""
+        with self._pin(key):
+            try:
+                with open(self._meta_path(key)) as f:
+                    size = json.load(f)["file_size"]
+                blob = open(self.blob_path(key), "rb")  # noqa: SIM115
+            except (OSError, ValueError, KeyError):
+                self._discard(key)
+                return None
+            if os.fstat(blob.fileno()).st_size != size:
+                blob.close()
+                self._discard(key)
+                return None
+            try:
+                # Mark as recently used for the next startup, the blob is not
+                # touched to keep its stamp
+                os.utime(self._meta_path(key))
+            except OSError:
+                pass
+            self._add(key, size)
+            return blob
+
+    def put(self, fm: FileMetadata, chunks: Iterable[bytes]) -> BinaryIO:
+        """Write the data to the cache and return the opened blob.
+
+        The data which doesn't match the hash of the file is not cached, it is
+        returned as an unlinked temporary file and left to the integrity check of
+        the caller, which hashes it as a stream.
+        """
+        key = cast(str, self.get_key(fm))
+        blob_path = self.blob_path(key)
+        tmp_path = f"{blob_path}.{uuid.uuid4().hex}.tmp"
+        hasher = hashlib.md5()
+        size = 0
+        with self._pin(key):
+            try:
+                with open(tmp_path, "wb") as f:
+                    for chunk in chunks:
+                        hasher.update(chunk)
+                        size += len(chunk)
+                        f.write(chunk)
+                if hasher.hexdigest() != fm.file_hash or size != fm.file_size:
+                    logger.warning(
+                        f"Hash mismatch of file {fm.bucket}/{fm.file_id}, skip caching"
+                    )
+                    # The data stays readable after the file is removed below
+                    return open(tmp_path, "rb")  # noqa: SIM115
+                os.replace(tmp_path, blob_path)
+            finally:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            meta = {
+                "file_hash": fm.file_hash,
+                "file_size": fm.file_size,
+                "bucket": fm.bucket,
+                "file_id": fm.file_id,
+                "storage_path": fm.storage_path,
+            }
+            meta_tmp_path = f"{self._meta_path(key)}.{uuid.uuid4().hex}.tmp"
+            with open(meta_tmp_path, "w") as f:
+                json.dump(meta, f)
+            os.replace(meta_tmp_path, self._meta_path(key))
+            blob = open(blob_path, "rb")  # noqa: SIM115
+            self._add(key, size)
+            return blob
+
+    def _add(self, key: str, size: int) -> None:
+        """Mark the key as recently used and evict the least recently used."""
+        with self._lock:
+            self._total_size += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            for evict_key in list(self._entries):
+                if self._total_size <= self._max_size:
+                    break
+                if evict_key in self._pinned or not self._remove(evict_key):
+                    # Being read or written, evicted by a later put
+                    continue
+                self._total_size -= self._entries.pop(evict_key)
+
+    def _discard(self, key: str) -> None:
+        """Forget the key whose blob is missing or incomplete."""
+        with self._lock:
+            self._total_size -= self._entries.pop(key, 0)
+
+    def _remove(self, key: str) -> bool:
+        """Remove the blob and its metadata, False if the blob can't be removed."""
+        try:
+            os.remove(self.blob_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError:
+            # E.g. the blob is opened on Windows
+            return False
+        try:
+            os.remove(self._meta_path(key))
+        except OSError:
+            pass
+        return True
+
+
 class SimpleDistributedStorage(StorageBackend):
     """Simple distributed storage backend."""
 
@@ -833,8 +1236,20 @@ class SimpleDistributedStorage(StorageBackend):
         transfer_chunk_size: int = 1024 * 1024,
         transfer_timeout: int = 360,
         api_prefix: str = "/api/v2/serve/file/files",
+        cache_max_size: int = 1024 * 1024 * 1024,
     ):
-        """Initialize the simple distributed storage backend."""
+        """Initialize the simple distributed storage backend.
+
+        Args:
+            node_address (str): The address of the current node
+            local_storage_path (str): The path to store the files of current node
+            save_chunk_size (int): The chunk size when saving the file
+            transfer_chunk_size (int): The chunk size when transferring the file
+            transfer_timeout (int): The timeout when transferring the file
+            api_prefix (str): The API prefix of the file server
+            cache_max_size (int): The max size in bytes of the local cache of files
+                stored on other nodes, 0 disables the cache
+        """
         self.node_address = node_address
         self.local_storage_path = local_storage_path
         os.makedirs(self.local_storage_path, exist_ok=True)
@@ -842,6 +1257,13 @@ class SimpleDistributedStorage(StorageBackend):
         self._transfer_chunk_size = transfer_chunk_size
         self._transfer_timeout = transfer_timeout
         self._api_prefix = api_prefix
+        self._cache: Optional[_BlobCache] = (
+            _BlobCache(
+                os.path.join(local_storage_path, ".remote_cache"), cache_max_size
+            )
+            if cache_max_size > 0
+            else None
+        )
 
     @property
     def save_chunk_size(self) -> int:
@@ -880,15 +1302,29 @@ class SimpleDistributedStorage(StorageBackend):
         """
         file_path = self._get_file_path(bucket, file_id, self.node_address)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as f:
-            while True:
-                chunk = file_data.read(self.save_chunk_size)
-                if not chunk:
-                    break
-                f.write(chunk)
+        _write_file(file_path, file_data, self.save_chunk_size)
 
         return f"distributed://{self.node_address}/{bucket}/{file_id}"
 
+    def get_stamp(self, fm: FileMetadata) -> Optional[str]:
+        """Get the stamp of the file stored or cached on the local node."""
+        node_address = self._parse_node_address(fm)
+        if node_address == self.node_address:
+            return _file_stamp(self._get_file_path(fm.bucket, fm.file_id, node_address))
+        cache_key = self._cache.get_key(fm) if self._cache else None
+        if not self._cache or not cache_key:
+            return None
+        return _file_stamp(self._cache.blob_path(cache_key))
+
+    def deduplicate(self, fm: FileMetadata, existing: FileMetadata) -> bool:
+        """Hard link the file to the identical existing file on the local node."""
+        if self._parse_node_address(existing) != self.node_address:
+            return False
+        return _link_file(
+            self._get_file_path(existing.bucket, existing.file_id, self.node_address),
+            self._get_file_path(fm.bucket, fm.file_id, self.node_address),
+        )
+
     def load(self, fm: FileMetadata) -> BinaryIO:
         """Load the file data from the distributed storage backend.
 
@@ -905,23 +1341,34 @@ class SimpleDistributedStorage(StorageBackend):
         node_address = self._parse_node_address(fm)
         file_path = self._get_file_path(bucket, file_id, node_address)
 
-        # TODO: check if the file is cached in local storage
         if node_address == self.node_address:
             if os.path.exists(file_path):
                 return open(file_path, "rb")  # noqa: SIM115
             else:
                 raise FileNotFoundError(f"File {file_id} not found on the local node")
-        else:
-            response = requests.get(
-                f"http://{node_address}{self._api_prefix}/{bucket}/{file_id}",
-                timeout=self._transfer_timeout,
-                stream=True,
-            )
-            response.raise_for_status()
-            # TODO: cache the file in local storage
-            return StreamedBytesIO(
-                response.iter_content(chunk_size=self._transfer_chunk_size)
-            )
+
+        cache_key = self._cache.get_key(fm) if self._cache else None
+        if not self._cache or not cache_key:
+            return StreamedBytesIO(self._request_remote_file(fm, node_address))
+        blob = self._cache.open(cache_key)
+        if not blob:
+            # Only one transfer for concurrent misses of the same file
+            with self._cache.key_lock(cache_key):
+                blob = self._cache.open(cache_key)
+                if not blob:
+                    return self._cache.put(
+                        fm, self._request_remote_file(fm, node_address)
+                    )
+        return blob
+
+    def _request_remote_file(self, fm: FileMetadata, node_address: str):
+        response = requests.get(
+            f"http://{node_address}{self._api_prefix}/{fm.bucket}/{fm.file_id}",
+            timeout=self._transfer_timeout,
+            stream=True,
+        )
+        response.raise_for_status()
+        return response.iter_content(chunk_size=self._transfer_chunk_size)
 
     def delete(self, fm: FileMetadata) -> bool:
         """Delete the file data from the distributed storage backend.
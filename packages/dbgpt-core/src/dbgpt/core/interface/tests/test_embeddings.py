@@ -0,0 +1,95 @@
+from typing import List, Optional
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.core.interface.embeddings import (
+    EmbeddingDimensionRegistry,
+    EmbeddingModelMetadata,
+    Embeddings,
+)
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self, model_name: Optional[str] = None, dim: int = 8):
+        self.model_name = model_name
+        self.dim = dim
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        return [0.1] * self.dim
+
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = EmbeddingDimensionRegistry(str(tmp_path / "dimensions.json"))
+    with patch(
+        "dbgpt.core.interface.embeddings._DIMENSION_REGISTRY",
+        registry,
+    ):
+        yield registry
+
+
+def test_probe_once_per_model(registry):
+    embeddings = _CountingEmbeddings("model-a", dim=16)
+    assert embeddings.embedding_dimension() == 16
+    assert embeddings.embedding_dimension() == 16
+    assert embeddings.calls == 1
+
+    # Another instance of the same model uses the registered dimension
+    other = _CountingEmbeddings("model-a", dim=16)
+    assert other.embedding_dimension() == 16
+    assert other.calls == 0
+
+
+def test_probed_dimension_persisted(registry):
+    _CountingEmbeddings("model-a", dim=16).embedding_dimension()
+
+    reloaded = EmbeddingDimensionRegistry(registry.persist_path)
+    assert reloaded.get("model-a") == 16
+    assert reloaded.get("model-b") is None
+
+
+def test_registered_dimension_without_model_call(registry):
+    registry.register("model-a", 1024)
+    embeddings = _CountingEmbeddings("model-a")
+    assert embeddings.embedding_dimension() == 1024
+    assert embeddings.calls == 0
+
+
+def test_anonymous_embeddings_always_probe(registry):
+    embeddings = _CountingEmbeddings(dim=4)
+    assert embeddings.embedding_dimension() == 4
+    assert embeddings.embedding_dimension() == 4
+    assert embeddings.calls == 2
+
+
+def test_register_dimensions_of_supported_models(registry):
+    from dbgpt.model.adapter.base import _register_embedding_dimensions
+
+    _register_embedding_dimensions(
+        [
+            EmbeddingModelMetadata(model=["model-a", "model-b"], dimension=768),
+            EmbeddingModelMetadata(model="model-c"),
+            EmbeddingModelMetadata(model="reranker", dimension=1, is_reranker=True),
+        ]
+    )
+    assert registry.get("model-a") == 768
+    assert registry.get("model-b") == 768
+    assert registry.get("model-c") is None
+    assert registry.get("reranker") is None
+
+
+def test_embed_queries_default():
+    class _Embeddings(Embeddings):
+        def embed_documents(self, texts):
+            raise AssertionError("Queries are not embedded as documents")
+
+        def embed_query(self, text):
+            return [float(len(text))]
+
+    assert _Embeddings().embed_queries(["a", "bb"]) == [[1.0], [2.0]]
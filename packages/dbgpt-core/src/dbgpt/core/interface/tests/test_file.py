@@ -13,6 +13,7 @@ from ..file import (
     InMemoryStorage,
     LocalFileStorage,
     SimpleDistributedStorage,
+    _BlobCache,
 )
 
 
@@ -504,3 +505,205 @@ def test_simple_distributed_storage_delete_file_remote(
         f"http://{remote_node_address}/api/v2/serve/file/files/{bucket}/{file_id}",
         timeout=360,
     )
+
+
+def test_save_file_hashes_in_single_pass(file_storage_system):
+    file_data = io.BytesIO(b"Single pass content")
+    with mock.patch.object(
+        file_storage_system, "_calculate_file_hash"
+    ) as calculate_file_hash:
+        uri = file_storage_system.save_file(
+            "test-bucket", "single.txt", file_data, "local"
+        )
+        calculate_file_hash.assert_not_called()
+    metadata = file_storage_system.get_file_metadata_by_uri(uri)
+    assert metadata.file_hash == hashlib.md5(b"Single pass content").hexdigest()
+    assert metadata.file_size == len(b"Single pass content")
+
+
+def test_get_file_skips_verified_hash(file_storage_system):
+    uri = file_storage_system.save_file(
+        "test-bucket", "verified.txt", io.BytesIO(b"Verified content"), "local"
+    )
+    with mock.patch.object(
+        file_storage_system,
+        "_calculate_file_hash",
+        wraps=file_storage_system._calculate_file_hash,
+    ) as calculate_file_hash:
+        for _ in range(3):
+            file_data, _ = file_storage_system.get_file(uri)
+            assert file_data.read() == b"Verified content"
+            file_data.close()
+        calculate_file_hash.assert_not_called()
+
+    # Changed data must be verified again
+    metadata = file_storage_system.get_file_metadata_by_uri(uri)
+    with open(metadata.storage_path, "wb") as f:
+        f.write(b"Verified CONTENT")
+    with pytest.raises(ValueError, match="Hash mismatch"):
+        file_storage_system.get_file(uri)
+
+
+def test_identical_files_share_stored_data(file_storage_system):
+    uri1 = file_storage_system.save_file(
+        "bucket1", "a.txt", io.BytesIO(b"Same content"), "local"
+    )
+    uri2 = file_storage_system.save_file(
+        "bucket2", "b.txt", io.BytesIO(b"Same content"), "local"
+    )
+    uri3 = file_storage_system.save_file(
+        "bucket2", "c.txt", io.BytesIO(b"Other content"), "local"
+    )
+    path1, path2, path3 = [
+        file_storage_system.get_file_metadata_by_uri(uri).storage_path
+        for uri in (uri1, uri2, uri3)
+    ]
+    assert os.path.samefile(path1, path2)
+    assert not os.path.samefile(path1, path3)
+
+    # Deleting one of them keeps the data of the other
+    assert file_storage_system.delete_file(uri1)
+    file_data, _ = file_storage_system.get_file(uri2)
+    assert file_data.read() == b"Same content"
+    file_data.close()
+
+    # Overwriting a file does not change the data of its duplicates
+    uri4 = file_storage_system.save_file(
+        "bucket1", "d.txt", io.BytesIO(b"Same content"), "local"
+    )
+    file_id4 = uri4.split("/")[-1]
+    file_storage_system.storage_backends["local"].save(
+        "bucket1", file_id4, io.BytesIO(b"New content")
+    )
+    file_data, _ = file_storage_system.get_file(uri2)
+    assert file_data.read() == b"Same content"
+    file_data.close()
+
+
+def _remote_metadata(file_id, content, remote_node_address="127.0.0.2:8000"):
+    bucket = "test-bucket"
+    return FileMetadata(
+        file_id=file_id,
+        bucket=bucket,
+        file_name=f"{file_id}.txt",
+        file_size=len(content),
+        storage_type="distributed",
+        storage_path=f"distributed://{remote_node_address}/{bucket}/{file_id}",
+        uri=f"distributed://{remote_node_address}/{bucket}/{file_id}",
+        custom_metadata={},
+        file_hash=hashlib.md5(content).hexdigest(),
+    )
+
+
+@mock.patch("requests.get")
+def test_simple_distributed_storage_caches_remote_file(mock_get, temp_storage_path):
+    content = b"Cached remote content"
+    mock_get.return_value.iter_content.side_effect = lambda chunk_size: iter([content])
+    backend = SimpleDistributedStorage("127.0.0.1:8000", temp_storage_path)
+    metadata = _remote_metadata("remote_file", content)
+
+    for _ in range(3):
+        with backend.load(metadata) as file_data:
+            assert file_data.read() == content
+    mock_get.assert_called_once()
+    stamp = backend.get_stamp(metadata)
+    assert stamp is not None
+    # Reading from the cache does not change the stamp of the cached data
+    with backend.load(metadata) as file_data:
+        file_data.read()
+    assert backend.get_stamp(metadata) == stamp
+
+
+@mock.patch("requests.get")
+def test_simple_distributed_storage_cache_eviction(mock_get, temp_storage_path):
+    contents = {f"file{i}": f"Remote content {i}".encode() for i in range(3)}
+    mock_get.side_effect = lambda url, **kwargs: mock.Mock(
+        iter_content=mock.Mock(return_value=iter([contents[url.split("/")[-1]]]))
+    )
+    # Room for two files
+    backend = SimpleDistributedStorage(
+        "127.0.0.1:8000", temp_storage_path, cache_max_size=2 * len(contents["file0"])
+    )
+    for file_id, content in contents.items():
+        with backend.load(_remote_metadata(file_id, content)) as file_data:
+            assert file_data.read() == content
+    assert mock_get.call_count == 3
+
+    # The least recently used file was evicted
+    with backend.load(_remote_metadata("file2", contents["file2"])) as file_data:
+        assert file_data.read() == contents["file2"]
+    assert mock_get.call_count == 3
+    with backend.load(_remote_metadata("file0", contents["file0"])) as file_data:
+        assert file_data.read() == contents["file0"]
+    assert mock_get.call_count == 4
+
+
+def test_blob_cache_skips_pinned_and_tracks_in_memory(temp_storage_path):
+    contents = {f"file{i}": f"Remote content {i}".encode() for i in range(3)}
+    cache_path = os.path.join(temp_storage_path, "cache")
+    cache = _BlobCache(cache_path, max_size=2 * len(contents["file0"]))
+    metadata = {k: _remote_metadata(k, v) for k, v in contents.items()}
+    keys = {k: _BlobCache.get_key(fm) for k, fm in metadata.items()}
+    cache.put(metadata["file0"], [contents["file0"]]).close()
+    cache.put(metadata["file1"], [contents["file1"]]).close()
+
+    # The least recently used file is being read, the next one is evicted
+    with cache._pin(keys["file0"]), mock.patch("os.scandir") as scandir:
+        cache.put(metadata["file2"], [contents["file2"]]).close()
+        scandir.assert_not_called()
+    assert cache.open(keys["file1"]) is None
+    with cache.open(keys["file0"]) as blob:
+        assert blob.read() == contents["file0"]
+
+    # The cache fits its size again on the next put
+    cache.put(metadata["file1"], [contents["file1"]]).close()
+    assert list(cache._entries) == [keys["file0"], keys["file1"]]
+    assert cache._total_size == 2 * len(contents["file0"])
+
+    # The entries are loaded by a new process
+    new_cache = _BlobCache(cache_path, max_size=cache._max_size)
+    assert dict(new_cache._entries) == dict(cache._entries)
+    assert new_cache._total_size == cache._total_size
+
+
+@mock.patch("requests.get")
+def test_simple_distributed_storage_skips_caching_mismatch(mock_get, temp_storage_path):
+    content = b"Corrupted remote content"
+    mock_get.return_value.iter_content.side_effect = lambda chunk_size: iter([content])
+    backend = SimpleDistributedStorage("127.0.0.1:8000", temp_storage_path)
+    metadata = _remote_metadata("remote_file", b"Original remote content")
+
+    with backend.load(metadata) as file_data:
+        assert not isinstance(file_data, io.BytesIO)
+        assert file_data.read() == content
+    assert backend.get_stamp(metadata) is None
+    assert os.listdir(backend._cache._cache_path) == []
+    # The lock of the key is removed after the load
+    assert backend._cache._key_locks == {}
+
+
+def test_download_file_skips_hash_of_unchanged_file(
+    file_storage_client, sample_file_path, temp_test_file_dir
+):
+    uri = file_storage_client.upload_file(
+        bucket="test-bucket", file_path=sample_file_path, storage_type="local"
+    )
+    dest_dir = os.path.join(temp_test_file_dir, "downloads")
+    target_path, _ = file_storage_client.download_file(uri, dest_dir=dest_dir)
+    with (
+        mock.patch(
+            "dbgpt.core.interface.file.calculate_file_hash"
+        ) as calculate_file_hash,
+        mock.patch.object(file_storage_client.storage_system, "get_file") as get_file,
+    ):
+        path, _ = file_storage_client.download_file(uri, dest_dir=dest_dir)
+        assert path == target_path
+        calculate_file_hash.assert_not_called()
+        get_file.assert_not_called()
+
+    # The changed file is downloaded again
+    with open(target_path, "wb") as f:
+        f.write(b"Changed content")
+    file_storage_client.download_file(uri, dest_dir=dest_dir)
+    with open(target_path, "rb") as f:
+        assert f.read() == b"Sample file content"
@@ -1,7 +1,8 @@
 """Base class for all connectors."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
 
 from .parameter import BaseDatasourceParameters  # noqa: F401
 
@@ -46,6 +47,13 @@ class BaseConnector(ABC):
         """Get all table names."""
         raise NotImplementedError("Current connector does not support get_table_names")
 
+    def refresh_table_names(self) -> None:
+        """Refresh the cached table names from the database.
+
+        Connectors which cache the table names override it, so tables created or
+        dropped after the connector was created are seen.
+        """
+
     def get_table_info(self, table_names: Optional[List[str]] = None) -> str:
         r"""Get table info about specified table.
 
@@ -245,6 +253,44 @@ class BaseConnector(ABC):
         """
         raise NotImplementedError("Current connector does not support get_indexes")
 
+    def get_multi_table_metadata(
+        self, table_names: Optional[List[str]] = None, max_workers: int = 1
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return columns, indexes and comment of many tables at once.
+
+        The default implementation calls :meth:`get_columns`,
+        :meth:`get_indexes` and :meth:`get_table_comment` for each table, on up
+        to `max_workers` threads. Connectors that can read the metadata of all
+        tables with a few bulk queries should override it.
+
+        Args:
+            table_names (Optional[List[str]]): table names, all tables if None
+            max_workers (int): max number of tables inspected concurrently
+
+        Returns:
+            Dict[str, Dict[str, Any]]: table metadata by table name, which contains
+                columns: List[Dict], indexes: List[Dict], comment: Dict
+        """
+        if table_names is None:
+            table_names = list(self.get_table_names())
+
+        def _table_metadata(table_name: str) -> Dict[str, Any]:
+            try:
+                comment = self.get_table_comment(table_name)
+            except Exception:
+                comment = {"text": None}
+            return {
+                "columns": self.get_columns(table_name),
+                "indexes": self.get_indexes(table_name),
+                "comment": comment,
+            }
+
+        if max_workers <= 1 or len(table_names) <= 1:
+            return {name: _table_metadata(name) for name in table_names}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_table_metadata, table_names)
+            return dict(zip(table_names, results))
+
     @classmethod
     def is_normal_type(cls) -> bool:
         """Return whether the connector is a normal type."""
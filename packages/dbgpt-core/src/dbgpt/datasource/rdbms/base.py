@@ -27,6 +27,7 @@ import sqlalchemy
 import sqlparse
 from sqlalchemy import MetaData, Table, create_engine, inspect, select, text
 from sqlalchemy.engine import CursorResult
+from sqlalchemy.engine.reflection import ObjectKind
 from sqlalchemy.exc import ProgrammingError, SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from sqlalchemy.orm.session import Session
@@ -242,6 +243,11 @@ class RDBMSConnector(BaseConnector):
         )
         return self._all_tables
 
+    def refresh_table_names(self) -> None:
+        """Refresh the cached table names from the database."""
+        self._inspector.clear_cache()
+        self._sync_tables_from_db()
+
     def get_usable_table_names(self) -> Iterable[str]:
         """Get names of tables available."""
         if self._include_tables:
@@ -774,6 +780,46 @@ class RDBMSConnector(BaseConnector):
         """
         return self._inspector.get_indexes(table_name)
 
+    def get_multi_table_metadata(
+        self, table_names: Optional[List[str]] = None, max_workers: int = 1
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return columns, indexes and comment of many tables at once.
+
+        Uses the bulk reflection of the SQLAlchemy inspector, which reads the
+        metadata of all tables in a few queries on dialects that support it.
+        Connectors overriding the per-table methods keep the per-table path.
+        """
+        # Always read the current schema, not the inspector's cached one
+        self._inspector.clear_cache()
+        cls = type(self)
+        if (
+            cls.get_columns is not RDBMSConnector.get_columns
+            or cls.get_indexes is not RDBMSConnector.get_indexes
+            or cls.get_table_comment is not RDBMSConnector.get_table_comment
+        ):
+            return super().get_multi_table_metadata(table_names, max_workers)
+        if table_names is None:
+            table_names = list(self.get_table_names())
+        if not table_names:
+            return {}
+        kind = ObjectKind.ANY
+        columns = self._inspector.get_multi_columns(filter_names=table_names, kind=kind)
+        indexes = self._inspector.get_multi_indexes(filter_names=table_names, kind=kind)
+        try:
+            comments = self._inspector.get_multi_table_comment(
+                filter_names=table_names, kind=kind
+            )
+        except NotImplementedError:
+            comments = {}
+        result = {}
+        for key, table_columns in columns.items():
+            result[key[1]] = {
+                "columns": table_columns,
+                "indexes": indexes.get(key, []),
+                "comment": comments.get(key, {"text": None}),
+            }
+        return result
+
     def get_show_create_table(self, table_name):
         """Get table show create table about specified table."""
         with self.session_scope() as session:
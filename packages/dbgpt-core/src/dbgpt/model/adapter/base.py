@@ -8,6 +8,7 @@ from dbgpt.core import (
     ModelMetadata,
     RerankEmbeddings,
 )
+from dbgpt.core.interface.embeddings import get_embedding_dimension_registry
 from dbgpt.core.interface.media import MediaProcessor
 from dbgpt.core.interface.message import ModelMessage, ModelMessageRoleType
 from dbgpt.core.interface.parameter import (
@@ -858,6 +859,7 @@ def register_embedding_adapter(
         match_funcs (List[Callable[[str, str, str], bool]], optional): The match
             functions. Defaults to None.
     """
+    _register_embedding_dimensions(supported_models)
     if issubclass(model_adapter_cls, Embeddings) or issubclass(
         model_adapter_cls, RerankEmbeddings
     ):
@@ -888,6 +890,19 @@ def register_embedding_adapter(
         embedding_adapters.append(AdapterEntry(model_adapter_cls(), match_funcs))
 
 
+def _register_embedding_dimensions(
+    supported_models: List[EmbeddingModelMetadata],
+) -> None:
+    """Register the known dimensions of the embedding models."""
+    registry = get_embedding_dimension_registry()
+    for sm in supported_models:
+        if sm.is_reranker or not sm.dimension:
+            continue
+        model_names = sm.model if isinstance(sm.model, list) else [sm.model]
+        for model_name in model_names:
+            registry.register(model_name, sm.dimension)
+
+
 def get_embedding_adapter(
     provider: str,
     is_rerank: bool,
@@ -5,10 +5,22 @@ Adapted from https://github.com/lm-sys/FastChat/blob/main/fastchat/serve/openai_
 """
 
 import asyncio
+import base64
 import json
 import logging
 import os
-from typing import Any, Dict, Generator, List, Optional
+import struct
+from collections import OrderedDict, deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import shortuuid
 from fastapi import APIRouter, Depends, HTTPException
@@ -49,7 +61,7 @@ from dbgpt.model.base import ModelInstance
 from dbgpt.model.cluster.manager_base import WorkerManager, WorkerManagerFactory
 from dbgpt.model.cluster.registry import ModelRegistry
 from dbgpt.model.parameter import ModelAPIServerParameters, WorkerType
-from dbgpt.util.chat_util import transform_to_sse
+from dbgpt.util.chat_util import merge_async_streams, transform_to_sse
 from dbgpt.util.fastapi import create_app
 from dbgpt.util.tracer import initialize_tracer, root_tracer, trace
 from dbgpt.util.tracer.tracer_impl import TracerParameters
@@ -76,7 +88,13 @@ class APISettings(BaseModel):
     def embedding_bach_size(self):
         if not self.api_params:
             return 4
-        return self.api_params.embedding_batch_size
+        return self.api_params.embedding_batch_size or 4
+
+    @property
+    def embedding_max_concurrency(self):
+        if not self.api_params:
+            return 8
+        return self.api_params.embedding_max_concurrency or 8
 
     @property
     def ignore_stop_exceeds_error(self):
@@ -184,9 +202,60 @@ def check_requests(request) -> Optional[JSONResponse]:
     return None
 
 
+class _FairLimiter:
+    """Limit the concurrency of a resource, serving the waiting callers in turn.
+
+    The waiters are queued per caller and a released slot is handed to the next
+    caller in round robin, so a caller with many waiting requests can't starve
+    the others.
+    """
+
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._active = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    async def acquire(self, caller: str) -> None:
+        if self._active < self._limit and not self._waiters:
+            self._active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(caller, deque()).append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed to us, pass it on
+                self.release()
+            else:
+                waiters = self._waiters.get(caller)
+                if waiters and fut in waiters:
+                    waiters.remove(fut)
+                    if not waiters:
+                        del self._waiters[caller]
+            raise
+
+    def release(self) -> None:
+        while self._waiters:
+            caller, waiters = next(iter(self._waiters.items()))
+            fut = waiters.popleft()
+            if waiters:
+                self._waiters.move_to_end(caller)
+            else:
+                del self._waiters[caller]
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._active -= 1
+
+
 class APIServer(BaseComponent):
     name = ComponentType.MODEL_API_SERVER
 
+    def __init__(self, system_app: Optional[SystemApp] = None):
+        self._embedding_limiters: Dict[str, _FairLimiter] = {}
+        super().__init__(system_app)
+
     def init_app(self, system_app: SystemApp):
         self.system_app = system_app
 
@@ -295,21 +364,16 @@ class APIServer(BaseComponent):
     ) -> Generator[str, Any, None]:
         """Chat stream completion generator
 
+        The n choices are generated concurrently, their chunks are interleaved in
+        the order they arrive and carry the usage of their own choice.
+
         Args:
             model_name (str): Model name
             params (Dict[str, Any]): The parameters pass to model worker
             n (int): How many completions to generate for each prompt.
         """
-        worker_manager = self.get_worker_manager()
         id = f"chatcmpl-{shortuuid.random()}"
-        finish_stream_events = []
-        curr_usage = UsageInfo()
-        last_usage = UsageInfo()
         for i in range(n):
-            last_usage.prompt_tokens += curr_usage.prompt_tokens
-            last_usage.completion_tokens += curr_usage.completion_tokens
-            last_usage.total_tokens += curr_usage.total_tokens
-
             # First chunk with role
             choice_data = ChatCompletionResponseStreamChoice(
                 index=i,
@@ -320,88 +384,117 @@ class APIServer(BaseComponent):
                 id=id,
                 choices=[choice_data],
                 model=model_name,
-                usage=last_usage,
+                usage=UsageInfo(),
             )
             yield transform_to_sse(chunk)
 
-            delta_text = ""
-            previous_text = ""
-            thinking_text = ""
-            previous_thinking_text = ""
-            full_text = ""
-
-            span = root_tracer.start_span(
-                "API.chat_completion_stream_generator",
-                metadata={
-                    "model": model_name,
-                    "params": json.dumps(params, ensure_ascii=False),
-                },
-            )
+        streams = [
+            self._chat_completion_choice_stream(id, model_name, params, i)
+            for i in range(n)
+        ]
+        async for sse_data in self._merge_choice_streams(streams):
+            yield sse_data
 
-            async for model_output in worker_manager.generate_stream(params):
-                model_output: ModelOutput = model_output
-                if model_output.error_code != 0:
-                    yield transform_to_sse(model_output.to_dict())
-                    yield transform_to_sse("[DONE]")
-                    return
-                if model_output.has_text:
-                    full_text = model_output.text
-                    decoded_unicode = model_output.text.replace("\ufffd", "")
-                    delta_text = decoded_unicode[len(previous_text) :]
-                    previous_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_text)
-                        else previous_text
-                    )
-                if model_output.has_thinking:
-                    decoded_unicode = model_output.thinking_text.replace("\ufffd", "")
-                    thinking_text = decoded_unicode[len(previous_thinking_text) :]
-                    previous_thinking_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_thinking_text)
-                        else previous_thinking_text
-                    )
+    async def _chat_completion_choice_stream(
+        self, id: str, model_name: str, params: Dict[str, Any], index: int
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the chunks of one choice of a chat completion.
 
-                if not delta_text:
-                    delta_text = None
-                if not thinking_text:
-                    thinking_text = None
-
-                has_usage = False
-                if model_output.usage:
-                    curr_usage = UsageInfo.model_validate(model_output.usage)
-                    has_usage = True
-                    usage = UsageInfo(
-                        prompt_tokens=last_usage.prompt_tokens
-                        + curr_usage.prompt_tokens,
-                        total_tokens=last_usage.total_tokens + curr_usage.total_tokens,
-                        completion_tokens=last_usage.completion_tokens
-                        + curr_usage.completion_tokens,
-                    )
-                else:
-                    usage = UsageInfo()
-                choice_data = ChatCompletionResponseStreamChoice(
-                    index=i,
-                    delta=DeltaMessage(
-                        content=delta_text, reasoning_content=thinking_text
-                    ),
-                    finish_reason=model_output.finish_reason,
+        Yields:
+            Tuple[str, Any]: The kind of the item, "chunk", "finish" or "error",
+                and the item
+        """
+        worker_manager = self.get_worker_manager()
+        delta_text = ""
+        previous_text = ""
+        thinking_text = ""
+        previous_thinking_text = ""
+        full_text = ""
+
+        span = root_tracer.start_span(
+            "API.chat_completion_stream_generator",
+            metadata={
+                "model": model_name,
+                "params": json.dumps(params, ensure_ascii=False),
+            },
+        )
+
+        async for model_output in worker_manager.generate_stream(dict(params)):
+            model_output: ModelOutput = model_output
+            if model_output.error_code != 0:
+                yield "error", model_output.to_dict()
+                break
+            if model_output.has_text:
+                full_text = model_output.text
+                decoded_unicode = model_output.text.replace("\ufffd", "")
+                delta_text = decoded_unicode[len(previous_text) :]
+                previous_text = (
+                    decoded_unicode
+                    if len(decoded_unicode) > len(previous_text)
+                    else previous_text
                 )
-                chunk = ChatCompletionStreamResponse(
-                    id=id, choices=[choice_data], model=model_name or "", usage=usage
+            if model_output.has_thinking:
+                decoded_unicode = model_output.thinking_text.replace("\ufffd", "")
+                thinking_text = decoded_unicode[len(previous_thinking_text) :]
+                previous_thinking_text = (
+                    decoded_unicode
+                    if len(decoded_unicode) > len(previous_thinking_text)
+                    else previous_thinking_text
                 )
-                if delta_text is None and thinking_text is None:
-                    if model_output.finish_reason is not None:
-                        finish_stream_events.append(chunk)
-                    if not has_usage:
-                        continue
-
-                yield transform_to_sse(chunk)
-            span.end(
-                metadata={
-                    "full_text": full_text,
-                }
+
+            if not delta_text:
+                delta_text = None
+            if not thinking_text:
+                thinking_text = None
+
+            if model_output.usage:
+                usage = UsageInfo.model_validate(model_output.usage)
+            else:
+                usage = UsageInfo()
+            choice_data = ChatCompletionResponseStreamChoice(
+                index=index,
+                delta=DeltaMessage(content=delta_text, reasoning_content=thinking_text),
+                finish_reason=model_output.finish_reason,
+            )
+            chunk = ChatCompletionStreamResponse(
+                id=id, choices=[choice_data], model=model_name or "", usage=usage
             )
+            if delta_text is None and thinking_text is None:
+                if model_output.finish_reason is not None:
+                    yield "finish", chunk
+                if not model_output.usage:
+                    continue
+
+            yield "chunk", chunk
+        span.end(
+            metadata={
+                "full_text": full_text,
+            }
+        )
+
+    async def _merge_choice_streams(
+        self, streams: List[AsyncIterator[Tuple[str, Any]]]
+    ) -> AsyncIterator[str]:
+        """Merge the streams of the choices into the SSE stream.
+
+        An error of any choice ends the whole stream, the finish chunks are sent
+        after all the choices are finished.
+        """
+        finish_stream_events = []
+        merged = merge_async_streams(streams)
+        try:
+            async for _, (kind, data) in merged:
+                if kind == "error":
+                    yield transform_to_sse(data)
+                    yield transform_to_sse("[DONE]")
+                    return
+                if kind == "finish":
+                    finish_stream_events.append(data)
+                else:
+                    yield transform_to_sse(data)
+        finally:
+            # Cancel the other choices if the stream stops early
+            await merged.aclose()
 
         # There is not "content" field in the last delta message, so exclude_none to
         # exclude field "content".
@@ -455,74 +548,81 @@ class APIServer(BaseComponent):
     async def completion_stream_generator(
         self, request: CompletionRequest, params: Dict
     ):
-        worker_manager = self.get_worker_manager()
+        """Completion stream generator
+
+        The n choices of all the prompts are generated concurrently, the choice of
+        the i-th generation of the k-th prompt has index ``k * n + i``.
+        """
         id = f"cmpl-{shortuuid.random()}"
-        finish_stream_events = []
         params["span_id"] = root_tracer.get_current_span_id()
-        curr_usage = UsageInfo()
-        last_usage = UsageInfo()
-        for text in request.prompt:
+        streams = []
+        for prompt_index, text in enumerate(request.prompt):
             for i in range(request.n):
-                params["prompt"] = text
-                previous_text = ""
-                last_usage.prompt_tokens += curr_usage.prompt_tokens
-                last_usage.completion_tokens += curr_usage.completion_tokens
-                last_usage.total_tokens += curr_usage.total_tokens
-
-                async for model_output in worker_manager.generate_stream(params):
-                    model_output: ModelOutput = model_output
-                    if model_output.error_code != 0:
-                        yield transform_to_sse(model_output.to_dict())
-                        yield transform_to_sse("[DONE]")
-                        return
-                    decoded_unicode = model_output.text.replace("\ufffd", "")
-                    delta_text = decoded_unicode[len(previous_text) :]
-                    previous_text = (
-                        decoded_unicode
-                        if len(decoded_unicode) > len(previous_text)
-                        else previous_text
+                streams.append(
+                    self._completion_choice_stream(
+                        id,
+                        request,
+                        {**params, "prompt": text},
+                        prompt_index * request.n + i,
                     )
+                )
+        async for sse_data in self._merge_choice_streams(streams):
+            yield sse_data
 
-                    if len(delta_text) == 0:
-                        delta_text = None
+    async def _completion_choice_stream(
+        self,
+        id: str,
+        request: CompletionRequest,
+        params: Dict[str, Any],
+        index: int,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream the chunks of one choice of a completion.
+
+        Yields:
+            Tuple[str, Any]: The kind of the item, "chunk", "finish" or "error",
+                and the item
+        """
+        worker_manager = self.get_worker_manager()
+        previous_text = ""
+        async for model_output in worker_manager.generate_stream(params):
+            model_output: ModelOutput = model_output
+            if model_output.error_code != 0:
+                yield "error", model_output.to_dict()
+                return
+            decoded_unicode = model_output.text.replace("\ufffd", "")
+            delta_text = decoded_unicode[len(previous_text) :]
+            previous_text = (
+                decoded_unicode
+                if len(decoded_unicode) > len(previous_text)
+                else previous_text
+            )
 
-                    choice_data = CompletionResponseStreamChoice(
-                        index=i,
-                        text=delta_text or "",
-                        # TODO: logprobs
-                        logprobs=None,
-                        finish_reason=model_output.finish_reason,
-                    )
-                    if model_output.usage:
-                        curr_usage = UsageInfo.model_validate(model_output.usage)
-                        usage = UsageInfo(
-                            prompt_tokens=last_usage.prompt_tokens
-                            + curr_usage.prompt_tokens,
-                            total_tokens=last_usage.total_tokens
-                            + curr_usage.total_tokens,
-                            completion_tokens=last_usage.completion_tokens
-                            + curr_usage.completion_tokens,
-                        )
-                    else:
-                        usage = UsageInfo()
-                    chunk = CompletionStreamResponse(
-                        id=id,
-                        object="text_completion",
-                        choices=[choice_data],
-                        model=request.model,
-                        usage=UsageInfo.model_validate(usage),
-                    )
-                    if delta_text is None:
-                        if model_output.finish_reason is not None:
-                            finish_stream_events.append(chunk)
-                        continue
-                    yield transform_to_sse(chunk)
-                last_usage = curr_usage
-        # There is not "content" field in the last delta message, so exclude_none to
-        # exclude field "content".
-        for finish_chunk in finish_stream_events:
-            yield transform_to_sse(finish_chunk)
-        yield transform_to_sse("[DONE]")
+            if len(delta_text) == 0:
+                delta_text = None
+
+            choice_data = CompletionResponseStreamChoice(
+                index=index,
+                text=delta_text or "",
+                # TODO: logprobs
+                logprobs=None,
+                finish_reason=model_output.finish_reason,
+            )
+            if model_output.usage:
+                usage = UsageInfo.model_validate(model_output.usage)
+            else:
+                usage = UsageInfo()
+            chunk = CompletionStreamResponse(
+                id=id,
+                object="text_completion",
+                choices=[choice_data],
+                model=request.model,
+                usage=usage,
+            )
+            if delta_text is None:
+                if model_output.finish_reason is not None:
+                    yield "finish", chunk
+                continue
+            yield "chunk", chunk
 
     async def completion_generate(
         self, request: CompletionRequest, params: Dict[str, Any]
@@ -589,6 +689,58 @@ class APIServer(BaseComponent):
             }
             return await worker_manager.embeddings(params)
 
+    async def embeddings_stream(
+        self,
+        model: str,
+        texts: List[str],
+        batch_size: int,
+        caller: str,
+        span_id: Optional[str] = None,
+    ) -> AsyncIterator[List[List[float]]]:
+        """Generate the embeddings of texts in batches, yielded in input order.
+
+        The concurrent batches of a model are limited, the waiting batches of
+        different callers are served in turn. At most the limit of batches of one
+        request are in flight, so the memory of a large request stays bounded.
+
+        Args:
+            model (str): Model name
+            texts (List[str]): Texts to embed
+            batch_size (int): The number of texts of a batch
+            caller (str): The caller, used to share the limit fairly
+            span_id (Optional[str], optional): The span id. Defaults to None.
+
+        Yields:
+            List[List[float]]: The embeddings of each batch
+        """
+        max_concurrency = api_settings.embedding_max_concurrency
+        limiter = self._embedding_limiters.get(model)
+        if limiter is None:
+            limiter = _FairLimiter(max_concurrency)
+            self._embedding_limiters[model] = limiter
+
+        async def _embed(batch: List[str]) -> List[List[float]]:
+            await limiter.acquire(caller)
+            try:
+                return await self.embeddings_generate(model, batch, span_id=span_id)
+            finally:
+                limiter.release()
+
+        batches = (texts[i : i + batch_size] for i in range(0, len(texts), batch_size))
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            for batch in batches:
+                pending.append(asyncio.create_task(_embed(batch)))
+                if len(pending) >= max_concurrency:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled batches to release their limiter slots
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def relevance_generate(
         self, model: str, query: str, texts: List[str]
     ) -> List[float]:
@@ -733,42 +885,61 @@ async def create_completion(
             return await api_server.completion_generate(request, params)
 
 
-@router.post("/v1/embeddings", dependencies=[Depends(check_api_key)])
+@router.post("/v1/embeddings")
 async def create_embeddings(
-    request: EmbeddingsRequest, api_server: APIServer = Depends(get_api_server)
+    request: EmbeddingsRequest,
+    api_server: APIServer = Depends(get_api_server),
+    api_key: Optional[str] = Depends(check_api_key),
 ):
     await api_server.get_model_instances_or_raise(request.model, worker_type="text2vec")
+    if request.encoding_format not in (None, "float", "base64"):
+        return create_error_response(
+            ErrorCode.PARAM_OUT_OF_RANGE,
+            f"{request.encoding_format} is not a valid encoding_format, "
+            "expected 'float' or 'base64'",
+        )
     texts = request.input
     if isinstance(texts, str):
         texts = [texts]
     batch_size = api_settings.embedding_bach_size
-    batches = [
-        texts[i : min(i + batch_size, len(texts))]
-        for i in range(0, len(texts), batch_size)
-    ]
-    data = []
-    async_tasks = []
-    for num_batch, batch in enumerate(batches):
-        async_tasks.append(
-            api_server.embeddings_generate(
-                request.model, batch, span_id=root_tracer.get_current_span_id()
-            )
-        )
-
-    # Request all embeddings in parallel
-    batch_embeddings: List[List[List[float]]] = await asyncio.gather(*async_tasks)
-    for num_batch, embeddings in enumerate(batch_embeddings):
-        data += [
+    embedding_batches = api_server.embeddings_stream(
+        request.model,
+        texts,
+        batch_size,
+        # The API key identifies the caller, the user is only trusted without auth
+        caller=api_key if api_key is not None else request.user or "",
+        span_id=root_tracer.get_current_span_id(),
+    )
+    # Errors before the response is started are returned as an error response
+    try:
+        first_embeddings = await embedding_batches.__anext__()
+    except StopAsyncIteration:
+        first_embeddings = []
+    except Exception as e:
+        await embedding_batches.aclose()
+        return create_error_response(ErrorCode.INTERNAL_ERROR, str(e))
+    if len(texts) <= batch_size:
+        data = [
             {
                 "object": "embedding",
-                "embedding": emb,
-                "index": num_batch * batch_size + i,
+                "embedding": _encode_embedding(emb, request.encoding_format),
+                "index": i,
             }
-            for i, emb in enumerate(embeddings)
+            for i, emb in enumerate(first_embeddings)
         ]
-    return model_to_dict(
-        EmbeddingsResponse(data=data, model=request.model, usage=UsageInfo()),
-        exclude_none=True,
+        return model_to_dict(
+            EmbeddingsResponse(data=data, model=request.model, usage=UsageInfo()),
+            exclude_none=True,
+        )
+    # Start writing the response as soon as the first batches are done
+    return StreamingResponse(
+        _embeddings_response_stream(
+            embedding_batches,
+            request.model,
+            request.encoding_format,
+            first_embeddings=first_embeddings,
+        ),
+        media_type="application/json",
     )
 
 
@@ -802,6 +973,58 @@ async def create_relevance(
     )
 
 
+def _encode_embedding(embedding: List[float], encoding_format: Optional[str]) -> Any:
+    """Encode the embedding, base64 is the little-endian float32 bytes."""
+    if encoding_format == "base64":
+        data = struct.pack(f"<{len(embedding)}f", *embedding)
+        return base64.b64encode(data).decode("ascii")
+    return embedding
+
+
+async def _embeddings_response_stream(
+    embedding_batches: AsyncIterator[List[List[float]]],
+    model: str,
+    encoding_format: Optional[str],
+    first_embeddings: Optional[List[List[float]]] = None,
+) -> AsyncIterator[str]:
+    """Write the embeddings response as each batch is done, in input order.
+
+    The first batch is embedded before the response is started. The status code
+    is already sent when a later batch fails, so the error is raised to abort the
+    response, the client sees a broken response instead of a partial result.
+    """
+    yield '{"object": "list", "data": ['
+    index = 0
+
+    def _items(embeddings: List[List[float]]) -> Generator[str, None, None]:
+        nonlocal index
+        for emb in embeddings:
+            item = {
+                "object": "embedding",
+                "embedding": _encode_embedding(emb, encoding_format),
+                "index": index,
+            }
+            yield ("," if index else "") + json.dumps(item)
+            index += 1
+
+    try:
+        if first_embeddings is not None:
+            for item in _items(first_embeddings):
+                yield item
+        async for embeddings in embedding_batches:
+            for item in _items(embeddings):
+                yield item
+    except Exception as e:
+        logger.warning(f"Embeddings of model {model} failed, abort response: {e}")
+        raise
+    finally:
+        aclose = getattr(embedding_batches, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    usage = model_to_dict(UsageInfo(), exclude_none=True)
+    yield f'], "model": {json.dumps(model)}, "usage": {json.dumps(usage)}}}'
+
+
 def _initialize_all(controller_addr: str, system_app: SystemApp):
     from dbgpt.model.cluster.controller.controller import ModelRegistryClient
     from dbgpt.model.cluster.worker.manager import _DefaultWorkerManagerFactory
@@ -873,6 +1096,7 @@ def initialize_apiserver(
         tracer_parameters=trace_config,
     )
 
+    api_settings.api_params = apiserver_params
     if apiserver_params.api_keys:
         api_settings.api_keys = apiserver_params.api_keys.strip().split(",")
 
@@ -1,11 +1,24 @@
+import asyncio
+import base64
+import json
+import struct
+from unittest import mock
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
 from dbgpt.component import SystemApp
+from dbgpt.core import ModelOutput
+from dbgpt.core.schema.api import CompletionRequest, EmbeddingsRequest
 from dbgpt.model.cluster.apiserver.api import (
+    APIServer,
+    JSONResponse,
     ModelList,
+    _embeddings_response_stream,
+    _FairLimiter,
     api_settings,
+    create_embeddings,
     initialize_apiserver,
 )
 from dbgpt.model.cluster.tests.conftest import _new_cluster
@@ -96,3 +109,193 @@ async def test_chat_completions(client: AsyncClient, expected_messages):
         await chat_completion("/api/v1/chat/completions", chat_data, client)
         == expected_messages
     )
+
+
+def _new_stream_api_server(choice_texts, delays):
+    """Create an API server whose i-th generation streams the i-th choice text."""
+    calls = iter(range(len(choice_texts)))
+
+    async def _generate_stream(params):
+        i = next(calls)
+        text = ""
+        for word in choice_texts[i]:
+            await asyncio.sleep(delays[i])
+            text += word
+            yield ModelOutput(text=text, error_code=0)
+        yield ModelOutput(
+            text=text,
+            error_code=0,
+            finish_reason="stop",
+            usage={"prompt_tokens": 1, "completion_tokens": i + 1, "total_tokens": 1},
+        )
+
+    worker_manager = mock.Mock()
+    worker_manager.generate_stream = _generate_stream
+    api_server = APIServer()
+    api_server.get_worker_manager = lambda: worker_manager
+    return api_server
+
+
+def _parse_sse(events):
+    return [json.loads(e[len("data: ") :]) for e in events if "[DONE]" not in e]
+
+
+@pytest.mark.asyncio
+async def test_chat_completion_stream_choices_concurrently():
+    # The first choice is much slower than the second one
+    api_server = _new_stream_api_server(
+        [["Slow", " choice"], ["Fast", " choice"]], [0.05, 0]
+    )
+    events = [
+        e
+        async for e in api_server.chat_completion_stream_generator(
+            "test-model", {"messages": []}, 2
+        )
+    ]
+    assert events[-1] == "data: [DONE]\n\n"
+    chunks = _parse_sse(events)
+    content_chunks = [c for c in chunks if c["choices"][0]["delta"].get("content")]
+    # The fast choice is streamed before the slow one finishes
+    assert [c["choices"][0]["index"] for c in content_chunks] == [1, 1, 0, 0]
+    texts = {0: "", 1: ""}
+    for c in content_chunks:
+        texts[c["choices"][0]["index"]] += c["choices"][0]["delta"]["content"]
+    assert texts == {0: "Slow choice", 1: "Fast choice"}
+    # Every choice reports its own usage
+    finish_chunks = [c for c in chunks if c["choices"][0].get("finish_reason")]
+    usages = {
+        c["choices"][0]["index"]: c["usage"]["completion_tokens"] for c in finish_chunks
+    }
+    assert usages == {0: 1, 1: 2}
+
+
+@pytest.mark.asyncio
+async def test_completion_stream_choices_concurrently():
+    api_server = _new_stream_api_server(
+        [["a"], ["b"], ["c"], ["d"]], [0.04, 0.03, 0.02, 0.01]
+    )
+    request = CompletionRequest(
+        model="test-model", prompt=["p1", "p2"], n=2, stream=True
+    )
+    events = [e async for e in api_server.completion_stream_generator(request, {})]
+    chunks = [c for c in _parse_sse(events) if c["choices"][0]["text"]]
+    assert [(c["choices"][0]["index"], c["choices"][0]["text"]) for c in chunks] == [
+        (3, "d"),
+        (2, "c"),
+        (1, "b"),
+        (0, "a"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fair_limiter_serves_callers_in_turn():
+    limiter = _FairLimiter(1)
+    await limiter.acquire("big")
+    order = []
+
+    async def _acquire(caller, name):
+        await limiter.acquire(caller)
+        order.append(name)
+        limiter.release()
+
+    tasks = [asyncio.create_task(_acquire("big", f"big{i}")) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_acquire("small", "small0")))
+    await asyncio.sleep(0)
+    limiter.release()
+    await asyncio.gather(*tasks)
+    assert order == ["big0", "small0", "big1", "big2"]
+
+
+@pytest.mark.asyncio
+async def test_embeddings_stream_bounded_and_ordered():
+    running = 0
+    max_running = 0
+
+    async def _embeddings(params):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later batches finish first
+        await asyncio.sleep(0.01 / int(params["input"][0]))
+        running -= 1
+        return [[float(text)] for text in params["input"]]
+
+    worker_manager = mock.Mock()
+    worker_manager.embeddings = _embeddings
+    api_server = APIServer()
+    api_server.get_worker_manager = lambda: worker_manager
+
+    texts = [str(i) for i in range(1, 21)]
+    batches = api_server.embeddings_stream("test-model", texts, 2, caller="c")
+    body = "".join(
+        [chunk async for chunk in _embeddings_response_stream(batches, "m", "base64")]
+    )
+    response = json.loads(body)
+    assert [item["index"] for item in response["data"]] == list(range(20))
+    embeddings = [
+        struct.unpack("<1f", base64.b64decode(item["embedding"]))[0]
+        for item in response["data"]
+    ]
+    assert embeddings == [float(text) for text in texts]
+    assert response["model"] == "m"
+    assert 1 < max_running <= 8
+
+
+def _embedding_api_server(embeddings) -> APIServer:
+    worker_manager = mock.Mock()
+    worker_manager.embeddings = embeddings
+    api_server = APIServer()
+    api_server.get_worker_manager = lambda: worker_manager
+    api_server.get_model_instances_or_raise = mock.AsyncMock()
+    return api_server
+
+
+@pytest.mark.asyncio
+async def test_embeddings_error_before_response_started():
+    async def _embeddings(params):
+        raise ValueError("worker failed")
+
+    api_server = _embedding_api_server(_embeddings)
+    request = EmbeddingsRequest(model="m", input=[str(i) for i in range(10)])
+    response = await create_embeddings(request, api_server=api_server, api_key=None)
+    assert isinstance(response, JSONResponse)
+    assert response.status_code == 400
+    assert json.loads(response.body)["message"] == "worker failed"
+
+
+@pytest.mark.asyncio
+async def test_embeddings_stream_aborted_by_later_error():
+    async def _embeddings(params):
+        if params["input"][0] == "4":
+            raise ValueError("worker failed")
+        return [[float(text)] for text in params["input"]]
+
+    api_server = _embedding_api_server(_embeddings)
+    texts = [str(i) for i in range(10)]
+    batches = api_server.embeddings_stream("m", texts, 2, caller="c")
+    chunks = []
+    with pytest.raises(ValueError, match="worker failed"):
+        async for chunk in _embeddings_response_stream(batches, "m", None):
+            chunks.append(chunk)
+    # The response is not ended, so it is never a valid partial result
+    with pytest.raises(json.JSONDecodeError):
+        json.loads("".join(chunks))
+    # The cancelled batches released their slots
+    assert api_server._embedding_limiters["m"]._active == 0
+
+
+@pytest.mark.asyncio
+async def test_embeddings_caller_is_api_key():
+    async def _embeddings(params):
+        return [[0.0] for _ in params["input"]]
+
+    api_server = _embedding_api_server(_embeddings)
+    with mock.patch.object(
+        api_server, "embeddings_stream", wraps=api_server.embeddings_stream
+    ) as embeddings_stream:
+        request = EmbeddingsRequest(model="m", input="a", user="other")
+        await create_embeddings(request, api_server=api_server, api_key="key")
+        assert embeddings_stream.call_args.kwargs["caller"] == "key"
+        await create_embeddings(request, api_server=api_server, api_key=None)
+        assert embeddings_stream.call_args.kwargs["caller"] == "other"
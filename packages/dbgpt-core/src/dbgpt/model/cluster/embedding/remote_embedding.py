@@ -19,6 +19,10 @@ class RemoteEmbeddings(Embeddings):
         """Embed query text."""
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many query texts in one call."""
+        return self.embed_documents(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         params = {"model": self.model_name, "input": texts}
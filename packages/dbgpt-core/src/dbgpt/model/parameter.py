@@ -141,6 +141,16 @@ class ModelAPIServerParameters(BaseServerParameters):
     embedding_batch_size: Optional[int] = field(
         default=None, metadata={"help": _("Embedding batch size")}
     )
+    embedding_max_concurrency: Optional[int] = field(
+        default=8,
+        metadata={
+            "help": _(
+                "The max number of embedding batches of a model processed at the "
+                "same time, the waiting batches of different callers are served in "
+                "turn"
+            )
+        },
+    )
     ignore_stop_exceeds_error: Optional[bool] = field(
         default=False, metadata={"help": _("Ignore exceeds stop words error")}
     )
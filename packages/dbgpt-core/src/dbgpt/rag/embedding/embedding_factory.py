@@ -266,6 +266,10 @@ class DefaultEmbeddings(Embeddings):
             self._embedding_factory = EmbeddingFactory.get_instance(system_app)
         return self._embedding_factory.create()
 
+    def embedding_dimension(self) -> int:
+        """Get the dimension of the embedding vectors."""
+        return self.embeddings.embedding_dimension()
+
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         """Embed search docs."""
         return self.embeddings.embed_documents(texts)
@@ -274,6 +278,10 @@ class DefaultEmbeddings(Embeddings):
         """Embed query text."""
         return self.embeddings.embed_query(text)
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed many query texts."""
+        return self.embeddings.embed_queries(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs."""
         return await self.embeddings.aembed_documents(texts)
@@ -274,6 +274,10 @@ class HuggingFaceEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of many queries in one call."""
+        return self.embed_documents(texts)
+
 
 @register_resource(
     _("HuggingFace Instructor Embeddings"),
@@ -414,6 +418,12 @@ class HuggingFaceInstructEmbeddings(BaseModel, Embeddings):
         embedding = self.client.encode([instruction_pair], **self.encode_kwargs)[0]
         return embedding.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of many queries in one call."""
+        instruction_pairs = [[self.query_instruction, text] for text in texts]
+        embeddings = self.client.encode(instruction_pairs, **self.encode_kwargs)
+        return embeddings.tolist()
+
 
 # TODO: Support AWEL flow
 class HuggingFaceBgeEmbeddings(BaseModel, Embeddings):
@@ -531,6 +541,12 @@ class HuggingFaceBgeEmbeddings(BaseModel, Embeddings):
         )
         return embedding.tolist()
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of many queries in one call."""
+        texts = [self.query_instruction + t.replace("\n", " ") for t in texts]
+        embeddings = self.client.encode(texts, **self.encode_kwargs)
+        return embeddings.tolist()
+
 
 @register_resource(
     _("HuggingFace Inference API Embeddings"),
@@ -623,6 +639,10 @@ class HuggingFaceInferenceAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of many queries in one call."""
+        return self.embed_documents(texts)
+
 
 def _handle_request_result(res: requests.Response) -> List[List[float]]:
     """Parse the result from a request.
@@ -879,6 +899,10 @@ class OpenAPIEmbeddings(BaseModel, Embeddings):
         """
         return self.embed_documents([text])[0]
 
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Compute the embeddings of many queries in one call."""
+        return self.embed_documents(texts)
+
     async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
         """Asynchronous Embed search docs.
 
@@ -990,7 +1014,7 @@ register_embedding_adapter(
             languages=["en"],
         ),
         EmbeddingModelMetadata(
-            model=["text-embedding-3-small"],
+            model=["text-embedding-3-large"],
             dimension=3072,
             context_length=8191,
             description=_(
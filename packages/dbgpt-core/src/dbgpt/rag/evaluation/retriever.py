@@ -1,7 +1,8 @@
 """Evaluation for retriever."""
 
+import asyncio
 from abc import ABC
-from typing import Any, Dict, List, Optional, Sequence, Type
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
 
 from dbgpt.core import Embeddings, LLMClient
 from dbgpt.core.interface.evaluation import (
@@ -12,7 +13,7 @@ from dbgpt.core.interface.evaluation import (
     Evaluator,
 )
 from dbgpt.core.interface.operators.retriever import RetrieverOperator
-from dbgpt.util.similarity_util import calculate_cosine_similarity
+from dbgpt.util.similarity_util import calculate_cosine_similarities
 
 from ..operators.evaluation import RetrieverEvaluatorOperator
 
@@ -49,25 +50,40 @@ class RetrieverSimilarityMetric(RetrieverEvaluationMetric):
                 The score is the mean of the cosine similarity between the prediction
                 and the contexts.
         """
-        if not prediction or not contexts:
-            return BaseEvaluationResult(
-                prediction=prediction,
-                contexts=contexts,
-                score=0.0,
-            )
-        try:
-            import numpy as np
-        except ImportError:
-            raise ImportError("numpy is required for RelevancySimilarityMetric")
+        return self.sync_compute_batch([(prediction, contexts, query)])[0]
 
-        similarity: np.ndarray = calculate_cosine_similarity(
-            self._embeddings, contexts[0], prediction
+    async def compute_batch(
+        self,
+        samples: Sequence[Tuple[List[str], Optional[Sequence[str]], Optional[str]]],
+    ) -> List[BaseEvaluationResult]:
+        """Compute the evaluation metric of many samples."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.sync_compute_batch, samples
         )
-        return BaseEvaluationResult(
-            prediction=prediction,
-            contexts=contexts,
-            score=float(similarity.mean()),
+
+    def sync_compute_batch(
+        self,
+        samples: Sequence[Tuple[List[str], Optional[Sequence[str]], Optional[str]]],
+    ) -> List[BaseEvaluationResult]:
+        """Compute the evaluation metric of many samples.
+
+        The unique texts of all the samples are embedded together in batches.
+        """
+        similarities = calculate_cosine_similarities(
+            self._embeddings,
+            [
+                (contexts[0], prediction) if prediction and contexts else ("", [])
+                for prediction, contexts, _ in samples
+            ],
         )
+        return [
+            BaseEvaluationResult(
+                prediction=prediction,
+                contexts=contexts,
+                score=float(similarity.mean()) if prediction and contexts else 0.0,
+            )
+            for (prediction, contexts, _), similarity in zip(samples, similarities)
+        ]
 
 
 class RetrieverMRRMetric(RetrieverEvaluationMetric):
@@ -238,14 +254,17 @@ class RetrieverEvaluator(Evaluator):
             input_task = IteratorTrigger(dataset)
             query_task: MapOperator = MapOperator(lambda x: x[query_key])
             retriever_task = self._operator_cls(**self._operator_kwargs)
-            retriever_eva_task = RetrieverEvaluatorOperator(
-                evaluation_metrics=metrics, llm_client=self.llm_client
-            )
-            input_task >> query_task
-            query_task >> retriever_eva_task
-            query_task >> retriever_task >> retriever_eva_task
-            input_task >> MapOperator(lambda x: x[contexts_key]) >> retriever_eva_task
-            input_task >> retriever_eva_task
-
-        results = await input_task.trigger(parallel_num=parallel_num)
-        return [item for _, item in results]
+            input_task >> query_task >> retriever_task
+
+        # Retrieve every query, then compute each metric over the whole dataset so
+        # that the metrics can batch their work, e.g. the embedding calls
+        retrieved = await input_task.trigger(parallel_num=parallel_num)
+        evaluator_task = RetrieverEvaluatorOperator(
+            evaluation_metrics=metrics, llm_client=self.llm_client
+        )
+        return await evaluator_task.evaluate_batch(
+            [
+                (raw_dataset[query_key], chunks, raw_dataset[contexts_key], raw_dataset)
+                for raw_dataset, chunks in retrieved
+            ]
+        )
@@ -0,0 +1,46 @@
+from typing import List
+from unittest import mock
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.core.interface.operators.retriever import RetrieverOperator
+from dbgpt.rag.evaluation import RetrieverEvaluator, RetrieverSimilarityMetric
+from dbgpt.rag.operators import RetrieverEvaluatorOperator
+from dbgpt.util.tests.test_similarity_utils import _CountingEmbeddings
+
+
+class _EchoRetrieverOperator(RetrieverOperator[str, List[Chunk]]):
+    def retrieve(self, query: str) -> List[Chunk]:
+        return [Chunk(content=query), Chunk(content=query + "a")]
+
+
+@pytest.mark.asyncio
+async def test_evaluate_with_batched_metrics():
+    embeddings = _CountingEmbeddings()
+    evaluator = RetrieverEvaluator(
+        operator_cls=_EchoRetrieverOperator, embeddings=embeddings
+    )
+    dataset = [
+        {"query": "banana", "contexts": ["apple"]},
+        {"query": "cat", "contexts": "dog"},
+    ]
+    with mock.patch.object(
+        RetrieverEvaluatorOperator,
+        "evaluate_batch",
+        autospec=True,
+        side_effect=RetrieverEvaluatorOperator.evaluate_batch,
+    ) as evaluate_batch:
+        results = await evaluator.evaluate(dataset)
+    evaluate_batch.assert_called_once()
+
+    assert [[r.query for r in result] for result in results] == [["banana"], ["cat"]]
+    assert results[1][0].contexts == ["dog"]
+    # The contexts are embedded as queries, the retrieved chunks as documents
+    assert embeddings.query_calls == [["apple", "dog"]]
+    assert len(embeddings.calls) == 1
+
+    # The same scores as the single sample path
+    metric = RetrieverSimilarityMetric(embeddings)
+    single = await metric.compute(["banana", "bananaa"], ["apple"])
+    assert results[0][0].score == pytest.approx(single.score)
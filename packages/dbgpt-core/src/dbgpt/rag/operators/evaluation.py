@@ -1,7 +1,7 @@
 """Evaluation operators."""
 
 import asyncio
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Sequence, Tuple
 
 from dbgpt.core import Chunk
 from dbgpt.core.awel import JoinOperator
@@ -38,24 +38,53 @@ class RetrieverEvaluatorOperator(JoinOperator[List[EvaluationResult]]):
             contexts(List[str]): The contexts from dataset.
             raw_dataset(Any): The raw data(single row) from dataset.
         """
-        if isinstance(contexts, str):
-            contexts = [contexts]
-        prediction_strs = [chunk.content for chunk in prediction]
-        tasks = []
-        for metric in self.evaluation_metrics:
-            tasks.append(metric.compute(prediction_strs, contexts))
-        task_results = await asyncio.gather(*tasks)
+        results = await self.evaluate_batch(
+            [(query, prediction, contexts, raw_dataset)]
+        )
+        return results[0]
+
+    async def evaluate_batch(
+        self, samples: Sequence[Tuple[str, List[Chunk], Sequence[str], Any]]
+    ) -> List[List[EvaluationResult]]:
+        """Run evaluation of many samples.
+
+        Each metric computes all the samples at once, so it can batch its work,
+        e.g. the embedding calls.
+
+        Args:
+            samples(Sequence[Tuple[str, List[Chunk], Sequence[str], Any]]): The
+                query, the retrieved chunks, the contexts and the raw data of every
+                sample.
+        """
+        metric_samples = []
+        for query, prediction, contexts, _ in samples:
+            if isinstance(contexts, str):
+                contexts = [contexts]
+            prediction_strs = [chunk.content for chunk in prediction]
+            metric_samples.append((prediction_strs, contexts, query))
+        metric_results = await asyncio.gather(
+            *(
+                metric.compute_batch(metric_samples)
+                for metric in self.evaluation_metrics
+            )
+        )
         results = []
-        for result, metric in zip(task_results, self.evaluation_metrics):
+        for i, (query, prediction, _, raw_dataset) in enumerate(samples):
+            contexts = metric_samples[i][1]
             results.append(
-                EvaluationResult(
-                    query=query,
-                    prediction=prediction,
-                    score=result.score,
-                    contexts=contexts,
-                    passing=result.passing,
-                    raw_dataset=raw_dataset,
-                    metric_name=metric.name(),
-                )
+                [
+                    EvaluationResult(
+                        query=query,
+                        prediction=prediction,
+                        score=metric_result[i].score,
+                        contexts=contexts,
+                        passing=metric_result[i].passing,
+                        raw_dataset=raw_dataset,
+                        metric_name=metric.name(),
+                    )
+                    for metric, metric_result in zip(
+                        self.evaluation_metrics, metric_results
+                    )
+                ]
             )
         return results
@@ -155,8 +155,7 @@ class EmbeddingRetriever(BaseRetriever):
             self._similarity_search(query, filters, root_tracer.get_current_span_id())
             for query in queries
         ]
-        new_candidates = await run_async_tasks(tasks=candidates, concurrency_limit=1)
-        return new_candidates
+        return await self._run_async_tasks(candidates)
 
     async def _aretrieve_with_score(
         self,
@@ -1,7 +1,8 @@
-from dbgpt.core import Chunk
+from dbgpt.core import Chunk, Document
 from dbgpt.rag.text_splitter.text_splitter import (
     CharacterTextSplitter,
     MarkdownHeaderTextSplitter,
+    RecursiveCharacterTextSplitter,
 )
 
 
@@ -63,3 +64,39 @@ def test_character_text_splitter_empty_doc() -> None:
     output = splitter.split_text(text)
     expected_output = ["db", "gpt"]
     assert output == expected_output
+
+
+def test_merge_splits_with_large_overlap() -> None:
+    """Test the overlap keeps as many previous splits as fit."""
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=7, chunk_overlap=5)
+    output = splitter.split_text("a b c d e f")
+    assert output == ["a b c d", "b c d e", "c d e f"]
+
+
+def test_recursive_text_splitter() -> None:
+    """Test longer pieces are split again with the next separators."""
+    text = "short line\nthis line is much longer than the chunk\nend"
+    splitter = RecursiveCharacterTextSplitter(chunk_size=12, chunk_overlap=0)
+    output = splitter.split_text(text)
+    assert output == [
+        "short line",
+        "this line is",
+        "much longer",
+        "than the",
+        "chunk",
+        "end",
+    ]
+
+
+def test_split_documents_in_parallel() -> None:
+    """Test splitting documents in threads keeps the order of the documents."""
+    documents = [
+        Document(content=f"doc{i} foo bar baz", metadata={"i": i}) for i in range(20)
+    ]
+    splitter = CharacterTextSplitter(separator=" ", chunk_size=9, chunk_overlap=0)
+    expected = splitter.split_documents(documents)
+    output = splitter.split_documents(documents, num_workers=4)
+    assert [(c.content, c.metadata) for c in output] == [
+        (c.content, c.metadata) for c in expected
+    ]
+    assert len(output) == 40
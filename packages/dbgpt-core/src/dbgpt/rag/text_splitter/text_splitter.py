@@ -3,7 +3,21 @@
 import copy
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Iterable, List, Optional, TypedDict, Union, cast
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 
 from dbgpt.core import Chunk, Document
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
@@ -69,15 +83,31 @@ class TextSplitter(ABC):
                     chunks.append(new_doc)
         return chunks
 
-    def split_documents(self, documents: Iterable[Document], **kwargs) -> List[Chunk]:
-        """Split documents."""
+    def split_documents(
+        self, documents: Iterable[Document], num_workers: int = 1, **kwargs
+    ) -> List[Chunk]:
+        """Split documents.
+
+        Args:
+            documents (Iterable[Document]): The documents to split.
+            num_workers (int): The number of threads to split the documents in
+                parallel, the chunks keep the order of the documents. It pays off
+                when the length function releases the GIL, e.g. a fast tokenizer.
+        """
         texts = []
         metadatas = []
         for doc in documents:
             # Iterable just supports one iteration
             texts.append(doc.content)
             metadatas.append(doc.metadata)
-        return self.create_documents(texts, metadatas, **kwargs)
+        if num_workers <= 1 or len(texts) <= 1:
+            return self.create_documents(texts, metadatas, **kwargs)
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = executor.map(
+                lambda i: self.create_documents([texts[i]], [metadatas[i]], **kwargs),
+                range(len(texts)),
+            )
+            return [chunk for chunks in results for chunk in chunks]
 
     def _join_docs(self, docs: List[str], separator: str, **kwargs) -> Optional[str]:
         text = separator.join(docs)
@@ -94,6 +124,25 @@ class TextSplitter(ABC):
         chunk_size: Optional[int] = None,
         chunk_overlap: Optional[int] = None,
     ) -> List[str]:
+        return self._merge_sized_splits(
+            ((d, self._length_function(d)) for d in cast(Iterable[str], splits)),
+            separator,
+            chunk_size,
+            chunk_overlap,
+        )
+
+    def _merge_sized_splits(
+        self,
+        splits: Iterable[Tuple[str, int]],
+        separator: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+    ) -> List[str]:
+        """Merge the splits with their lengths into chunks.
+
+        The length of every split is computed once, the splits of the current
+        chunk are kept in a deque so the overlap is dropped in linear time.
+        """
         # We now want to combine these smaller pieces into medium size
         # chunks to send to the LLM.
         if chunk_size is None:
@@ -105,11 +154,9 @@ class TextSplitter(ABC):
         separator_len = self._length_function(separator)
 
         docs = []
-        current_doc: List[str] = []
+        current_doc: Deque[Tuple[str, int]] = deque()
         total = 0
-        for s in splits:
-            d = cast(str, s)
-            _len = self._length_function(d)
+        for d, _len in splits:
             if (
                 total + _len + (separator_len if len(current_doc) > 0 else 0)
                 > chunk_size
@@ -120,7 +167,7 @@ class TextSplitter(ABC):
                         f"which is longer than the specified {chunk_size}"
                     )
                 if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
+                    doc = self._join_docs([text for text, _ in current_doc], separator)
                     if doc is not None:
                         docs.append(doc)
                     # Keep on popping if:
@@ -131,13 +178,12 @@ class TextSplitter(ABC):
                         > chunk_size
                         and total > 0
                     ):
-                        total -= self._length_function(current_doc[0]) + (
-                            separator_len if len(current_doc) > 1 else 0
+                        total -= current_doc.popleft()[1] + (
+                            separator_len if len(current_doc) > 0 else 0
                         )
-                        current_doc = current_doc[1:]
-            current_doc.append(d)
+            current_doc.append((d, _len))
             total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
+        doc = self._join_docs([text for text, _ in current_doc], separator)
         if doc is not None:
             docs.append(doc)
         return docs
@@ -289,15 +335,23 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         self, text: str, separator: Optional[str] = None, **kwargs
     ) -> List[str]:
         """Split incoming text and return chunks."""
+        return self._split_text(text, 0, **kwargs)
+
+    def _split_text(self, text: str, start: int, **kwargs) -> List[str]:
+        """Split the text with the separators from the start index.
+
+        The separators before the one used to split a text don't occur in it, so
+        the longer pieces are split again without searching for them.
+        """
         final_chunks = []
         # Get appropriate separator to use
         separator = self._separators[-1]
-        for _s in self._separators:
-            if _s == "":
-                separator = _s
-                break
-            if _s in text:
+        next_start = len(self._separators) - 1
+        for i in range(start, len(self._separators)):
+            _s = self._separators[i]
+            if _s == "" or _s in text:
                 separator = _s
+                next_start = i
                 break
         # Now that we have the separator, split the text
         if separator:
@@ -305,13 +359,14 @@ class RecursiveCharacterTextSplitter(TextSplitter):
         else:
             splits = list(text)
         # Now go merging things, recursively splitting longer texts.
-        _good_splits = []
+        _good_splits: List[Tuple[str, int]] = []
         for s in splits:
-            if self._length_function(s) < self._chunk_size:
-                _good_splits.append(s)
+            _len = self._length_function(s)
+            if _len < self._chunk_size:
+                _good_splits.append((s, _len))
             else:
                 if _good_splits:
-                    merged_text = self._merge_splits(
+                    merged_text = self._merge_sized_splits(
                         _good_splits,
                         separator,
                         chunk_size=kwargs.get("chunk_size", None),
@@ -319,10 +374,10 @@ class RecursiveCharacterTextSplitter(TextSplitter):
                     )
                     final_chunks.extend(merged_text)
                     _good_splits = []
-                other_info = self.split_text(s)
+                other_info = self._split_text(s, next_start)
                 final_chunks.extend(other_info)
         if _good_splits:
-            merged_text = self._merge_splits(
+            merged_text = self._merge_sized_splits(
                 _good_splits,
                 separator,
                 chunk_size=kwargs.get("chunk_size", None),
@@ -688,60 +743,25 @@ class MarkdownHeaderTextSplitter(TextSplitter):
         chunk_size: Optional[int] = None,
         chunk_overlap: Optional[int] = None,
     ) -> List[str]:
-        # We now want to combine these smaller pieces into medium size
-        # chunks to send to the LLM.
-        if chunk_size is None:
-            chunk_size = self._chunk_size
-        if chunk_overlap is None:
-            chunk_overlap = self._chunk_overlap
         if separator is None:
             separator = self._separator
-        separator_len = self._length_function(separator)
 
-        docs = []
-        current_doc: List[str] = []
-        total = 0
-        for _doc in documents:
+        def _to_text(_doc: str | dict) -> str:
             dict_doc = cast(dict, _doc)
             if dict_doc["metadata"] != {}:
                 head = sorted(
                     dict_doc["metadata"].items(), key=lambda x: x[0], reverse=True
                 )[0][1]
-                d = head + separator + dict_doc["page_content"]
-            else:
-                d = dict_doc["page_content"]
-            _len = self._length_function(d)
-            if (
-                total + _len + (separator_len if len(current_doc) > 0 else 0)
-                > chunk_size
-            ):
-                if total > chunk_size:
-                    logger.warning(
-                        f"Created a chunk of size {total}, "
-                        f"which is longer than the specified {chunk_size}"
-                    )
-                if len(current_doc) > 0:
-                    doc = self._join_docs(current_doc, separator)
-                    if doc is not None:
-                        docs.append(doc)
-                    # Keep on popping if:
-                    # - we have a larger chunk than in the chunk overlap
-                    # - or if we still have any chunks and the length is long
-                    while total > chunk_overlap or (
-                        total + _len + (separator_len if len(current_doc) > 0 else 0)
-                        > chunk_size
-                        and total > 0
-                    ):
-                        total -= self._length_function(current_doc[0]) + (
-                            separator_len if len(current_doc) > 1 else 0
-                        )
-                        current_doc = current_doc[1:]
-            current_doc.append(d)
-            total += _len + (separator_len if len(current_doc) > 1 else 0)
-        doc = self._join_docs(current_doc, separator)
-        if doc is not None:
-            docs.append(doc)
-        return docs
+                return head + separator + dict_doc["page_content"]
+            return dict_doc["page_content"]
+
+        texts = (_to_text(_doc) for _doc in documents)
+        return self._merge_sized_splits(
+            ((d, self._length_function(d)) for d in texts),
+            separator,
+            chunk_size,
+            chunk_overlap,
+        )
 
     def run(
         self,
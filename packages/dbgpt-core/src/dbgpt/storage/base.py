@@ -1,12 +1,14 @@
 """Index store base class."""
 
 import asyncio
+import itertools
 import logging
 import time
 from abc import ABC, abstractmethod
-from concurrent.futures import Executor, ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Deque, Iterable, Iterator, List, Optional, Set, Sized
 
 from dbgpt.core import Chunk
 from dbgpt.storage.vector_store.filters import MetadataFilters
@@ -16,6 +18,18 @@ from dbgpt.util.executor_utils import blocking_func_to_async_no_executor
 logger = logging.getLogger(__name__)
 
 
+def _iter_chunk_groups(
+    chunks: Iterable[Chunk], group_size: int
+) -> Iterator[List[Chunk]]:
+    """Split the chunks into groups of group_size lazily."""
+    iterator = iter(chunks)
+    while True:
+        group = list(itertools.islice(iterator, group_size))
+        if not group:
+            return
+        yield group
+
+
 @dataclass
 class IndexStoreConfig(BaseParameters):
     """Index store config."""
@@ -111,14 +125,17 @@ class IndexStoreBase(ABC):
 
     def load_document_with_limit(
         self,
-        chunks: List[Chunk],
+        chunks: Iterable[Chunk],
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
     ) -> List[str]:
         """Load document in index database with specified limit.
 
+        The chunks are grouped lazily, so an iterator of chunks is loaded with at most
+        2 * max_threads groups held in memory.
+
         Args:
-            chunks(List[Chunk]): Document chunks.
+            chunks(Iterable[Chunk]): Document chunks.
             max_chunks_once_load(int): Max number of chunks to load at once.
             max_threads(int): Max number of threads to use.
 
@@ -127,42 +144,40 @@ class IndexStoreBase(ABC):
         """
         max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
         max_threads = max_threads or self._max_threads
-        # Group the chunks into chunks of size max_chunks
-        chunk_groups = [
-            chunks[i : i + max_chunks_once_load]
-            for i in range(0, len(chunks), max_chunks_once_load)
-        ]
+        total = f", total {len(chunks)} chunks" if isinstance(chunks, Sized) else ""
         logger.info(
-            f"Loading {len(chunks)} chunks in {len(chunk_groups)} groups with "
-            f"{max_threads} threads."
+            f"Loading chunks in groups of {max_chunks_once_load} with "
+            f"{max_threads} threads{total}."
         )
         ids = []
-        loaded_cnt = 0
         start_time = time.time()
+        pending: Deque[Future] = deque()
         with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            tasks = []
-            for chunk_group in chunk_groups:
-                tasks.append(executor.submit(self.load_document, chunk_group))
-            for future in tasks:
-                success_ids = future.result()
-                ids.extend(success_ids)
-                loaded_cnt += len(success_ids)
-                logger.info(f"Loaded {loaded_cnt} chunks, total {len(chunks)} chunks.")
-        logger.info(
-            f"Loaded {len(chunks)} chunks in {time.time() - start_time} seconds"
-        )
+            for chunk_group in _iter_chunk_groups(chunks, max_chunks_once_load):
+                # Keep the threads busy without reading the whole input
+                if len(pending) >= 2 * max_threads:
+                    ids.extend(pending.popleft().result())
+                    logger.info(f"Loaded {len(ids)} chunks{total}.")
+                pending.append(executor.submit(self.load_document, chunk_group))
+            while pending:
+                ids.extend(pending.popleft().result())
+                logger.info(f"Loaded {len(ids)} chunks{total}.")
+        logger.info(f"Loaded {len(ids)} chunks in {time.time() - start_time} seconds")
         return ids
 
     async def aload_document_with_limit(
         self,
-        chunks: List[Chunk],
+        chunks: Iterable[Chunk],
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
     ) -> List[str]:
         """Load document in index database with specified limit.
 
+        The chunks are grouped lazily and loaded through a sliding window, a new group
+        is started as soon as any of the max_threads running groups is loaded.
+
         Args:
-            chunks(List[Chunk]): Document chunks.
+            chunks(Iterable[Chunk]): Document chunks.
             max_chunks_once_load(int): Max number of chunks to load at once.
             max_threads(int): Max number of threads to use.
 
@@ -171,27 +186,38 @@ class IndexStoreBase(ABC):
         """
         max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
         max_threads = max_threads or self._max_threads
-        chunk_groups = [
-            chunks[i : i + max_chunks_once_load]
-            for i in range(0, len(chunks), max_chunks_once_load)
-        ]
+        total = f", total {len(chunks)} chunks" if isinstance(chunks, Sized) else ""
         logger.info(
-            f"Loading {len(chunks)} chunks in {len(chunk_groups)} groups with "
-            f"{max_threads} threads."
+            f"Loading chunks in groups of {max_chunks_once_load} with "
+            f"{max_threads} threads{total}."
         )
-        tasks = []
-        for chunk_group in chunk_groups:
-            tasks.append(self.aload_document(chunk_group))
-
-        results = await self._run_tasks_with_concurrency(tasks, max_threads)
-
-        ids = []
-        loaded_cnt = 0
-        for success_ids in results:
-            ids.extend(success_ids)
-            loaded_cnt += len(success_ids)
-            logger.info(f"Loaded {loaded_cnt} chunks, total {len(chunks)} chunks.")
-
+        ids: List[str] = []
+        # The tasks in input order, at most max_threads of them are running
+        tasks: Deque[asyncio.Task] = deque()
+        running: Set[asyncio.Task] = set()
+
+        def _collect_done():
+            while tasks and tasks[0].done():
+                ids.extend(tasks.popleft().result())
+                logger.info(f"Loaded {len(ids)} chunks{total}.")
+
+        try:
+            for chunk_group in _iter_chunk_groups(chunks, max_chunks_once_load):
+                # Start the next group as soon as any running group is loaded
+                while len(running) >= max_threads:
+                    _, running = await asyncio.wait(
+                        running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    _collect_done()
+                task = asyncio.create_task(self.aload_document(chunk_group))
+                tasks.append(task)
+                running.add(task)
+            while tasks:
+                await asyncio.wait([tasks[0]])
+                _collect_done()
+        finally:
+            for task in tasks:
+                task.cancel()
         return ids
 
     async def _run_tasks_with_concurrency(self, tasks, max_concurrent):
@@ -239,6 +265,73 @@ class IndexStoreBase(ABC):
             self.similar_search_with_scores, query, topk, score_threshold, filters
         )
 
+    def similar_search_batch(
+        self, texts: List[str], topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[List[Chunk]]:
+        """Similar search of many queries in index database.
+
+        The stores which can search many query vectors in one request override it,
+        by default the queries are searched one by one.
+
+        Args:
+            texts(List[str]): The query texts.
+            topk(int): The number of similar documents to return for each query.
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[List[Chunk]]: The similar documents of each query.
+        """
+        return [self.similar_search(text, topk, filters) for text in texts]
+
+    def similar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Similar search with scores of many queries in index database.
+
+        Args:
+            texts(List[str]): The query texts.
+            topk(int): The number of similar documents to return for each query.
+            score_threshold(float): score_threshold: Optional, a floating point value
+                between 0 to 1
+            filters(Optional[MetadataFilters]): metadata filters.
+        Return:
+            List[List[Chunk]]: The similar documents of each query.
+        """
+        return [
+            self.similar_search_with_scores(text, topk, score_threshold, filters)
+            for text in texts
+        ]
+
+    async def asimilar_search_batch(
+        self,
+        queries: List[str],
+        topk: int,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Async similar_search_batch in index database."""
+        return await blocking_func_to_async_no_executor(
+            self.similar_search_batch, queries, topk, filters
+        )
+
+    async def asimilar_search_with_scores_batch(
+        self,
+        queries: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Async similar_search_with_scores_batch in index database."""
+        return await blocking_func_to_async_no_executor(
+            self.similar_search_with_scores_batch,
+            queries,
+            topk,
+            score_threshold,
+            filters,
+        )
+
     def full_text_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
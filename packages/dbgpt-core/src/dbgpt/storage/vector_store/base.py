@@ -2,14 +2,16 @@
 
 import logging
 import math
+import time
 from abc import ABC, abstractmethod
-from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, List, Optional
+from typing import Any, Callable, Deque, Iterable, List, Optional, Tuple
 
 from dbgpt.core import Chunk, Embeddings
 from dbgpt.core.awel.flow import Parameter
-from dbgpt.storage.base import IndexStoreBase, IndexStoreConfig
+from dbgpt.storage.base import IndexStoreBase, IndexStoreConfig, _iter_chunk_groups
 from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util import RegisterParameters
 from dbgpt.util.executor_utils import blocking_func_to_async
@@ -115,16 +117,29 @@ class VectorStoreConfig(IndexStoreConfig, RegisterParameters):
 class VectorStoreBase(IndexStoreBase, ABC):
     """Vector store base class."""
 
+    # Whether the store implements _load_document_in_batches, its loads with limit
+    # are pipelined across the groups of chunks
+    _supports_pipeline_load: bool = False
+
     def __init__(
         self,
         executor: Optional[ThreadPoolExecutor] = None,
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
+        max_inflight_batches: Optional[int] = None,
     ):
-        """Initialize vector store."""
+        """Initialize vector store.
+
+        Args:
+            max_inflight_batches(int): Max number of embedded batches waiting to be
+                inserted when loading documents, defaults to 2.
+        """
         super().__init__(
             executor, max_chunks_once_load=max_chunks_once_load, max_threads=max_threads
         )
+        self._max_inflight_batches = max_inflight_batches or 2
+        # The batches of all the loads of the store are embedded by it
+        self._embed_executor = ThreadPoolExecutor(max_workers=self._max_threads)
 
     @abstractmethod
     def get_config(self) -> VectorStoreConfig:
@@ -183,6 +198,137 @@ class VectorStoreBase(IndexStoreBase, ABC):
         norm = np.linalg.norm(vectors)
         return vectors / norm
 
+    @staticmethod
+    def _to_vector_array(vectors: Any, normalize: bool = False) -> Any:
+        """Convert the vectors to a compact float32 numpy array.
+
+        A float32 array takes 4 bytes per dimension, a list of python floats takes
+        about 32 bytes per dimension.
+        """
+        import numpy as np
+
+        arr = np.asarray(vectors, dtype=np.float32)
+        if normalize and arr.size:
+            norms = np.linalg.norm(arr, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            arr /= norms
+        return arr
+
+    def _pipeline_load(
+        self,
+        chunks: Iterable[Chunk],
+        batch_size: int,
+        embed_func: Callable[[List[Chunk]], Any],
+        insert_func: Callable[[List[Chunk], Any], List[str]],
+    ) -> List[str]:
+        """Load the chunks in batches, overlap embedding with inserting.
+
+        The batches are embedded by the embed executor of the store while the embedded
+        batches are inserted in the current thread, so batch N+1 is being embedded
+        while batch N is being inserted. The batches are read lazily from the chunks
+        and at most max_inflight_batches embedded batches wait to be inserted, so the
+        memory is bounded by the batch size instead of the number of chunks.
+
+        Args:
+            chunks(Iterable[Chunk]): The chunks to load, can be an iterator.
+            batch_size(int): The number of chunks in a batch.
+            embed_func(Callable): Embed the chunks of a batch.
+            insert_func(Callable): Insert a batch with its vectors, return the ids.
+
+        Return:
+            List[str]: The ids of the inserted chunks.
+        """
+        batches = _iter_chunk_groups(chunks, batch_size)
+        next_batch = next(batches, None)
+        ids: List[str] = []
+        pending: Deque[Tuple[List[Chunk], Future]] = deque()
+        try:
+            while pending or next_batch is not None:
+                # The batch being inserted is not counted as in-flight
+                while (
+                    next_batch is not None
+                    and len(pending) <= self._max_inflight_batches
+                ):
+                    pending.append(
+                        (
+                            next_batch,
+                            self._embed_executor.submit(embed_func, next_batch),
+                        )
+                    )
+                    next_batch = next(batches, None)
+                batch, future = pending.popleft()
+                ids.extend(insert_func(batch, future.result()))
+        finally:
+            for _, future in pending:
+                future.cancel()
+        return ids
+
+    def _load_document_in_batches(
+        self, chunks: Iterable[Chunk], batch_size: int
+    ) -> List[str]:
+        """Load the chunks in pipelined batches of batch_size.
+
+        Stores which set _supports_pipeline_load implement it, usually with
+        :meth:`_pipeline_load`.
+        """
+        raise NotImplementedError
+
+    def load_document_with_limit(
+        self,
+        chunks: Iterable[Chunk],
+        max_chunks_once_load: Optional[int] = None,
+        max_threads: Optional[int] = None,
+    ) -> List[str]:
+        """Load document in vector database with specified limit.
+
+        With a single thread the groups of chunks are pipelined if the store
+        supports it, the next group is embedded while the current group is being
+        inserted.
+
+        Args:
+            chunks(Iterable[Chunk]): Document chunks.
+            max_chunks_once_load(int): Max number of chunks to load at once.
+            max_threads(int): Max number of threads to use.
+
+        Return:
+            List[str]: Chunk ids.
+        """
+        max_chunks_once_load = max_chunks_once_load or self._max_chunks_once_load
+        max_threads = max_threads or self._max_threads
+        if not self._supports_pipeline_load or max_threads > 1:
+            return super().load_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+        logger.info(f"Loading chunks in pipelined groups of {max_chunks_once_load}.")
+        start_time = time.time()
+        ids = self._load_document_in_batches(chunks, max_chunks_once_load)
+        logger.info(f"Loaded {len(ids)} chunks in {time.time() - start_time} seconds")
+        return ids
+
+    async def aload_document_with_limit(
+        self,
+        chunks: Iterable[Chunk],
+        max_chunks_once_load: Optional[int] = None,
+        max_threads: Optional[int] = None,
+    ) -> List[str]:
+        """Load document in vector database with specified limit.
+
+        With a single thread the groups of chunks are pipelined if the store
+        supports it, see :meth:`load_document_with_limit`.
+        """
+        max_threads = max_threads or self._max_threads
+        if not self._supports_pipeline_load or max_threads > 1:
+            return await super().aload_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+        return await blocking_func_to_async(
+            self._executor,
+            self.load_document_with_limit,
+            chunks,
+            max_chunks_once_load,
+            max_threads,
+        )
+
     def _default_relevance_score_fn(self, distance: float) -> float:
         """Return a similarity score on a scale [0, 1]."""
         return 1.0 - distance / math.sqrt(2)
@@ -0,0 +1,252 @@
+import asyncio
+import threading
+import time
+import tracemalloc
+from typing import Iterator, List
+
+import numpy as np
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.storage.vector_store.base import VectorStoreBase
+
+
+class _PipelineStore(VectorStoreBase):
+    _supports_pipeline_load = True
+
+    def __init__(self, max_inflight_batches: int = 2, delay: float = 0.0):
+        super().__init__(max_inflight_batches=max_inflight_batches)
+        self.delay = delay
+        self.events: List[str] = []
+        self.embedded: List[int] = []
+        self.inserted: List[int] = []
+        self.max_waiting = 0
+        self.embed_threads = set()
+        self._lock = threading.Lock()
+
+    def get_config(self):
+        raise NotImplementedError
+
+    def vector_name_exists(self) -> bool:
+        return True
+
+    def load_document(self, chunks: List[Chunk]) -> List[str]:
+        return self._load_document_in_batches(chunks, 2)
+
+    def _load_document_in_batches(self, chunks, batch_size: int) -> List[str]:
+        return self._pipeline_load(chunks, batch_size, self._embed, self._insert)
+
+    def similar_search_with_scores(self, text, topk, score_threshold, filters=None):
+        return []
+
+    def delete_by_ids(self, ids):
+        return []
+
+    def delete_vector_name(self, index_name: str):
+        pass
+
+    def _embed(self, chunks: List[Chunk]) -> List[List[float]]:
+        time.sleep(self.delay)
+        with self._lock:
+            self.embed_threads.add(threading.get_ident())
+            self.embedded.append(len(chunks))
+            self.max_waiting = max(
+                self.max_waiting, len(self.embedded) - len(self.inserted)
+            )
+        if any(c.content == "bad" for c in chunks):
+            raise ValueError("embed failed")
+        return [[1.0, 0.0] for _ in chunks]
+
+    def _insert(self, chunks: List[Chunk], vectors: List[List[float]]) -> List[str]:
+        assert len(chunks) == len(vectors)
+        time.sleep(self.delay)
+        with self._lock:
+            self.inserted.append(len(chunks))
+        return [c.chunk_id for c in chunks]
+
+
+def _chunks(num: int) -> List[Chunk]:
+    return [Chunk(chunk_id=str(i), content=f"text {i}") for i in range(num)]
+
+
+def _iter_chunks(num: int) -> Iterator[Chunk]:
+    for i in range(num):
+        yield Chunk(chunk_id=str(i), content=f"text {i}")
+
+
+class _LargeVectorStore(_PipelineStore):
+    def load_document(self, chunks) -> List[str]:
+        return self._pipeline_load(chunks, 100, self._embed, self._insert)
+
+    def _embed(self, chunks: List[Chunk]) -> np.ndarray:
+        return self._to_vector_array(np.ones((len(chunks), 1024)))
+
+
+def test_pipeline_load_keeps_order():
+    store = _PipelineStore()
+    ids = store.load_document(_chunks(7))
+    assert ids == [str(i) for i in range(7)]
+    assert store.inserted == [2, 2, 2, 1]
+
+
+def test_pipeline_load_overlaps_embed_and_insert():
+    store = _PipelineStore(delay=0.05)
+    start = time.perf_counter()
+    store.load_document(_chunks(16))
+    cost = time.perf_counter() - start
+    # Sequential loading takes 8 * (0.05 + 0.05) seconds
+    assert cost < 0.7
+
+
+def test_pipeline_load_bounded_inflight():
+    store = _PipelineStore(max_inflight_batches=1)
+    store.delay = 0.01
+    store.load_document(_chunks(20))
+    # The batch being inserted and one embedded batch waiting
+    assert store.max_waiting <= 2
+
+
+def test_pipeline_load_embed_error():
+    store = _PipelineStore()
+    chunks = _chunks(10)
+    chunks[5].content = "bad"
+    with pytest.raises(ValueError, match="embed failed"):
+        store.load_document(chunks)
+    assert sum(store.inserted) <= 4
+
+
+def test_to_vector_array():
+    vectors = VectorStoreBase._to_vector_array(
+        [[3.0, 4.0], [0.0, 0.0], [2.0, 0.0]], normalize=True
+    )
+    assert vectors.dtype == np.float32
+    np.testing.assert_allclose(vectors, [[0.6, 0.8], [0.0, 0.0], [1.0, 0.0]])
+    assert VectorStoreBase._to_vector_array([], normalize=True).size == 0
+
+
+def test_pipeline_load_iterator():
+    store = _PipelineStore()
+    ids = store.load_document(_iter_chunks(7))
+    assert ids == [str(i) for i in range(7)]
+    assert store.inserted == [2, 2, 2, 1]
+    assert store.load_document(iter([])) == []
+
+
+def test_pipeline_load_bounded_memory():
+    def _peak_memory(num: int) -> int:
+        store = _LargeVectorStore()
+        tracemalloc.start()
+        try:
+            ids = store.load_document(_iter_chunks(num))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(ids) == num
+        return peak
+
+    small = _peak_memory(500)
+    large = _peak_memory(5000)
+    # Holding the float32 vectors of all the chunks takes 20MB
+    assert large < 5000 * 1024 * 4 / 4
+    assert large < small * 2
+
+
+def test_load_document_with_limit_iterator():
+    store = _PipelineStore()
+    ids = store.load_document_with_limit(
+        _iter_chunks(23), max_chunks_once_load=5, max_threads=2
+    )
+    assert ids == [str(i) for i in range(23)]
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit_iterator():
+    store = _PipelineStore()
+    ids = await store.aload_document_with_limit(
+        _iter_chunks(23), max_chunks_once_load=5, max_threads=2
+    )
+    assert ids == [str(i) for i in range(23)]
+
+
+def test_load_document_with_limit_pipelines_groups():
+    store = _PipelineStore(delay=0.05)
+    start = time.perf_counter()
+    ids = store.load_document_with_limit(_chunks(16), max_chunks_once_load=2)
+    cost = time.perf_counter() - start
+    assert ids == [str(i) for i in range(16)]
+    assert store.inserted == [2] * 8
+    # One thread loading the groups one by one takes 8 * (0.05 + 0.05) seconds
+    assert cost < 0.7
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit_pipelines_groups():
+    store = _PipelineStore(delay=0.05)
+    start = time.perf_counter()
+    ids = await store.aload_document_with_limit(_chunks(16), max_chunks_once_load=2)
+    cost = time.perf_counter() - start
+    assert ids == [str(i) for i in range(16)]
+    assert cost < 0.7
+
+
+def test_pipeline_load_reuses_embed_executor():
+    store = _PipelineStore()
+    for _ in range(3):
+        store.load_document(_chunks(6))
+    assert len(store.embed_threads) == 1
+
+
+class _SlowGroupStore(_PipelineStore):
+    _supports_pipeline_load = False
+
+    def __init__(self):
+        super().__init__()
+        self.started: List[str] = []
+        self.slow_done = False
+
+    async def aload_document(self, chunks: List[Chunk]) -> List[str]:
+        self.started.append(chunks[0].chunk_id)
+        if chunks[0].chunk_id == "0":
+            await asyncio.sleep(0.2)
+            self.slow_done = True
+        else:
+            await asyncio.sleep(0.01)
+        return [c.chunk_id for c in chunks]
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit_sliding_window():
+    store = _SlowGroupStore()
+    started_before_slow_done = []
+
+    async def _watch():
+        while not store.slow_done:
+            started_before_slow_done[:] = store.started
+            await asyncio.sleep(0.005)
+
+    watcher = asyncio.create_task(_watch())
+    ids = await store.aload_document_with_limit(
+        _chunks(20), max_chunks_once_load=2, max_threads=2
+    )
+    await watcher
+    assert ids == [str(i) for i in range(20)]
+    # The slow group doesn't hold back the other groups
+    assert len(started_before_slow_done) == 10
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit_error():
+    store = _SlowGroupStore()
+    chunks = _chunks(6)
+
+    async def _aload_document(chunks: List[Chunk]) -> List[str]:
+        if chunks[0].chunk_id == "2":
+            raise ValueError("load failed")
+        await asyncio.sleep(0.01)
+        return [c.chunk_id for c in chunks]
+
+    store.aload_document = _aload_document
+    with pytest.raises(ValueError, match="load failed"):
+        await store.aload_document_with_limit(
+            chunks, max_chunks_once_load=2, max_threads=2
+        )
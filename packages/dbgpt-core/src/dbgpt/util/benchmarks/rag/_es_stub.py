@@ -0,0 +1,135 @@
+"""An in-memory Elasticsearch stub for the benchmarks and tests of the full text
+store, which simulates the latency of the bulk and refresh requests.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StubIndicesClient:
+    """The indices API of :class:`StubElasticsearch`."""
+
+    def __init__(self, client: "StubElasticsearch"):
+        self._client = client
+
+    def exists(self, index: str) -> bool:
+        return index in self._client.indices_settings
+
+    def create(self, index: str, **kwargs) -> Dict[str, Any]:
+        self._client.indices_settings[index] = {}
+        self._client.documents[index] = {}
+        return {"acknowledged": True}
+
+    def get_settings(self, index: str, name: Optional[str] = None) -> Dict[str, Any]:
+        settings = self._client.indices_settings.get(index, {})
+        return {index: {"settings": {"index": dict(settings)} if settings else {}}}
+
+    def put_settings(self, index: str, settings: Dict[str, Any]) -> Dict[str, Any]:
+        self._client.settings_history.append(settings)
+        for key, value in settings.get("index", {}).items():
+            if value is None:
+                self._client.indices_settings[index].pop(key, None)
+            else:
+                self._client.indices_settings[index][key] = value
+        return {"acknowledged": True}
+
+    def refresh(self, index: str) -> Dict[str, Any]:
+        self._client.refresh_count += 1
+        time.sleep(self._client.refresh_latency)
+        return {"_shards": {"failed": 0}}
+
+
+class StubElasticsearch:
+    """An in-memory Elasticsearch-compatible client for the bulk ingestion.
+
+    Args:
+        bulk_latency(float): The seconds of a bulk request.
+        refresh_latency(float): The seconds of a refresh request.
+    """
+
+    def __init__(self, bulk_latency: float = 0.0, refresh_latency: float = 0.0):
+        self.bulk_latency = bulk_latency
+        self.refresh_latency = refresh_latency
+        self.indices_settings: Dict[str, Dict[str, Any]] = {}
+        self.documents: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.settings_history: List[Dict[str, Any]] = []
+        self.bulk_sizes: List[int] = []
+        self.refresh_count = 0
+        self.max_inflight = 0
+        self.fail_ids: List[str] = []
+        self.closed = False
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self.indices = StubIndicesClient(self)
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._inflight += 1
+            self.max_inflight = max(self.max_inflight, self._inflight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._inflight -= 1
+
+    def _apply_bulk(self, body: List[Dict[str, Any]]) -> Dict[str, Any]:
+        items = []
+        with self._lock:
+            self.bulk_sizes.append(len(body) // 2)
+            for action, source in zip(body[::2], body[1::2]):
+                meta = action["index"]
+                if meta["_id"] in self.fail_ids:
+                    items.append(
+                        {"index": {"_id": meta["_id"], "status": 400, "error": "fail"}}
+                    )
+                    continue
+                self.documents[meta["_index"]][meta["_id"]] = source
+                items.append({"index": {"_id": meta["_id"], "status": 201}})
+        return {
+            "errors": any("error" in item["index"] for item in items),
+            "items": items,
+        }
+
+    def bulk(self, body: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self._enter()
+        try:
+            time.sleep(self.bulk_latency)
+            return self._apply_bulk(body)
+        finally:
+            self._exit()
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class AsyncStubIndicesClient:
+    """The async indices API of :class:`AsyncStubElasticsearch`."""
+
+    def __init__(self, client: StubElasticsearch):
+        self._client = client
+
+    async def refresh(self, index: str) -> Dict[str, Any]:
+        self._client.refresh_count += 1
+        await asyncio.sleep(self._client.refresh_latency)
+        return {"_shards": {"failed": 0}}
+
+
+class AsyncStubElasticsearch:
+    """The async client which shares the state of a :class:`StubElasticsearch`."""
+
+    def __init__(self, client: StubElasticsearch):
+        self._client = client
+        self.closed = False
+        self.indices = AsyncStubIndicesClient(client)
+
+    async def bulk(self, body: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self._client._enter()
+        try:
+            await asyncio.sleep(self._client.bulk_latency)
+            return self._client._apply_bulk(body)
+        finally:
+            self._client._exit()
+
+    async def close(self) -> None:
+        self.closed = True
@@ -0,0 +1,108 @@
+"""Benchmark the bulk ingestion of the Elasticsearch full text store.
+
+Run against an in-memory Elasticsearch-compatible stub, which simulates the latency
+of the bulk and refresh requests, no Elasticsearch server is required:
+
+.. code-block:: shell
+
+    python -m dbgpt.util.benchmarks.rag.full_text_benchmarks --num_chunks 20000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, List
+
+from dbgpt.core import Chunk
+from dbgpt.util.benchmarks.rag._es_stub import (
+    AsyncStubElasticsearch,
+    StubElasticsearch,
+)
+
+
+def _generate_chunks(num_chunks: int, chunk_size: int) -> List[Chunk]:
+    content = ("db-gpt knowledge retrieval " * chunk_size)[:chunk_size]
+    return [
+        Chunk(content=content, metadata={"source": f"doc_{i // 100}"})
+        for i in range(num_chunks)
+    ]
+
+
+def _timeit(name: str, num_chunks: int, func: Callable[[], Any]) -> None:
+    start = time.perf_counter()
+    func()
+    cost = time.perf_counter() - start
+    print(f"{name:<40} {cost:>8.2f} s {num_chunks / cost:>10.0f} docs/s")
+
+
+def run_benchmarks(
+    num_chunks: int,
+    chunk_size: int,
+    max_chunks_once_load: int,
+    bulk_latency: float,
+    refresh_latency: float,
+    bulk_max_inflight: int,
+):
+    from dbgpt_ext.storage.full_text.elasticsearch import ElasticDocumentStore
+    from dbgpt_ext.storage.vector_store.elastic_store import ElasticsearchStoreConfig
+
+    chunks = _generate_chunks(num_chunks, chunk_size)
+    print(
+        f"{num_chunks} chunks, {max_chunks_once_load} chunks per load, bulk latency "
+        f"{bulk_latency * 1000:.0f} ms, refresh latency {refresh_latency * 1000:.0f} ms"
+    )
+
+    def _store(inflight: int) -> ElasticDocumentStore:
+        client = StubElasticsearch(bulk_latency, refresh_latency)
+        return ElasticDocumentStore(
+            ElasticsearchStoreConfig(),
+            name="benchmark",
+            bulk_max_inflight=inflight,
+            es_client=client,
+            async_es_client=AsyncStubElasticsearch(client),
+        )
+
+    # The previous ingestion: one bulk request and one refresh per load
+    legacy = _store(1)
+
+    def _legacy_load():
+        for i in range(0, len(chunks), max_chunks_once_load):
+            legacy.load_document(chunks[i : i + max_chunks_once_load])
+
+    _timeit("load per group (legacy)", num_chunks, _legacy_load)
+    _timeit(
+        "load with limit (bulk session)",
+        num_chunks,
+        lambda: _store(bulk_max_inflight).load_document_with_limit(
+            chunks, max_chunks_once_load
+        ),
+    )
+    _timeit(
+        "load once (parallel bulk)",
+        num_chunks,
+        lambda: _store(bulk_max_inflight).load_document(chunks),
+    )
+    _timeit(
+        "async load once (parallel bulk)",
+        num_chunks,
+        lambda: asyncio.run(_store(bulk_max_inflight).aload_document(chunks)),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num_chunks", type=int, default=5000)
+    parser.add_argument("--chunk_size", type=int, default=512)
+    parser.add_argument("--max_chunks_once_load", type=int, default=10)
+    parser.add_argument("--bulk_latency", type=float, default=0.01)
+    parser.add_argument("--refresh_latency", type=float, default=0.02)
+    parser.add_argument("--bulk_max_inflight", type=int, default=4)
+    args = parser.parse_args()
+    run_benchmarks(
+        args.num_chunks,
+        args.chunk_size,
+        args.max_chunks_once_load,
+        args.bulk_latency,
+        args.refresh_latency,
+        args.bulk_max_inflight,
+    )
@@ -0,0 +1,477 @@
+"""Benchmark the latency, throughput and recall of the retrievers.
+
+Replay a local query set against a retriever at several concurrency levels and
+report the p50/p95/p99 latency, the QPS, the recall@k and the MRR. The results
+are saved as JSON, pass a previous result file to diff the runs:
+
+.. code-block:: shell
+
+    # Offline, with a generated corpus, Chroma and a deterministic fake embedding
+    python -m dbgpt.util.benchmarks.rag.retriever_benchmarks \
+        --concurrency 1,4,16 --result_file /tmp/retriever_benchmarks.json
+
+    python -m dbgpt.util.benchmarks.rag.retriever_benchmarks \
+        --concurrency 1,4,16 --baseline_file /tmp/retriever_benchmarks.json
+
+The corpus file is a JSON lines file of ``{"id": ..., "content": ...}`` and the
+query file is a JSON lines file of ``{"query": ..., "relevant_ids": [...]}``.
+Any :class:`~dbgpt.rag.retriever.base.BaseRetriever` (e.g. the
+``DBSchemaRetriever``) can be benchmarked with :func:`run_retriever_benchmark`.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Sequence
+
+from dbgpt.core import Chunk, Embeddings
+from dbgpt.rag.retriever.base import BaseRetriever
+
+logger = logging.getLogger(__name__)
+
+# The metadata key of the chunks which holds the id of the corpus document
+DOC_ID_KEY = "benchmark_doc_id"
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_WORDS = [
+    "agent",
+    "database",
+    "graph",
+    "vector",
+    "knowledge",
+    "retrieval",
+    "schema",
+    "table",
+    "index",
+    "query",
+    "model",
+    "embedding",
+    "workflow",
+    "operator",
+    "memory",
+    "prompt",
+    "storage",
+    "cluster",
+    "metric",
+    "plugin",
+]
+
+
+class DeterministicEmbeddings(Embeddings):
+    """A fake embedding model which hashes the tokens of the text.
+
+    The vector is the normalized set of the hashed tokens, so the texts which share
+    many distinct tokens are similar. It needs no model and returns the same vectors
+    in every run.
+    """
+
+    def __init__(self, dim: int = 256):
+        """Create a DeterministicEmbeddings.
+
+        Args:
+            dim(int): The dimension of the vectors.
+        """
+        self._dim = dim
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self._dim
+        for token in _TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self._dim] = 1.0
+        norm = math.sqrt(sum(v * v for v in vector))
+        if norm == 0:
+            # Avoid the zero vector which has no cosine similarity
+            vector[0] = norm = 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed search docs."""
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed query text."""
+        return self._embed(text)
+
+
+@dataclass
+class BenchmarkQuery:
+    """A query and the ids of its relevant documents."""
+
+    query: str
+    relevant_ids: List[str]
+
+
+@dataclass
+class RetrieverBenchmarkResult:
+    """The result of a benchmark run at one concurrency level."""
+
+    name: str
+    concurrency: int
+    top_k: int
+    num_queries: int
+    num_errors: int
+    total_time_ms: float
+    qps: float
+    latency_mean_ms: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    recall_at_k: float
+    mrr: float
+    created_at: str = field(
+        default_factory=lambda: datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a dict."""
+        return asdict(self)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the q-th percentile of the values with linear interpolation.
+
+    Args:
+        values(Sequence[float]): The values.
+        q(float): The percentile, between 0 and 100.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lower = math.floor(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def _chunk_doc_id(chunk: Chunk) -> str:
+    doc_id = (chunk.metadata or {}).get(DOC_ID_KEY)
+    return str(doc_id) if doc_id is not None else chunk.content
+
+
+def recall_at_k(retrieved_ids: Sequence[str], relevant_ids: Sequence[str]) -> float:
+    """Return the fraction of the relevant documents which are retrieved."""
+    if not relevant_ids:
+        return 0.0
+    relevant = set(relevant_ids)
+    return len(relevant.intersection(retrieved_ids)) / len(relevant)
+
+
+def reciprocal_rank(retrieved_ids: Sequence[str], relevant_ids: Sequence[str]) -> float:
+    """Return the reciprocal rank of the first relevant document retrieved."""
+    relevant = set(relevant_ids)
+    for i, doc_id in enumerate(retrieved_ids):
+        if doc_id in relevant:
+            return 1.0 / (i + 1)
+    return 0.0
+
+
+async def run_retriever_benchmark(
+    retriever: BaseRetriever,
+    queries: Sequence[BenchmarkQuery],
+    top_k: int,
+    concurrency: int = 1,
+    name: str = "retriever",
+    doc_id_func: Callable[[Chunk], str] = _chunk_doc_id,
+) -> RetrieverBenchmarkResult:
+    """Replay the queries against the retriever with a bounded concurrency.
+
+    Args:
+        retriever(BaseRetriever): The retriever to benchmark.
+        queries(Sequence[BenchmarkQuery]): The queries with their ground truth.
+        top_k(int): Only the first top_k chunks retrieved are scored.
+        concurrency(int): The max number of the queries in flight.
+        name(str): The name of the benchmark.
+        doc_id_func(Callable[[Chunk], str]): Map a retrieved chunk to the id of its
+            document, defaults to the ``benchmark_doc_id`` metadata, or the content.
+
+    Returns:
+        RetrieverBenchmarkResult: The result.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    recalls: List[float] = []
+    ranks: List[float] = []
+    num_errors = 0
+
+    async def _run_query(item: BenchmarkQuery) -> None:
+        nonlocal num_errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                chunks = await retriever.aretrieve(item.query)
+            except Exception as e:
+                logger.warning(f"Retrieve query {item.query!r} error: {e}")
+                num_errors += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+        retrieved_ids = [doc_id_func(chunk) for chunk in chunks[:top_k]]
+        recalls.append(recall_at_k(retrieved_ids, item.relevant_ids))
+        ranks.append(reciprocal_rank(retrieved_ids, item.relevant_ids))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_run_query(item) for item in queries))
+    total_time_ms = (time.perf_counter() - start) * 1000
+    num_success = len(latencies)
+    return RetrieverBenchmarkResult(
+        name=name,
+        concurrency=concurrency,
+        top_k=top_k,
+        num_queries=len(queries),
+        num_errors=num_errors,
+        total_time_ms=total_time_ms,
+        qps=num_success / (total_time_ms / 1000.0) if total_time_ms > 0 else 0.0,
+        latency_mean_ms=sum(latencies) / num_success if num_success else 0.0,
+        latency_p50_ms=percentile(latencies, 50),
+        latency_p95_ms=percentile(latencies, 95),
+        latency_p99_ms=percentile(latencies, 99),
+        recall_at_k=sum(recalls) / num_success if num_success else 0.0,
+        mrr=sum(ranks) / num_success if num_success else 0.0,
+    )
+
+
+# The metrics which regress when they increase, the others regress when they drop
+_LOWER_IS_BETTER = {
+    "latency_mean_ms",
+    "latency_p50_ms",
+    "latency_p95_ms",
+    "latency_p99_ms",
+    "num_errors",
+}
+_COMPARED_METRICS = [
+    "qps",
+    "latency_p50_ms",
+    "latency_p95_ms",
+    "latency_p99_ms",
+    "recall_at_k",
+    "mrr",
+    "num_errors",
+]
+
+
+def compare_results(
+    baseline: Sequence[Dict[str, Any]],
+    current: Sequence[Dict[str, Any]],
+    tolerance: float = 0.1,
+) -> List[Dict[str, Any]]:
+    """Diff the results of two runs, matched by the name and the concurrency.
+
+    Args:
+        baseline(Sequence[Dict[str, Any]]): The results of the previous run.
+        current(Sequence[Dict[str, Any]]): The results of the current run.
+        tolerance(float): The relative change allowed before a metric regresses.
+
+    Returns:
+        List[Dict[str, Any]]: The diff of every metric, with a ``regression`` flag.
+    """
+    baseline_map = {(r["name"], r["concurrency"]): r for r in baseline}
+    diffs = []
+    for result in current:
+        base = baseline_map.get((result["name"], result["concurrency"]))
+        if not base:
+            continue
+        for metric in _COMPARED_METRICS:
+            old, new = base[metric], result[metric]
+            change = (new - old) / old if old else (0.0 if new == old else math.inf)
+            if metric in _LOWER_IS_BETTER:
+                regression = change > tolerance
+            else:
+                regression = change < -tolerance
+            diffs.append(
+                {
+                    "name": result["name"],
+                    "concurrency": result["concurrency"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": change,
+                    "regression": regression,
+                }
+            )
+    return diffs
+
+
+def load_corpus(path: str) -> List[Chunk]:
+    """Load the corpus from a JSON lines file of ``{"id", "content"}``."""
+    chunks = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                chunks.append(
+                    Chunk(content=item["content"], metadata={DOC_ID_KEY: item["id"]})
+                )
+    return chunks
+
+
+def load_queries(path: str) -> List[BenchmarkQuery]:
+    """Load the queries from a JSON lines file of ``{"query", "relevant_ids"}``."""
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                item = json.loads(line)
+                queries.append(
+                    BenchmarkQuery(
+                        query=item["query"],
+                        relevant_ids=[str(i) for i in item["relevant_ids"]],
+                    )
+                )
+    return queries
+
+
+def generate_dataset(num_docs: int, num_queries: int, seed: int = 0):
+    """Generate a corpus and the queries built from the terms of its documents."""
+    rand = random.Random(seed)
+    vocab = [f"{rand.choice(_WORDS)}{n}" for n in range(num_docs * 4)]
+    chunks = []
+    doc_terms = []
+    for i in range(num_docs):
+        # The rare terms tell the documents apart, the common words are noise
+        terms = rand.sample(vocab, 8)
+        words = terms + [rand.choice(_WORDS) for _ in range(rand.randint(20, 60))]
+        rand.shuffle(words)
+        doc_terms.append(terms)
+        chunks.append(Chunk(content=" ".join(words), metadata={DOC_ID_KEY: str(i)}))
+    queries = []
+    for _ in range(num_queries):
+        i = rand.randrange(num_docs)
+        words = rand.sample(doc_terms[i], 4) + rand.sample(_WORDS, 2)
+        queries.append(BenchmarkQuery(query=" ".join(words), relevant_ids=[str(i)]))
+    return chunks, queries
+
+
+def _build_chroma_retriever(
+    chunks: List[Chunk], top_k: int, persist_path: str, dim: int
+) -> BaseRetriever:
+    try:
+        from dbgpt_ext.storage.vector_store.chroma_store import (
+            ChromaStore,
+            ChromaVectorConfig,
+        )
+    except ImportError:
+        raise ImportError(
+            "Please install dbgpt-ext and chromadb to benchmark the Chroma store."
+        )
+    from dbgpt.rag.retriever.embedding import EmbeddingRetriever
+
+    config = ChromaVectorConfig(persist_path=persist_path)
+    store = ChromaStore(
+        config,
+        name="retriever_benchmarks",
+        embedding_fn=DeterministicEmbeddings(dim),
+    )
+    store.load_document(chunks)
+    return EmbeddingRetriever(index_store=store, top_k=top_k)
+
+
+def _build_bm25_retriever(chunks: List[Chunk], top_k: int, es_url: str):
+    try:
+        from elasticsearch import Elasticsearch
+
+        from dbgpt_ext.rag.retriever.bm25 import BM25Retriever
+    except ImportError:
+        raise ImportError(
+            "Please install dbgpt-ext and elasticsearch to benchmark the BM25 "
+            "retriever."
+        )
+
+    retriever = BM25Retriever(
+        top_k=top_k,
+        es_index="dbgpt_retriever_benchmarks",
+        es_client=Elasticsearch(es_url),
+    )
+    retriever.load_document(chunks)
+    return retriever
+
+
+async def run_benchmarks(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    if args.corpus_file and args.query_file:
+        chunks = load_corpus(args.corpus_file)
+        queries = load_queries(args.query_file)
+    else:
+        chunks, queries = generate_dataset(args.num_docs, args.num_queries)
+    print(f"Corpus {len(chunks)} documents, {len(queries)} queries")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.retriever == "bm25":
+            retriever = _build_bm25_retriever(chunks, args.top_k, args.es_url)
+        else:
+            retriever = _build_chroma_retriever(
+                chunks, args.top_k, args.persist_path or tmp_dir, args.dim
+            )
+        # Warmup first
+        await run_retriever_benchmark(retriever, queries[:10], args.top_k)
+
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_retriever_benchmark(
+                retriever,
+                queries,
+                args.top_k,
+                concurrency=concurrency,
+                name=args.retriever,
+            )
+            print(
+                f"{result.name} concurrency={concurrency}: "
+                f"qps={result.qps:.1f}, p50={result.latency_p50_ms:.2f} ms, "
+                f"p95={result.latency_p95_ms:.2f} ms, "
+                f"p99={result.latency_p99_ms:.2f} ms, "
+                f"recall@{args.top_k}={result.recall_at_k:.3f}, mrr={result.mrr:.3f}"
+            )
+            results.append(result.to_dict())
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--retriever", type=str, default="embedding", choices=["embedding", "bm25"]
+    )
+    parser.add_argument("--corpus_file", type=str, default=None)
+    parser.add_argument("--query_file", type=str, default=None)
+    parser.add_argument("--num_docs", type=int, default=2000)
+    parser.add_argument("--num_queries", type=int, default=500)
+    parser.add_argument("--top_k", type=int, default=5)
+    parser.add_argument("--concurrency", type=str, default="1,4,16")
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument(
+        "--persist_path",
+        type=str,
+        default=None,
+        help="The Chroma path, defaults to a temporary directory",
+    )
+    parser.add_argument("--es_url", type=str, default="http://127.0.0.1:9200")
+    parser.add_argument("--result_file", type=str, default=None)
+    parser.add_argument("--baseline_file", type=str, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+    args.concurrency = [int(i) for i in args.concurrency.strip().split(",")]
+
+    baseline = None
+    if args.baseline_file and os.path.exists(args.baseline_file):
+        with open(args.baseline_file, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    results = asyncio.run(run_benchmarks(args))
+    if args.result_file:
+        with open(args.result_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Save result to {args.result_file}")
+    if baseline:
+        for diff in compare_results(baseline, results, args.tolerance):
+            flag = "REGRESSION" if diff["regression"] else ""
+            print(
+                f"{diff['name']} concurrency={diff['concurrency']} "
+                f"{diff['metric']:<16} {diff['baseline']:>12.3f} -> "
+                f"{diff['current']:>12.3f} ({diff['change']:+.1%}) {flag}"
+            )
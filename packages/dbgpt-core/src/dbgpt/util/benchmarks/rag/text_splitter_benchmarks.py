@@ -0,0 +1,129 @@
+"""Benchmark the text splitters on a generated corpus.
+
+Compare the chunk merging with the previous quadratic implementation:
+
+.. code-block:: shell
+
+    python -m dbgpt.util.benchmarks.rag.text_splitter_benchmarks --size_mb 16
+"""
+
+import argparse
+import logging
+import random
+import time
+from typing import Callable, List
+
+from dbgpt.core import Document
+from dbgpt.rag.text_splitter.text_splitter import (
+    CharacterTextSplitter,
+    RecursiveCharacterTextSplitter,
+    TextSplitter,
+)
+
+_WORDS = ["db", "gpt", "agent", "knowledge", "retrieval", "graph", "vector", "a"]
+
+
+def _generate_corpus(size: int, seed: int = 0) -> str:
+    rand = random.Random(seed)
+    parts: List[str] = []
+    length = 0
+    while length < size:
+        sentence = " ".join(rand.choice(_WORDS) for _ in range(rand.randint(3, 20)))
+        parts.append(sentence)
+        length += len(sentence) + 1
+        if rand.random() < 0.05:
+            parts.append("")
+    return "\n".join(parts)
+
+
+def _legacy_merge_splits(
+    splitter: TextSplitter, splits: List[str], separator: str
+) -> List[str]:
+    """The previous merge which drops the overlap by copying the current list."""
+    chunk_size = splitter._chunk_size
+    chunk_overlap = splitter._chunk_overlap
+    length_function = splitter._length_function
+    separator_len = length_function(separator)
+    docs = []
+    current_doc: List[str] = []
+    total = 0
+    for d in splits:
+        _len = length_function(d)
+        if total + _len + (separator_len if len(current_doc) > 0 else 0) > chunk_size:
+            if len(current_doc) > 0:
+                doc = splitter._join_docs(current_doc, separator)
+                if doc is not None:
+                    docs.append(doc)
+                while total > chunk_overlap or (
+                    total + _len + (separator_len if len(current_doc) > 0 else 0)
+                    > chunk_size
+                    and total > 0
+                ):
+                    total -= length_function(current_doc[0]) + (
+                        separator_len if len(current_doc) > 1 else 0
+                    )
+                    current_doc = current_doc[1:]
+        current_doc.append(d)
+        total += _len + (separator_len if len(current_doc) > 1 else 0)
+    doc = splitter._join_docs(current_doc, separator)
+    if doc is not None:
+        docs.append(doc)
+    return docs
+
+
+def _timeit(name: str, func: Callable[[], List]) -> List:
+    start = time.perf_counter()
+    result = func()
+    cost = time.perf_counter() - start
+    print(f"{name:<40} {cost * 1000:>10.1f} ms {len(result):>10} chunks")
+    return result
+
+
+def run_benchmarks(
+    size_mb: float, chunk_size: int, chunk_overlap: int, num_workers: int
+):
+    corpus = _generate_corpus(int(size_mb * 1024 * 1024))
+    print(
+        f"Corpus {size_mb} MB, chunk_size={chunk_size}, chunk_overlap={chunk_overlap}"
+    )
+    # Merging many small splits with a large overlap is the worst case of the
+    # previous implementation
+    splitter = CharacterTextSplitter(
+        separator=" ", chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    splits = corpus.split(" ")
+    legacy = _timeit(
+        "merge splits (legacy)",
+        lambda: _legacy_merge_splits(splitter, splits, " "),
+    )
+    current = _timeit(
+        "merge splits", lambda: splitter._merge_splits(splits, separator=" ")
+    )
+    assert legacy == current, "The chunks of the implementations differ"
+
+    recursive_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size, chunk_overlap=chunk_overlap
+    )
+    _timeit("recursive split text", lambda: recursive_splitter.split_text(corpus))
+
+    documents = [Document(content=text) for text in corpus.split("\n\n")]
+    _timeit(
+        "split documents",
+        lambda: recursive_splitter.split_documents(documents),
+    )
+    _timeit(
+        f"split documents ({num_workers} workers)",
+        lambda: recursive_splitter.split_documents(documents, num_workers=num_workers),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size_mb", type=float, default=4)
+    parser.add_argument("--chunk_size", type=int, default=4000)
+    parser.add_argument("--chunk_overlap", type=int, default=3000)
+    parser.add_argument("--num_workers", type=int, default=4)
+    args = parser.parse_args()
+    # Ignore the warnings of the oversize chunks
+    logging.disable(logging.WARNING)
+    run_benchmarks(args.size_mb, args.chunk_size, args.chunk_overlap, args.num_workers)
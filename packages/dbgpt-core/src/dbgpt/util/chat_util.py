@@ -2,12 +2,23 @@ import asyncio
 import json
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, is_dataclass
-from typing import Any, Callable, Coroutine, List, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    List,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from dbgpt._private.pydantic import BaseModel, model_to_json
 
 SSE_DATA_TYPE = Union[str, BaseModel, dict]
 
+T = TypeVar("T")
+
 
 async def run_async_tasks(
     tasks: List[Coroutine],
@@ -69,6 +80,54 @@ def run_tasks(
     return results
 
 
+async def merge_async_streams(
+    streams: List[AsyncIterator[T]],
+) -> AsyncIterator[Tuple[int, T]]:
+    """Consume async streams concurrently and yield their items as they arrive.
+
+    Items of the same stream keep their order. The first exception raised by a
+    stream is raised to the consumer, the remaining streams are cancelled when
+    the consumer stops early. The buffer holds at most two items per stream, a
+    stream waits for the consumer when the buffer is full.
+
+    Args:
+        streams: The async streams to merge
+
+    Yields:
+        Tuple[int, T]: The index of the stream and the item
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(2 * len(streams), 1))
+    done = object()
+
+    async def _consume(index: int, stream: AsyncIterator[T]):
+        try:
+            async for item in stream:
+                await queue.put((index, item, None))
+        except Exception as e:
+            await queue.put((index, done, e))
+        else:
+            await queue.put((index, done, None))
+
+    tasks = [
+        asyncio.create_task(_consume(index, stream))
+        for index, stream in enumerate(streams)
+    ]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            index, item, error = await queue.get()
+            if error is not None:
+                raise error
+            if item is done:
+                remaining -= 1
+                continue
+            yield index, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 def transform_to_sse(data: SSE_DATA_TYPE) -> str:
     """Transform data to Server-Sent Events format.
 
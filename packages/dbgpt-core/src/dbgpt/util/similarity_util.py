@@ -1,6 +1,6 @@
 """Utility functions for calculating similarity."""
 
-from typing import TYPE_CHECKING, Any, List, Sequence
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Tuple
 
 if TYPE_CHECKING:
     from dbgpt.core.interface.embeddings import Embeddings
@@ -79,3 +79,59 @@ def calculate_cosine_similarity(
         prediction_vec, axis=1
     )
     return dot / norm
+
+
+def calculate_cosine_similarities(
+    embeddings: "Embeddings",
+    samples: Sequence[Tuple[str, Sequence[str]]],
+    batch_size: int = 256,
+) -> List[Any]:
+    """Calculate the cosine similarities of many (text, contexts) samples.
+
+    As in :func:`calculate_cosine_similarity`, the texts are embedded as queries
+    and the contexts as documents. The unique texts of each side are embedded in
+    batches and the similarities are computed in a single matrix operation.
+
+    Args:
+        embeddings(Embeddings): The embeddings to use.
+        samples(Sequence[Tuple[str, Sequence[str]]]): The text and its contexts of
+            every sample.
+        batch_size(int): The number of texts embedded in one call.
+
+    Returns:
+        List[numpy.ndarray]: The cosine similarity between the text and each context
+            of every sample.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy is required for SimilarityMetric")
+    query_ids: Dict[str, int] = {}
+    document_ids: Dict[str, int] = {}
+    query_indexes = []
+    document_indexes = []
+    counts = []
+    for text, contexts in samples:
+        if contexts:
+            query_id = query_ids.setdefault(text, len(query_ids))
+        for context in contexts:
+            query_indexes.append(query_id)
+            document_indexes.append(document_ids.setdefault(context, len(document_ids)))
+        counts.append(len(contexts))
+    if not query_indexes:
+        return [np.zeros(0) for _ in samples]
+
+    def _embed(texts: List[str], embed_func) -> Any:
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            vectors.extend(embed_func(texts[i : i + batch_size]))
+        return np.asarray(vectors, dtype=float).reshape(len(texts), -1)
+
+    query_matrix = _embed(list(query_ids.keys()), embeddings.embed_queries)
+    document_matrix = _embed(list(document_ids.keys()), embeddings.embed_documents)
+    # cos(a,b) = dot(a,b) / (norm(a) * norm(b))
+    left = query_matrix[np.asarray(query_indexes)]
+    right = document_matrix[np.asarray(document_indexes)]
+    dots = np.einsum("ij,ij->i", left, right)
+    similarities = dots / (np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1))
+    return np.split(similarities, np.cumsum(counts)[:-1])
@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from ..chat_util import merge_async_streams
+
+
+@pytest.mark.asyncio
+async def test_merge_async_streams_backpressure():
+    produced = [0, 0]
+
+    async def _stream(index: int):
+        for i in range(100):
+            produced[index] += 1
+            yield i
+
+    merged = merge_async_streams([_stream(0), _stream(1)])
+    assert (await merged.__anext__())[1] == 0
+    await asyncio.sleep(0.05)
+    # The producers wait for the slow consumer instead of running ahead
+    assert sum(produced) <= 2 * 2 + 3
+    await merged.aclose()
+
+
+@pytest.mark.asyncio
+async def test_merge_async_streams_order_and_error():
+    async def _stream(items, error=None):
+        for item in items:
+            await asyncio.sleep(0)
+            yield item
+        if error:
+            raise error
+
+    items = [
+        item async for item in merge_async_streams([_stream([1, 2]), _stream([3])])
+    ]
+    assert sorted(items) == [(0, 1), (0, 2), (1, 3)]
+    assert [i for i in items if i[0] == 0] == [(0, 1), (0, 2)]
+
+    with pytest.raises(ValueError):
+        async for _ in merge_async_streams(
+            [_stream(range(10)), _stream([], ValueError("failed"))]
+        ):
+            pass
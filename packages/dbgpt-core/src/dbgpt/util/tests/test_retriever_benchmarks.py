@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.rag.retriever.base import BaseRetriever
+from dbgpt.storage.vector_store.filters import MetadataFilters
+from dbgpt.util.benchmarks.rag.retriever_benchmarks import (
+    DOC_ID_KEY,
+    BenchmarkQuery,
+    compare_results,
+    percentile,
+    run_retriever_benchmark,
+)
+
+
+class _FixedRetriever(BaseRetriever):
+    def __init__(self, doc_ids: List[str]):
+        self._doc_ids = doc_ids
+
+    def _retrieve(
+        self, query: str, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        if query == "error":
+            raise ValueError("retrieve error")
+        return [Chunk(content=i, metadata={DOC_ID_KEY: i}) for i in self._doc_ids]
+
+    async def _aretrieve(
+        self, query: str, filters: Optional[MetadataFilters] = None
+    ) -> List[Chunk]:
+        return self._retrieve(query, filters)
+
+    def _retrieve_with_score(self, query, score_threshold, filters=None):
+        return self._retrieve(query, filters)
+
+    async def _aretrieve_with_score(self, query, score_threshold, filters=None):
+        return self._retrieve(query, filters)
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_run_retriever_benchmark():
+    retriever = _FixedRetriever(["a", "b", "c"])
+    queries = [
+        BenchmarkQuery(query="q1", relevant_ids=["a"]),
+        BenchmarkQuery(query="q2", relevant_ids=["b", "d"]),
+        BenchmarkQuery(query="q3", relevant_ids=["c"]),
+        BenchmarkQuery(query="error", relevant_ids=["a"]),
+    ]
+    result = await run_retriever_benchmark(retriever, queries, top_k=2, concurrency=2)
+    assert result.num_queries == 4
+    assert result.num_errors == 1
+    # recall: 1, 0.5, 0 ; reciprocal rank: 1, 0.5, 0
+    assert result.recall_at_k == pytest.approx(0.5)
+    assert result.mrr == pytest.approx(0.5)
+    assert result.qps > 0
+    assert result.latency_p50_ms <= result.latency_p99_ms
+
+
+def test_compare_results():
+    baseline = [
+        {
+            "name": "embedding",
+            "concurrency": 4,
+            "qps": 100.0,
+            "latency_p50_ms": 10.0,
+            "latency_p95_ms": 20.0,
+            "latency_p99_ms": 30.0,
+            "recall_at_k": 0.9,
+            "mrr": 0.8,
+            "num_errors": 0,
+        }
+    ]
+    current = [
+        dict(baseline[0], qps=50.0, latency_p99_ms=31.0, recall_at_k=0.95),
+        dict(baseline[0], concurrency=16),
+    ]
+    diffs = compare_results(baseline, current, tolerance=0.1)
+    regressions = {d["metric"] for d in diffs if d["regression"]}
+    assert regressions == {"qps"}
+    assert all(d["concurrency"] == 4 for d in diffs)
@@ -0,0 +1,72 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from dbgpt.core import Embeddings
+from dbgpt.core.interface.evaluation import SimilarityMetric
+from dbgpt.util.similarity_util import (
+    calculate_cosine_similarities,
+    calculate_cosine_similarity,
+)
+
+
+class _CountingEmbeddings(Embeddings):
+    """Embed queries and documents differently, like instruction embeddings."""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+        self.query_calls: List[List[str]] = []
+
+    def _embed(self, text: str) -> List[float]:
+        return [float(len(text)), float(text.count("a")) + 1.0, 1.0]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        length, count, _ = self._embed(text)
+        return [count, length, 2.0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        self.query_calls.append(list(texts))
+        return [self.embed_query(text) for text in texts]
+
+
+def test_calculate_cosine_similarities_matches_single():
+    embeddings = _CountingEmbeddings()
+    samples = [
+        ("banana", ["apple", "cat"]),
+        ("banana", ["cat"]),
+        ("dog", []),
+        ("aaa", ["apple", "a"]),
+    ]
+    results = calculate_cosine_similarities(embeddings, samples, batch_size=2)
+    assert len(results) == len(samples)
+    for (text, contexts), result in zip(samples, results):
+        if not contexts:
+            assert len(result) == 0
+            continue
+        expected = calculate_cosine_similarity(embeddings, text, contexts)
+        np.testing.assert_allclose(result, expected)
+
+    # "dog" has no contexts, the other unique texts are embedded once, the texts
+    # as queries and the contexts as documents
+    assert embeddings.query_calls[0] == ["banana", "aaa"]
+    embedded = [text for call in embeddings.calls[:2] for text in call]
+    assert sorted(embedded) == ["a", "apple", "cat"]
+    assert [len(call) for call in embeddings.calls[:2]] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_similarity_metric_compute_batch():
+    embeddings = _CountingEmbeddings()
+    metric = SimilarityMetric(embeddings=embeddings)
+    samples = [("banana", ["apple", "cat"], None), ("dog", [], None)]
+    results = await metric.compute_batch(samples)
+    assert len(embeddings.calls) == 1
+    assert embeddings.query_calls == [["banana"]]
+    assert results[1].score == 0.0
+    single = await metric.compute("banana", ["apple", "cat"])
+    assert results[0].score == pytest.approx(single.score)
@@ -1,7 +1,10 @@
 """MySQL connector."""
 
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Type
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import text
 
 from dbgpt.core.awel.flow import (
     TAGS_ORDER_HIGH,
@@ -50,3 +53,67 @@ class MySQLConnector(RDBMSConnector):
     def param_class(cls) -> Type[RDBMSDatasourceParameters]:
         """Return the parameter class."""
         return MySQLParameters
+
+    def get_multi_table_metadata(
+        self, table_names: Optional[List[str]] = None, max_workers: int = 1
+    ) -> Dict[str, Dict[str, Any]]:
+        """Read the metadata of all tables with three information_schema queries."""
+        if table_names is None:
+            table_names = list(self.get_table_names())
+        wanted = set(table_names)
+        result: Dict[str, Dict[str, Any]] = {
+            name: {"columns": [], "indexes": [], "comment": {"text": None}}
+            for name in table_names
+        }
+        with self.session_scope() as session:
+            columns = session.execute(
+                text(
+                    "SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, "
+                    "COLUMN_DEFAULT, COLUMN_COMMENT FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = DATABASE() "
+                    "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+                )
+            ).fetchall()
+            statistics = session.execute(
+                text(
+                    "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME, NON_UNIQUE "
+                    "FROM information_schema.STATISTICS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND INDEX_NAME != 'PRIMARY' "
+                    "ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+                )
+            ).fetchall()
+            comments = session.execute(
+                text(
+                    "SELECT TABLE_NAME, TABLE_COMMENT FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE()"
+                )
+            ).fetchall()
+        for table_name, name, col_type, nullable, default, comment in columns:
+            if table_name in wanted:
+                result[table_name]["columns"].append(
+                    {
+                        "name": name,
+                        "type": col_type,
+                        "nullable": nullable == "YES",
+                        "default": default,
+                        "comment": comment or None,
+                    }
+                )
+        indexes: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for table_name, index_name, column_name, non_unique in statistics:
+            if table_name in wanted:
+                index = indexes[table_name].setdefault(
+                    index_name,
+                    {
+                        "name": index_name,
+                        "column_names": [],
+                        "unique": not int(non_unique),
+                    },
+                )
+                index["column_names"].append(column_name)
+        for table_name, table_indexes in indexes.items():
+            result[table_name]["indexes"] = list(table_indexes.values())
+        for table_name, comment in comments:
+            if table_name in wanted:
+                result[table_name]["comment"] = {"text": comment or None}
+        return result
@@ -1,6 +1,8 @@
 """DBSchemaAssembler."""
 
-from typing import Any, List, Optional
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
 
 from dbgpt.core import Chunk, Embeddings
 from dbgpt.datasource.base import BaseConnector
@@ -12,6 +14,8 @@ from ..chunk_manager import ChunkParameters
 from ..knowledge.datasource import DatasourceKnowledge
 from ..retriever.db_schema import DBSchemaRetriever
 
+logger = logging.getLogger(__name__)
+
 
 class DBSchemaAssembler(BaseAssembler):
     """DBSchemaAssembler.
@@ -43,6 +47,9 @@ class DBSchemaAssembler(BaseAssembler):
         embedding_model: Optional[str] = None,
         embeddings: Optional[Embeddings] = None,
         max_seq_length: int = 512,
+        table_names: Optional[List[str]] = None,
+        max_workers: int = 1,
+        table_summaries: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize with Embedding Assembler arguments.
@@ -56,6 +63,10 @@ class DBSchemaAssembler(BaseAssembler):
             chunk_manager: (Optional[ChunkManager]) ChunkManager to use for chunking.
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
+            table_names: (Optional[List[str]]) Only load these tables.
+            max_workers: (int) Max number of tables inspected concurrently.
+            table_summaries: (Optional[List[Tuple[str, Dict[str, Any]]]]) The table
+                summaries which are already read from the connector.
         """
         self._connector = connector
         self._table_vector_store_connector = table_vector_store_connector
@@ -66,7 +77,13 @@ class DBSchemaAssembler(BaseAssembler):
                 default_model_name=self._embedding_model
             ).create(self._embedding_model)
 
-        knowledge = DatasourceKnowledge(connector, model_dimension=max_seq_length)
+        knowledge = DatasourceKnowledge(
+            connector,
+            model_dimension=max_seq_length,
+            table_names=table_names,
+            max_workers=max_workers,
+            table_summaries=table_summaries,
+        )
         super().__init__(
             knowledge=knowledge,
             chunk_parameters=chunk_parameters,
@@ -83,6 +100,9 @@ class DBSchemaAssembler(BaseAssembler):
         embedding_model: Optional[str] = None,
         embeddings: Optional[Embeddings] = None,
         max_seq_length: int = 512,
+        table_names: Optional[List[str]] = None,
+        max_workers: int = 1,
+        table_summaries: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
     ) -> "DBSchemaAssembler":
         """Load document embedding into vector store from path.
 
@@ -96,6 +116,13 @@ class DBSchemaAssembler(BaseAssembler):
             embedding_model: (Optional[str]) Embedding model to use.
             embeddings: (Optional[Embeddings]) Embeddings to use.
             max_seq_length: Embedding model max sequence length
+            table_names: (Optional[List[str]]) Only load these tables, all tables
+                if None.
+            max_workers: (int) Max number of tables inspected concurrently when
+                the connector has no bulk metadata query.
+            table_summaries: (Optional[List[Tuple[str, Dict[str, Any]]]]) The table
+                summaries which are already read from the connector, the schema is
+                not read again.
         Returns:
              DBSchemaAssembler
         """
@@ -107,6 +134,9 @@ class DBSchemaAssembler(BaseAssembler):
             chunk_parameters=chunk_parameters,
             embeddings=embeddings,
             max_seq_length=max_seq_length,
+            table_names=table_names,
+            max_workers=max_workers,
+            table_summaries=table_summaries,
         )
 
     def get_chunks(self) -> List[Chunk]:
@@ -119,6 +149,42 @@ class DBSchemaAssembler(BaseAssembler):
         Returns:
             List[str]: List of chunk ids.
         """
+        table_chunks, field_chunks = self._split_table_field_chunks()
+        if self._field_vector_store_connector and field_chunks:
+            self._field_vector_store_connector.load_document_with_limit(field_chunks)
+        return self._table_vector_store_connector.load_document_with_limit(table_chunks)
+
+    def persist_by_table(self) -> Dict[str, Dict[str, List[str]]]:
+        """Persist chunks into vector store and group the ids by table.
+
+        Returns:
+            Dict[str, Dict[str, List[str]]]: The ids in the table vector store
+                (key "table") and in the field vector store (key "field"), by
+                table name.
+        """
+        table_chunks, field_chunks = self._split_table_field_chunks()
+        ids_by_table: Dict[str, Dict[str, List[str]]] = defaultdict(
+            lambda: {"table": [], "field": []}
+        )
+        groups = [("table", table_chunks, self._table_vector_store_connector)]
+        if self._field_vector_store_connector:
+            groups.append(("field", field_chunks, self._field_vector_store_connector))
+        for part, chunks, store in groups:
+            if not chunks:
+                continue
+            ids = store.load_document_with_limit(chunks)
+            if len(ids) != len(chunks):
+                logger.warning(
+                    f"Expect {len(chunks)} {part} ids, but got {len(ids)}, the ids "
+                    "can not be mapped back to tables"
+                )
+                continue
+            for chunk, chunk_id in zip(chunks, ids):
+                table_name = chunk.metadata.get("table_name")
+                ids_by_table[table_name][part].append(chunk_id)
+        return dict(ids_by_table)
+
+    def _split_table_field_chunks(self):
         table_chunks, field_chunks = [], []
         for chunk in self._chunks:
             metadata = chunk.metadata
@@ -129,10 +195,7 @@ class DBSchemaAssembler(BaseAssembler):
                     field_chunks.append(chunk)
             else:
                 table_chunks.append(chunk)
-
-        if self._field_vector_store_connector and field_chunks:
-            self._field_vector_store_connector.load_document_with_limit(field_chunks)
-        return self._table_vector_store_connector.load_document_with_limit(table_chunks)
+        return table_chunks, field_chunks
 
     def _extract_info(self, chunks) -> List[Chunk]:
         """Extract info from chunks."""
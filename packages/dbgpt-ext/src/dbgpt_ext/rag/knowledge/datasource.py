@@ -1,6 +1,6 @@
 """Datasource Knowledge."""
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from dbgpt.core import Document
 from dbgpt.datasource import BaseConnector
@@ -30,6 +30,9 @@ class DatasourceKnowledge(Knowledge):
         knowledge_type: Optional[KnowledgeType] = KnowledgeType.DOCUMENT,
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
         model_dimension: int = 512,
+        table_names: Optional[List[str]] = None,
+        max_workers: int = 1,
+        table_summaries: Optional[List[Tuple[str, Dict[str, Any]]]] = None,
         **kwargs: Any,
     ) -> None:
         """Create Datasource Knowledge with Knowledge arguments.
@@ -43,25 +46,41 @@ class DatasourceKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             metadata(Dict[str, Union[str, List[str]], optional): metadata
             model_dimension(int, optional): The threshold for splitting field string
+            table_names(List[str], optional): only load these tables, all tables
+                if None
+            max_workers(int, optional): max number of tables inspected
+                concurrently when the connector has no bulk metadata query
+            table_summaries(List[Tuple[str, Dict[str, Any]]], optional): the table
+                summaries with metadata which are already read, the schema is not
+                read from the connector again
         """
         self._separator = separator
         self._column_separator = column_separator
         self._connector = connector
         self._summary_template = summary_template
         self._model_dimension = model_dimension
+        self._table_names = table_names
+        self._max_workers = max_workers
+        self._table_summaries = table_summaries
         super().__init__(knowledge_type=knowledge_type, metadata=metadata, **kwargs)
 
     def _load(self) -> List[Document]:
         """Load datasource document from data_loader."""
         docs = []
-        db_summary_with_metadata = _parse_db_summary_with_metadata(
-            self._connector,
-            self._summary_template,
-            self._separator,
-            column_separator=self._column_separator,
-            model_dimension=self._model_dimension,
-        )
+        if self._table_summaries is not None:
+            db_summary_with_metadata = self._table_summaries
+        else:
+            db_summary_with_metadata = _parse_db_summary_with_metadata(
+                self._connector,
+                self._summary_template,
+                self._separator,
+                column_separator=self._column_separator,
+                model_dimension=self._model_dimension,
+                table_names=self._table_names,
+                max_workers=self._max_workers,
+            )
         for summary, table_metadata in db_summary_with_metadata:
+            table_metadata = dict(table_metadata)
             metadata = {"source": "database"}
 
             if self._metadata:
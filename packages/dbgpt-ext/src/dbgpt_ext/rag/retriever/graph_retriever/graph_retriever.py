@@ -1,5 +1,6 @@
 """Graph Retriever."""
 
+import asyncio
 import logging
 import os
 from typing import List, Optional, Tuple, Union
@@ -144,74 +145,105 @@ class GraphRetriever(GraphRetrieverBase):
         )
 
     async def retrieve(self, text: str) -> Tuple[Graph, Tuple[Graph, str]]:
-        """Retrieve subgraph from triplet graph and document graph."""
+        """Retrieve subgraph from triplet graph and document graph.
+
+        The independent stages run concurrently: the keywords are extracted and the
+        question is embedded while the text search is running, and they are
+        cancelled if the text search retrieves a subgraph.
+        """
         subgraph = MemoryGraph()
         subgraph_for_doc = MemoryGraph()
         text2gql_query = ""
 
-        # Retrieve from triplet graph and document graph
-        if self._enable_text_search:
-            # Retrieve from knowledge graph with text.
-            subgraph, text2gql_query = await self._text_based_graph_retriever.retrieve(
-                text
+        # Speculatively prepare the subs for the keyword or vector based search
+        subs_task = asyncio.create_task(self._search_subs(text))
+        try:
+            # Retrieve from triplet graph and document graph
+            if self._enable_text_search:
+                # Retrieve from knowledge graph with text.
+                (
+                    subgraph,
+                    text2gql_query,
+                ) = await self._text_based_graph_retriever.retrieve(text)
+
+            if subgraph.vertex_count == 0 and subgraph.edge_count == 0:
+                # if not enable text search or text search failed to retrieve subgraph
+
+                # Using subs to transfer keywords or embeddings
+                subs = await subs_task
+
+                # If enable triplet graph
+                if self._triplet_graph_enabled:
+                    # Retrieve from triplet graph
+                    if self._enable_similarity_search:
+                        # Retrieve from triplet graph with vectors
+                        subgraph = await self._vector_based_graph_retriever.retrieve(
+                            subs
+                        )
+                    else:
+                        # Retrieve from triplet graph with keywords
+                        subgraph = await self._keyword_based_graph_retriever.retrieve(
+                            subs
+                        )
+
+                # If enable document graph
+                if self._document_graph_enabled:
+                    # Retrieve from document graph
+                    # If not enable triplet graph or failed to retrieve subgraph
+                    if subgraph.vertex_count == 0 and subgraph.edge_count == 0:
+                        # Using subs to retrieve from document graph
+                        subgraph_for_doc = (
+                            await self._document_graph_retriever.retrieve(subs)
+                        )
+                    else:
+                        # If retrieve subgraph from triplet graph successfully
+                        # Using entities in subgraph to search chunks and doc
+                        subgraph_for_doc = (
+                            await self._document_graph_retriever.retrieve(subgraph)
+                        )
+        finally:
+            if not subs_task.done():
+                # The text search retrieved the subgraph, the subs are not needed
+                subs_task.cancel()
+            elif not subs_task.cancelled():
+                # Retrieve the exception of the unused subs
+                subs_task.exception()
+
+        return subgraph, (subgraph_for_doc, text2gql_query)
+
+    async def _search_subs(self, text: str) -> Union[List[str], List[List[float]]]:
+        """Get the keywords or the embeddings to search the subgraph.
+
+        The question is embedded while the keywords are being extracted, the keywords
+        are embedded once they are extracted.
+        """
+        keywords_task = asyncio.create_task(self._keyword_extractor.extract(text))
+        if not self._enable_similarity_search:
+            # Extract keywords from original question
+            keywords: List[str] = await keywords_task
+            logger.info(
+                f"Search subgraph with the following keywords:\n[KEYWORDS]:{keywords}"
             )
+            return keywords
 
-        # Extract keywords from original question
-        keywords: List[str] = await self._keyword_extractor.extract(text)
-
-        if subgraph.vertex_count == 0 and subgraph.edge_count == 0:
-            # if not enable text search or text search failed to retrieve subgraph
-
-            # Using subs to transfer keywords or embeddings
-            subs: Union[List[str], List[List[float]]]
-
-            if self._enable_similarity_search:
-                # Embedding the question
-                vector = await self._text_embedder.embed(text)
-                # Embedding the keywords
-                vectors = await self._text_embedder.batch_embed(
-                    keywords, batch_size=self._embedding_batch_size
-                )
-                # Using the embeddings of keywords and question
-                vectors.append(vector)
-                # Using vectors as subs
-                subs = vectors
-                logger.info(
-                    "Search subgraph with the following keywords and question's "
-                    f"embedding vector:\n[KEYWORDS]:{keywords}\n[QUESTION]:{text}"
-                )
-            else:
-                # Using keywords as subs
-                subs = keywords
-                logger.info(
-                    "Search subgraph with the following keywords:\n"
-                    f"[KEYWORDS]:{keywords}"
-                )
-
-            # If enable triplet graph
-            if self._triplet_graph_enabled:
-                # Retrieve from triplet graph
-                if self._enable_similarity_search:
-                    # Retrieve from triplet graph with vectors
-                    subgraph = await self._vector_based_graph_retriever.retrieve(subs)
-                else:
-                    # Retrieve from triplet graph with keywords
-                    subgraph = await self._keyword_based_graph_retriever.retrieve(subs)
-
-            # If enable document graph
-            if self._document_graph_enabled:
-                # Retrieve from document graph
-                # If not enable triplet graph or failed to retrieve subgraph
-                if subgraph.vertex_count == 0 and subgraph.edge_count == 0:
-                    # Using subs to retrieve from document graph
-                    subgraph_for_doc = await self._document_graph_retriever.retrieve(
-                        subs
-                    )
-                else:
-                    # If retrieve subgraph from triplet graph successfully
-                    # Using entities in subgraph to search chunks and doc
-                    subgraph_for_doc = await self._document_graph_retriever.retrieve(
-                        subgraph
-                    )
+        async def _embed_keywords() -> List[List[float]]:
+            return await self._text_embedder.batch_embed(
+                await keywords_task, batch_size=self._embedding_batch_size
+            )
 
-        return subgraph, (subgraph_for_doc, text2gql_query)
+        try:
+            # Embedding the question and the keywords
+            vector, vectors = await asyncio.gather(
+                self._text_embedder.embed(text), _embed_keywords()
+            )
+        finally:
+            if not keywords_task.done():
+                keywords_task.cancel()
+        logger.info(
+            "Search subgraph with the following keywords and question's "
+            f"embedding vector:\n[KEYWORDS]:{keywords_task.result()}\n"
+            f"[QUESTION]:{text}"
+        )
+        # Using the embeddings of keywords and question
+        vectors.append(vector)
+        return vectors
@@ -0,0 +1,128 @@
+import asyncio
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+
+from dbgpt.storage.graph_store.graph import Edge, MemoryGraph, Vertex
+from dbgpt_ext.rag.retriever.graph_retriever.graph_retriever import GraphRetriever
+
+
+def _graph() -> MemoryGraph:
+    graph = MemoryGraph()
+    graph.upsert_vertex(Vertex("a"))
+    graph.upsert_vertex(Vertex("b"))
+    graph.append_edge(Edge("a", "b", "rel"))
+    return graph
+
+
+class _Stage:
+    """Record the start and the end of a slow stage."""
+
+    def __init__(self, events: List[str], name: str, delay: float, result):
+        self.events = events
+        self.name = name
+        self.delay = delay
+        self.result = result
+        self.args = None
+
+    async def __call__(self, *args, **kwargs):
+        self.args = args
+        self.events.append(f"start {self.name}")
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.events.append(f"cancel {self.name}")
+            raise
+        self.events.append(f"end {self.name}")
+        return self.result
+
+
+def _retriever(
+    events: List[str],
+    text_graph: MemoryGraph,
+    enable_similarity_search: bool = True,
+    delay: float = 0.1,
+) -> GraphRetriever:
+    adapter = MagicMock()
+    adapter.graph_store.enable_similarity_search = enable_similarity_search
+    retriever = GraphRetriever(
+        adapter,
+        llm_client=MagicMock(),
+        llm_model="test",
+        embedding_fn=MagicMock(),
+        enable_text_search=True,
+    )
+    retriever._text_based_graph_retriever = MagicMock()
+    retriever._text_based_graph_retriever.retrieve = _Stage(
+        events, "text2gql", delay, (text_graph, "MATCH (n) RETURN n")
+    )
+    retriever._keyword_extractor = MagicMock()
+    retriever._keyword_extractor.extract = _Stage(
+        events, "keywords", delay, ["k1", "k2"]
+    )
+    retriever._text_embedder = MagicMock()
+    retriever._text_embedder.embed = _Stage(events, "embed", delay, [0.0, 1.0])
+    retriever._text_embedder.batch_embed = _Stage(
+        events, "batch_embed", delay, [[1.0, 0.0], [1.0, 1.0]]
+    )
+    retriever._vector_based_graph_retriever = MagicMock()
+    retriever._vector_based_graph_retriever.retrieve = _Stage(
+        events, "vector_search", 0, _graph()
+    )
+    retriever._keyword_based_graph_retriever = MagicMock()
+    retriever._keyword_based_graph_retriever.retrieve = _Stage(
+        events, "keyword_search", 0, _graph()
+    )
+    retriever._document_graph_retriever = MagicMock()
+    retriever._document_graph_retriever.retrieve = _Stage(
+        events, "doc_search", 0, MemoryGraph()
+    )
+    return retriever
+
+
+@pytest.mark.asyncio
+async def test_cancel_speculative_stages_when_text_search_succeeds():
+    events: List[str] = []
+    retriever = _retriever(events, _graph(), delay=0.05)
+    subgraph, (_, query) = await retriever.retrieve("question")
+    await asyncio.sleep(0)
+
+    assert subgraph.vertex_count == 2
+    assert query == "MATCH (n) RETURN n"
+    assert {"start keywords", "start embed"} <= set(events)
+    assert "cancel keywords" in events
+    assert "end keywords" not in events
+    assert "start vector_search" not in events
+
+
+@pytest.mark.asyncio
+async def test_stages_run_concurrently():
+    events: List[str] = []
+    retriever = _retriever(events, MemoryGraph(), delay=0.1)
+    start = asyncio.get_running_loop().time()
+    subgraph, _ = await retriever.retrieve("question")
+    cost = asyncio.get_running_loop().time() - start
+
+    # The longest chain is keywords -> batch_embed
+    assert cost < 0.3
+    assert subgraph.vertex_count == 2
+    assert events[:3] == ["start text2gql", "start keywords", "start embed"]
+    assert events.index("start vector_search") > events.index("end batch_embed")
+    # The embeddings of the keywords and the question
+    vector_search = retriever._vector_based_graph_retriever.retrieve
+    assert vector_search.args == ([[1.0, 0.0], [1.0, 1.0], [0.0, 1.0]],)
+
+
+@pytest.mark.asyncio
+async def test_keyword_search_without_similarity_search():
+    events: List[str] = []
+    retriever = _retriever(
+        events, MemoryGraph(), enable_similarity_search=False, delay=0.01
+    )
+    subgraph, _ = await retriever.retrieve("question")
+
+    assert subgraph.vertex_count == 2
+    keyword_search = retriever._keyword_based_graph_retriever.retrieve
+    assert keyword_search.args == (["k1", "k2"],)
+    assert "start embed" not in events
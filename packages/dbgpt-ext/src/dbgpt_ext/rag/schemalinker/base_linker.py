@@ -1,7 +1,7 @@
 """Base Linker."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Union
 
 
 class BaseSchemaLinker(ABC):
@@ -17,11 +17,11 @@ class BaseSchemaLinker(ABC):
         """
         return self._schema_linking(query)
 
-    def schema_linking_with_vector_db(self, query: str) -> List:
+    def schema_linking_with_vector_db(self, query: Union[str, List[str]]) -> List:
         """Query schema info with vector db.
 
         Args:
-            query (str): query text
+            query (Union[str, List[str]]): query text or many query texts
         Returns:
             List: list of schema
         """
@@ -48,11 +48,11 @@ class BaseSchemaLinker(ABC):
         """
 
     @abstractmethod
-    def _schema_linking_with_vector_db(self, query: str) -> List:
+    def _schema_linking_with_vector_db(self, query: Union[str, List[str]]) -> List:
         """Query schema info with vector db.
 
         Args:
-            query (str): query text
+            query (Union[str, List[str]]): query text or many query texts
         Returns:
             List: list of schema
         """
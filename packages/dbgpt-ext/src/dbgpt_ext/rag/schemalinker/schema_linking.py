@@ -1,7 +1,6 @@
 """SchemaLinking by LLM."""
 
-from functools import reduce
-from typing import List, Optional, cast
+from typing import List, Optional, Union
 
 from dbgpt.core import (
     Chunk,
@@ -67,14 +66,24 @@ class SchemaLinking(BaseSchemaLinker):
         chunks_content = [chunk.content for chunk in chunks]
         return chunks_content
 
-    def _schema_linking_with_vector_db(self, query: str) -> List[Chunk]:
-        queries = [query]
+    def _schema_linking_with_vector_db(
+        self, query: Union[str, List[str]]
+    ) -> List[Chunk]:
+        queries = [query] if isinstance(query, str) else query
         if not self._index_store:
             raise ValueError("Vector store connector is not provided.")
-        candidates = [
-            self._index_store.similar_search(query, self._top_k) for query in queries
-        ]
-        return cast(List[Chunk], reduce(lambda x, y: x + y, candidates))
+        # Embed all the queries in one call and search them in one request
+        candidates = self._index_store.similar_search_batch(queries, self._top_k)
+        # The same table may be recalled by many queries, keep the first one
+        chunks: List[Chunk] = []
+        seen = set()
+        for chunk in [chunk for chunks in candidates for chunk in chunks]:
+            table_key = chunk.metadata.get("table_name") or chunk.content
+            if table_key in seen:
+                continue
+            seen.add(table_key)
+            chunks.append(chunk)
+        return chunks
 
     async def _schema_linking_with_llm(self, query: str) -> List:
         chunks_content = self.schema_linking(query)
@@ -1,5 +1,6 @@
 """Summary for rdbms database."""
 
+import hashlib
 import re
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
@@ -116,31 +117,59 @@ def _parse_db_summary_with_metadata(
     separator: str = "--table-field-separator--",
     column_separator: str = _DEFAULT_COLUMN_SEPARATOR,
     model_dimension: int = 512,
+    table_names: Optional[List[str]] = None,
+    max_workers: int = 1,
 ) -> List[Tuple[str, Dict[str, Any]]]:
     """Get db summary for database.
 
+    The metadata of all tables is read with
+    :meth:`~dbgpt.datasource.base.BaseConnector.get_multi_table_metadata`, which
+    uses bulk queries where the connector supports them.
+
     Args:
         conn (BaseConnector): database connection
         summary_template (str): summary template
         separator(str, optional): separator used to separate table's
             basic info and fields. defaults to `-- table-field-separator--`
         model_dimension(int, optional): The threshold for splitting field string
+        table_names(List[str], optional): only summarize these tables
+        max_workers(int, optional): max number of tables inspected concurrently
+            when the connector has no bulk metadata query
     """
-    tables = conn.get_table_names()
-    table_info_summaries = [
-        _parse_table_summary_with_metadata(
-            conn,
-            summary_template,
-            separator,
-            table_name,
-            model_dimension,
-            column_separator=column_separator,
+    if table_names is None:
+        table_names = list(conn.get_table_names())
+    tables_metadata = conn.get_multi_table_metadata(
+        table_names, max_workers=max_workers
+    )
+    table_info_summaries = []
+    for table_name in table_names:
+        if table_name not in tables_metadata:
+            continue
+        table_metadata = tables_metadata[table_name]
+        table_info_summaries.append(
+            _format_table_summary_with_metadata(
+                table_name,
+                table_metadata["columns"],
+                table_metadata["indexes"],
+                (table_metadata.get("comment") or {}).get("text"),
+                summary_template,
+                separator,
+                model_dimension,
+                column_separator=column_separator,
+            )
         )
-        for table_name in tables
-    ]
     return table_info_summaries
 
 
+def _table_schema_fingerprint(table_summary: str) -> str:
+    """Return the fingerprint of a table summary.
+
+    The summary covers the columns, types, comments and indexes of the table, so
+    the fingerprint changes whenever any of them changes.
+    """
+    return hashlib.sha256(table_summary.encode("utf-8")).hexdigest()
+
+
 def _split_columns_str(
     columns: List[str], model_dimension: int, column_separator: str = ",\r\n    "
 ):
@@ -206,13 +235,46 @@ def _parse_table_summary_with_metadata(
         (column1,comment), (column2, comment), (column3, comment)
         (column4,comment), (column5, comment), (column6, comment)
     """
+    table_comment = ""
+
+    try:
+        comment = conn.get_table_comment(table_name)
+        table_comment = comment.get("text")
+    except Exception:
+        pass
+
+    return _format_table_summary_with_metadata(
+        table_name,
+        conn.get_columns(table_name),
+        conn.get_indexes(table_name),
+        table_comment,
+        summary_template,
+        separator,
+        model_dimension,
+        column_separator=column_separator,
+        db_summary_version=db_summary_version,
+    )
+
+
+def _format_table_summary_with_metadata(
+    table_name: str,
+    raw_columns: List[Dict],
+    raw_indexes: List[Any],
+    table_comment: Optional[str],
+    summary_template: str,
+    separator,
+    model_dimension=512,
+    column_separator: str = _DEFAULT_COLUMN_SEPARATOR,
+    db_summary_version: str = "v1.0",
+) -> Tuple[str, Dict[str, Any]]:
+    """Format the summary of a table from its already fetched metadata."""
     columns = []
     metadata = {
         "table_name": table_name,
         "separated": 0,
         "db_summary_version": db_summary_version,
     }
-    for column in conn.get_columns(table_name):
+    for column in raw_columns:
         col_name = column["name"]
         col_type = str(column["type"]) if "type" in column else None
         col_comment = column.get("comment")
@@ -229,7 +291,6 @@ def _parse_table_summary_with_metadata(
     column_str = column_separator.join(separated_columns)
     # Obtain index information
     index_keys = []
-    raw_indexes = conn.get_indexes(table_name)
     for index in raw_indexes:
         if isinstance(index, tuple):  # Process tuple type index information
             index_name, index_creation_command = index
@@ -242,14 +303,6 @@ def _parse_table_summary_with_metadata(
             key_str = ", ".join(index["column_names"])
             index_keys.append(f"{index['name']}(`{key_str}`) ")
 
-    table_comment = ""
-
-    try:
-        comment = conn.get_table_comment(table_name)
-        table_comment = comment.get("text")
-    except Exception:
-        pass
-
     index_key_str = ", ".join(index_keys)
     table_str = summary_template.format(
         table_name=table_name, table_comment=table_comment, index_keys=index_key_str
@@ -1,7 +1,13 @@
 import unittest
 from unittest.mock import Mock
 
-from ...summary.rdbms_db_summary import RdbmsSummary
+from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteTempConnector
+
+from ...summary.rdbms_db_summary import (
+    RdbmsSummary,
+    _parse_db_summary_with_metadata,
+    _table_schema_fingerprint,
+)
 
 
 class MockRDBMSConnector(object):
@@ -63,5 +69,55 @@ class TestRdbmsSummary(unittest.TestCase):
         )
 
 
+class TestParseDbSummaryWithMetadata(unittest.TestCase):
+    def setUp(self):
+        self.connector = SQLiteTempConnector.create_temporary_db()
+        self.connector.create_temp_tables(
+            {
+                "user": {
+                    "columns": {"id": "INTEGER PRIMARY KEY", "name": "TEXT"},
+                    "data": [],
+                },
+                "orders": {
+                    "columns": {"id": "INTEGER PRIMARY KEY", "uid": "INTEGER"},
+                    "data": [],
+                },
+            }
+        )
+        self.connector._write("CREATE INDEX idx_uid ON orders(uid)")
+
+    def _summaries(self, **kwargs):
+        return {
+            metadata["table_name"]: summary
+            for summary, metadata in _parse_db_summary_with_metadata(
+                self.connector, **kwargs
+            )
+        }
+
+    def test_summary_of_all_tables(self):
+        summaries = self._summaries()
+        self.assertEqual(set(summaries), {"user", "orders"})
+        self.assertIn("idx_uid(`uid`)", summaries["orders"])
+        self.assertIn('"name" TEXT', summaries["user"])
+        self.assertEqual(summaries, self._summaries(max_workers=4))
+
+    def test_summary_of_selected_tables(self):
+        summaries = self._summaries(table_names=["orders"])
+        self.assertEqual(list(summaries), ["orders"])
+
+    def test_fingerprint_changes_with_schema(self):
+        before = self._summaries()
+        self.connector._write("ALTER TABLE user ADD COLUMN age INTEGER")
+        after = self._summaries()
+        self.assertNotEqual(
+            _table_schema_fingerprint(before["user"]),
+            _table_schema_fingerprint(after["user"]),
+        )
+        self.assertEqual(
+            _table_schema_fingerprint(before["orders"]),
+            _table_schema_fingerprint(after["orders"]),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,44 @@
+from unittest.mock import MagicMock
+
+from dbgpt.core import Chunk
+from dbgpt_ext.rag.schemalinker.schema_linking import SchemaLinking
+
+
+def _chunk(table_name: str) -> Chunk:
+    return Chunk(
+        content=f"table_name: {table_name}", metadata={"table_name": table_name}
+    )
+
+
+def test_schema_linking_with_vector_db_batch():
+    index_store = MagicMock()
+    index_store.similar_search_batch.return_value = [
+        [_chunk("user"), _chunk("order")],
+        [_chunk("order"), _chunk("item")],
+    ]
+    linker = SchemaLinking(
+        connector=MagicMock(),
+        model_name="test",
+        llm=MagicMock(),
+        top_k=2,
+        index_store=index_store,
+    )
+    chunks = linker.schema_linking_with_vector_db(["users", "orders"])
+
+    index_store.similar_search_batch.assert_called_once_with(["users", "orders"], 2)
+    assert [c.metadata["table_name"] for c in chunks] == ["user", "order", "item"]
+
+
+def test_schema_linking_with_vector_db_single_query():
+    index_store = MagicMock()
+    index_store.similar_search_batch.return_value = [[_chunk("user")]]
+    linker = SchemaLinking(
+        connector=MagicMock(),
+        model_name="test",
+        llm=MagicMock(),
+        index_store=index_store,
+    )
+    chunks = linker.schema_linking_with_vector_db("users")
+
+    index_store.similar_search_batch.assert_called_once_with(["users"], 5)
+    assert len(chunks) == 1
@@ -1,9 +1,12 @@
 """Elasticsearch document store."""
 
+import asyncio
 import json
 import os
+import threading
 from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import List, Optional
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Iterable, List, Optional
 
 from dbgpt.core import Chunk
 from dbgpt.storage.base import IndexStoreConfig, logger
@@ -13,6 +16,10 @@ from dbgpt.util import string_utils
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt_ext.storage.vector_store.elastic_store import ElasticsearchStoreConfig
 
+_DEFAULT_BULK_CHUNK_SIZE = 500
+_DEFAULT_BULK_MAX_BYTES = 10 * 1024 * 1024
+_DEFAULT_BULK_MAX_INFLIGHT = 4
+
 
 class ElasticDocumentStore(FullTextStoreBase):
     """Elasticsearch index store."""
@@ -24,6 +31,11 @@ class ElasticDocumentStore(FullTextStoreBase):
         k1: Optional[float] = 2.0,
         b: Optional[float] = 0.75,
         executor: Optional[Executor] = None,
+        bulk_chunk_size: int = _DEFAULT_BULK_CHUNK_SIZE,
+        bulk_max_bytes: int = _DEFAULT_BULK_MAX_BYTES,
+        bulk_max_inflight: int = _DEFAULT_BULK_MAX_INFLIGHT,
+        es_client: Optional[Any] = None,
+        async_es_client: Optional[Any] = None,
     ):
         """Init elasticsearch index store.
 
@@ -32,11 +44,17 @@ class ElasticDocumentStore(FullTextStoreBase):
         TF/IDF based similarity that has built-in tf normalization and is supposed to
         work better for short fields (like names). See Okapi_BM25 for more details.
         This similarity has the following options:
+
+        Args:
+            bulk_chunk_size(int): Max number of documents in one bulk request.
+            bulk_max_bytes(int): Max bytes of the documents in one bulk request.
+            bulk_max_inflight(int): Max number of bulk requests sent in parallel.
+            es_client: The elasticsearch client, create one from the config if not
+                set.
+            async_es_client: The async elasticsearch client, create one from the
+                config if not set.
         """
         super().__init__()
-        self._es_config = es_config
-        from elasticsearch import Elasticsearch
-
         self._es_config = es_config
         self._es_url = es_config.uri or os.getenv("ELASTICSEARCH_URL", "localhost")
         self._es_port = es_config.port or os.getenv("ELASTICSEARCH_PORT", "9200")
@@ -55,15 +73,30 @@ class ElasticDocumentStore(FullTextStoreBase):
         # b (Optional[float]): Controls to what degree document length normalizes
         #             tf values. The default value is 0.75.
         self._b = b or 0.75
-        if self._es_username and self._es_password:
-            self._es_client = Elasticsearch(
-                hosts=[f"http://{self._es_url}:{self._es_port}"],
-                basic_auth=(self._es_username, self._es_password),
-            )
-        else:
-            self._es_client = Elasticsearch(
-                hosts=[f"http://{self._es_url}:{self._es_port}"],
-            )
+        self._bulk_chunk_size = bulk_chunk_size
+        self._bulk_max_bytes = bulk_max_bytes
+        self._bulk_max_inflight = max(1, bulk_max_inflight)
+        self._bulk_lock = threading.Lock()
+        self._bulk_sessions = 0
+        self._refresh_interval: Optional[str] = None
+        self._es_client_kwargs: Optional[Dict[str, Any]] = None
+        # Only the clients created by the store are closed by it
+        self._owns_es_client = es_client is None
+        self._owns_async_es_client = False
+        if es_client is None:
+            from elasticsearch import Elasticsearch
+
+            self._es_client_kwargs = {
+                "hosts": [f"http://{self._es_url}:{self._es_port}"]
+            }
+            if self._es_username and self._es_password:
+                self._es_client_kwargs["basic_auth"] = (
+                    self._es_username,
+                    self._es_password,
+                )
+            es_client = Elasticsearch(**self._es_client_kwargs)
+        self._es_client = es_client
+        self._async_es_client = async_es_client
         self._es_index_settings = {
             "analysis": {"analyzer": {"default": {"type": "standard"}}},
             "similarity": {
@@ -93,43 +126,203 @@ class ElasticDocumentStore(FullTextStoreBase):
                 settings=self._es_index_settings,
             )
         self._executor = executor or ThreadPoolExecutor()
+        # The bulk requests of all the loads of the store share the in-flight limit
+        self._bulk_executor = ThreadPoolExecutor(max_workers=self._bulk_max_inflight)
+        self._bulk_semaphore = asyncio.Semaphore(self._bulk_max_inflight)
 
     def get_config(self) -> IndexStoreConfig:
         """Get the es store config."""
         return self._es_config
 
+    def _get_async_client(self) -> Optional[Any]:
+        """Get the async client, return None if it can't be created."""
+        if self._async_es_client is None and self._es_client_kwargs is not None:
+            try:
+                from elasticsearch import AsyncElasticsearch
+
+                self._async_es_client = AsyncElasticsearch(**self._es_client_kwargs)
+                self._owns_async_es_client = True
+            except Exception as e:
+                logger.warning(
+                    f"Create async elasticsearch client failed: {e}, fall back to the "
+                    "sync client. Please install it with "
+                    "`pip install elasticsearch[async]`."
+                )
+                self._es_client_kwargs = None
+        return self._async_es_client
+
+    @property
+    def _in_bulk_session(self) -> bool:
+        return self._bulk_sessions > 0
+
+    def _bulk_batches(self, chunks: List[Chunk]) -> List[List[Dict[str, Any]]]:
+        """Split the bulk operations of the chunks by count and bytes."""
+        batches: List[List[Dict[str, Any]]] = []
+        operations: List[Dict[str, Any]] = []
+        batch_count = 0
+        batch_bytes = 0
+        for chunk in chunks:
+            action = {"index": {"_index": self._index_name, "_id": chunk.chunk_id}}
+            source = {"content": chunk.content, "metadata": json.dumps(chunk.metadata)}
+            # Each operation is a line of the ndjson body
+            size = sum(
+                len(json.dumps(op, ensure_ascii=False).encode("utf-8")) + 1
+                for op in (action, source)
+            )
+            if operations and (
+                batch_count >= self._bulk_chunk_size
+                or batch_bytes + size > self._bulk_max_bytes
+            ):
+                batches.append(operations)
+                operations = []
+                batch_count = 0
+                batch_bytes = 0
+            operations.extend([action, source])
+            batch_count += 1
+            batch_bytes += size
+        if operations:
+            batches.append(operations)
+        return batches
+
+    @staticmethod
+    def _check_bulk_response(response: Any) -> None:
+        if not response["errors"]:
+            return
+        errors = [
+            result["error"]
+            for item in response["items"]
+            for result in item.values()
+            if "error" in result
+        ]
+        raise ValueError(
+            f"Bulk index {len(errors)} documents failed, first error: {errors[0]}"
+        )
+
+    def _bulk_once(self, operations: List[Dict[str, Any]]) -> None:
+        response = self._es_client.bulk(body=operations)
+        self._check_bulk_response(response)
+
+    def _begin_bulk_session(self) -> None:
+        with self._bulk_lock:
+            self._bulk_sessions += 1
+            if self._bulk_sessions > 1:
+                return
+            try:
+                settings = self._es_client.indices.get_settings(
+                    index=self._index_name, name="index.refresh_interval"
+                )
+                try:
+                    refresh_interval = settings[self._index_name]["settings"]["index"][
+                        "refresh_interval"
+                    ]
+                except KeyError:
+                    refresh_interval = None
+                # "-1" is left by a session which was never ended, e.g. the process
+                # was killed, restore the default instead of keeping it disabled
+                self._refresh_interval = (
+                    None if refresh_interval in ("-1", -1) else refresh_interval
+                )
+                self._es_client.indices.put_settings(
+                    index=self._index_name,
+                    settings={"index": {"refresh_interval": "-1"}},
+                )
+            except Exception:
+                self._bulk_sessions -= 1
+                raise
+
+    def _end_bulk_session(self) -> None:
+        with self._bulk_lock:
+            self._bulk_sessions -= 1
+            if self._bulk_sessions > 0:
+                return
+            try:
+                # None resets the refresh interval to the default of the index
+                self._es_client.indices.put_settings(
+                    index=self._index_name,
+                    settings={"index": {"refresh_interval": self._refresh_interval}},
+                )
+            finally:
+                self._refresh_interval = None
+                self._es_client.indices.refresh(index=self._index_name)
+
+    @contextmanager
+    def bulk_session(self):
+        """Open a bulk-ingest session.
+
+        The refresh of the index is disabled in the session, the documents loaded in
+        the session are searchable after the index is refreshed once at the end.
+        Sessions can be nested, only the outermost one changes the index settings.
+
+        Examples:
+            .. code-block:: python
+
+                with store.bulk_session():
+                    for chunks in chunk_groups:
+                        store.load_document(chunks)
+        """
+        self._begin_bulk_session()
+        try:
+            yield self
+        finally:
+            self._end_bulk_session()
+
+    @asynccontextmanager
+    async def abulk_session(self):
+        """Open a bulk-ingest session asynchronously, see :meth:`bulk_session`."""
+        await blocking_func_to_async(self._executor, self._begin_bulk_session)
+        try:
+            yield self
+        finally:
+            await blocking_func_to_async(self._executor, self._end_bulk_session)
+
     def load_document(self, chunks: List[Chunk]) -> List[str]:
         """Load document in elasticsearch.
 
+        The chunks are split into bulk requests by bulk_chunk_size and
+        bulk_max_bytes, at most bulk_max_inflight requests of the store are sent in
+        parallel. The index is refreshed after loading unless in a bulk session.
+
         Args:
             chunks(List[Chunk]): document chunks.
 
         Return:
             List[str]: chunk ids.
         """
-        try:
-            from elasticsearch.helpers import bulk
-        except ImportError:
-            raise ValueError("Please install package `pip install elasticsearch`.")
-        es_requests = []
-        ids = []
-        contents = [chunk.content for chunk in chunks]
-        metadatas = [json.dumps(chunk.metadata) for chunk in chunks]
-        chunk_ids = [chunk.chunk_id for chunk in chunks]
-        for i, content in enumerate(contents):
-            es_request = {
-                "_op_type": "index",
-                "_index": self._index_name,
-                "content": content,
-                "metadata": metadatas[i],
-                "_id": chunk_ids[i],
-            }
-            ids.append(chunk_ids[i])
-            es_requests.append(es_request)
-        bulk(self._es_client, es_requests)
-        self._es_client.indices.refresh(index=self._index_name)
+        ids = [chunk.chunk_id for chunk in chunks]
+        batches = self._bulk_batches(chunks)
+        if len(batches) > 1 and self._bulk_max_inflight > 1:
+            list(self._bulk_executor.map(self._bulk_once, batches))
+        else:
+            for operations in batches:
+                self._bulk_once(operations)
+        if not self._in_bulk_session:
+            self._es_client.indices.refresh(index=self._index_name)
         return ids
 
+    def load_document_with_limit(
+        self,
+        chunks: Iterable[Chunk],
+        max_chunks_once_load: Optional[int] = None,
+        max_threads: Optional[int] = None,
+    ) -> List[str]:
+        """Load document in a bulk session, refresh the index once at the end."""
+        with self.bulk_session():
+            return super().load_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+
+    async def aload_document_with_limit(
+        self,
+        chunks: Iterable[Chunk],
+        max_chunks_once_load: Optional[int] = None,
+        max_threads: Optional[int] = None,
+    ) -> List[str]:
+        """Async load document in a bulk session, refresh the index once at the end."""
+        async with self.abulk_session():
+            return await super().aload_document_with_limit(
+                chunks, max_chunks_once_load, max_threads
+            )
+
     def similar_search(
         self, text: str, topk: int, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -204,7 +397,23 @@ class ElasticDocumentStore(FullTextStoreBase):
         Return:
             List[str]: chunk ids.
         """
-        return await blocking_func_to_async(self._executor, self.load_document, chunks)
+        client = self._get_async_client()
+        if client is None:
+            return await blocking_func_to_async(
+                self._executor, self.load_document, chunks
+            )
+
+        async def _bulk_once(operations: List[Dict[str, Any]]) -> None:
+            async with self._bulk_semaphore:
+                response = await client.bulk(body=operations)
+            self._check_bulk_response(response)
+
+        await asyncio.gather(
+            *[_bulk_once(operations) for operations in self._bulk_batches(chunks)]
+        )
+        if not self._in_bulk_session:
+            await client.indices.refresh(index=self._index_name)
+        return [chunk.chunk_id for chunk in chunks]
 
     def delete_by_ids(self, ids: str) -> List[str]:
         """Delete document by ids.
@@ -229,3 +438,31 @@ class ElasticDocumentStore(FullTextStoreBase):
             index_name(str): The name of index to delete.
         """
         self._es_client.indices.delete(index=self._index_name)
+
+    def close(self):
+        """Close the clients created by the store and its bulk executor."""
+        self._bulk_executor.shutdown(wait=False)
+        async_client = self._pop_owned_async_client()
+        if async_client is not None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                asyncio.run(async_client.close())
+            else:
+                loop.create_task(async_client.close())
+        if self._owns_es_client:
+            self._es_client.close()
+
+    async def aclose(self):
+        """Close the clients created by the store asynchronously."""
+        async_client = self._pop_owned_async_client()
+        if async_client is not None:
+            await async_client.close()
+        self.close()
+
+    def _pop_owned_async_client(self) -> Optional[Any]:
+        if not self._owns_async_es_client or self._async_es_client is None:
+            return None
+        client, self._async_es_client = self._async_es_client, None
+        self._owns_async_es_client = False
+        return client
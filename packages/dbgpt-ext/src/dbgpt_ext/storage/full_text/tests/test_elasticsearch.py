@@ -0,0 +1,140 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt.util.benchmarks.rag._es_stub import (
+    AsyncStubElasticsearch,
+    StubElasticsearch,
+)
+from dbgpt_ext.storage.full_text.elasticsearch import ElasticDocumentStore
+from dbgpt_ext.storage.vector_store.elastic_store import ElasticsearchStoreConfig
+
+
+def _create_store(client: StubElasticsearch, **kwargs) -> ElasticDocumentStore:
+    return ElasticDocumentStore(
+        ElasticsearchStoreConfig(),
+        name="test",
+        es_client=client,
+        async_es_client=AsyncStubElasticsearch(client),
+        **kwargs,
+    )
+
+
+def _chunks(num: int, content: str = "content") -> list:
+    return [Chunk(chunk_id=f"id_{i}", content=content) for i in range(num)]
+
+
+def test_load_document_refresh_once():
+    client = StubElasticsearch()
+    store = _create_store(client, bulk_chunk_size=10)
+    ids = store.load_document(_chunks(25))
+
+    assert ids == [f"id_{i}" for i in range(25)]
+    assert client.bulk_sizes == [10, 10, 5]
+    assert len(client.documents["test"]) == 25
+    assert client.refresh_count == 1
+
+
+def test_bulk_split_by_bytes():
+    client = StubElasticsearch()
+    store = _create_store(client, bulk_max_bytes=1024)
+    store.load_document(_chunks(10, content="x" * 400))
+
+    assert client.bulk_sizes == [2, 2, 2, 2, 2]
+
+
+def test_bulk_bounded_inflight():
+    client = StubElasticsearch(bulk_latency=0.02)
+    store = _create_store(client, bulk_chunk_size=1, bulk_max_inflight=3)
+    store.load_document(_chunks(12))
+
+    assert len(client.documents["test"]) == 12
+    assert 1 < client.max_inflight <= 3
+
+
+def test_bulk_errors_raised():
+    client = StubElasticsearch()
+    client.fail_ids = ["id_1"]
+    store = _create_store(client)
+    with pytest.raises(ValueError, match="1 documents failed"):
+        store.load_document(_chunks(3))
+
+
+def test_bulk_session_defers_refresh():
+    client = StubElasticsearch()
+    store = _create_store(client, bulk_chunk_size=10)
+    client.indices_settings["test"] = {"refresh_interval": "5s"}
+    with store.bulk_session():
+        with store.bulk_session():
+            store.load_document(_chunks(5))
+        assert client.indices_settings["test"]["refresh_interval"] == "-1"
+        store.load_document(_chunks(5))
+        assert client.refresh_count == 0
+
+    assert client.refresh_count == 1
+    assert client.indices_settings["test"] == {"refresh_interval": "5s"}
+    assert len(client.settings_history) == 2
+
+
+def test_load_document_with_limit_refresh_once():
+    client = StubElasticsearch()
+    store = _create_store(client)
+    ids = store.load_document_with_limit(_chunks(100), max_chunks_once_load=10)
+
+    assert len(ids) == 100
+    assert client.refresh_count == 1
+    # The default refresh interval is restored
+    assert client.indices_settings["test"] == {}
+
+
+@pytest.mark.asyncio
+async def test_aload_document_with_limit():
+    client = StubElasticsearch(bulk_latency=0.01)
+    store = _create_store(client, bulk_chunk_size=5, bulk_max_inflight=2)
+    ids = await store.aload_document_with_limit(
+        _chunks(100), max_chunks_once_load=20, max_threads=2
+    )
+
+    assert len(ids) == 100
+    assert len(client.documents["test"]) == 100
+    assert client.refresh_count == 1
+    assert client.max_inflight <= 4
+
+
+def test_bulk_inflight_shared_by_loads():
+    client = StubElasticsearch(bulk_latency=0.02)
+    store = _create_store(client, bulk_chunk_size=1, bulk_max_inflight=2)
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda _: store.load_document(_chunks(4)), range(4)))
+
+    assert client.max_inflight <= 2
+
+
+def test_bulk_session_restores_disabled_refresh():
+    client = StubElasticsearch()
+    store = _create_store(client)
+    # Left disabled by a session which was never ended
+    client.indices_settings["test"] = {"refresh_interval": "-1"}
+    with store.bulk_session():
+        store.load_document(_chunks(5))
+
+    assert client.indices_settings["test"] == {}
+
+
+@pytest.mark.asyncio
+async def test_aclose_owned_clients():
+    client = StubElasticsearch()
+    store = _create_store(client)
+    async_client = store._async_es_client
+    await store.aclose()
+    # The clients passed in are not owned by the store
+    assert not async_client.closed and not client.closed
+
+    store = _create_store(client)
+    store._owns_async_es_client = True
+    store._owns_es_client = True
+    async_client = store._async_es_client
+    await store.aclose()
+    assert async_client.closed and client.closed
+    assert store._async_es_client is None
@@ -1,5 +1,6 @@
 """Define the CommunitySummaryKnowledgeGraph."""
 
+import asyncio
 import logging
 import os
 import uuid
@@ -474,22 +475,27 @@ class CommunitySummaryKnowledgeGraph(BuiltinKnowledgeGraph):
         filters: Optional[MetadataFilters] = None,
     ) -> List[Chunk]:
         """Retrieve relevant community summaries."""
-        # Global search: retrieve relevant community summaries
-        communities = await self._community_store.search_communities(text)
+        # Global search: retrieve relevant community summaries, the local search of
+        # the graph retriever is independent of it, so they run concurrently
+        (
+            communities,
+            (
+                subgraph,
+                (
+                    subgraph_for_doc,
+                    text2gql_query,
+                ),
+            ),
+        ) = await asyncio.gather(
+            self._community_store.search_communities(text),
+            self._graph_retriever.retrieve(text),
+        )
         summaries = [
             f"Section {i + 1}:\n{community.summary}"
             for i, community in enumerate(communities)
         ]
         context = "\n".join(summaries) if summaries else ""
 
-        (
-            subgraph,
-            (
-                subgraph_for_doc,
-                text2gql_query,
-            ),
-        ) = await self._graph_retriever.retrieve(text)
-
         knowledge_graph_str = subgraph.format() if subgraph else ""
         knowledge_graph_for_doc_str = (
             subgraph_for_doc.format() if subgraph_for_doc else ""
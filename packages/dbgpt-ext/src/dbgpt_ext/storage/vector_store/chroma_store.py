@@ -84,6 +84,8 @@ class ChromaVectorConfig(VectorStoreConfig):
 class ChromaStore(VectorStoreBase):
     """Chroma vector store."""
 
+    _supports_pipeline_load = True
+
     def __init__(
         self,
         vector_store_config: ChromaVectorConfig,
@@ -160,22 +162,27 @@ class ChromaStore(VectorStoreBase):
     ) -> List[Chunk]:
         """Search similar documents."""
         logger.info("ChromaStore similar search")
-        chroma_results = self._query(
-            text=text,
-            topk=topk,
-            filters=filters,
-        )
+        return self.similar_search_batch([text], topk, filters)[0]
+
+    def similar_search_batch(
+        self, texts: List[str], topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[List[Chunk]]:
+        """Search similar documents of many queries with one query request."""
+        chroma_results = self._query_batch(texts=texts, topk=topk, filters=filters)
         return [
-            Chunk(
-                content=chroma_result[0],
-                metadata=chroma_result[1] or {},
-                score=0.0,
-                chunk_id=chroma_result[2],
-            )
-            for chroma_result in zip(
-                chroma_results["documents"][0],
-                chroma_results["metadatas"][0],
-                chroma_results["ids"][0],
+            [
+                Chunk(
+                    content=chroma_result[0],
+                    metadata=chroma_result[1] or {},
+                    score=0.0,
+                    chunk_id=chroma_result[2],
+                )
+                for chroma_result in zip(documents, metadatas, ids)
+            ]
+            for documents, metadatas, ids in zip(
+                chroma_results["documents"],
+                chroma_results["metadatas"],
+                chroma_results["ids"],
             )
         ]
 
@@ -195,28 +202,37 @@ class ChromaStore(VectorStoreBase):
             filters(MetadataFilters): metadata filters, defaults to None
         """
         logger.info("ChromaStore similar search with scores")
-        chroma_results = self._query(
-            text=text,
-            topk=topk,
-            filters=filters,
-        )
-        chunks = [
-            (
+        return self.similar_search_with_scores_batch(
+            [text], topk, score_threshold, filters
+        )[0]
+
+    def similar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Search similar documents with scores of many queries with one request."""
+        chroma_results = self._query_batch(texts=texts, topk=topk, filters=filters)
+        results = []
+        for documents, metadatas, distances, ids in zip(
+            chroma_results["documents"],
+            chroma_results["metadatas"],
+            chroma_results["distances"],
+            chroma_results["ids"],
+        ):
+            chunks = [
                 Chunk(
                     content=chroma_result[0],
                     metadata=chroma_result[1] or {},
                     score=(1 - chroma_result[2]),
                     chunk_id=chroma_result[3],
                 )
-            )
-            for chroma_result in zip(
-                chroma_results["documents"][0],
-                chroma_results["metadatas"][0],
-                chroma_results["distances"][0],
-                chroma_results["ids"][0],
-            )
-        ]
-        return self.filter_by_score_threshold(chunks, score_threshold)
+                for chroma_result in zip(documents, metadatas, distances, ids)
+            ]
+            results.append(self.filter_by_score_threshold(chunks, score_threshold))
+        return results
 
     def vector_name_exists(self) -> bool:
         """Whether vector name exists."""
@@ -227,17 +243,39 @@ class ChromaStore(VectorStoreBase):
             logger.info(f"Collection {self._collection_name} does not exist")
             return False
 
-    def load_document(self, chunks: List[Chunk]) -> List[str]:
-        """Load document to vector store."""
+    def load_document(self, chunks: Iterable[Chunk]) -> List[str]:
+        """Load document to vector store.
+
+        The chunks are read lazily in batches of max_chunks_once_load, each batch is
+        embedded to a float32 array and upserted, the next batch is embedded while
+        the current batch is being upserted.
+        """
         logger.info("ChromaStore load document")
+        return self._load_document_in_batches(chunks, self._max_chunks_once_load)
+
+    def _load_document_in_batches(
+        self, chunks: Iterable[Chunk], batch_size: int
+    ) -> List[str]:
+        return self._pipeline_load(
+            chunks, batch_size, self._embed_chunks, self._upsert_chunks
+        )
+
+    def _embed_chunks(self, chunks: List[Chunk]) -> Any:
+        if self.embeddings is None:
+            return None
+        return self._to_vector_array(
+            self.embeddings.embed_documents([chunk.content for chunk in chunks])
+        )
+
+    def _upsert_chunks(self, chunks: List[Chunk], embeddings: Any) -> List[str]:
         texts = [chunk.content for chunk in chunks]
-        metadatas = [chunk.metadata for chunk in chunks]
         ids = [chunk.chunk_id for chunk in chunks]
         chroma_metadatas = [
-            _transform_chroma_metadata(metadata) for metadata in metadatas
+            _transform_chroma_metadata(chunk.metadata) for chunk in chunks
         ]
-        self._add_texts(texts=texts, metadatas=chroma_metadatas, ids=ids)
-        return ids
+        return self._add_texts(
+            texts=texts, ids=ids, metadatas=chroma_metadatas, embeddings=embeddings
+        )
 
     def delete_vector_name(self, vector_name: str):
         """Delete vector name and clean up resources.
@@ -353,6 +391,7 @@ class ChromaStore(VectorStoreBase):
         texts: Iterable[str],
         ids: List[str],
         metadatas: Optional[List[Mapping[str, Union[str, int, float, bool]]]] = None,
+        embeddings: Optional[Any] = None,
     ) -> List[str]:
         """Add texts to Chroma collection.
 
@@ -360,13 +399,14 @@ class ChromaStore(VectorStoreBase):
             texts(Iterable[str]): texts.
             metadatas(Optional[List[dict]]): metadatas.
             ids(Optional[List[str]]): ids.
+            embeddings(Optional[Any]): the float32 vectors of the texts, the texts
+                are embedded if not provided.
         Returns:
             List[str]: ids.
         """
-        embeddings = None
         texts = list(texts)
-        if self.embeddings is not None:
-            embeddings = self.embeddings.embed_documents(texts)
+        if embeddings is None and self.embeddings is not None:
+            embeddings = self._to_vector_array(self.embeddings.embed_documents(texts))
         if metadatas:
             try:
                 self._collection.upsert(
@@ -397,15 +437,44 @@ class ChromaStore(VectorStoreBase):
         """
         if not text:
             return {}
+        return self._query_batch([text], topk, filters)
+
+    def _query_batch(
+        self, texts: List[str], topk: int, filters: Optional[MetadataFilters] = None
+    ) -> Dict[str, List[List[Any]]]:
+        """Query Chroma collection with the embeddings of many texts.
+
+        All the texts are embedded in one call and searched in one query request,
+        the empty texts get empty results.
+
+        Args:
+            texts(List[str]): query texts.
+            topk(int): topk.
+            filters(MetadataFilters): metadata filters.
+        Returns:
+            Dict[str, List[List[Any]]]: query result, each field has a list of
+                results for each text.
+        """
+        keys = ["documents", "metadatas", "distances", "ids"]
+        results: Dict[str, List[List[Any]]] = {key: [[] for _ in texts] for key in keys}
+        query_index = [i for i, text in enumerate(texts) if text]
+        if not query_index:
+            return results
         where_filters = self.convert_metadata_filters(filters) if filters else None
         if self.embeddings is None:
             raise ValueError("Chroma Embeddings is None")
-        query_embedding = self.embeddings.embed_query(text)
-        return self._collection.query(
-            query_embeddings=query_embedding,
+        query_embeddings = self.embeddings.embed_queries(
+            [texts[i] for i in query_index]
+        )
+        chroma_results = self._collection.query(
+            query_embeddings=query_embeddings,
             n_results=topk,
             where=where_filters,
         )
+        for key in keys:
+            for i, values in zip(query_index, chroma_results.get(key) or []):
+                results[key][i] = values or []
+        return results
 
     def _clean_persist_folder(self):
         """Clean persist folder."""
@@ -6,7 +6,7 @@ import json
 import logging
 import os
 from dataclasses import dataclass, field
-from typing import Any, Iterable, List, Optional
+from typing import Any, Iterable, List, Optional, Tuple
 
 from dbgpt.core import Chunk, Embeddings
 from dbgpt.core.awel.flow import Parameter, ResourceCategory, register_resource
@@ -193,6 +193,8 @@ class MilvusVectorConfig(VectorStoreConfig):
 class MilvusStore(VectorStoreBase):
     """Milvus vector store."""
 
+    _supports_pipeline_load = True
+
     def __init__(
         self,
         vector_store_config: MilvusVectorConfig,
@@ -200,6 +202,7 @@ class MilvusStore(VectorStoreBase):
         embedding_fn: Optional[Embeddings] = None,
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
+        max_inflight_batches: Optional[int] = None,
     ) -> None:
         """Create a MilvusStore instance.
 
@@ -208,7 +211,9 @@ class MilvusStore(VectorStoreBase):
             refer to https://milvus.io/docs/v2.0.x/manage_connection.md
         """
         super().__init__(
-            max_chunks_once_load=max_chunks_once_load, max_threads=max_threads
+            max_chunks_once_load=max_chunks_once_load,
+            max_threads=max_threads,
+            max_inflight_batches=max_inflight_batches,
         )
         self._vector_store_config = vector_store_config
 
@@ -288,6 +293,11 @@ class MilvusStore(VectorStoreBase):
             password=self.password,
             alias="default",
         )
+        # The load state, the fields and the search params of the collection are
+        # resolved once, and refreshed when the collection or its index changes
+        self._col_loaded = False
+        self._fields_resolved = False
+        self._search_param: Optional[dict] = None
         self.col = self.create_collection(collection_name=self.collection_name)
 
     def create_collection(self, collection_name: str, **kwargs) -> Any:
@@ -321,13 +331,13 @@ class MilvusStore(VectorStoreBase):
                 alias="default",
                 # secure=self.secure,
             )
-        embeddings = self.embedding.embed_query(collection_name)
-
         if utility.has_collection(collection_name):
             return Collection(self.collection_name, using=self.alias)
             # return self.collection_name
 
-        dim = len(embeddings)
+        # The dimension is registered per model, only the first collection of a
+        # new model calls the embedding model
+        dim = self.embedding.embedding_dimension()
         # Generate unique names
         primary_field = self.primary_field
         vector_field = self.vector_field
@@ -356,40 +366,69 @@ class MilvusStore(VectorStoreBase):
         # milvus index
         collection.create_index(vector_field, index)
         collection.load()
+        self._refresh_collection()
+        self._col_loaded = True
         return collection
 
-    def _load_documents(self, documents) -> List[str]:
+    def _get_collection(self) -> Any:
+        """Get the collection, create it if it has been dropped."""
+        if self.col is None:
+            self.col = self.create_collection(collection_name=self.collection_name)
+        return self.col
+
+    def _refresh_collection(self) -> None:
+        """Forget the cached state of the collection, e.g. after its index changes."""
+        self._col_loaded = False
+        self._fields_resolved = False
+        self._search_param = None
+
+    def _resolve_fields(self) -> None:
+        """Resolve the fields of the collection from its schema once."""
+        if self._fields_resolved:
+            return
+        try:
+            from pymilvus import DataType
+        except ImportError:
+            raise ValueError(
+                "Could not import pymilvus python package. "
+                "Please install it with `pip install pymilvus`."
+            )
+        fields = []
+        for x in self._get_collection().schema.fields:
+            if not x.auto_id:
+                fields.append(x.name)
+            if x.is_primary:
+                self.primary_field = x.name
+            if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
+                self.vector_field = x.name
+        self.fields = fields
+        self._fields_resolved = True
+
+    def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed the texts to insert."""
+        try:
+            return self.embedding.embed_documents(texts)
+        except NotImplementedError:
+            return [self.embedding.embed_query(x) for x in texts]
+
+    def _load_documents(
+        self, documents: List[Chunk], embeddings: Optional[List[List[float]]] = None
+    ) -> List[str]:
         """Load documents into Milvus.
 
         Load documents.
 
         Args:
             documents (List[str]): Text to insert.
+            embeddings (Optional[List[List[float]]]): The embedded vectors of the
+                documents, embed the documents if not set.
         Returns:
             List[str]: document ids.
         """
-        try:
-            from pymilvus import (
-                DataType,
-            )
-            from pymilvus.orm.types import infer_dtype_bydata  # noqa: F401
-        except ImportError:
-            raise ValueError(
-                "Could not import pymilvus python package. "
-                "Please install it with `pip install pymilvus`."
-            )
         texts = [d.content for d in documents]
         metadatas = [d.metadata for d in documents]
-        self.fields = []
-        for x in self.col.schema.fields:
-            self.fields.append(x.name)
-            if x.auto_id:
-                self.fields.remove(x.name)
-            if x.is_primary:
-                self.primary_field = x.name
-            if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
-                self.vector_field = x.name
-        return self._add_documents(texts, metadatas)
+        self._resolve_fields()
+        return self._add_documents(texts, metadatas, embeddings=embeddings)
 
     def _add_documents(
         self,
@@ -397,18 +436,14 @@ class MilvusStore(VectorStoreBase):
         metadatas: Optional[List[dict]] = None,
         partition_name: Optional[str] = None,
         timeout: Optional[int] = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> List[str]:
         """Add text data into Milvus."""
-        insert_dict: Any = {self.text_field: list(texts)}
-        try:
-            import numpy as np  # noqa: F401
-
-            text_vector = self.embedding.embed_documents(list(texts))
-            insert_dict[self.vector_field] = text_vector
-        except NotImplementedError:
-            insert_dict[self.vector_field] = [
-                self.embedding.embed_query(x) for x in texts
-            ]
+        texts = list(texts)
+        insert_dict: Any = {self.text_field: texts}
+        if embeddings is None:
+            embeddings = self._embed_documents(texts)
+        insert_dict[self.vector_field] = embeddings
         # Collect the metadata into the insert dict.
         # self.fields.extend(metadatas[0].keys())
         if len(self.fields) > 2 and metadatas is not None:
@@ -420,7 +455,7 @@ class MilvusStore(VectorStoreBase):
         # Convert dict to list of lists for insertion
         insert_list = [insert_dict[x] for x in self.fields]
         # Insert into the collection.
-        res = self.col.insert(
+        res = self._get_collection().insert(
             insert_list, partition_name=partition_name, timeout=timeout
         )
 
@@ -431,14 +466,21 @@ class MilvusStore(VectorStoreBase):
         return self._vector_store_config
 
     def load_document(self, chunks: List[Chunk]) -> List[str]:
-        """Load document in vector database."""
-        batch_size = 500
-        batched_list = [
-            chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)
-        ]
-        doc_ids = []
-        for doc_batch in batched_list:
-            doc_ids.extend(self._load_documents(doc_batch))
+        """Load document in vector database.
+
+        The next batch is embedded while the current batch is being inserted.
+        """
+        return self._load_document_in_batches(chunks, 500)
+
+    def _load_document_in_batches(
+        self, chunks: Iterable[Chunk], batch_size: int
+    ) -> List[str]:
+        doc_ids = self._pipeline_load(
+            chunks,
+            batch_size,
+            lambda batch: self._embed_documents([d.content for d in batch]),
+            self._load_documents,
+        )
         doc_ids = [str(doc_id) for doc_id in doc_ids]
         return doc_ids
 
@@ -446,34 +488,24 @@ class MilvusStore(VectorStoreBase):
         self, text, topk, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
         """Perform a search on a query string and return results."""
-        try:
-            from pymilvus import Collection, DataType
-        except ImportError:
-            raise ValueError(
-                "Could not import pymilvus python package. "
-                "Please install it with `pip install pymilvus`."
-            )
-        """similar_search in vector database."""
-        self.col = Collection(self.collection_name)
-        schema = self.col.schema
-        for x in schema.fields:
-            self.fields.append(x.name)
-            if x.auto_id:
-                self.fields.remove(x.name)
-            if x.is_primary:
-                self.primary_field = x.name
-            if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
-                self.vector_field = x.name
+        return self.similar_search_batch([text], topk, filters)[0]
+
+    def similar_search_batch(
+        self, texts: List[str], topk: int, filters: Optional[MetadataFilters] = None
+    ) -> List[List[Chunk]]:
+        """Search many query strings with one request and return their results."""
         # convert to milvus expr filter.
         milvus_filter_expr = self.convert_metadata_filters(filters) if filters else None
-        _, docs_and_scores = self._search(text, topk, expr=milvus_filter_expr)
-
+        results = self._search_batch(texts, topk, expr=milvus_filter_expr)
         return [
-            Chunk(
-                metadata=json.loads(doc.metadata.get("metadata", "")),
-                content=doc.content,
-            )
-            for doc, _, _ in docs_and_scores
+            [
+                Chunk(
+                    metadata=json.loads(doc.metadata.get("metadata", "")),
+                    content=doc.content,
+                )
+                for doc, _, _ in docs_and_scores
+            ]
+            for docs_and_scores in results
         ]
 
     def similar_search_with_scores(
@@ -497,28 +529,38 @@ class MilvusStore(VectorStoreBase):
         Returns:
             List[Tuple[Document, float]]: Result doc and score.
         """
-        try:
-            from pymilvus import Collection, DataType
-        except ImportError:
-            raise ValueError(
-                "Could not import pymilvus python package. "
-                "Please install it with `pip install pymilvus`."
-            )
+        return self.similar_search_with_scores_batch(
+            [text], topk, score_threshold, filters
+        )[0]
 
-        self.col = Collection(self.collection_name)
-        schema = self.col.schema
-        for x in schema.fields:
-            self.fields.append(x.name)
-            if x.auto_id:
-                self.fields.remove(x.name)
-            if x.is_primary:
-                self.primary_field = x.name
+    def similar_search_with_scores_batch(
+        self,
+        texts: List[str],
+        topk: int,
+        score_threshold: float,
+        filters: Optional[MetadataFilters] = None,
+    ) -> List[List[Chunk]]:
+        """Search many query strings with one request and return results with score.
 
-            if x.dtype == DataType.FLOAT_VECTOR or x.dtype == DataType.BINARY_VECTOR:
-                self.vector_field = x.name
+        Args:
+            texts (List[str]): The query texts.
+            topk (int): The number of similar documents to return for each query.
+            score_threshold (float): Optional, a floating point value between 0 to 1.
+            filters (Optional[MetadataFilters]): Optional, metadata filters.
+        Returns:
+            List[List[Chunk]]: The result chunks with score of each query.
+        """
         # convert to milvus expr filter.
         milvus_filter_expr = self.convert_metadata_filters(filters) if filters else None
-        _, docs_and_scores = self._search(query=text, k=topk, expr=milvus_filter_expr)
+        results = self._search_batch(texts, topk, expr=milvus_filter_expr)
+        return [
+            self._filter_by_score(docs_and_scores, score_threshold)
+            for docs_and_scores in results
+        ]
+
+    def _filter_by_score(
+        self, docs_and_scores: List[Tuple[Chunk, float, Any]], score_threshold: float
+    ) -> Any:
         if any(score < 0.0 or score > 1.0 for _, score, id in docs_and_scores):
             logger.warning(
                 f"similarity score need between 0 and 1, got {docs_and_scores}"
@@ -567,44 +609,109 @@ class MilvusStore(VectorStoreBase):
         Returns:
             Tuple[Document, float, int]: Result doc and score.
         """
-        self.col.load()
-        # use default index params.
-        if param is None:
-            index_type = self.col.indexes[0].params["index_type"]
-            param = self.index_params_map[index_type]
-        #  query text embedding.
-        query_vector = self.embedding.embed_query(query)
-        # Determine result metadata fields.
-        output_fields = self.fields[:]
-        output_fields.remove(self.vector_field)
-        # milvus search.
-        res = self.col.search(
-            [query_vector],
-            self.vector_field,
-            param,
+        ret = self._search_batch(
+            [query],
             k,
+            param=param,
             expr=expr,
-            output_fields=output_fields,
             partition_names=partition_names,
             round_decimal=round_decimal,
-            timeout=60,
+            timeout=timeout,
             **kwargs,
-        )
-        ret = []
-        for result in res[0]:
-            meta = {x: result.entity.get(x) for x in output_fields}
-            ret.append(
-                (
-                    Chunk(content=meta.pop(self.text_field), metadata=meta),
-                    result.distance,
-                    result.id,
-                )
-            )
+        )[0]
         if len(ret) == 0:
-            logger.warning("No relevant docs were retrieved.")
             return None, []
         return ret[0], ret
 
+    def _search_batch(
+        self,
+        queries: List[str],
+        k: int = 4,
+        param: Optional[dict] = None,
+        expr: Optional[str] = None,
+        partition_names: Optional[List[str]] = None,
+        round_decimal: int = -1,
+        timeout: Optional[int] = None,
+        **kwargs: Any,
+    ) -> List[List[Tuple[Chunk, float, Any]]]:
+        """Search many queries in vector database with one request.
+
+        The collection is loaded and the search params are resolved only once, if
+        the search fails they are refreshed and the search is retried once.
+
+        Returns:
+            List[List[Tuple[Chunk, float, Any]]]: Result doc, score and id of each
+                query.
+        """
+        self._resolve_fields()
+        #  query text embedding.
+        query_vectors = self.embedding.embed_queries(queries)
+        # Determine result metadata fields.
+        output_fields = [x for x in self.fields if x != self.vector_field]
+        try:
+            res = self._search_vectors(
+                query_vectors,
+                k,
+                param,
+                expr=expr,
+                output_fields=output_fields,
+                partition_names=partition_names,
+                round_decimal=round_decimal,
+                timeout=timeout or 60,
+                **kwargs,
+            )
+        except Exception as e:
+            if not self._col_loaded and self._search_param is None:
+                raise
+            logger.warning(
+                f"Search milvus collection {self.collection_name} failed: {e}, "
+                "refresh the collection state and retry"
+            )
+            self._refresh_collection()
+            res = self._search_vectors(
+                query_vectors,
+                k,
+                param,
+                expr=expr,
+                output_fields=output_fields,
+                partition_names=partition_names,
+                round_decimal=round_decimal,
+                timeout=timeout or 60,
+                **kwargs,
+            )
+        results = []
+        for hits in res:
+            ret = []
+            for result in hits:
+                meta = {x: result.entity.get(x) for x in output_fields}
+                ret.append(
+                    (
+                        Chunk(content=meta.pop(self.text_field), metadata=meta),
+                        result.distance,
+                        result.id,
+                    )
+                )
+            if len(ret) == 0:
+                logger.warning("No relevant docs were retrieved.")
+            results.append(ret)
+        return results
+
+    def _search_vectors(
+        self, query_vectors: List[List[float]], k: int, param: Optional[dict], **kwargs
+    ) -> Any:
+        col = self._get_collection()
+        if not self._col_loaded:
+            col.load()
+            self._col_loaded = True
+        # use default index params.
+        if param is None:
+            if self._search_param is None:
+                index_type = col.indexes[0].params["index_type"]
+                self._search_param = self.index_params_map[index_type]
+            param = self._search_param
+        # milvus search.
+        return col.search(query_vectors, self.vector_field, param, k, **kwargs)
+
     def vector_name_exists(self):
         """Whether vector name exists."""
         try:
@@ -630,24 +737,18 @@ class MilvusStore(VectorStoreBase):
         """milvus delete collection name"""
         logger.info(f"milvus vector_name:{vector_name} begin delete...")
         utility.drop_collection(self.collection_name)
+        self.col = None
+        self._refresh_collection()
         return True
 
     def delete_by_ids(self, ids):
         """Delete vector by ids."""
-        try:
-            from pymilvus import Collection
-        except ImportError:
-            raise ValueError(
-                "Could not import pymilvus python package. "
-                "Please install it with `pip install pymilvus`."
-            )
-        self.col = Collection(self.collection_name)
         # milvus delete vectors by ids
         logger.info(f"begin delete milvus ids: {ids}")
         delete_ids = ids.split(",")
         doc_ids = [int(doc_id) for doc_id in delete_ids]
         delete_expr = f"{self.primary_field} in {doc_ids}"
-        self.col.delete(delete_expr)
+        self._get_collection().delete(delete_expr)
         return True
 
     def convert_metadata_filters(self, filters: MetadataFilters) -> str:
@@ -691,5 +792,7 @@ class MilvusStore(VectorStoreBase):
 
         if utility.has_collection(self.collection_name):
             utility.drop_collection(self.collection_name)
+        self.col = None
+        self._refresh_collection()
 
         logger.info(f"truncate milvus collection {self.collection_name} success")
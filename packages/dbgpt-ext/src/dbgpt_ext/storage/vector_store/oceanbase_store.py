@@ -1,12 +1,13 @@
 """OceanBase vector store."""
 
+import itertools
 import json
 import logging
 import math
 import os
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, List, Optional, Tuple
+from typing import Any, Iterable, List, Optional, Tuple
 
 import numpy as np
 from sqlalchemy import JSON, Column, String, Table, func, text
@@ -187,6 +188,8 @@ class OceanBaseConfig(VectorStoreConfig):
 class OceanBaseStore(VectorStoreBase):
     """OceanBase vector store."""
 
+    _supports_pipeline_load = True
+
     def __init__(
         self,
         vector_store_config: OceanBaseConfig,
@@ -194,6 +197,7 @@ class OceanBaseStore(VectorStoreBase):
         embedding_fn: Optional[Embeddings] = None,
         max_chunks_once_load: Optional[int] = None,
         max_threads: Optional[int] = None,
+        max_inflight_batches: Optional[int] = None,
     ) -> None:
         """Create a OceanBaseStore instance."""
         try:
@@ -208,7 +212,9 @@ class OceanBaseStore(VectorStoreBase):
             raise ValueError("embedding_fn is required for OceanBaseStore")
 
         super().__init__(
-            max_chunks_once_load=max_chunks_once_load, max_threads=max_threads
+            max_chunks_once_load=max_chunks_once_load,
+            max_threads=max_threads,
+            max_inflight_batches=max_inflight_batches,
         )
 
         self._vector_store_config = vector_store_config
@@ -273,7 +279,7 @@ class OceanBaseStore(VectorStoreBase):
         self.text_field = column_names[2]
         self.metadata_field = column_names[3]
 
-    def _create_table_with_index(self, embeddings: list) -> None:
+    def _create_table_with_index(self, dim: int) -> None:
         try:
             from pyobvector import VECTOR
         except ImportError:
@@ -286,7 +292,6 @@ class OceanBaseStore(VectorStoreBase):
             self._load_table()
             return
 
-        dim = len(embeddings[0])
         cols = [
             Column(
                 self.primary_field, String(4096), primary_key=True, autoincrement=False
@@ -314,43 +319,58 @@ class OceanBaseStore(VectorStoreBase):
 
     def create_collection(self, collection_name: str, **kwargs) -> Any:
         """Create the collection."""
-        embeddings = self.embedding_function.embed_documents([collection_name])
-        return self._create_table_with_index(embeddings)
-
-    def load_document(self, chunks: List[Chunk]) -> List[str]:
-        """Load document in vector database."""
-        batch_size = 100
-        texts = [d.content for d in chunks]
-        metadatas = [d.metadata for d in chunks]
-        embeddings = self.embedding_function.embed_documents(texts)
-
-        self._create_table_with_index(embeddings)
-
-        ids = [str(uuid.uuid4()) for _ in texts]
-        pks: list[str] = []
-        for i in range(0, len(embeddings), batch_size):
-            data = [
-                {
-                    self.primary_field: id,
-                    self.vector_field: (
-                        embedding if not self.normalize else _normalize(embedding)
-                    ),
-                    self.text_field: text,
-                    self.metadata_field: metadata,
-                }
-                for id, embedding, text, metadata in zip(
-                    ids[i : i + batch_size],
-                    embeddings[i : i + batch_size],
-                    texts[i : i + batch_size],
-                    metadatas[i : i + batch_size],
-                )
-            ]
-            self.vector_store_client.insert(
-                table_name=self.table_name,
-                data=data,
-            )
-            pks.extend(ids[i : i + batch_size])
-        return pks
+        if self.vector_store_client.check_table_exists(self.table_name):
+            self._load_table()
+            return
+        dim = self.embedding_function.embedding_dimension()
+        return self._create_table_with_index(dim)
+
+    def load_document(self, chunks: Iterable[Chunk]) -> List[str]:
+        """Load document in vector database.
+
+        The chunks are read lazily in batches and the vectors are held as float32
+        arrays, the next batch is embedded while the current batch is being
+        inserted, only the in-flight batches are held in memory.
+        """
+        return self._load_document_in_batches(chunks, 100)
+
+    def _load_document_in_batches(
+        self, chunks: Iterable[Chunk], batch_size: int
+    ) -> List[str]:
+        chunks = iter(chunks)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return []
+        self._create_table_with_index(self.embedding_function.embedding_dimension())
+        return self._pipeline_load(
+            itertools.chain([first_chunk], chunks),
+            batch_size,
+            self._embed_chunks,
+            self._insert_chunks,
+        )
+
+    def _embed_chunks(self, chunks: List[Chunk]) -> np.ndarray:
+        embeddings = self.embedding_function.embed_documents(
+            [d.content for d in chunks]
+        )
+        return self._to_vector_array(embeddings, normalize=self.normalize)
+
+    def _insert_chunks(self, chunks: List[Chunk], embeddings: np.ndarray) -> List[str]:
+        ids = [str(uuid.uuid4()) for _ in chunks]
+        data = [
+            {
+                self.primary_field: id,
+                self.vector_field: embedding.tolist(),
+                self.text_field: chunk.content,
+                self.metadata_field: chunk.metadata,
+            }
+            for id, embedding, chunk in zip(ids, embeddings, chunks)
+        ]
+        self.vector_store_client.insert(
+            table_name=self.table_name,
+            data=data,
+        )
+        return ids
 
     def _parse_metric_type_str_to_dist_func(self) -> Any:
         if self.vidx_metric_type == "l2":
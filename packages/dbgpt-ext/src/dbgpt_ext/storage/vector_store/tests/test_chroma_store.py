@@ -0,0 +1,92 @@
+from typing import List
+
+import pytest
+
+from dbgpt.core import Chunk, Embeddings
+
+from ..chroma_store import ChromaStore, ChromaVectorConfig
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.query_calls = 0
+        self.queries_calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_calls += 1
+        return self._embed(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        self.queries_calls += 1
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> List[float]:
+        if "user" in text:
+            return [1.0, 0.0, 0.0]
+        if "order" in text:
+            return [0.0, 1.0, 0.0]
+        return [0.0, 0.0, 1.0]
+
+
+@pytest.fixture
+def store(tmp_path):
+    import chromadb
+
+    embeddings = _CountingEmbeddings()
+    store = ChromaStore(
+        ChromaVectorConfig(persist_path=str(tmp_path)),
+        name="test_batch",
+        embedding_fn=embeddings,
+        chroma_client=chromadb.EphemeralClient(),
+    )
+    store.load_document(
+        [
+            Chunk(chunk_id="1", content="table user", metadata={"table_name": "user"}),
+            Chunk(
+                chunk_id="2", content="table order", metadata={"table_name": "order"}
+            ),
+            Chunk(chunk_id="3", content="table item", metadata={"table_name": "item"}),
+        ]
+    )
+    yield store
+    store.delete_vector_name("test_batch")
+
+
+def test_similar_search_batch(store):
+    embeddings = store.embeddings
+    results = store.similar_search_batch(["user info", "", "order list"], topk=1)
+
+    assert [[c.chunk_id for c in chunks] for chunks in results] == [["1"], [], ["2"]]
+    assert results[0][0].metadata["table_name"] == "user"
+    assert embeddings.queries_calls == 1
+    assert embeddings.query_calls == 0
+
+
+def test_similar_search_with_scores_batch(store):
+    results = store.similar_search_with_scores_batch(
+        ["user info", "order list"], topk=2, score_threshold=0.5
+    )
+    assert [[c.chunk_id for c in chunks] for chunks in results] == [["1"], ["2"]]
+    assert results[0][0].score == pytest.approx(1.0)
+
+
+def test_similar_search(store):
+    chunks = store.similar_search("order list", topk=1)
+    assert [c.chunk_id for c in chunks] == ["2"]
+
+
+def test_load_document_iterator(store):
+    def _chunks():
+        for i in range(25):
+            yield Chunk(
+                chunk_id=f"it_{i}", content=f"table item {i}", metadata={"i": i}
+            )
+
+    ids = store.load_document(_chunks())
+    assert ids == [f"it_{i}" for i in range(25)]
+    assert store._collection.count() == 28
+    embeddings = store._collection.get(ids=["it_0"], include=["embeddings"])
+    assert list(embeddings["embeddings"][0]) == [0.0, 0.0, 1.0]
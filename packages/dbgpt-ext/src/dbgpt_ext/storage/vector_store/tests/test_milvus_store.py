@@ -0,0 +1,140 @@
+import sys
+import types
+from typing import List
+from unittest.mock import patch
+
+import pytest
+
+from dbgpt.core import Embeddings
+
+from ..milvus_store import MilvusStore, MilvusVectorConfig
+
+
+class _FakeEmbeddings(Embeddings):
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0]
+
+
+class _DataType:
+    VARCHAR = "varchar"
+    INT64 = "int64"
+    FLOAT_VECTOR = "float_vector"
+    BINARY_VECTOR = "binary_vector"
+    JSON = "json"
+
+
+class _Field:
+    def __init__(self, name, dtype, is_primary=False, auto_id=False):
+        self.name = name
+        self.dtype = dtype
+        self.is_primary = is_primary
+        self.auto_id = auto_id
+
+
+class _Hit:
+    def __init__(self, i: int, query_vector: List[float]):
+        self.id = i
+        self.distance = 0.9
+        self.entity = {
+            "content": f"doc {i} of query {query_vector[0]}",
+            "metadata": '{"source": "test"}',
+            "props_field": {"source": "test"},
+        }
+
+
+class _FakeCollection:
+    """Count the round trips of the store to the Milvus server."""
+
+    def __init__(self, name, using="default", **kwargs):
+        self.name = name
+        self.rpc_calls: List[str] = []
+        self.schema = types.SimpleNamespace(
+            fields=[
+                _Field("content", _DataType.VARCHAR),
+                _Field("pk_id", _DataType.INT64, is_primary=True, auto_id=True),
+                _Field("vector", _DataType.FLOAT_VECTOR),
+                _Field("metadata", _DataType.VARCHAR),
+                _Field("props_field", _DataType.JSON),
+            ]
+        )
+
+    def load(self):
+        self.rpc_calls.append("load")
+
+    @property
+    def indexes(self):
+        self.rpc_calls.append("indexes")
+        return [types.SimpleNamespace(params={"index_type": "IVF_FLAT"})]
+
+    def search(self, data, anns_field, param, limit, **kwargs):
+        self.rpc_calls.append("search")
+        assert param == {"params": {"nprobe": 10}}
+        return [[_Hit(i, vector) for i in range(limit)] for vector in data]
+
+
+@pytest.fixture
+def milvus_store():
+    pymilvus = types.ModuleType("pymilvus")
+    pymilvus.Collection = _FakeCollection
+    pymilvus.CollectionSchema = object
+    pymilvus.FieldSchema = _Field
+    pymilvus.DataType = _DataType
+    pymilvus.connections = types.SimpleNamespace(
+        connect=lambda **kwargs: None, has_connection=lambda alias: True
+    )
+    pymilvus.utility = types.SimpleNamespace(has_collection=lambda name: True)
+    orm_types = types.ModuleType("pymilvus.orm.types")
+    orm_types.infer_dtype_bydata = lambda data: None
+    with patch.dict(
+        sys.modules,
+        {
+            "pymilvus": pymilvus,
+            "pymilvus.orm": types.ModuleType("pymilvus.orm"),
+            "pymilvus.orm.types": orm_types,
+        },
+    ):
+        yield MilvusStore(
+            MilvusVectorConfig(), name="test", embedding_fn=_FakeEmbeddings()
+        )
+
+
+def test_similar_search_one_round_trip(milvus_store: MilvusStore):
+    chunks = milvus_store.similar_search("hello", 2)
+    assert len(chunks) == 2
+    assert chunks[0].metadata == {"source": "test"}
+    # The first query loads the collection and resolves the search params
+    assert milvus_store.col.rpc_calls == ["load", "indexes", "search"]
+
+    milvus_store.col.rpc_calls.clear()
+    chunks = milvus_store.similar_search_with_scores("hello world", 3, 0.5)
+    assert [chunk.score for chunk in chunks] == [0.9, 0.9, 0.9]
+    assert milvus_store.col.rpc_calls == ["search"]
+
+
+def test_similar_search_batch(milvus_store: MilvusStore):
+    results = milvus_store.similar_search_batch(["a", "bb", "ccc"], 2)
+    assert [len(chunks) for chunks in results] == [2, 2, 2]
+    assert results[2][0].content == "doc 0 of query 3.0"
+    assert milvus_store.col.rpc_calls == ["load", "indexes", "search"]
+
+
+def test_search_refresh_on_failure(milvus_store: MilvusStore):
+    milvus_store.similar_search("hello", 1)
+    col = milvus_store.col
+    search = col.search
+    failed = []
+
+    def _search_once_failed(*args, **kwargs):
+        if not failed:
+            failed.append(True)
+            col.rpc_calls.append("search")
+            raise RuntimeError("collection not loaded")
+        return search(*args, **kwargs)
+
+    col.search = _search_once_failed
+    col.rpc_calls.clear()
+    assert len(milvus_store.similar_search("hello", 1)) == 1
+    assert col.rpc_calls == ["search", "load", "indexes", "search"]
@@ -1,10 +1,15 @@
 """DBSummaryClient class."""
 
+import json
 import logging
+import os
+import threading
 import traceback
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Optional, Tuple
 
 from dbgpt.component import SystemApp
+from dbgpt.configs.model_config import DATA_DIR
 from dbgpt.core import Embeddings
 from dbgpt.rag.embedding.embedding_factory import EmbeddingFactory
 from dbgpt.rag.text_splitter.text_splitter import RDBTextSplitter
@@ -17,6 +22,21 @@ from dbgpt_serve.rag.storage_manager import StorageManager
 
 logger = logging.getLogger(__name__)
 
+# Max number of databases (and tables of a database) profiled concurrently
+DEFAULT_PROFILE_CONCURRENCY = 4
+_DEFAULT_PROFILE_STATE_DIR = os.path.join(DATA_DIR, "db_profile")
+# Bump it when the summary format changes, to re-profile every table
+_PROFILE_STATE_VERSION = 1
+
+# Profiling of a database is serialized across all the clients of the process
+_PROFILE_LOCKS: Dict[str, threading.Lock] = {}
+_PROFILE_LOCKS_LOCK = threading.Lock()
+
+
+def _get_profile_lock(dbname: str) -> threading.Lock:
+    with _PROFILE_LOCKS_LOCK:
+        return _PROFILE_LOCKS.setdefault(dbname, threading.Lock())
+
 
 class DBSummaryClient:
     """The client for DBSummary.
@@ -25,17 +45,35 @@ class DBSummaryClient:
     summary into vector store), get_similar_tables method(get user query related tables
     info)
 
+    Each table's summary is fingerprinted and the fingerprints are kept in a small
+    state file per database, so profiling again only re-embeds the tables whose
+    schema changed. The state also records the vector store type and the embedding
+    model, the whole profile is rebuilt when they change or the profile vectors are
+    gone.
+
     Args:
         system_app (SystemApp): Main System Application class that manages the
             lifecycle and registration of components..
+        max_workers (Optional[int]): Max number of databases profiled concurrently,
+            also used for the tables of a database when the connector has no bulk
+            metadata query.
+        profile_state_dir (Optional[str]): Directory of the table fingerprint
+            state files.
     """
 
-    def __init__(self, system_app: SystemApp):
+    def __init__(
+        self,
+        system_app: SystemApp,
+        max_workers: Optional[int] = None,
+        profile_state_dir: Optional[str] = None,
+    ):
         """Create a new DBSummaryClient."""
         self.system_app = system_app
 
         self.app_config = self.system_app.config.configs.get("app_config")
         self.storage_config = self.app_config.rag.storage
+        self._max_workers = max_workers or DEFAULT_PROFILE_CONCURRENCY
+        self._profile_state_dir = profile_state_dir or _DEFAULT_PROFILE_STATE_DIR
 
     @property
     def embeddings(self) -> Embeddings:
@@ -83,36 +121,108 @@ class DBSummaryClient:
         local_db_manager = ConnectorManager.get_instance(self.system_app)
         db_mange = local_db_manager
         dbs = db_mange.get_db_list()
-        for item in dbs:
-            try:
-                self.db_summary_embedding(item["db_name"], item["db_type"])
-            except Exception as e:
-                message = traceback.format_exc()
-                logger.warning(
-                    f"{item['db_name']}, {item['db_type']} summary error!{str(e)}, "
-                    f"detail: {message}"
-                )
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.db_summary_embedding, item["db_name"], item["db_type"]
+                ): item
+                for item in dbs
+            }
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    message = traceback.format_exc()
+                    logger.warning(
+                        f"{item['db_name']}, {item['db_type']} summary error!{str(e)}, "
+                        f"detail: {message}"
+                    )
 
     def init_db_profile(self, db_summary_client, dbname):
         """Initialize db summary profile.
 
+        Only the tables that are new or whose schema fingerprint changed since the
+        last profiling are summarized and embedded again, the vectors of changed
+        and dropped tables are deleted.
+
         Args:
         db_summary_client(DBSummaryClient): DB Summary Client
         dbname(str): dbname
         """
-        vector_store_name = dbname + "_profile"
+        with _get_profile_lock(dbname):
+            self._init_db_profile(db_summary_client, dbname)
+        logger.info("initialize db summary profile success...")
 
+    def _init_db_profile(self, db_summary_client, dbname):
+        from dbgpt_ext.rag.assembler.db_schema import DBSchemaAssembler
+        from dbgpt_ext.rag.summary.rdbms_db_summary import (
+            _DEFAULT_COLUMN_SEPARATOR,
+            _parse_db_summary_with_metadata,
+            _table_schema_fingerprint,
+        )
+
+        separator = "--table-field-separator--"
+        max_seq_length = self.app_config.service.web.embedding_model_max_seq_len
         table_vector_connector, field_vector_connector = (
             self._get_vector_connector_by_db(dbname)
         )
-        if not table_vector_connector.vector_name_exists():
-            from dbgpt_ext.rag.assembler.db_schema import DBSchemaAssembler
-            from dbgpt_ext.rag.summary.rdbms_db_summary import _DEFAULT_COLUMN_SEPARATOR
+        state = self._load_profile_state(dbname)
+        store_meta = self._profile_store_meta()
+        vector_name_exists = table_vector_connector.vector_name_exists()
+        if state is not None and (
+            state.get("store") != store_meta or not vector_name_exists
+        ):
+            # The vectors were wiped or embedded by another store or model
+            logger.info(
+                f"Vector store of the {dbname} profile changed, rebuild its profile"
+            )
+            state = None
+        if state is None and vector_name_exists:
+            # Profiled without fingerprints, we can't tell which tables are stale
+            logger.info(f"No schema fingerprints of {dbname}, rebuild its profile")
+            self._delete_vector_names(dbname)
+            table_vector_connector, field_vector_connector = (
+                self._get_vector_connector_by_db(dbname)
+            )
+        tables_state: Dict[str, Dict[str, Any]] = (state or {}).get("tables", {})
+
+        # Tables may be created or dropped since the connector was created
+        db_summary_client.db.refresh_table_names()
+        # The schema is read once, the summaries of the changed tables are reused
+        # to embed them
+        summaries = _parse_db_summary_with_metadata(
+            db_summary_client.db,
+            separator=separator,
+            column_separator=_DEFAULT_COLUMN_SEPARATOR,
+            model_dimension=max_seq_length,
+            max_workers=self._max_workers,
+        )
+        fingerprints = {
+            metadata["table_name"]: _table_schema_fingerprint(summary)
+            for summary, metadata in summaries
+        }
+        changed = [
+            table_name
+            for table_name, fingerprint in fingerprints.items()
+            if tables_state.get(table_name, {}).get("fingerprint") != fingerprint
+        ]
+        removed = [name for name in tables_state if name not in fingerprints]
+        if not changed and not removed:
+            logger.info(f"Schema of {dbname} not changed, skip profiling")
+            return
+        logger.info(
+            f"Profile {dbname}: {len(changed)} new or changed tables, "
+            f"{len(removed)} dropped tables, {len(fingerprints)} tables in total"
+        )
 
+        ids_by_table = {}
+        if changed:
+            changed_tables = set(changed)
             chunk_parameters = ChunkParameters(
                 text_splitter=RDBTextSplitter(
                     column_separator=_DEFAULT_COLUMN_SEPARATOR,
-                    separator="--table-field-separator--",
+                    separator=separator,
                 )
             )
             db_assembler = DBSchemaAssembler.load_from_connection(
@@ -120,17 +230,63 @@ class DBSummaryClient:
                 table_vector_store_connector=table_vector_connector,
                 field_vector_store_connector=field_vector_connector,
                 chunk_parameters=chunk_parameters,
-                max_seq_length=self.app_config.service.web.embedding_model_max_seq_len,
+                max_seq_length=max_seq_length,
+                table_names=changed,
+                max_workers=self._max_workers,
+                table_summaries=[
+                    (summary, metadata)
+                    for summary, metadata in summaries
+                    if metadata["table_name"] in changed_tables
+                ],
             )
-
             if len(db_assembler.get_chunks()) > 0:
-                db_assembler.persist()
-        else:
-            logger.info(f"Vector store name {vector_store_name} exist")
-        logger.info("initialize db summary profile success...")
+                ids_by_table = db_assembler.persist_by_table()
+
+        # Delete the old vectors after the new ones are loaded, the ids which are
+        # reused by the new vectors are kept
+        stale_table_ids, stale_field_ids = [], []
+        for table_name in changed + removed:
+            table_state = tables_state.pop(table_name, {})
+            new_ids = ids_by_table.get(table_name, {})
+            new_table_ids = set(new_ids.get("table", []))
+            new_field_ids = set(new_ids.get("field", []))
+            stale_table_ids.extend(
+                i for i in table_state.get("table_ids", []) if i not in new_table_ids
+            )
+            stale_field_ids.extend(
+                i for i in table_state.get("field_ids", []) if i not in new_field_ids
+            )
+        if stale_table_ids:
+            table_vector_connector.delete_by_ids(",".join(stale_table_ids))
+        if stale_field_ids:
+            field_vector_connector.delete_by_ids(",".join(stale_field_ids))
+
+        for table_name in changed:
+            ids = ids_by_table.get(table_name, {})
+            tables_state[table_name] = {
+                "fingerprint": fingerprints[table_name],
+                "table_ids": ids.get("table", []),
+                "field_ids": ids.get("field", []),
+            }
+        self._save_profile_state(
+            dbname,
+            {
+                "version": _PROFILE_STATE_VERSION,
+                "store": store_meta,
+                "tables": tables_state,
+            },
+        )
 
     def delete_db_profile(self, dbname):
         """Delete db profile."""
+        with _get_profile_lock(dbname):
+            self._delete_vector_names(dbname)
+            state_file = self._profile_state_file(dbname)
+            if os.path.exists(state_file):
+                os.remove(state_file)
+        logger.info(f"delete db profile {dbname} success")
+
+    def _delete_vector_names(self, dbname):
         table_vector_store_name = dbname + "_profile"
         field_vector_store_name = dbname + "_profile_field"
 
@@ -140,7 +296,39 @@ class DBSummaryClient:
 
         table_vector_connector.delete_vector_name(table_vector_store_name)
         field_vector_connector.delete_vector_name(field_vector_store_name)
-        logger.info(f"delete db profile {dbname} success")
+
+    def _profile_store_meta(self) -> Dict[str, Optional[str]]:
+        """Return the vector store type and the embedding model of the profile."""
+        vector_config = self.storage_config.vector
+        return {
+            "vector_type": vector_config.get_type_value() if vector_config else None,
+            "embedding_model": self.app_config.models.default_embedding,
+        }
+
+    def _profile_state_file(self, dbname: str) -> str:
+        return os.path.join(self._profile_state_dir, f"{dbname}.json")
+
+    def _load_profile_state(self, dbname: str) -> Optional[Dict[str, Any]]:
+        state_file = self._profile_state_file(dbname)
+        if not os.path.exists(state_file):
+            return None
+        try:
+            with open(state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.warning(f"Invalid profile state file {state_file}: {str(e)}")
+            return None
+        if state.get("version") != _PROFILE_STATE_VERSION:
+            return None
+        return state
+
+    def _save_profile_state(self, dbname: str, state: Dict[str, Any]):
+        os.makedirs(self._profile_state_dir, exist_ok=True)
+        state_file = self._profile_state_file(dbname)
+        tmp_file = state_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_file, state_file)
 
     @staticmethod
     def create_summary_client(dbname: str, db_type: str):
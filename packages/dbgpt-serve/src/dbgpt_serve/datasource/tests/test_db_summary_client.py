@@ -0,0 +1,200 @@
+from typing import List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from dbgpt.core import Chunk
+from dbgpt_ext.datasource.rdbms.conn_sqlite import SQLiteTempConnector
+
+from ..service.db_summary_client import DBSummaryClient
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.docs = {}
+        self.loaded: List[Chunk] = []
+
+    def vector_name_exists(self) -> bool:
+        return bool(self.docs)
+
+    def load_document_with_limit(self, chunks: List[Chunk], **kwargs) -> List[str]:
+        self.loaded.extend(chunks)
+        for chunk in chunks:
+            self.docs[chunk.chunk_id] = chunk
+        return [chunk.chunk_id for chunk in chunks]
+
+    def delete_by_ids(self, ids: str):
+        for chunk_id in ids.split(","):
+            self.docs.pop(chunk_id)
+
+    def delete_vector_name(self, name: str):
+        self.docs.clear()
+
+
+@pytest.fixture
+def connector():
+    connector = SQLiteTempConnector.create_temporary_db()
+    connector.create_temp_tables(
+        {
+            "user": {
+                "columns": {"id": "INTEGER PRIMARY KEY", "name": "TEXT"},
+                "data": [],
+            },
+            "orders": {
+                "columns": {"id": "INTEGER PRIMARY KEY", "uid": "INTEGER"},
+                "data": [],
+            },
+        }
+    )
+    return connector
+
+
+@pytest.fixture
+def stores():
+    return FakeVectorStore(), FakeVectorStore()
+
+
+@pytest.fixture
+def client(tmp_path, stores):
+    system_app = MagicMock()
+    app_config = MagicMock()
+    app_config.service.web.embedding_model_max_seq_len = 512
+    app_config.models.default_embedding = "text2vec"
+    app_config.rag.storage.vector.get_type_value.return_value = "chroma"
+    system_app.config.configs.get.return_value = app_config
+    client = DBSummaryClient(system_app, profile_state_dir=str(tmp_path))
+    client._get_vector_connector_by_db = MagicMock(return_value=stores)
+    return client
+
+
+class StableIdVectorStore(FakeVectorStore):
+    """Give the chunks of a table the same ids every time they are loaded."""
+
+    def load_document_with_limit(self, chunks: List[Chunk], **kwargs) -> List[str]:
+        counts = {}
+        for chunk in chunks:
+            table_name = chunk.metadata["table_name"]
+            counts[table_name] = counts.get(table_name, -1) + 1
+            chunk.chunk_id = f"{table_name}-{counts[table_name]}"
+        return super().load_document_with_limit(chunks, **kwargs)
+
+
+def _table_names(chunks: List[Chunk]) -> List[str]:
+    return sorted(chunk.metadata["table_name"] for chunk in chunks)
+
+
+def test_profile_only_changed_tables(client, connector, stores):
+    table_store, _ = stores
+    summary = MagicMock(db=connector)
+
+    client.init_db_profile(summary, "test_db")
+    assert _table_names(table_store.loaded) == ["orders", "user"]
+
+    # Nothing changed, nothing embedded again
+    table_store.loaded.clear()
+    client.init_db_profile(summary, "test_db")
+    assert table_store.loaded == []
+
+    connector._write("ALTER TABLE user ADD COLUMN age INTEGER")
+    client.init_db_profile(summary, "test_db")
+    assert _table_names(table_store.loaded) == ["user"]
+    assert _table_names(table_store.docs.values()) == ["orders", "user"]
+    assert "age" in next(
+        chunk.content
+        for chunk in table_store.docs.values()
+        if chunk.metadata["table_name"] == "user"
+    )
+
+
+def test_profile_dropped_table(client, connector, stores):
+    table_store, _ = stores
+    summary = MagicMock(db=connector)
+    client.init_db_profile(summary, "test_db")
+
+    connector._write("DROP TABLE orders")
+    table_store.loaded.clear()
+    client.init_db_profile(summary, "test_db")
+    assert table_store.loaded == []
+    assert _table_names(table_store.docs.values()) == ["user"]
+
+
+def test_rebuild_profile_without_state(client, connector, stores):
+    table_store, _ = stores
+    table_store.docs["legacy"] = Chunk(content="legacy")
+
+    client.init_db_profile(MagicMock(db=connector), "test_db")
+    assert "legacy" not in table_store.docs
+    assert _table_names(table_store.docs.values()) == ["orders", "user"]
+
+
+def test_profile_new_table(client, connector, stores):
+    table_store, _ = stores
+    summary = MagicMock(db=connector)
+    client.init_db_profile(summary, "test_db")
+
+    connector._write("CREATE TABLE item (id INTEGER PRIMARY KEY)")
+    table_store.loaded.clear()
+    client.init_db_profile(summary, "test_db")
+    assert _table_names(table_store.loaded) == ["item"]
+
+
+def test_read_schema_once(client, connector):
+    with patch.object(
+        connector,
+        "get_multi_table_metadata",
+        wraps=connector.get_multi_table_metadata,
+    ) as get_metadata:
+        client.init_db_profile(MagicMock(db=connector), "test_db")
+    assert get_metadata.call_count == 1
+
+
+def test_delete_old_ids_not_reused(client, connector):
+    table_store, field_store = StableIdVectorStore(), StableIdVectorStore()
+    client._get_vector_connector_by_db = MagicMock(
+        return_value=(table_store, field_store)
+    )
+    summary = MagicMock(db=connector)
+    client.init_db_profile(summary, "test_db")
+    assert sorted(table_store.docs) == ["orders-0", "user-0"]
+
+    # The old profile has more vectors of the table than the new one
+    state = client._load_profile_state("test_db")
+    state["tables"]["user"]["fingerprint"] = "old"
+    state["tables"]["user"]["table_ids"].append("user-old")
+    table_store.docs["user-old"] = Chunk(content="old", chunk_id="user-old")
+    client._save_profile_state("test_db", state)
+
+    client.init_db_profile(summary, "test_db")
+    assert sorted(table_store.docs) == ["orders-0", "user-0"]
+    assert client._load_profile_state("test_db")["tables"]["user"]["table_ids"] == [
+        "user-0"
+    ]
+
+
+def test_rebuild_profile_without_vectors(client, connector, stores):
+    table_store, _ = stores
+    summary = MagicMock(db=connector)
+    client.init_db_profile(summary, "test_db")
+
+    # The vector store was wiped, the unchanged schema is profiled again
+    table_store.docs.clear()
+    table_store.loaded.clear()
+    client.init_db_profile(summary, "test_db")
+    assert _table_names(table_store.loaded) == ["orders", "user"]
+
+
+def test_rebuild_profile_embedding_model_changed(client, connector, stores):
+    table_store, _ = stores
+    summary = MagicMock(db=connector)
+    client.init_db_profile(summary, "test_db")
+    old_ids = set(table_store.docs)
+
+    client.app_config.models.default_embedding = "bge"
+    table_store.loaded.clear()
+    client.init_db_profile(summary, "test_db")
+    assert _table_names(table_store.loaded) == ["orders", "user"]
+    assert not old_ids & set(table_store.docs)
+    assert client._load_profile_state("test_db")["store"] == {
+        "vector_type": "chroma",
+        "embedding_model": "bge",
+    }
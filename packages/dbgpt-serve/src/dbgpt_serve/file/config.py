@@ -72,6 +72,15 @@ class ServeConfig(BaseServeConfig):
     local_storage_path: Optional[str] = field(
         default=None, metadata={"help": _("The local storage path")}
     )
+    remote_cache_size: Optional[int] = field(
+        default=1024 * 1024 * 1024,
+        metadata={
+            "help": _(
+                "The max size in bytes of the local cache of the files stored on "
+                "other nodes, 0 to disable the cache"
+            )
+        },
+    )
     default_backend: Optional[str] = field(
         default=None,
         metadata={"help": _("The default storage backend")},
@@ -5,7 +5,15 @@ You can define your own models and DAOs here
 from datetime import datetime
 from typing import Any, Dict, Union
 
-from sqlalchemy import Column, DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 
 from dbgpt.storage.metadata import BaseDao, Model
 
@@ -15,7 +23,11 @@ from ..config import SERVER_APP_TABLE_NAME, ServeConfig
 
 class ServeEntity(Model):
     __tablename__ = SERVER_APP_TABLE_NAME
-    __table_args__ = (UniqueConstraint("bucket", "file_id", name="uk_bucket_file_id"),)
+    __table_args__ = (
+        UniqueConstraint("bucket", "file_id", name="uk_bucket_file_id"),
+        # Look up the duplicates of a new file by its content
+        Index("idx_file_hash_size", "file_hash", "file_size"),
+    )
 
     id = Column(Integer, primary_key=True, comment="Auto increment id")
 
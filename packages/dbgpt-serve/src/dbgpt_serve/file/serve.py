@@ -95,6 +95,7 @@ class Serve(BaseServe):
             save_chunk_size=self._serve_config.save_chunk_size,
             transfer_chunk_size=self._serve_config.transfer_chunk_size,
             transfer_timeout=self._serve_config.transfer_timeout,
+            cache_max_size=self._serve_config.remote_cache_size or 0,
         )
         storage_backends = {
             simple_distributed_storage.storage_type: simple_distributed_storage,
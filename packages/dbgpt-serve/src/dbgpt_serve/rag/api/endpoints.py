@@ -226,6 +226,28 @@ async def space_retrieve(
     return Result.succ(await service.retrieve(request, space))
 
 
+@router.post(
+    "/spaces/{space_id}/question_index/rebuild",
+    response_model=Result[int],
+    dependencies=[Depends(check_api_key)],
+)
+async def rebuild_question_index(
+    space_id: str, service: Service = Depends(get_service)
+) -> Result[int]:
+    """Rebuild the question index of a space
+
+    Args:
+        space_id (str): The space id
+        service (Service): The service
+    Returns:
+        ServerResponse: The number of indexed questions
+    """
+    res = await blocking_func_to_async(
+        global_system_app, service.rebuild_question_index, space_id
+    )
+    return Result.succ(res)
+
+
 @router.post("/documents")
 async def create_document(
     doc_name: str = Form(...),
@@ -103,6 +103,17 @@ class DocumentChunkDao(BaseDao):
         session.close()
         return result
 
+    def get_chunks_by_ids(self, ids: List[int]) -> List[DocumentChunkEntity]:
+        if not ids:
+            return []
+        session = self.get_raw_session()
+        document_chunks = session.query(DocumentChunkEntity).filter(
+            DocumentChunkEntity.id.in_(ids)
+        )
+        result = document_chunks.order_by(DocumentChunkEntity.id.asc()).all()
+        session.close()
+        return result
+
     def get_chunks_with_questions(self, query: DocumentChunkEntity, document_ids=None):
         session = self.get_raw_session()
         document_chunks = session.query(DocumentChunkEntity)
@@ -0,0 +1,342 @@
+"""Question index for the knowledge QA retriever.
+
+Questions attached to documents and chunks are stored as JSON text on the owning
+row. Matching a query against them would require loading and decoding every row
+of a space, so the questions are normalized and written to a separate table at
+ingest time, keyed by ``(space, question_key)``.
+
+Spaces whose questions were saved before the index existed are indexed lazily, the
+first time they are looked up.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import cachetools
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from dbgpt.storage.metadata import BaseDao, Model
+from dbgpt.util.string_utils import remove_trailing_punctuation
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Max number of (space, question) lookups kept in memory
+DEFAULT_QUESTION_CACHE_SIZE = 4096
+
+# Questions by document id, and by (document id, chunk id)
+SpaceQuestions = Tuple[Dict[int, List[str]], Dict[Tuple[int, int], List[str]]]
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question so that trivially different spellings match.
+
+    Surrounding whitespace and trailing punctuation are removed, inner whitespace
+    is collapsed and the text is case folded.
+    """
+    question = _WHITESPACE_PATTERN.sub(" ", question or "").strip()
+    return remove_trailing_punctuation(question).strip().casefold()
+
+
+def question_key(question: str) -> str:
+    """Return the fixed-size lookup key of a question."""
+    normalized = normalize_question(question)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class QuestionHit(NamedTuple):
+    """A document or chunk that a question points to.
+
+    ``chunk_id`` is None when the question is attached to the whole document.
+    """
+
+    document_id: int
+    chunk_id: Optional[int]
+
+
+class KnowledgeQuestionIndexEntity(Model):
+    __tablename__ = "knowledge_question_index"
+    __table_args__ = (
+        Index("idx_question_space_key", "space", "question_key"),
+        Index("idx_question_document_id", "document_id"),
+    )
+    id = Column(Integer, primary_key=True)
+    space = Column(String(100), nullable=False)
+    question_key = Column(String(64), nullable=False)
+    question = Column(Text)
+    document_id = Column(Integer, nullable=False)
+    chunk_id = Column(Integer, nullable=True)
+    gmt_created = Column(DateTime)
+
+    def __repr__(self):
+        return (
+            f"KnowledgeQuestionIndexEntity(id={self.id}, space='{self.space}', "
+            f"question='{self.question}', document_id={self.document_id}, "
+            f"chunk_id={self.chunk_id}, gmt_created='{self.gmt_created}')"
+        )
+
+
+class QuestionIndexCache:
+    """In-memory LRU cache of question lookups, invalidated per space."""
+
+    def __init__(self, maxsize: int = DEFAULT_QUESTION_CACHE_SIZE):
+        self._cache: cachetools.LRUCache = cachetools.LRUCache(maxsize=maxsize)
+        # The spaces known to be indexed, they are not checked again
+        self._indexed_spaces: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def is_indexed(self, space: str) -> bool:
+        with self._lock:
+            return space in self._indexed_spaces
+
+    def set_indexed(self, space: str, indexed: bool = True) -> None:
+        with self._lock:
+            if indexed:
+                self._indexed_spaces.add(space)
+            else:
+                self._indexed_spaces.discard(space)
+
+    def get(self, space: str, key: str) -> Optional[List[QuestionHit]]:
+        with self._lock:
+            return self._cache.get((space, key))
+
+    def put(self, space: str, key: str, hits: List[QuestionHit]) -> None:
+        with self._lock:
+            self._cache[(space, key)] = hits
+
+    def invalidate(self, space: Optional[str] = None) -> None:
+        """Drop the cached lookups of a space, or of all spaces if None."""
+        with self._lock:
+            if space is None:
+                self._cache.clear()
+                return
+            for cache_key in [k for k in self._cache.keys() if k[0] == space]:
+                self._cache.pop(cache_key, None)
+
+
+_question_index_cache = QuestionIndexCache()
+
+
+class KnowledgeQuestionIndexDao(BaseDao):
+    """Persist and look up the normalized question index."""
+
+    def __init__(self, cache: Optional[QuestionIndexCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache or _question_index_cache
+
+    def lookup(self, space: str, question: str) -> List[QuestionHit]:
+        """Find the documents and chunks a question is attached to.
+
+        Args:
+            space (str): The knowledge space name.
+            question (str): The raw question text.
+
+        Returns:
+            List[QuestionHit]: The hits, chunk level hits first.
+        """
+        key = question_key(question)
+        hits = self._cache.get(space, key)
+        if hits is not None:
+            return hits
+        with self.session(commit=False) as session:
+            rows = (
+                session.query(
+                    KnowledgeQuestionIndexEntity.document_id,
+                    KnowledgeQuestionIndexEntity.chunk_id,
+                )
+                .filter(
+                    KnowledgeQuestionIndexEntity.space == space,
+                    KnowledgeQuestionIndexEntity.question_key == key,
+                )
+                .order_by(KnowledgeQuestionIndexEntity.id.asc())
+                .all()
+            )
+            hits = [QuestionHit(row.document_id, row.chunk_id) for row in rows]
+        # Chunk level questions are more specific, keep them in front
+        hits.sort(key=lambda hit: hit.chunk_id is None)
+        self._cache.put(space, key, hits)
+        return hits
+
+    def replace_questions(
+        self,
+        space: str,
+        document_id: int,
+        questions: Optional[Iterable[str]],
+        chunk_id: Optional[int] = None,
+    ) -> None:
+        """Replace the questions of a document, or of one of its chunks.
+
+        Args:
+            space (str): The knowledge space name.
+            document_id (int): The document id.
+            questions (Optional[Iterable[str]]): The new questions, empty or None
+                removes all the questions.
+            chunk_id (Optional[int]): The chunk id, None for document questions.
+        """
+        entities = self._build_entities(space, document_id, questions, chunk_id)
+        with self.session() as session:
+            query = session.query(KnowledgeQuestionIndexEntity).filter(
+                KnowledgeQuestionIndexEntity.document_id == document_id
+            )
+            if chunk_id is None:
+                query = query.filter(KnowledgeQuestionIndexEntity.chunk_id.is_(None))
+            else:
+                query = query.filter(KnowledgeQuestionIndexEntity.chunk_id == chunk_id)
+            query.delete(synchronize_session=False)
+            session.add_all(entities)
+        self._cache.invalidate(space)
+
+    def delete_by_document(self, space: str, document_id: int) -> None:
+        """Delete all the questions of a document and its chunks."""
+        with self.session() as session:
+            session.query(KnowledgeQuestionIndexEntity).filter(
+                KnowledgeQuestionIndexEntity.document_id == document_id
+            ).delete(synchronize_session=False)
+        self._cache.invalidate(space)
+
+    def delete_chunk_questions(self, space: str, document_id: int) -> None:
+        """Delete the questions of the chunks of a document.
+
+        The chunks of a document are created again when it is synced, the questions
+        of the old chunks are stale.
+        """
+        with self.session() as session:
+            session.query(KnowledgeQuestionIndexEntity).filter(
+                KnowledgeQuestionIndexEntity.document_id == document_id,
+                KnowledgeQuestionIndexEntity.chunk_id.isnot(None),
+            ).delete(synchronize_session=False)
+        self._cache.invalidate(space)
+
+    def delete_by_space(self, space: str) -> None:
+        """Delete all the questions of a knowledge space."""
+        with self.session() as session:
+            session.query(KnowledgeQuestionIndexEntity).filter(
+                KnowledgeQuestionIndexEntity.space == space
+            ).delete(synchronize_session=False)
+        self._cache.invalidate(space)
+        self._cache.set_indexed(space, False)
+
+    def ensure_space_indexed(
+        self, space: str, load_questions: Callable[[], SpaceQuestions]
+    ) -> None:
+        """Index the stored questions of a space if it has no index rows.
+
+        The questions saved before the index existed are indexed the first time the
+        space is looked up, the check is done once per space and process.
+
+        Args:
+            space (str): The knowledge space name.
+            load_questions (Callable[[], SpaceQuestions]): Load the stored questions
+                of the space, see :func:`load_space_questions`.
+        """
+        if self._cache.is_indexed(space):
+            return
+        with self.session(commit=False) as session:
+            indexed = (
+                session.query(KnowledgeQuestionIndexEntity.id)
+                .filter(KnowledgeQuestionIndexEntity.space == space)
+                .first()
+                is not None
+            )
+        if not indexed:
+            document_questions, chunk_questions = load_questions()
+            if document_questions or chunk_questions:
+                self.rebuild_space(space, document_questions, chunk_questions)
+        self._cache.set_indexed(space)
+
+    def rebuild_space(
+        self,
+        space: str,
+        document_questions: Dict[int, List[str]],
+        chunk_questions: Dict[Tuple[int, int], List[str]],
+    ) -> int:
+        """Rebuild the index of a space, e.g. for data written before the index.
+
+        Args:
+            space (str): The knowledge space name.
+            document_questions (Dict[int, List[str]]): Questions by document id.
+            chunk_questions (Dict[Tuple[int, int], List[str]]): Questions by
+                (document id, chunk id).
+
+        Returns:
+            int: The number of indexed questions.
+        """
+        entities = []
+        for document_id, questions in document_questions.items():
+            entities.extend(self._build_entities(space, document_id, questions))
+        for (document_id, chunk_id), questions in chunk_questions.items():
+            entities.extend(
+                self._build_entities(space, document_id, questions, chunk_id)
+            )
+        with self.session() as session:
+            session.query(KnowledgeQuestionIndexEntity).filter(
+                KnowledgeQuestionIndexEntity.space == space
+            ).delete(synchronize_session=False)
+            session.add_all(entities)
+        self._cache.invalidate(space)
+        return len(entities)
+
+    def _build_entities(
+        self,
+        space: str,
+        document_id: int,
+        questions: Optional[Iterable[str]],
+        chunk_id: Optional[int] = None,
+    ) -> List[KnowledgeQuestionIndexEntity]:
+        entities = []
+        seen = set()
+        now = datetime.now()
+        for question in questions or []:
+            normalized = normalize_question(question)
+            if not normalized or normalized in seen:
+                continue
+            seen.add(normalized)
+            entities.append(
+                KnowledgeQuestionIndexEntity(
+                    space=space,
+                    question_key=question_key(normalized),
+                    question=normalized,
+                    document_id=document_id,
+                    chunk_id=chunk_id,
+                    gmt_created=now,
+                )
+            )
+        return entities
+
+
+def load_space_questions(
+    space: str, document_dao=None, chunk_dao=None
+) -> SpaceQuestions:
+    """Load the questions stored on the documents and chunks of a space.
+
+    Args:
+        space (str): The knowledge space name.
+        document_dao (KnowledgeDocumentDao, optional): The document dao.
+        chunk_dao (DocumentChunkDao, optional): The chunk dao.
+
+    Returns:
+        SpaceQuestions: The questions by document id, and by (document id, chunk id).
+    """
+    from .chunk_db import DocumentChunkDao, DocumentChunkEntity
+    from .document_db import KnowledgeDocumentDao, KnowledgeDocumentEntity
+
+    document_dao = document_dao or KnowledgeDocumentDao()
+    chunk_dao = chunk_dao or DocumentChunkDao()
+    documents = document_dao.get_documents(KnowledgeDocumentEntity(space=space))
+    document_questions = {
+        doc.id: json.loads(doc.questions) for doc in documents if doc.questions
+    }
+    chunk_questions = {}
+    if documents:
+        chunks = chunk_dao.get_chunks_with_questions(
+            query=DocumentChunkEntity(), document_ids=[doc.id for doc in documents]
+        )
+        chunk_questions = {
+            (chunk.document_id, chunk.id): json.loads(chunk.questions)
+            for chunk in chunks
+            if chunk.questions
+        }
+    return document_questions, chunk_questions
@@ -7,7 +7,6 @@ from dbgpt.rag.retriever import EmbeddingRetriever, QueryRewrite, Ranker
 from dbgpt.rag.retriever.base import BaseRetriever
 from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
-from dbgpt_serve.rag.models.models import KnowledgeSpaceDao
 from dbgpt_serve.rag.retriever.qa_retriever import QARetriever
 from dbgpt_serve.rag.retriever.retriever_chain import RetrieverChain
 from dbgpt_serve.rag.storage_manager import StorageManager
@@ -48,10 +47,7 @@ class KnowledgeSpaceRetriever(BaseRetriever):
         )
         embedding_fn = embedding_factory.create()
 
-        space_dao = KnowledgeSpaceDao()
-        space = space_dao.get_one({"id": space_id})
-        if space is None:
-            space = space_dao.get_one({"name": space_id})
+        space = self.storage_manager.get_space(space_id)
         if space is None:
             raise ValueError(f"Knowledge space {space_id} not found")
         storage_connector = self.storage_manager.get_storage_connector(
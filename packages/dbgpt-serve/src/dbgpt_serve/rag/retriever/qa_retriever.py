@@ -1,7 +1,6 @@
 import ast
-import json
 import logging
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional
 
 from dbgpt.component import ComponentType, SystemApp
 from dbgpt.core import Chunk
@@ -9,16 +8,24 @@ from dbgpt.rag.retriever.base import BaseRetriever
 from dbgpt.storage.vector_store.filters import MetadataFilters
 from dbgpt.util.executor_utils import ExecutorFactory, blocking_func_to_async
 from dbgpt.util.similarity_util import calculate_cosine_similarity
-from dbgpt.util.string_utils import remove_trailing_punctuation
-from dbgpt_serve.rag.models.models import KnowledgeSpaceDao
+from dbgpt_serve.rag.storage_manager import StorageManager
 
 from ..models.chunk_db import DocumentChunkDao, DocumentChunkEntity
-from ..models.document_db import KnowledgeDocumentDao
+from ..models.question_index_db import (
+    KnowledgeQuestionIndexDao,
+    QuestionHit,
+    load_space_questions,
+)
 
 CHUNK_PAGE_SIZE = 1000
 logger = logging.getLogger(__name__)
 
 
+def _unique(ids: Iterable[int]) -> List[int]:
+    """Deduplicate ids, keeping the first-seen order."""
+    return list(dict.fromkeys(ids))
+
+
 class QARetriever(BaseRetriever):
     """Document QA retriever."""
 
@@ -40,17 +47,14 @@ class QARetriever(BaseRetriever):
         self._system_app = system_app
         self._top_k = top_k
         self._lambda_value = lambda_value
-        self._space_dao = KnowledgeSpaceDao()
-        self._document_dao = KnowledgeDocumentDao()
         self._chunk_dao = DocumentChunkDao()
+        self._question_index_dao = KnowledgeQuestionIndexDao()
         self._embedding_fn = embedding_fn
 
-        space = self._space_dao.get_one({"id": space_id})
-        if not space:
-            space = self._space_dao.get_one({"name": space_id})
+        space = StorageManager.get_instance(system_app).get_space(space_id)
         if not space:
             raise ValueError("space not found")
-        self.documents = self._document_dao.get_list({"space": space.name})
+        self._space_name = space.name
         self._executor = self._system_app.get_component(
             ComponentType.EXECUTOR_DEFAULT, ExecutorFactory
         ).create()
@@ -65,28 +69,23 @@ class QARetriever(BaseRetriever):
         Return:
             List[Chunk]: list of chunks
         """
-        query = remove_trailing_punctuation(query)
+        hits = self._lookup(query)
         candidate_results = []
-        for doc in self.documents:
-            if doc.questions:
-                questions = json.loads(doc.questions)
-                if query in questions:
-                    chunks = self._chunk_dao.get_document_chunks(
-                        DocumentChunkEntity(document_id=doc.id),
-                        page_size=CHUNK_PAGE_SIZE,
-                    )
-                    candidates = [
-                        Chunk(
-                            content=chunk.content,
-                            metadata=ast.literal_eval(chunk.meta_info),
-                            retriever=self.name(),
-                            score=0.0,
-                        )
-                        for chunk in chunks
-                    ]
-                    candidate_results.extend(
-                        self._cosine_similarity_rerank(candidates, query)
-                    )
+        for document_id in _unique(hit.document_id for hit in hits if not hit.chunk_id):
+            chunks = self._chunk_dao.get_document_chunks(
+                DocumentChunkEntity(document_id=document_id),
+                page_size=CHUNK_PAGE_SIZE,
+            )
+            candidates = [
+                Chunk(
+                    content=chunk.content,
+                    metadata=ast.literal_eval(chunk.meta_info),
+                    retriever=self.name(),
+                    score=0.0,
+                )
+                for chunk in chunks
+            ]
+            candidate_results.extend(self._cosine_similarity_rerank(candidates, query))
         return candidate_results
 
     def _retrieve_with_score(
@@ -104,54 +103,54 @@ class QARetriever(BaseRetriever):
         Return:
             List[Chunk]: list of chunks with score
         """
-        query = remove_trailing_punctuation(query)
+        hits = self._lookup(query)
+        if not hits:
+            return []
         candidate_results = []
-        doc_ids = [doc.id for doc in self.documents]
-        query_param = DocumentChunkEntity()
-        chunks = self._chunk_dao.get_chunks_with_questions(
-            query=query_param, document_ids=doc_ids
-        )
-        for chunk in chunks:
-            if chunk.questions:
-                questions = json.loads(chunk.questions)
-                if query in questions:
-                    logger.info(f"qa chunk hit:{chunk}, question:{query}")
-                    candidate_results.append(
-                        Chunk(
-                            content=chunk.content,
-                            chunk_id=str(chunk.id),
-                            metadata={"prop_field": ast.literal_eval(chunk.meta_info)},
-                            retriever=self.name(),
-                            score=1.0,
-                        )
-                    )
+        chunk_ids = _unique(hit.chunk_id for hit in hits if hit.chunk_id)
+        for chunk in self._chunk_dao.get_chunks_by_ids(chunk_ids):
+            logger.info(f"qa chunk hit:{chunk}, question:{query}")
+            candidate_results.append(
+                Chunk(
+                    content=chunk.content,
+                    chunk_id=str(chunk.id),
+                    metadata={"prop_field": ast.literal_eval(chunk.meta_info)},
+                    retriever=self.name(),
+                    score=1.0,
+                )
+            )
         if len(candidate_results) > 0:
             return self._cosine_similarity_rerank(candidate_results, query)
 
-        for doc in self.documents:
-            if doc.questions:
-                questions = json.loads(doc.questions)
-                if query in questions:
-                    logger.info(f"qa document hit:{doc}, question:{query}")
-                    chunks = self._chunk_dao.get_document_chunks(
-                        DocumentChunkEntity(document_id=doc.id),
-                        page_size=CHUNK_PAGE_SIZE,
-                    )
-                    candidates_with_scores = [
-                        Chunk(
-                            content=chunk.content,
-                            chunk_id=str(chunk.id),
-                            metadata={"prop_field": ast.literal_eval(chunk.meta_info)},
-                            retriever=self.name(),
-                            score=1.0,
-                        )
-                        for chunk in chunks
-                    ]
-                    candidate_results.extend(
-                        self._cosine_similarity_rerank(candidates_with_scores, query)
-                    )
+        for document_id in _unique(hit.document_id for hit in hits if not hit.chunk_id):
+            logger.info(f"qa document hit:{document_id}, question:{query}")
+            chunks = self._chunk_dao.get_document_chunks(
+                DocumentChunkEntity(document_id=document_id),
+                page_size=CHUNK_PAGE_SIZE,
+            )
+            candidates_with_scores = [
+                Chunk(
+                    content=chunk.content,
+                    chunk_id=str(chunk.id),
+                    metadata={"prop_field": ast.literal_eval(chunk.meta_info)},
+                    retriever=self.name(),
+                    score=1.0,
+                )
+                for chunk in chunks
+            ]
+            candidate_results.extend(
+                self._cosine_similarity_rerank(candidates_with_scores, query)
+            )
         return candidate_results
 
+    def _lookup(self, query: str) -> List[QuestionHit]:
+        """Look up the question, index the stored questions of the space first."""
+        self._question_index_dao.ensure_space_indexed(
+            self._space_name,
+            lambda: load_space_questions(self._space_name, chunk_dao=self._chunk_dao),
+        )
+        return self._question_index_dao.lookup(self._space_name, query)
+
     async def _aretrieve(
         self, query: str, filters: Optional[MetadataFilters] = None
     ) -> List[Chunk]:
@@ -191,14 +190,14 @@ class QARetriever(BaseRetriever):
     ) -> List[Chunk]:
         """Rerank candidates using cosine similarity."""
         if len(candidates_with_scores) > self._top_k:
-            for candidate in candidates_with_scores:
-                similarity = calculate_cosine_similarity(
-                    embeddings=self._embedding_fn,
-                    prediction=query,
-                    contexts=[candidate.content],
-                )
-                score = float(similarity.mean())
-                candidate.score = score
+            # Embed all the candidates in one batch instead of one call per chunk
+            similarities = calculate_cosine_similarity(
+                embeddings=self._embedding_fn,
+                prediction=query,
+                contexts=[candidate.content for candidate in candidates_with_scores],
+            )
+            for candidate, similarity in zip(candidates_with_scores, similarities):
+                candidate.score = float(similarity)
             candidates_with_scores.sort(key=lambda x: x.score, reverse=True)
             candidates_with_scores = candidates_with_scores[: self._top_k]
             candidates_with_scores = [
@@ -62,6 +62,9 @@ class Serve(BaseServe):
         # import your own module here to ensure the module is loaded before the
         # application starts
         from .models.models import KnowledgeSpaceEntity as _  # noqa: F401
+        from .models.question_index_db import (  # noqa: F401
+            KnowledgeQuestionIndexEntity as _question_index,
+        )
 
     def before_start(self):
         """Called before the start of the application."""
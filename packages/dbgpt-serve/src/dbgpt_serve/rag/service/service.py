@@ -47,6 +47,10 @@ from ..models.document_db import (
     KnowledgeDocumentEntity,
 )
 from ..models.models import KnowledgeSpaceDao, KnowledgeSpaceEntity
+from ..models.question_index_db import (
+    KnowledgeQuestionIndexDao,
+    load_space_questions,
+)
 from ..retriever.knowledge_space import KnowledgeSpaceRetriever
 from ..storage_manager import StorageManager
 
@@ -72,11 +76,13 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         dao: Optional[KnowledgeSpaceDao] = None,
         document_dao: Optional[KnowledgeDocumentDao] = None,
         chunk_dao: Optional[DocumentChunkDao] = None,
+        question_index_dao: Optional[KnowledgeQuestionIndexDao] = None,
     ):
         self._system_app = system_app
         self._dao: KnowledgeSpaceDao = dao
         self._document_dao: KnowledgeDocumentDao = document_dao
         self._chunk_dao: DocumentChunkDao = chunk_dao
+        self._question_index_dao: KnowledgeQuestionIndexDao = question_index_dao
         self._serve_config = config
 
         super().__init__(system_app)
@@ -91,12 +97,23 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         self._dao = self._dao or KnowledgeSpaceDao()
         self._document_dao = self._document_dao or KnowledgeDocumentDao()
         self._chunk_dao = self._chunk_dao or DocumentChunkDao()
+        self._question_index_dao = (
+            self._question_index_dao or KnowledgeQuestionIndexDao()
+        )
         self._system_app = system_app
 
     @property
     def storage_manager(self):
         return StorageManager.get_instance(self._system_app)
 
+    def _invalidate_storage(self, space_name: str) -> None:
+        """Drop the cached storage connectors and metadata of the space."""
+        storage_manager = StorageManager.get_instance(
+            self._system_app, default_component=None
+        )
+        if storage_manager:
+            storage_manager.invalidate(space_name)
+
     @property
     def dao(
         self,
@@ -156,6 +173,7 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                 detail=f"no space name named {request.name}",
             )
         update_obj = self._dao.update_knowledge_space(self._dao.from_request(request))
+        self._invalidate_storage(spaces[0].name)
         return update_obj
 
     def create_document(self, request: DocumentServeRequest) -> str:
@@ -301,8 +319,11 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             self._chunk_dao.raw_delete(document.id)
         # delete documents
         self._document_dao.raw_delete(document_query)
+        # delete question index
+        self._question_index_dao.delete_by_space(space.name)
         # delete space
         self._dao.delete(query_request)
+        self._invalidate_storage(space.name)
         return space
 
     def update_document(self, request: DocumentServeRequest):
@@ -322,6 +343,7 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             if update_chunk:
                 update_chunk.doc_name = request.doc_name
                 self._chunk_dao.update({"id": update_chunk.id}, update_chunk)
+        questions = []
         if not request.questions:
             entity.questions = ""
         else:
@@ -332,6 +354,9 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
         self._document_dao.update(
             {"id": entity.id}, self._document_dao.to_request(entity)
         )
+        self._question_index_dao.replace_questions(
+            space=entity.space, document_id=entity.id, questions=questions
+        )
 
     def delete_document(self, document_id: str) -> Optional[DocumentServeResponse]:
         """Delete a Flow entity
@@ -363,8 +388,11 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             vector_store_connector.delete_by_ids(vector_ids)
         # delete chunks
         self._chunk_dao.raw_delete(docuemnt.id)
+        # delete question index
+        self._question_index_dao.delete_by_document(space.name, docuemnt.id)
         # delete document
         self._document_dao.raw_delete(docuemnt)
+        self._invalidate_storage(space.name)
         return docuemnt
 
     def get_list(self, request: SpaceServeRequest) -> List[SpaceServeResponse]:
@@ -439,6 +467,35 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
             ]
             entity.questions = json.dumps(questions, ensure_ascii=False)
         self._chunk_dao.update_chunk(entity)
+        if request.questions:
+            document = self._document_dao.get_one({"id": entity.document_id})
+            self._question_index_dao.replace_questions(
+                space=document.space,
+                document_id=entity.document_id,
+                questions=questions,
+                chunk_id=entity.id,
+            )
+
+    def rebuild_question_index(self, space_id: str) -> int:
+        """Rebuild the question index of a space from the stored questions
+
+        The QA retriever indexes a space without index rows on its first lookup, run
+        it to rebuild the index of a space which is partially indexed.
+
+        Args:
+            - space_id: space id
+        Returns:
+            - int: the number of indexed questions
+        """
+        space = self.get({"id": space_id})
+        if space is None:
+            raise Exception(f"space id:{space_id} not found")
+        document_questions, chunk_questions = load_space_questions(
+            space.name, self._document_dao, self._chunk_dao
+        )
+        return self._question_index_dao.rebuild_space(
+            space.name, document_questions, chunk_questions
+        )
 
     async def _batch_document_sync(
         self, space_id, sync_requests: List[KnowledgeSyncRequest]
@@ -609,6 +666,8 @@ class Service(BaseService[KnowledgeSpaceEntity, SpaceServeRequest, SpaceServeRes
                 )
                 for chunk_doc in chunk_docs
             ]
+            # The questions of the chunks of the previous sync are stale
+            self._question_index_dao.delete_chunk_questions(doc.space, doc.id)
             self._chunk_dao.create_documents_chunks(chunk_entities)
         except Exception as e:
             doc.status = SyncStatus.FAILED.name
@@ -1,6 +1,12 @@
 """RAG STORAGE MANAGER manager."""
 
-from typing import List, Optional, Type
+import copy
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import cachetools
 
 from dbgpt import BaseComponent
 from dbgpt.component import ComponentType, SystemApp
@@ -12,6 +18,13 @@ from dbgpt.storage.full_text.base import FullTextStoreBase
 from dbgpt.storage.vector_store.base import VectorStoreBase, VectorStoreConfig
 from dbgpt_ext.storage.full_text.elasticsearch import ElasticDocumentStore
 from dbgpt_ext.storage.knowledge_graph.knowledge_graph import BuiltinKnowledgeGraph
+from dbgpt_serve.rag.api.schemas import SpaceServeResponse
+from dbgpt_serve.rag.models.models import KnowledgeSpaceDao
+
+logger = logging.getLogger(__name__)
+
+# (index name, storage type, llm model, embedding model)
+_StoreKey = Tuple[str, str, Optional[str], Optional[str]]
 
 
 class StorageManager(BaseComponent):
@@ -19,9 +32,25 @@ class StorageManager(BaseComponent):
 
     name = ComponentType.RAG_STORAGE_MANAGER
 
-    def __init__(self, system_app: SystemApp):
-        """Create a new ConnectorManager."""
+    def __init__(self, system_app: SystemApp, max_cached_stores: int = 64):
+        """Create a new ConnectorManager.
+
+        Args:
+            system_app (SystemApp): The system app.
+            max_cached_stores (int): The max number of the cached storage
+                connectors, the least recently used are evicted. 0 disables the
+                cache.
+        """
         self.system_app = system_app
+        self._max_cached_stores = max_cached_stores
+        self._stores: "OrderedDict[_StoreKey, IndexStoreBase]" = OrderedDict()
+        # The knowledge spaces cached by id and by name, the least recently used
+        # are evicted
+        self._spaces: cachetools.LRUCache = cachetools.LRUCache(
+            maxsize=max(2 * max_cached_stores, 1)
+        )
+        self._lock = threading.Lock()
+        self._key_locks: Dict[_StoreKey, threading.Lock] = {}
         super().__init__(system_app)
 
     def init_app(self, system_app: SystemApp):
@@ -36,7 +65,101 @@ class StorageManager(BaseComponent):
     def get_storage_connector(
         self, index_name: str, storage_type: str, llm_model: Optional[str] = None
     ) -> IndexStoreBase:
-        """Get storage connector."""
+        """Get storage connector.
+
+        The connectors are cached by the index name, the storage type, the llm model
+        and the embedding model, so the clients and the collections of a space are
+        reused between the requests. Call :meth:`invalidate` when the space changes.
+
+        The cache is a plain LRU without reference counting: an evicted or
+        invalidated connector is not closed, because a request may still be using
+        it. It is released by the garbage collector when its last holder drops it,
+        so the connectors must not need an explicit close.
+        """
+        if self._max_cached_stores <= 0:
+            return self._create_storage_connector(index_name, storage_type, llm_model)
+        app_config = self.system_app.config.configs.get("app_config")
+        key: _StoreKey = (
+            index_name,
+            storage_type.lower(),
+            llm_model if storage_type == "KnowledgeGraph" else None,
+            app_config.models.default_embedding if app_config else None,
+        )
+        with self._lock:
+            store = self._stores.get(key)
+            if store is not None:
+                self._stores.move_to_end(key)
+                return store
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        # Only one thread creates the connector of a key, the others wait for it
+        with key_lock:
+            with self._lock:
+                store = self._stores.get(key)
+                if store is not None:
+                    self._stores.move_to_end(key)
+                    return store
+            try:
+                store = self._create_storage_connector(
+                    index_name, storage_type, llm_model
+                )
+                with self._lock:
+                    self._stores[key] = store
+                    while len(self._stores) > self._max_cached_stores:
+                        # The evicted connector is still usable by its holders,
+                        # it is released when the last of them drops it
+                        self._stores.popitem(last=False)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return store
+
+    def get_space(self, space_id: Any) -> Optional[SpaceServeResponse]:
+        """Get a knowledge space by its id or name, the spaces are cached.
+
+        Args:
+            space_id (Any): The id or the name of the knowledge space.
+
+        Returns:
+            Optional[SpaceServeResponse]: The knowledge space, None if not found.
+        """
+        with self._lock:
+            space = self._spaces.get(str(space_id))
+        if space is not None:
+            return space
+        space_dao = KnowledgeSpaceDao()
+        space = space_dao.get_one({"id": space_id})
+        if space is None:
+            space = space_dao.get_one({"name": space_id})
+        if space is not None and self._max_cached_stores > 0:
+            with self._lock:
+                self._spaces[str(space.id)] = space
+                self._spaces[space.name] = space
+        return space
+
+    def invalidate(self, index_name: Optional[Any] = None) -> None:
+        """Drop the cached connectors and spaces of an index, or all of them.
+
+        Args:
+            index_name (Optional[Any]): The index name, which is the space name of
+                the knowledge spaces, or the space id. Drop everything if None.
+        """
+        with self._lock:
+            if index_name is None:
+                self._stores.clear()
+                self._spaces.clear()
+                return
+            names = {str(index_name)}
+            for space in list(self._spaces.values()):
+                if str(index_name) in (str(space.id), space.name):
+                    names.add(space.name)
+                    self._spaces.pop(str(space.id), None)
+                    self._spaces.pop(space.name, None)
+            for key in [k for k in self._stores if k[0] in names]:
+                del self._stores[key]
+
+    def _create_storage_connector(
+        self, index_name: str, storage_type: str, llm_model: Optional[str] = None
+    ) -> IndexStoreBase:
         supported_vector_types = self.get_vector_supported_types
         storage_config = self.storage_config()
         if storage_type.lower() in supported_vector_types:
@@ -89,8 +212,10 @@ class StorageManager(BaseComponent):
             "embedding_factory", EmbeddingFactory
         )
         embedding_fn = embedding_factory.create()
-        if storage_config.graph:
-            graph_config = storage_config.graph
+        # The graph config is shared by all the spaces, set the llm model of this
+        # space on a copy
+        graph_config = copy.copy(storage_config.graph)
+        if graph_config:
             graph_config.llm_model = llm_model
             if hasattr(graph_config, "enable_summary") and graph_config.enable_summary:
                 from dbgpt_ext.storage.knowledge_graph.community_summary import (
@@ -98,7 +223,7 @@ class StorageManager(BaseComponent):
                 )
 
                 return CommunitySummaryKnowledgeGraph(
-                    config=storage_config.graph,
+                    config=graph_config,
                     name=index_name,
                     llm_client=llm_client,
                     vector_store_config=storage_config.vector,
@@ -122,7 +247,7 @@ class StorageManager(BaseComponent):
                     kg_max_threads=rag_config.max_threads,
                 )
         return BuiltinKnowledgeGraph(
-            config=storage_config.graph,
+            config=graph_config,
             name=index_name,
             llm_client=llm_client,
         )
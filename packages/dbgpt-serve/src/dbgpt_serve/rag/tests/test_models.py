@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from dbgpt.storage.metadata import db
+
+from ..models.chunk_db import DocumentChunkDao, DocumentChunkEntity
+from ..models.document_db import KnowledgeDocumentDao, KnowledgeDocumentEntity
+from ..models.question_index_db import (
+    KnowledgeQuestionIndexDao,
+    KnowledgeQuestionIndexEntity,
+    QuestionHit,
+    QuestionIndexCache,
+    load_space_questions,
+    normalize_question,
+    question_key,
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_and_teardown():
+    db.init_db("sqlite:///:memory:")
+    db.create_all()
+
+    yield
+
+
+@pytest.fixture
+def cache():
+    return QuestionIndexCache()
+
+
+@pytest.fixture
+def dao(cache):
+    return KnowledgeQuestionIndexDao(cache=cache)
+
+
+def test_table_exist():
+    assert KnowledgeQuestionIndexEntity.__tablename__ in db.metadata.tables
+
+
+def test_normalize_question():
+    assert normalize_question("  What   is DB-GPT? ") == "what is db-gpt"
+    assert normalize_question("如何部署？") == "如何部署"
+    assert question_key("What is DB-GPT?") == question_key("what is  db-gpt")
+
+
+def test_lookup_document_and_chunk_questions(dao):
+    dao.replace_questions("space1", 1, ["What is DB-GPT?", "what is db-gpt"])
+    dao.replace_questions("space1", 1, ["What is DB-GPT"], chunk_id=10)
+    dao.replace_questions("space2", 2, ["What is DB-GPT"])
+
+    assert dao.lookup("space1", "what is DB-GPT") == [
+        QuestionHit(1, 10),
+        QuestionHit(1, None),
+    ]
+    assert dao.lookup("space2", "What is DB-GPT?") == [QuestionHit(2, None)]
+    assert dao.lookup("space1", "How to deploy") == []
+
+
+def test_lookup_is_cached(dao, cache):
+    dao.replace_questions("space1", 1, ["How to deploy"])
+    assert dao.lookup("space1", "How to deploy") == [QuestionHit(1, None)]
+
+    # Written behind the dao's back, served from the cache
+    with db.session() as session:
+        session.query(KnowledgeQuestionIndexEntity).delete()
+    assert dao.lookup("space1", "How to deploy") == [QuestionHit(1, None)]
+
+    cache.invalidate("space1")
+    assert dao.lookup("space1", "How to deploy") == []
+
+
+def test_update_invalidates_cache(dao):
+    dao.replace_questions("space1", 1, ["How to deploy"])
+    assert dao.lookup("space1", "How to deploy") == [QuestionHit(1, None)]
+
+    dao.replace_questions("space1", 1, ["How to upgrade"])
+    assert dao.lookup("space1", "How to deploy") == []
+    assert dao.lookup("space1", "How to upgrade") == [QuestionHit(1, None)]
+
+    dao.delete_by_document("space1", 1)
+    assert dao.lookup("space1", "How to upgrade") == []
+
+
+def test_rebuild_and_delete_space(dao):
+    count = dao.rebuild_space(
+        "space1",
+        {1: ["How to deploy"], 2: []},
+        {(1, 10): ["How to upgrade", "How to upgrade?"]},
+    )
+    assert count == 2
+    assert dao.lookup("space1", "How to upgrade") == [QuestionHit(1, 10)]
+
+    dao.delete_by_space("space1")
+    assert dao.lookup("space1", "How to deploy") == []
+
+
+def test_ensure_space_indexed(dao, cache):
+    loads = []
+
+    def _load_questions():
+        loads.append(1)
+        return {1: ["How to deploy"]}, {(1, 10): ["How to upgrade"]}
+
+    dao.ensure_space_indexed("space1", _load_questions)
+    assert dao.lookup("space1", "How to upgrade") == [QuestionHit(1, 10)]
+    # Checked once per space
+    dao.ensure_space_indexed("space1", _load_questions)
+    assert len(loads) == 1
+
+    # A space with index rows is not rebuilt
+    dao.replace_questions("space2", 2, ["How to deploy"])
+    dao.ensure_space_indexed("space2", _load_questions)
+    assert len(loads) == 1
+    assert dao.lookup("space2", "How to upgrade") == []
+
+
+def test_delete_chunk_questions(dao):
+    dao.replace_questions("space1", 1, ["How to deploy"])
+    dao.replace_questions("space1", 1, ["How to upgrade"], chunk_id=10)
+    dao.delete_chunk_questions("space1", 1)
+    assert dao.lookup("space1", "How to upgrade") == []
+    assert dao.lookup("space1", "How to deploy") == [QuestionHit(1, None)]
+
+
+def test_load_space_questions():
+    document_dao = KnowledgeDocumentDao()
+    document_id = document_dao.create_knowledge_document(
+        KnowledgeDocumentEntity(
+            doc_name="doc1",
+            doc_type="TEXT",
+            space="space1",
+            questions=json.dumps(["How to deploy"]),
+        )
+    )
+    with DocumentChunkDao().session() as session:
+        session.add(
+            DocumentChunkEntity(
+                doc_name="doc1",
+                doc_type="TEXT",
+                document_id=document_id,
+                content="chunk",
+                meta_info="{}",
+                questions=json.dumps(["How to upgrade"]),
+            )
+        )
+    document_questions, chunk_questions = load_space_questions("space1")
+    assert document_questions == {document_id: ["How to deploy"]}
+    assert list(chunk_questions.values()) == [["How to upgrade"]]
+    assert load_space_questions("space2") == ({}, {})
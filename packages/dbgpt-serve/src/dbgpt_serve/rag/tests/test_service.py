@@ -17,8 +17,9 @@ from ..api.schemas import (
     SpaceServeResponse,
 )
 from ..models.chunk_db import DocumentChunkDao
-from ..models.document_db import KnowledgeDocumentDao
+from ..models.document_db import KnowledgeDocumentDao, KnowledgeDocumentEntity
 from ..models.models import KnowledgeSpaceDao, SpaceServeRequest
+from ..models.question_index_db import KnowledgeQuestionIndexDao
 from ..service.service import Service
 
 
@@ -43,13 +44,26 @@ def mock_chunk_dao():
 
 
 @pytest.fixture
-def service(system_app: SystemApp, mock_dao, mock_document_dao, mock_chunk_dao, config):
+def mock_question_index_dao():
+    return Mock(KnowledgeQuestionIndexDao)
+
+
+@pytest.fixture
+def service(
+    system_app: SystemApp,
+    mock_dao,
+    mock_document_dao,
+    mock_chunk_dao,
+    mock_question_index_dao,
+    config,
+):
     return Service(
         system_app=system_app,
         config=config,
         dao=mock_dao,
         document_dao=mock_document_dao,
         chunk_dao=mock_chunk_dao,
+        question_index_dao=mock_question_index_dao,
     )
 
 
@@ -137,9 +151,30 @@ async def test_delete_document(service):
 
     assert response.id == document_id
     service._chunk_dao.raw_delete.assert_called_once_with(document_id)
+    service._question_index_dao.delete_by_document.assert_called_once_with(
+        "TestSpace", document_id
+    )
     service._document_dao.raw_delete.assert_called_once_with(existing_document)
 
 
+def test_update_document_indexes_questions(service):
+    existing_document = KnowledgeDocumentEntity(id=3, space="TestSpace")
+    service._document_dao.get_one = Mock(return_value=existing_document)
+    service._document_dao.from_response = Mock(return_value=existing_document)
+    service._document_dao.to_request = Mock()
+    service._document_dao.update = Mock()
+
+    service.update_document(
+        DocumentServeRequest(id=3, questions=["What is DB-GPT?", "How to deploy"])
+    )
+
+    service._question_index_dao.replace_questions.assert_called_once_with(
+        space="TestSpace",
+        document_id=3,
+        questions=["What is DB-GPT", "How to deploy"],
+    )
+
+
 # @pytest.mark.asyncio
 # async def test_batch_document_sync_success(service):
 #     space_id = "test_space_id"
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from dbgpt.component import SystemApp
+
+from ..api.schemas import SpaceServeResponse
+from ..models.models import KnowledgeSpaceDao
+from ..storage_manager import StorageManager
+
+
+@pytest.fixture
+def storage_manager():
+    system_app = SystemApp()
+    app_config = Mock()
+    app_config.models.default_embedding = "text2vec"
+    system_app.config.set("app_config", app_config)
+    manager = StorageManager(system_app, max_cached_stores=2)
+    manager._create_storage_connector = Mock(side_effect=lambda *args: Mock())
+    return manager
+
+
+def test_get_storage_connector_cached(storage_manager: StorageManager):
+    store = storage_manager.get_storage_connector("space1", "Chroma")
+    assert storage_manager.get_storage_connector("space1", "Chroma") is store
+    assert storage_manager.get_storage_connector("space2", "Chroma") is not store
+    assert storage_manager._create_storage_connector.call_count == 2
+
+    # Evict the least recently used
+    storage_manager.get_storage_connector("space1", "Chroma")
+    storage_manager.get_storage_connector("space3", "Chroma")
+    assert storage_manager.get_storage_connector("space1", "Chroma") is store
+    storage_manager.get_storage_connector("space2", "Chroma")
+    assert storage_manager._create_storage_connector.call_count == 4
+
+    storage_manager.invalidate("space1")
+    assert storage_manager.get_storage_connector("space1", "Chroma") is not store
+
+
+def test_get_storage_connector_created_once(storage_manager: StorageManager):
+    with ThreadPoolExecutor(8) as executor:
+        stores = list(
+            executor.map(
+                lambda _: storage_manager.get_storage_connector("space1", "Chroma"),
+                range(16),
+            )
+        )
+    assert all(store is stores[0] for store in stores)
+    assert storage_manager._create_storage_connector.call_count == 1
+
+
+def test_get_space_cached(storage_manager: StorageManager):
+    space = SpaceServeResponse(id=1, name="space1", vector_type="Chroma")
+    with patch.object(KnowledgeSpaceDao, "get_one", return_value=space) as mock_get_one:
+        assert storage_manager.get_space(1) is space
+        assert storage_manager.get_space("space1") is space
+        assert mock_get_one.call_count == 1
+
+        storage_manager.invalidate(1)
+        assert storage_manager.get_space("space1") is space
+        assert mock_get_one.call_count == 2
+
+
+def test_get_storage_connector_creation_failed(storage_manager: StorageManager):
+    storage_manager._create_storage_connector.side_effect = ValueError("failed")
+    with pytest.raises(ValueError):
+        storage_manager.get_storage_connector("space1", "Chroma")
+    assert storage_manager._key_locks == {}
+
+
+def test_get_space_cache_bounded(storage_manager: StorageManager):
+    spaces = {
+        i: SpaceServeResponse(id=i, name=f"space{i}", vector_type="Chroma")
+        for i in range(10)
+    }
+    with patch.object(
+        KnowledgeSpaceDao, "get_one", side_effect=lambda q: spaces[q["id"]]
+    ):
+        for i in range(10):
+            storage_manager.get_space(i)
+    # Two entries, by id and by name, of the last two spaces
+    assert len(storage_manager._spaces) == 4
+
+
+def test_create_kg_store_copies_graph_config(storage_manager: StorageManager):
+    graph_config = Mock(enable_summary=False, llm_model=None)
+    app_config = storage_manager.system_app.config.get("app_config")
+    app_config.rag.storage.graph = graph_config
+    storage_manager.system_app.get_component = Mock()
+    with patch(
+        "dbgpt_serve.rag.storage_manager.BuiltinKnowledgeGraph"
+    ) as knowledge_graph:
+        storage_manager.create_kg_store("space1", llm_model="model1")
+    config = knowledge_graph.call_args.kwargs["config"]
+    assert config is not graph_config
+    assert config.llm_model == "model1"
+    assert graph_config.llm_model is None